@@ -0,0 +1,59 @@
+import os
+
+# Simulation parameters shared by every benchmark case, each case only overrides what it needs
+BENCH_DEFAULTS_DICT = {
+    'mod_assumption': 'example_mod_a',
+    'mod_assumptions_path': os.path.join('json_input', 'example_mods', 'example_mod_formats.json'),
+    'holding_time': 1.0,
+    'num_requests': 2000,
+    'request_distribution': {"25": 0.0, "50": 0.3, "100": 0.5, "200": 0.0, "400": 0.2},
+    'guard_slots': 1,
+    'max_iters': 1,
+    'max_segments': 1,
+    'dynamic_lps': False,
+    'k_paths': 3,
+    'save_snapshots': False,
+    'snapshot_step': 10,
+    'print_step': 1,
+    'bw_per_slot': 12.5,
+    'const_link_weight': False,
+    'c_band': 128,
+    'file_type': 'json',
+    'seeds': [1],
+    'is_training': False,
+    'deploy_model': False,
+    'output_train_data': False,
+    'xt_type': 'without_length',
+    'beta': 0.5,
+    'theta': 0.0,
+    'input_power': 0.001,
+    'egn_model': False,
+    'xt_noise': False,
+    'phi': {"QPSK": 1, "16-QAM": 0.68, "64-QAM": 0.6190476190476191},
+    'requested_xt': {"QPSK": -26.19, "16-QAM": -36.69, "64-QAM": -41.69},
+    'profile_phases': True,
+}
+
+# Representative combinations of the settings used in production sweeps
+BENCH_CASES_LIST = [
+    {'network': 'NSFNet', 'allocation_method': 'first_fit', 'route_method': 'k_shortest_path', 'snr_type': None,
+     'cores_per_link': 1, 'erlang': 100.0},
+    {'network': 'NSFNet', 'allocation_method': 'first_fit', 'route_method': 'k_shortest_path', 'snr_type': None,
+     'cores_per_link': 7, 'erlang': 700.0},
+    {'network': 'NSFNet', 'allocation_method': 'best_fit', 'route_method': 'k_shortest_path', 'snr_type': None,
+     'cores_per_link': 4, 'erlang': 400.0},
+    {'network': 'NSFNet', 'allocation_method': 'first_fit', 'route_method': 'k_shortest_path',
+     'snr_type': 'xt_calculation', 'cores_per_link': 7, 'erlang': 700.0},
+    {'network': 'USNet', 'allocation_method': 'first_fit', 'route_method': 'k_shortest_path', 'snr_type': None,
+     'cores_per_link': 7, 'erlang': 700.0},
+    {'network': 'USNet', 'allocation_method': 'last_fit', 'route_method': 'least_congested', 'snr_type': None,
+     'cores_per_link': 4, 'erlang': 400.0},
+    {'network': 'Pan-European', 'allocation_method': 'first_fit', 'route_method': 'k_shortest_path',
+     'snr_type': None, 'cores_per_link': 7, 'erlang': 700.0},
+    # XT-aware allocation is orders of magnitude slower than the other methods, use fewer requests
+    {'network': 'Pan-European', 'allocation_method': 'xt_aware', 'route_method': 'k_shortest_path',
+     'snr_type': None, 'cores_per_link': 7, 'erlang': 700.0, 'num_requests': 50},
+]
+
+# Keys that make up a benchmark case's unique identifier
+BENCH_ID_KEYS_LIST = ['network', 'allocation_method', 'route_method', 'snr_type', 'cores_per_link', 'erlang']
@@ -63,6 +63,14 @@ OTHER_OPTIONS = {
         'filter_mods': bool,
         'snapshot_step': int,
         'print_step': int,
+        'profile_phases': str_to_bool,
+        'save_trace': str_to_bool,
+        'replay_trace': str,
+        'compare_policies': str_to_bool,
+        'target_blocking': float,
+        'search_tol': float,
+        'max_pilots': int,
+        'max_full': int,
     },
     'topology_settings': {
         'bi_directional': str_to_bool,
@@ -99,6 +107,7 @@ OTHER_OPTIONS = {
         'optimize': str_to_bool,
         'optimize_hyperparameters': str_to_bool,
         'super_channel_space': int,
+        'num_envs': int,
         'device': str,
         'policy': str,
         'reward': float,
@@ -116,11 +125,18 @@ OTHER_OPTIONS = {
         'train_file_path': str,
         'ml_model': str,
         'test_size': float,
+        'plot_ml': str_to_bool,
+        'ml_workers': int,
     },
     'file_settings': {
     },
 }
 
+# Options that must be identical across simulations when comparing policies on common random numbers
+WORKLOAD_OPTIONS_LIST = ['network', 'cores_per_link', 'holding_time', 'erlangs', 'num_requests',
+                         'request_distribution', 'max_iters', 'seeds', 'mod_assumption', 'mod_assumptions_path',
+                         'bw_per_slot', 'const_link_weight', 'c_band', 'l_band', 's_band', 'o_band', 'e_band']
+
 COMMAND_LINE_PARAMS = [
     ['epsilon_start', float, ''],
     ['epsilon_end', float, ''],
@@ -163,10 +179,19 @@ COMMAND_LINE_PARAMS = [
     ['xt_type', str, ''],
     ['snapshot_step', int, ''],
     ['print_step', int, ''],
+    ['profile_phases', bool, ''],
+    ['save_trace', bool, ''],
+    ['replay_trace', str, ''],
+    ['compare_policies', bool, ''],
+    ['target_blocking', float, ''],
+    ['search_tol', float, ''],
+    ['max_pilots', int, ''],
+    ['max_full', int, ''],
     ['file_type', str, ''],
     ['theta', float, ''],
     ['filter_mods', bool, ''],
     ['super_channel_space', int, ''],
+    ['num_envs', int, ''],
     ['policy', str, ''],
     ['path_model', str, ''],
     ['core_model', str, ''],
@@ -182,6 +207,8 @@ COMMAND_LINE_PARAMS = [
     ['train_file_path', str, ''],
     ['ml_model', str, ''],
     ['test_size', float, ''],
+    ['plot_ml', bool, ''],
+    ['ml_workers', int, ''],
     ['deploy_model', bool, ''],
     ['path_levels', int, ''],
     ['core_beta', float, ''],
@@ -0,0 +1,38 @@
+import os
+
+DATASET_DIR = os.path.join('data', 'datasets')  # Default directory offline datasets are saved in
+DATASET_CHUNK_SIZE = 1 << 16  # Rows written to each file of a dataset
+DATASET_INFO_FILE = 'dataset_info.json'  # Describes how a dataset was generated
+
+# The behaviour policy the simulator runs under while a dataset is generated
+BEHAVIOUR_POLICY_DICT = {
+    'route_method': 'k_shortest_path',
+    'allocation_method': 'first_fit',
+}
+
+# One column for every arrival request
+REQUEST_COLUMNS_DICT = {
+    'seed': 'int32',
+    'req_id': 'int32',
+    'source': 'int16',
+    'destination': 'int16',
+    'bandwidth': 'int16',
+    'path_index': 'int8',  # Path chosen by the behaviour policy, its first choice if the request was blocked
+    'core_num': 'int8',  # Core chosen by the behaviour policy, its first choice if the request was blocked
+    'was_allocated': 'bool',
+    'next_path_level': 'int8',  # Congestion level of the chosen path after the request was handled
+    'next_core_level': 'int8',  # Congestion level of the chosen core after the request was handled
+}
+
+# One column for every candidate path, named '{column}_{path index}', padded when a pair has fewer paths
+PATH_COLUMNS_DICT = {
+    'path_level': 'int8',  # Congestion level, -1 for padding
+    'path_len': 'float32',
+    'path_feasible': 'bool',  # Whether the request fits in the spectrum of the path
+}
+
+# One column for every core of every candidate path, named '{column}_{path index}_{core number}'
+CORE_COLUMNS_DICT = {
+    'core_level': 'int8',
+    'core_feasible': 'bool',
+}
@@ -0,0 +1,100 @@
+# pylint: disable=too-few-public-methods
+from enum import IntEnum
+
+
+class RouteMethod(IntEnum):
+    """
+    Routing methods supported by the routing.py script.
+    """
+    NLI_AWARE = 0
+    XT_AWARE = 1
+    LEAST_CONGESTED = 2
+    SHORTEST_PATH = 3
+    K_SHORTEST_PATH = 4
+
+
+class AllocationMethod(IntEnum):
+    """
+    Allocation methods supported by the spectrum_assignment.py script.
+    """
+    FIRST_FIT = 0
+    LAST_FIT = 1
+    PRIORITY_FIRST = 2
+    PRIORITY_LAST = 3
+    BEST_FIT = 4
+    XT_AWARE = 5
+
+
+def get_method(method_enum: type, method_name: str):
+    """
+    Finds the enum member of a method from its name in the configuration file.
+
+    :param method_enum: The enum of supported methods.
+    :param method_name: The method's name e.g., k_shortest_path.
+    :return: The method or None if it's not supported.
+    :rtype: IntEnum
+    """
+    if not isinstance(method_name, str):
+        return None
+
+    return method_enum.__members__.get(method_name.upper())
+
+
+def get_slots_needed(mod_per_bw: dict):
+    """
+    Flattens the slots needed for every bandwidth and modulation format.
+
+    :param mod_per_bw: The modulation formats of each bandwidth.
+    :return: Slots needed keyed by bandwidth and modulation format.
+    :rtype: dict
+    """
+    slots_dict = dict()
+    for bandwidth, mods_dict in mod_per_bw.items():
+        if not isinstance(mods_dict, dict):
+            continue
+
+        for mod_format, mod_dict in mods_dict.items():
+            if isinstance(mod_dict, dict) and 'slots_needed' in mod_dict:
+                slots_dict[(bandwidth, mod_format)] = mod_dict['slots_needed']
+
+    return slots_dict
+
+
+class EngineConfig:
+    """
+    The options read on every request, compiled once from the engine properties.
+    """
+
+    __slots__ = ('guard_slots', 'cores_per_link', 'band_list', 'route_method', 'route_method_name',
+                 'allocation_method', 'allocation_method_name', 'k_paths', 'max_segments', 'snr_type', 'is_snr',
+                 'topology', 'slots_needed_dict', 'bw_per_slot', 'input_power', '_is_frozen')
+
+    def __init__(self, engine_props: dict):
+        self.guard_slots = int(engine_props.get('guard_slots', 0))
+        self.cores_per_link = engine_props.get('cores_per_link')
+        self.band_list = tuple(engine_props.get('band_list', ()))
+        self.route_method_name = engine_props.get('route_method')
+        self.route_method = get_method(method_enum=RouteMethod, method_name=self.route_method_name)
+        self.allocation_method_name = engine_props.get('allocation_method')
+        self.allocation_method = get_method(method_enum=AllocationMethod, method_name=self.allocation_method_name)
+        self.k_paths = engine_props.get('k_paths')
+        self.max_segments = engine_props.get('max_segments', 1)
+        self.snr_type = engine_props.get('snr_type')
+        self.is_snr = self.snr_type is not None and self.snr_type != 'None'
+        self.topology = engine_props.get('topology')
+        self.slots_needed_dict = get_slots_needed(mod_per_bw=engine_props.get('mod_per_bw', {}))
+        self.bw_per_slot = engine_props.get('bw_per_slot')
+        self.input_power = engine_props.get('input_power')
+        self._is_frozen = True
+
+    def __setattr__(self, key: str, value: object):
+        if getattr(self, '_is_frozen', False):
+            raise AttributeError(f"'EngineConfig' object is immutable, can't set '{key}'")
+
+        super().__setattr__(key, value)
+
+    def __delattr__(self, key: str):
+        raise AttributeError(f"'EngineConfig' object is immutable, can't delete '{key}'")
+
+    def __repr__(self):
+        return f"EngineConfig({ {key: getattr(self, key) for key in self.__slots__ if key != '_is_frozen'} })"
@@ -0,0 +1,4 @@
+BANDWIDTH_PREFIX = 'old_bandwidth_'  # One-hot bandwidth features are named by this prefix and the bandwidth
+# The column order the simulator's models are trained with, used when a model doesn't record its feature names
+ML_FEATURES_LIST = ['path_length', 'longest_reach', 'ave_cong', 'old_bandwidth_50', 'old_bandwidth_100',
+                    'old_bandwidth_200', 'old_bandwidth_400']
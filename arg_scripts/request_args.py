@@ -0,0 +1,48 @@
+# pylint: disable=too-few-public-methods
+import numpy as np
+
+# One row per request, nodes and bandwidths are stored as their index in the topology and bandwidth lists
+REQUEST_DTYPE = np.dtype([
+    ('req_id', '<u4'),  # Request ID number
+    ('source', '<u2'),  # Index of the source node in the topology
+    ('destination', '<u2'),  # Index of the destination node in the topology
+    ('arrive', '<f8'),  # Arrival time
+    ('depart', '<f8'),  # Departure time, NaN if unknown
+    ('bandwidth', 'u1'),  # Index of the bandwidth in the modulation formats per bandwidth
+])
+# One row per arrival or release, sorted by time
+EVENT_DTYPE = np.dtype([
+    ('time', '<f8'),  # Simulated time of the event
+    ('req_index', '<u4'),  # Row of the request in the requests array
+    ('req_type', 'u1'),  # Index in the trace's REQ_TYPE_LIST
+])
+
+
+class Request:
+    """
+    A single arrival or release of a request.
+    """
+
+    __slots__ = ('req_id', 'source', 'destination', 'arrive', 'depart', 'request_type', 'bandwidth', 'mod_formats')
+
+    def __init__(self, *, req_id: int, source: str, destination: str, arrive: float, depart: float,
+                 request_type: str, bandwidth: str, mod_formats: dict):
+        self.req_id = req_id  # Request ID number
+        self.source = source  # Source node
+        self.destination = destination  # Destination node
+        self.arrive = arrive  # Arrival time
+        self.depart = depart  # Departure time
+        self.request_type = request_type  # Arrival or release
+        self.bandwidth = bandwidth  # Requested bandwidth
+        self.mod_formats = mod_formats  # Modulation formats of the bandwidth, shared by every request
+
+    def __eq__(self, other: object):
+        if not isinstance(other, Request):
+            return NotImplemented
+
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Request({ {key: getattr(self, key) for key in self.__slots__} })"
@@ -10,6 +10,7 @@ class RLProps:
         self.cores_per_link = None  # Number of cores on every link
         self.spectral_slots = None  # Numerical value of spectral slots on every core
         self.num_nodes = None  # Total nodes in the network topology
+        self.super_channel_space = None  # Number of super-channels the spectrum agent observes and chooses from
 
         self.arrival_list = []  # Inter-arrival times for every request
         self.depart_list = []  # Departure times for every request
@@ -40,16 +41,21 @@ class QProps:
 
         self.is_training = None  # Flag to determine whether to load an already trained agent
 
-        # Rewards for the core and path q-learning agents
+        # Min, max, and average reward at every request over all episodes for the core and path q-learning agents
         self.rewards_dict = {
-            'routes_dict': {'average': [], 'min': [], 'max': [], 'rewards': {}},
-            'cores_dict': {'average': [], 'min': [], 'max': [], 'rewards': {}}
+            'routes_dict': {'average': [], 'min': [], 'max': []},
+            'cores_dict': {'average': [], 'min': [], 'max': []}
         }
-        # Temporal difference (TD) errors for the core and path agents
+        # Min, max, and average temporal difference (TD) error at every request for the core and path agents
         self.errors_dict = {
-            'routes_dict': {'average': [], 'min': [], 'max': [], 'errors': {}},
-            'cores_dict': {'average': [], 'min': [], 'max': [], 'errors': {}}
+            'routes_dict': {'average': [], 'min': [], 'max': []},
+            'cores_dict': {'average': [], 'min': [], 'max': []}
         }
+        # Every reward and TD error received by each agent, preallocated as (max_iters, num_requests)
+        self.rewards_matrix_dict = {'routes_dict': None, 'cores_dict': None}
+        self.errors_matrix_dict = {'routes_dict': None, 'cores_dict': None}
+        # Number of rewards received by each agent for each episode
+        self.stats_count_dict = {'routes_dict': None, 'cores_dict': None}
         # Total sum of rewards for each episode (episode as a key, sum of rewards as a value)
         self.sum_rewards_dict = {}
         # Total sum of TD errors each episode
@@ -57,6 +63,7 @@ class QProps:
 
         self.routes_matrix = None  # Main routing q-table used by the path agent
         self.cores_matrix = None  # Main core q-table used by the core agent
+        self.paths_matrix = None  # K-shortest paths for every source and destination, shared by both q-tables
         self.num_nodes = None  # Total number of nodes in the topology
 
         # All important parameters to be saved in a QL simulation run
@@ -87,7 +94,8 @@ class BanditProps:
     """
 
     def __init__(self):
-        self.rewards_matrix = []  # Total sum of rewards for each episode
+        self.rewards_matrix = None  # Every reward received, preallocated as (max_iters, num_requests)
+        self.rewards_count = None  # Number of rewards received for each episode
         self.counts_list = []  # Total number of counts for each action taken for every episode
         self.state_values_list = []  # Every possible V(s)
 
@@ -1,10 +1,18 @@
 # pylint: disable=too-few-public-methods
+import os
+
+# Precomputed k-shortest paths are saved here per topology and k
+K_PATHS_CACHE_DIR = os.path.join('data', 'cache', 'k_paths')
+
 
 class RoutingProps:
     """
     Main properties used for the routing.py script.
     """
 
+    __slots__ = ('paths_matrix', 'mod_formats_matrix', 'weights_list', 'input_power', 'freq_spacing', 'mci_worst',
+                 'max_link_length', 'span_len', 'max_span')
+
     def __init__(self):
         self.paths_matrix = []  # Matrix of potential paths for a single request
         self.mod_formats_matrix = []  # Modulation formats corresponding to each path in paths_matrix
@@ -18,4 +26,4 @@ class RoutingProps:
         self.max_span = None  # Maximum number of spans in the network
 
     def __repr__(self):
-        return f"RoutingProps({self.__dict__})"
+        return f"RoutingProps({ {key: getattr(self, key) for key in self.__slots__} })"
@@ -5,6 +5,12 @@ class SDNProps:
     Main properties used for the sdn_controller.py script.
     """
 
+    __slots__ = ('path_list', 'was_routed', 'topology', 'net_spec_dict', 'req_id', 'source', 'destination', 'bandwidth',
+                 'bandwidth_list', 'modulation_list', 'core_list', 'band_list', 'start_slot_list', 'end_slot_list',
+                 'xt_list', 'num_trans', 'arrive', 'depart',
+                 'request_type', 'slots_needed', 'single_core', 'block_reason', 'mod_formats_dict', 'curr_band',
+                 'path_index', 'is_sliced', 'route_time', 'path_weight', 'spectrum_object', 'stat_key_list')
+
     def __init__(self):
         self.path_list = None  # List of nodes for the current request
         self.was_routed = None  # Flag to determine successful route
@@ -18,6 +24,9 @@ class SDNProps:
         self.bandwidth_list = []  # Multiple bandwidths used (typically for light-segment slicing)
         self.modulation_list = []  # List of modulation formats used by a single request
         self.core_list = []  # List of cores used (typically for light-segment slicing)
+        self.band_list = []  # List of bands used (typically for light-segment slicing)
+        self.start_slot_list = []  # List of start slots used (typically for light-segment slicing)
+        self.end_slot_list = []  # List of end slots used (typically for light-segment slicing)
         self.xt_list = []  # List of crosstalk calculations for a single request
         self.num_trans = None  # Number of transponders a single request has used
         self.arrive = None  # Arrival time for a single request
@@ -28,9 +37,29 @@ class SDNProps:
         self.block_reason = None  # Reason for blocking a request
         self.mod_formats_dict = None  # List of valid modulation formats for this bandwidth
         self.curr_band = None  # Current band of allocation
+        self.path_index = None  # Index of the chosen path in the route matrix
+        self.is_sliced = None  # Whether the request was allocated with light-segment slicing
+        self.route_time = None  # Time taken to route the request
+        self.path_weight = None  # Weight of the chosen path
+        self.spectrum_object = None  # Spectrum properties of the allocated request
 
         self.stat_key_list = ['modulation_list', 'xt_list', 'core_list']  # Statistical keys used to save results
 
+    def bind_request(self, req_obj: object):
+        """
+        Sets the current request's properties from its request record.
+
+        :param req_obj: The request record.
+        """
+        self.req_id = req_obj.req_id
+        self.source = req_obj.source
+        self.destination = req_obj.destination
+        self.arrive = req_obj.arrive
+        self.depart = req_obj.depart
+        self.request_type = req_obj.request_type
+        self.bandwidth = req_obj.bandwidth
+        self.mod_formats_dict = req_obj.mod_formats
+
     def update_params(self, key: str, spectrum_key: str, spectrum_obj: object, value: int = None):
         """
         Update lists to track statistics of routed requests or general network metrics.
@@ -58,6 +87,9 @@ class SDNProps:
         self.modulation_list = list()
         self.xt_list = list()
         self.core_list = list()
+        self.band_list = list()
+        self.start_slot_list = list()
+        self.end_slot_list = list()
 
     # TODO: Update standards and guidelines, this should be a standardized function name.
     def get_data(self, key: str):
@@ -73,4 +105,4 @@ class SDNProps:
         raise AttributeError(f"'SDNProps' object has no attribute '{key}'")
 
     def __repr__(self):
-        return f"SDNProps({self.__dict__})"
+        return f"SDNProps({ {key: getattr(self, key) for key in self.__slots__} })"
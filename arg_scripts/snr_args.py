@@ -5,6 +5,9 @@ class SNRProps:
     Main properties used for the snr_measurements.py script.
     """
 
+    __slots__ = ('light_frequency', 'plank', 'req_bit_rate', 'req_snr', 'nsp', 'center_freq', 'bandwidth', 'center_psd',
+                 'mu_param', 'sci_psd', 'xci_psd', 'length', 'num_span', 'link_dict')
+
     def __init__(self):
         self.light_frequency = 1.9341 * 10 ** 14  # Center light frequency
         self.plank = 6.62607004e-34  # Plank's constant
@@ -24,4 +27,4 @@ class SNRProps:
         self.link_dict = None  # Dictionary of links for calculating various metrics
 
     def __repr__(self):
-        return f"SNRProps({self.__dict__})"
+        return f"SNRProps({ {key: getattr(self, key) for key in self.__slots__} })"
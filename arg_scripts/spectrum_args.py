@@ -1,10 +1,18 @@
 # pylint: disable=too-few-public-methods
 
+# Order cores are searched in by the priority allocation methods
+PRIORITY_CORES_LIST = [0, 2, 4, 1, 3, 5, 6]
+
+
 class SpectrumProps:
     """
     Main properties used for the spectrum_assignment.py script.
     """
 
+    __slots__ = ('path_list', 'slots_needed', 'forced_core', 'is_free', 'modulation', 'xt_cost', 'cores_matrix',
+                 'rev_cores_matrix', 'core_num', 'forced_index', 'forced_band', 'curr_band', 'start_slot', 'end_slot',
+                 'block_reason')
+
     def __init__(self):
         self.path_list = None  # List of nodes for the current request
         self.slots_needed = None  # Slots needed for current request
@@ -20,6 +28,7 @@ class SpectrumProps:
         self.curr_band = None  # The chosen band to allocate
         self.start_slot = None  # Start slot assigned for current request
         self.end_slot = None  # End slot assigned for current request
+        self.block_reason = None  # Reason the spectrum could not be assigned
 
     def __repr__(self):
-        return f"SpectrumProps({self.__dict__})"
+        return f"SpectrumProps({ {key: getattr(self, key) for key in self.__slots__} })"
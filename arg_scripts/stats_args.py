@@ -19,9 +19,11 @@ class StatsProps:
         self.route_times_list = list()  # Average route times per simulation
         self.xt_list = list()  # Average cross-talk per simulation
         self.bands_list = list()  # Tracks the band allocated in a simulation
+        self.phase_times_dict = dict()  # Time spent in each simulation phase (only when profiling)
 
     def __repr__(self):
         return f"StatsProps({self.__dict__})"
 
 
 SNAP_KEYS_LIST = ['occupied_slots', 'guard_slots', 'active_requests', 'blocking_prob', 'num_segments']
+PHASE_KEYS_LIST = ['routing', 'spectrum', 'snr', 'allocation', 'release', 'stats', 'snapshot']
@@ -0,0 +1,28 @@
+import struct
+
+import numpy as np
+
+TRACE_MAGIC = b'SDNT'  # Identifies a binary event trace file
+TRACE_VERSION = 1  # Incremented whenever the record layout changes
+TRACE_HEADER = struct.Struct('<4sHH')  # Magic, version, record size in bytes
+
+# Fixed-size little-endian record, the struct and numpy layouts must always match
+TRACE_RECORD = struct.Struct('<dBIHHHhhbiiB')
+TRACE_RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),  # Simulated time of the event
+    ('req_type', 'u1'),  # Index in REQ_TYPE_LIST
+    ('req_id', '<u4'),  # Request ID number
+    ('source', '<u2'),  # Index of the source node in the topology
+    ('destination', '<u2'),  # Index of the destination node in the topology
+    ('bandwidth', '<u2'),  # Requested bandwidth in Gbps
+    ('path_index', '<i2'),  # Index of the chosen path, -1 if none
+    ('core_num', '<i2'),  # Core used, -1 if none
+    ('band_index', 'i1'),  # Index in the engine's band list, -1 if none
+    ('start_slot', '<i4'),  # First slot used, -1 if none
+    ('num_slots', '<i4'),  # Number of slots used including guard bands, -1 if none
+    ('outcome', 'u1'),  # Index in OUTCOME_LIST
+])
+
+REQ_TYPE_LIST = ['arrival', 'release']
+# Routed followed by every block reason, 'blocked' covers releases of blocked requests and unknown reasons
+OUTCOME_LIST = ['routed', 'distance', 'congestion', 'xt_threshold', 'max_segments', 'blocked']
@@ -1,4 +1,5 @@
 import os
+import ast
 import json
 
 import numpy as np
@@ -12,14 +13,25 @@ def load_model(train_fp: str):
     Loads a pre-trained bandit model.
 
     :param train_fp: File path the model has been saved on.
-    :return: The state-value functions V(s, a)
-    :rtype: dict
+    :return: The state-value functions V(s, a) indexed by (source, destination[, path index], arm).
+    :rtype: np.ndarray
     """
     train_fp = os.path.join('logs', train_fp)
+    if train_fp.endswith('.npz'):
+        with np.load(train_fp) as model_dict:
+            return model_dict['values']
+
+    # Older models were saved as JSON with stringified tuple keys
     with open(train_fp, 'r', encoding='utf-8') as file_obj:
         state_vals_dict = json.load(file_obj)
 
-    return state_vals_dict
+    states_list = [ast.literal_eval(state) for state in state_vals_dict]
+    state_shape = tuple(max(state[index] for state in states_list) + 1 for index in range(len(states_list[0])))
+    values_arr = np.zeros(state_shape + (len(next(iter(state_vals_dict.values()))),))
+    for state, state_vals_list in zip(states_list, state_vals_dict.values()):
+        values_arr[state] = state_vals_list
+
+    return values_arr
 
 
 def _get_base_fp(is_path: bool, erlang: float, cores_per_link: int):
@@ -31,19 +43,18 @@ def _get_base_fp(is_path: bool, erlang: float, cores_per_link: int):
     return base_fp
 
 
-def _save_model(state_values_dict: dict, erlang: float, cores_per_link: int, save_dir: str, is_path: bool):
-    if state_values_dict is None:
+def _save_model(self: object, save_dir: str):
+    if self.values is None:
         return
-    # Convert tuples to strings and arrays to lists for JSON format
-    state_values_dict = {str(key): value.tolist() for key, value in state_values_dict.items()}
 
-    if is_path:
-        state_vals_fp = f"state_vals_e{erlang}_routes_c{cores_per_link}.json"
+    erlang = self.engine_props['erlang']
+    cores_per_link = self.engine_props['cores_per_link']
+    if self.is_path:
+        state_vals_fp = f"state_vals_e{erlang}_routes_c{cores_per_link}.npz"
     else:
-        state_vals_fp = f"state_vals_e{erlang}_cores_c{cores_per_link}.json"
+        state_vals_fp = f"state_vals_e{erlang}_cores_c{cores_per_link}.npz"
     save_fp = os.path.join(os.getcwd(), save_dir, state_vals_fp)
-    with open(save_fp, 'w', encoding='utf-8') as file_obj:
-        json.dump(state_values_dict, file_obj)
+    np.savez(save_fp, values=self.values, counts=self.counts)
 
 
 def save_model(iteration: int, algorithm: str, self: object):
@@ -55,12 +66,10 @@ def save_model(iteration: int, algorithm: str, self: object):
     :param self: The object to be saved.
     """
     max_iters = self.engine_props['max_iters']
-    rewards_matrix = self.props.rewards_matrix
     # TODO: Add save every 'x' iters to the configuration file (It's now 50)
     if (iteration in (max_iters - 1, (max_iters - 1) % 50)) and \
-            (len(self.props.rewards_matrix[iteration]) == self.engine_props['num_requests']):
-        rewards_matrix = np.array(rewards_matrix)
-        rewards_arr = rewards_matrix.mean(axis=0)
+            (self.props.rewards_count[iteration] == self.engine_props['num_requests']):
+        rewards_arr = self.props.rewards_matrix[:iteration + 1].mean(axis=0)
 
         date_time = os.path.join(self.engine_props['network'], self.engine_props['date'],
                                  self.engine_props['sim_start'])
@@ -75,8 +84,7 @@ def save_model(iteration: int, algorithm: str, self: object):
         save_fp = os.path.join(os.getcwd(), save_dir, rewards_fp)
         np.save(save_fp, rewards_arr)
 
-        _save_model(state_values_dict=self.values, erlang=erlang, cores_per_link=cores_per_link,
-                    save_dir=save_dir, is_path=self.is_path)
+        _save_model(self=self, save_dir=save_dir)
 
 
 def get_q_table(self: object):
@@ -84,41 +92,38 @@ def get_q_table(self: object):
     Constructs the q-table.
 
     :param self: The current bandit object.
-    :return: The initial V(s, a) and N(s, a) values.
+    :return: The initial N(s, a) and V(s, a) values, indexed by (source, destination[, path index], arm).
     :rtype: tuple
     """
-    self.counts = {}
-    self.values = {}
-    for source in range(self.num_nodes):
-        for destination in range(self.num_nodes):
-            if source == destination:
-                continue
-
-            if self.is_path:
-                self.counts[(source, destination)] = np.zeros(self.n_arms)
-                self.values[(source, destination)] = np.zeros(self.n_arms)
-            else:
-                for path_index in range(self.engine_props['k_paths']):
-                    self.counts[(source, destination, path_index)] = np.zeros(self.n_arms)
-                    self.values[(source, destination, path_index)] = np.zeros(self.n_arms)
+    if self.is_path:
+        state_shape = (self.num_nodes, self.num_nodes)
+    else:
+        state_shape = (self.num_nodes, self.num_nodes, self.engine_props['k_paths'])
+
+    self.counts = np.zeros(state_shape + (self.n_arms,))
+    self.values = np.zeros(state_shape + (self.n_arms,))
 
     return self.counts, self.values
 
 
+def _init_rewards(self: object):
+    # Every reward of the simulation fits without growing a list
+    self.props.rewards_matrix = np.zeros((self.engine_props['max_iters'], self.engine_props['num_requests']))
+    self.props.rewards_count = np.zeros(self.engine_props['max_iters'], dtype=np.int64)
+
+
 def _update_bandit(self: object, iteration: int, reward: float, arm: int, algorithm: str):
     if self.is_path:
-        pair = (self.source, self.dest)
+        state_arm = (self.source, self.dest, arm)
     else:
-        pair = (self.source, self.dest, self.path_index)
+        state_arm = (self.source, self.dest, self.path_index, arm)
 
-    self.counts[pair][arm] += 1
-    n_times = self.counts[pair][arm]
-    value = self.values[pair][arm]
-    self.values[pair][arm] = value + (reward - value) / n_times
+    self.counts[state_arm] += 1
+    value = self.values[state_arm]
+    self.values[state_arm] = value + (reward - value) / self.counts[state_arm]
 
-    if self.iteration >= len(self.props.rewards_matrix):
-        self.props.rewards_matrix.append([])
-    self.props.rewards_matrix[self.iteration].append(reward)
+    self.props.rewards_matrix[self.iteration, self.props.rewards_count[self.iteration]] = reward
+    self.props.rewards_count[self.iteration] += 1
 
     # Check if we need to save the model
     save_model(iteration=iteration, algorithm=algorithm, self=self)
@@ -149,6 +154,7 @@ class EpsilonGreedyBandit:
         self.epsilon = engine_props['epsilon_start']
         self.num_nodes = rl_props.num_nodes
         self.counts, self.values = get_q_table(self=self)  # Amount of times an action has been taken and every V(s,a)
+        _init_rewards(self=self)
 
     def _get_action(self, state_action_pair: tuple):
         if np.random.rand() < self.epsilon:
@@ -221,14 +227,15 @@ class UCBBandit:
             self.n_arms = engine_props['cores_per_link']
 
         self.counts, self.values = get_q_table(self=self)
+        _init_rewards(self=self)
 
     def _get_action(self, state_action_pair: tuple):
-        if 0 in self.counts[state_action_pair]:
-            return np.argmin(self.counts[state_action_pair])
+        counts_arr = self.counts[state_action_pair]
+        min_index = counts_arr.argmin()
+        if counts_arr[min_index] == 0:
+            return min_index
 
-        total_counts = sum(self.counts[state_action_pair])
-        ucb_values = self.values[state_action_pair] + \
-                     np.sqrt(2 * np.log(total_counts) / self.counts[state_action_pair])
+        ucb_values = self.values[state_action_pair] + np.sqrt(2 * np.log(counts_arr.sum()) / counts_arr)
         return np.argmax(ucb_values)
 
     def select_path_arm(self, source: int, dest: int):
@@ -0,0 +1,172 @@
+import os
+import sys
+import copy
+import json
+import time
+import platform
+from statistics import mean
+import concurrent.futures
+
+from helper_scripts.os_helpers import create_dir
+from helper_scripts.sim_helpers import create_engine_props
+from arg_scripts.bench_args import BENCH_DEFAULTS_DICT, BENCH_ID_KEYS_LIST
+from src.engine import Engine
+
+try:
+    import resource
+# The resource module only exists on Unix systems
+except ImportError:
+    resource = None
+
+
+def get_case_id(case_dict: dict):
+    """
+    Creates a unique identifier for a benchmark case.
+
+    :param case_dict: The settings of the benchmark case.
+    :return: The case identifier.
+    :rtype: str
+    """
+    return '_'.join(str(case_dict[key]) for key in BENCH_ID_KEYS_LIST)
+
+
+def get_peak_rss():
+    """
+    Gets the peak resident set size of the current process.
+
+    :return: The peak memory usage in megabytes, None if it can't be measured on this platform.
+    :rtype: float
+    """
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes while macOS reports bytes
+    if sys.platform == 'darwin':
+        return peak_rss / 1024.0 ** 2
+
+    return peak_rss / 1024.0
+
+
+def get_bench_props(case_dict: dict):
+    """
+    Builds the engine properties for a benchmark case without writing any input files.
+
+    :param case_dict: The settings of the benchmark case.
+    :return: The engine properties.
+    :rtype: dict
+    """
+    engine_props = copy.deepcopy(BENCH_DEFAULTS_DICT)
+    engine_props.update(case_dict)
+    return create_engine_props(engine_props=engine_props, date='bench', sim_start=get_case_id(case_dict=case_dict))
+
+
+def run_bench_case(case_dict: dict):
+    """
+    Runs a single benchmark case.
+
+    :param case_dict: The settings of the benchmark case.
+    :return: The throughput, peak memory, blocking, and per-phase timings of the case.
+    :rtype: dict
+    """
+    engine_props = get_bench_props(case_dict=case_dict)
+    engine = Engine(engine_props=engine_props)
+
+    start_time = time.perf_counter()
+    engine.run()
+    elapsed_time = time.perf_counter() - start_time
+
+    sim_block_list = engine.stats_obj.stats_props.sim_block_list
+    num_requests = engine_props['num_requests'] * len(sim_block_list)
+    resp_dict = {
+        'case': case_dict,
+        'num_requests': num_requests,
+        'elapsed_s': elapsed_time,
+        'requests_per_sec': num_requests / elapsed_time,
+        'peak_rss_mb': get_peak_rss(),
+        'blocking_mean': mean(sim_block_list),
+        'phase_times_dict': engine.stats_obj.stats_props.phase_times_dict,
+    }
+
+    return resp_dict
+
+
+def run_bench_suite(cases_list: list):
+    """
+    Runs every benchmark case, each in a fresh process so peak memory is measured per case.
+
+    :param cases_list: The benchmark cases to run.
+    :return: The results of every case, keyed by case identifier.
+    :rtype: dict
+    """
+    results_dict = dict()
+    for case_dict in cases_list:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(run_bench_case, case_dict=case_dict)
+            results_dict[get_case_id(case_dict=case_dict)] = future.result()
+
+    return results_dict
+
+
+def compare_to_baseline(results_dict: dict, baseline_dict: dict, tolerance: float):
+    """
+    Compares benchmark results to a previously saved baseline.
+
+    :param results_dict: The current benchmark results.
+    :param baseline_dict: The baseline benchmark results.
+    :param tolerance: The allowed fractional drop in throughput, e.g., 0.1 for 10%.
+    :return: Every case that became slower than allowed or whose blocking changed.
+    :rtype: dict
+    """
+    resp_dict = dict()
+    for case_id, case_dict in results_dict.items():
+        if case_id not in baseline_dict:
+            continue
+
+        base_dict = baseline_dict[case_id]
+        speedup = case_dict['requests_per_sec'] / base_dict['requests_per_sec']
+        issues_list = list()
+        if speedup < 1.0 - tolerance:
+            issues_list.append(f'throughput dropped to {round(speedup * 100.0, 2)}% of the baseline')
+        # Identical seeds must give identical results, otherwise the change is not a pure optimization
+        if base_dict['blocking_mean'] != case_dict['blocking_mean']:
+            issues_list.append(f"blocking changed from {base_dict['blocking_mean']} to {case_dict['blocking_mean']}")
+
+        if issues_list:
+            resp_dict[case_id] = issues_list
+
+    return resp_dict
+
+
+def save_bench_results(results_dict: dict, save_fp: str):
+    """
+    Saves benchmark results in a format that can later be used as a baseline.
+
+    :param results_dict: The benchmark results.
+    :param save_fp: The file path to save to.
+    """
+    save_dir = os.path.dirname(save_fp)
+    if save_dir:
+        create_dir(file_path=save_dir)
+
+    save_dict = {
+        'machine': {'platform': platform.platform(), 'processor': platform.processor(),
+                    'python': platform.python_version()},
+        'results': results_dict,
+    }
+    with open(save_fp, 'w', encoding='utf-8') as file_obj:
+        json.dump(save_dict, file_obj, indent=4)
+
+
+def load_bench_results(load_fp: str):
+    """
+    Loads previously saved benchmark results.
+
+    :param load_fp: The file path to load from.
+    :return: The benchmark results, keyed by case identifier.
+    :rtype: dict
+    """
+    with open(load_fp, 'r', encoding='utf-8') as file_obj:
+        resp_dict = json.load(file_obj)
+
+    return resp_dict['results']
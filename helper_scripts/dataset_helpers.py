@@ -0,0 +1,390 @@
+import os
+import copy
+import glob
+import json
+import itertools
+import concurrent.futures
+
+import numpy as np
+import pandas as pd
+
+from arg_scripts.dataset_args import DATASET_CHUNK_SIZE, DATASET_INFO_FILE, BEHAVIOUR_POLICY_DICT
+from arg_scripts.dataset_args import REQUEST_COLUMNS_DICT, PATH_COLUMNS_DICT, CORE_COLUMNS_DICT
+from arg_scripts.routing_args import K_PATHS_CACHE_DIR
+from helper_scripts.os_helpers import create_dir
+from helper_scripts.routing_helpers import get_k_paths_cache
+from helper_scripts.sim_helpers import find_path_cong, find_core_cong, find_cores_cong, classify_cong, get_path_mod
+from helper_scripts.sim_helpers import create_engine_props
+from helper_scripts.spectrum_helpers import FeasibilityOracle
+from src.engine import Engine
+
+
+def get_dataset_columns(k_paths: int, cores_per_link: int):
+    """
+    Gets every column of a dataset and its type.
+
+    :param k_paths: The number of candidate paths for every request.
+    :param cores_per_link: The number of cores on every link.
+    :return: The type of every column.
+    :rtype: dict
+    """
+    columns_dict = dict(REQUEST_COLUMNS_DICT)
+    for column, dtype in PATH_COLUMNS_DICT.items():
+        for path_index in range(k_paths):
+            columns_dict[f'{column}_{path_index}'] = dtype
+    for column, dtype in CORE_COLUMNS_DICT.items():
+        for path_index, core_num in itertools.product(range(k_paths), range(cores_per_link)):
+            columns_dict[f'{column}_{path_index}_{core_num}'] = dtype
+
+    return columns_dict
+
+
+class DatasetRecorder:
+    """
+    Writes one row for every arrival request to a directory of columnar files of a fixed number of rows.
+    """
+
+    def __init__(self, save_dir: str, k_paths: int, cores_per_link: int, chunk_size: int = DATASET_CHUNK_SIZE):
+        self.save_dir = save_dir
+        self.k_paths = k_paths
+        self.cores_per_link = cores_per_link
+        self.chunk_size = chunk_size
+        create_dir(file_path=save_dir)
+
+        # Candidate path and core columns are buffered as matrices and only split into columns when written
+        self.request_buffer_dict = {column: np.zeros(chunk_size, dtype=dtype)
+                                    for column, dtype in REQUEST_COLUMNS_DICT.items()}
+        self.path_buffer_dict = {column: np.zeros((chunk_size, k_paths), dtype=dtype)
+                                 for column, dtype in PATH_COLUMNS_DICT.items()}
+        self.core_buffer_dict = {column: np.zeros((chunk_size, k_paths, cores_per_link), dtype=dtype)
+                                 for column, dtype in CORE_COLUMNS_DICT.items()}
+        self.num_rows = 0
+        self.num_chunks = 0
+
+    def write_row(self, request_dict: dict, path_dict: dict, core_dict: dict):
+        """
+        Buffers a row, the buffer is written to a new file once it is full.
+
+        :param request_dict: A value for every request column.
+        :param path_dict: An array of one value per candidate path for every path column.
+        :param core_dict: A matrix of one value per candidate path and core for every core column.
+        """
+        for column, value in request_dict.items():
+            self.request_buffer_dict[column][self.num_rows] = value
+        for column, value_arr in path_dict.items():
+            self.path_buffer_dict[column][self.num_rows] = value_arr
+        for column, value_mat in core_dict.items():
+            self.core_buffer_dict[column][self.num_rows] = value_mat
+
+        self.num_rows += 1
+        if self.num_rows == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes every buffered row to a new file.
+        """
+        if self.num_rows == 0:
+            return
+
+        data_dict = {column: value_arr[:self.num_rows] for column, value_arr in self.request_buffer_dict.items()}
+        for column, value_mat in self.path_buffer_dict.items():
+            for path_index in range(self.k_paths):
+                data_dict[f'{column}_{path_index}'] = value_mat[:self.num_rows, path_index]
+        for column, value_mat in self.core_buffer_dict.items():
+            for path_index, core_num in itertools.product(range(self.k_paths), range(self.cores_per_link)):
+                data_dict[f'{column}_{path_index}_{core_num}'] = value_mat[:self.num_rows, path_index, core_num]
+
+        save_fp = os.path.join(self.save_dir, f'part_{self.num_chunks:05d}.parquet')
+        pd.DataFrame(data_dict).to_parquet(save_fp, index=False)
+        self.num_chunks += 1
+        self.num_rows = 0
+
+
+def get_dataset_props(engine_props: dict):
+    """
+    Gets the engine properties to generate a dataset with, the simulator runs under the behaviour policy.
+
+    :param engine_props: Properties of the simulation.
+    :return: The modified engine properties.
+    :rtype: dict
+    """
+    engine_props = copy.deepcopy(engine_props)
+    engine_props.update(BEHAVIOUR_POLICY_DICT)
+    engine_props['max_iters'] = 1
+    engine_props['max_segments'] = 1
+    return create_engine_props(engine_props=engine_props, date='dataset',
+                               sim_start=f"{engine_props['network']}_{engine_props['erlang']}")
+
+
+def _get_path_state(engine: object, req_obj: object, paths_list: list, oracle_obj: object):
+    k_paths = engine.engine_props['k_paths']
+    cores_per_link = engine.engine_props['cores_per_link']
+    path_dict = {'path_level': np.full(k_paths, -1), 'path_len': np.zeros(k_paths),
+                 'path_feasible': np.zeros(k_paths, dtype=bool)}
+    core_dict = {'core_level': np.full((k_paths, cores_per_link), -1),
+                 'core_feasible': np.zeros((k_paths, cores_per_link), dtype=bool)}
+
+    mods_dict = engine.engine_props['mod_per_bw'][req_obj.bandwidth]
+    for path_index, (path_list, path_len) in enumerate(paths_list):
+        path_dict['path_level'][path_index] = classify_cong(
+            curr_cong=find_path_cong(path_list=path_list, net_spec_dict=engine.net_spec_dict))
+        path_dict['path_len'][path_index] = path_len
+        cong_arr = find_cores_cong(path_list=path_list, net_spec_dict=engine.net_spec_dict)
+        for core_num in range(cores_per_link):
+            core_dict['core_level'][path_index, core_num] = classify_cong(curr_cong=cong_arr[core_num])
+
+    # Spectrum feasibility of every action, including the ones the behaviour policy did not take
+    feasible_arr, _ = oracle_obj.get_feasibility(
+        net_spec_dict=engine.net_spec_dict, paths_matrix=[path_list for path_list, _ in paths_list],
+        mod_formats_matrix=[[get_path_mod(mods_dict=mods_dict, path_len=path_len)] for _, path_len in paths_list],
+        mod_formats_dict=req_obj.mod_formats)
+    path_dict['path_feasible'][:len(paths_list)] = feasible_arr.any(axis=(1, 2))
+    core_dict['core_feasible'][:len(paths_list)] = feasible_arr.any(axis=2)
+
+    return path_dict, core_dict
+
+
+def generate_seed_data(engine_props: dict, seed: int, save_dir: str, k_paths_cache: dict = None,
+                       chunk_size: int = DATASET_CHUNK_SIZE):
+    """
+    Simulates one seed under the behaviour policy and records every arrival request.
+
+    :param engine_props: Properties of the simulation, modified for the behaviour policy.
+    :param seed: The seed the requests are generated with.
+    :param save_dir: The directory the seed's files are saved in.
+    :param k_paths_cache: The k-shortest paths of every pair, found here if not given.
+    :param chunk_size: The number of rows written to each file.
+    :return: The number of rows recorded.
+    :rtype: int
+    """
+    engine_props = copy.deepcopy(engine_props)
+    engine_props['seeds'] = [seed]
+    engine = Engine(engine_props=engine_props)
+    engine.create_topology()
+
+    k_paths = engine_props['k_paths']
+    if k_paths_cache is None:
+        k_paths_cache = get_k_paths_cache(topology=engine.topology, k_paths=k_paths, cache_dir=K_PATHS_CACHE_DIR,
+                                          max_workers=1)
+    engine.sdn_obj.route_obj.k_paths_cache = k_paths_cache
+    oracle_obj = FeasibilityOracle(engine_props=engine.engine_props, config_obj=engine.config_obj)
+    recorder_obj = DatasetRecorder(save_dir=save_dir, k_paths=k_paths, cores_per_link=engine_props['cores_per_link'],
+                                   chunk_size=chunk_size)
+
+    engine.init_iter(iteration=0)
+    req_num = 1
+    num_rows = 0
+    for curr_time, req_obj in engine.reqs_dict.items():
+        if req_obj.request_type != 'arrival':
+            engine.handle_request(curr_time=curr_time, req_num=req_num)
+            continue
+
+        paths_list = k_paths_cache[(req_obj.source, req_obj.destination, k_paths)]
+        path_dict, core_dict = _get_path_state(engine=engine, req_obj=req_obj, paths_list=paths_list,
+                                               oracle_obj=oracle_obj)
+        engine.handle_request(curr_time=curr_time, req_num=req_num)
+        req_num += 1
+
+        # A blocked request tried the first path and core first
+        sdn_props = engine.sdn_obj.sdn_props
+        if sdn_props.was_routed:
+            path_index, core_num = sdn_props.path_index, sdn_props.spectrum_object.core_num
+        else:
+            path_index, core_num = 0, 0
+        path_list = paths_list[path_index][0]
+
+        request_dict = {
+            'seed': seed,
+            'req_id': req_obj.req_id,
+            'source': int(req_obj.source),
+            'destination': int(req_obj.destination),
+            'bandwidth': int(req_obj.bandwidth),
+            'path_index': path_index,
+            'core_num': core_num,
+            'was_allocated': sdn_props.was_routed,
+            'next_path_level': classify_cong(curr_cong=find_path_cong(path_list=path_list,
+                                                                      net_spec_dict=engine.net_spec_dict)),
+            'next_core_level': classify_cong(curr_cong=find_core_cong(core_index=core_num, path_list=path_list,
+                                                                      net_spec_dict=engine.net_spec_dict)),
+        }
+        recorder_obj.write_row(request_dict=request_dict, path_dict=path_dict, core_dict=core_dict)
+        num_rows += 1
+
+    recorder_obj.flush()
+    return num_rows
+
+
+def generate_dataset(engine_props: dict, seeds_list: list, save_dir: str, max_workers: int = None,
+                     chunk_size: int = DATASET_CHUNK_SIZE):
+    """
+    Generates an offline dataset by simulating several seeds under the behaviour policy in parallel.
+
+    :param engine_props: Properties of the simulation.
+    :param seeds_list: The seeds to simulate, each is one episode of the dataset.
+    :param save_dir: The directory the dataset is saved in.
+    :param max_workers: The maximum number of processes, one simulates in the current process.
+    :param chunk_size: The number of rows written to each file.
+    :return: The dataset's information.
+    :rtype: dict
+    """
+    engine_props = get_dataset_props(engine_props=engine_props)
+    create_dir(file_path=save_dir)
+
+    # Routes are found once and shared by every seed
+    topology_engine = Engine(engine_props=copy.deepcopy(engine_props))
+    topology_engine.create_topology()
+    k_paths_cache = get_k_paths_cache(topology=topology_engine.topology, k_paths=engine_props['k_paths'],
+                                      cache_dir=K_PATHS_CACHE_DIR, max_workers=max_workers)
+
+    args_list = [[engine_props] * len(seeds_list), seeds_list,
+                 [os.path.join(save_dir, f'seed_{seed}') for seed in seeds_list],
+                 [k_paths_cache] * len(seeds_list), [chunk_size] * len(seeds_list)]
+    if max_workers == 1:
+        rows_list = list(map(generate_seed_data, *args_list))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows_list = list(executor.map(generate_seed_data, *args_list))
+
+    info_dict = {
+        'network': engine_props['network'],
+        'erlang': engine_props['erlang'],
+        'num_requests': engine_props['num_requests'],
+        'k_paths': engine_props['k_paths'],
+        'cores_per_link': engine_props['cores_per_link'],
+        'behaviour_policy': BEHAVIOUR_POLICY_DICT,
+        'seeds': seeds_list,
+        'num_rows': dict(zip(map(str, seeds_list), rows_list)),
+        'columns': get_dataset_columns(k_paths=engine_props['k_paths'],
+                                       cores_per_link=engine_props['cores_per_link']),
+    }
+    with open(os.path.join(save_dir, DATASET_INFO_FILE), 'w', encoding='utf-8') as file_obj:
+        json.dump(info_dict, file_obj, indent=4)
+
+    return info_dict
+
+
+def read_dataset_info(dataset_dir: str):
+    """
+    Reads how a dataset was generated.
+
+    :param dataset_dir: The directory of the dataset.
+    :return: The dataset's information.
+    :rtype: dict
+    """
+    with open(os.path.join(dataset_dir, DATASET_INFO_FILE), 'r', encoding='utf-8') as file_obj:
+        info_dict = json.load(file_obj)
+
+    return info_dict
+
+
+def iter_dataset(dataset_dir: str, seed: int = None, columns: list = None):
+    """
+    Reads a dataset one file at a time, so it never has to fit in memory.
+
+    :param dataset_dir: The directory of the dataset.
+    :param seed: Only read this seed's rows, every seed in order if not given.
+    :param columns: Only read these columns, every column if not given.
+    :return: The rows of every file, in the order they were recorded.
+    :rtype: generator
+    """
+    seeds_list = read_dataset_info(dataset_dir=dataset_dir)['seeds'] if seed is None else [seed]
+    for curr_seed in seeds_list:
+        for data_fp in sorted(glob.glob(os.path.join(dataset_dir, f'seed_{curr_seed}', 'part_*.parquet'))):
+            yield pd.read_parquet(data_fp, columns=columns)
+
+
+def load_dataset(dataset_dir: str, columns: list = None):
+    """
+    Reads a whole dataset.
+
+    :param dataset_dir: The directory of the dataset.
+    :param columns: Only read these columns, every column if not given.
+    :return: Every row of the dataset.
+    :rtype: pd.DataFrame
+    """
+    return pd.concat(iter_dataset(dataset_dir=dataset_dir, columns=columns), ignore_index=True)
+
+
+def get_path_matrix(data_df: pd.DataFrame, column: str, k_paths: int, cores_per_link: int = None):
+    """
+    Stacks the columns of every candidate path (and core) back into a matrix.
+
+    :param data_df: Rows of a dataset.
+    :param column: A column from the path or core columns.
+    :param k_paths: The number of candidate paths.
+    :param cores_per_link: The number of cores, only for core columns.
+    :return: The values, shaped (rows, paths) or (rows, paths, cores).
+    :rtype: np.array
+    """
+    if cores_per_link is None:
+        return np.column_stack([data_df[f'{column}_{path_index}'] for path_index in range(k_paths)])
+
+    value_mat = np.column_stack([data_df[f'{column}_{path_index}_{core_num}'] for path_index, core_num in
+                                 itertools.product(range(k_paths), range(cores_per_link))])
+    return value_mat.reshape(len(data_df), k_paths, cores_per_link)
+
+
+def _set_bandit_state(agent: object, algorithm: str, source: int, dest: int, path_index: int):
+    # Bandits keep the state of the last arm they selected, the dataset's action was selected for them
+    if 'bandit' in algorithm:
+        agent.agent_obj.source = source
+        agent.agent_obj.dest = dest
+        agent.agent_obj.path_index = path_index
+
+
+def _replay_rows(data_df: pd.DataFrame, info_dict: dict, iteration: int, path_agent: object, core_agent: object):
+    rows_arr = np.arange(len(data_df))
+    path_index_arr = data_df['path_index'].to_numpy()
+    core_num_arr = data_df['core_num'].to_numpy()
+    path_len_arr = get_path_matrix(data_df=data_df, column='path_len',
+                                   k_paths=info_dict['k_paths'])[rows_arr, path_index_arr]
+    path_level_arr = get_path_matrix(data_df=data_df, column='path_level',
+                                     k_paths=info_dict['k_paths'])[rows_arr, path_index_arr]
+    core_level_arr = get_path_matrix(data_df=data_df, column='core_level', k_paths=info_dict['k_paths'],
+                                     cores_per_link=info_dict['cores_per_link'])[rows_arr, path_index_arr,
+                                                                                 core_num_arr]
+
+    for row_index, row in enumerate(data_df[list(REQUEST_COLUMNS_DICT)].itertuples(index=False)):
+        path_index, core_num = int(row.path_index), int(row.core_num)
+        for agent in (path_agent, core_agent):
+            if agent is not None:
+                agent.rl_props.source = int(row.source)
+                agent.rl_props.destination = int(row.destination)
+                agent.rl_props.chosen_path_index = path_index
+                agent.rl_props.core_index = core_num
+
+        if path_agent is not None:
+            _set_bandit_state(agent=path_agent, algorithm=path_agent.path_algorithm, source=int(row.source),
+                              dest=int(row.destination), path_index=None)
+            path_agent.level_index = int(path_level_arr[row_index])
+            path_agent.update(was_allocated=bool(row.was_allocated), net_spec_dict=None, iteration=iteration,
+                              path_length=float(path_len_arr[row_index]), next_level_index=int(row.next_path_level))
+
+        if core_agent is not None:
+            _set_bandit_state(agent=core_agent, algorithm=core_agent.core_algorithm, source=int(row.source),
+                              dest=int(row.destination), path_index=path_index)
+            core_agent.level_index = int(core_level_arr[row_index])
+            core_agent.update(was_allocated=bool(row.was_allocated), net_spec_dict=None, iteration=iteration,
+                              req_id=int(row.req_id), next_level_index=int(row.next_core_level))
+
+
+def replay_dataset(dataset_dir: str, path_agent: object = None, core_agent: object = None):
+    """
+    Updates path and core agents from a dataset instead of simulating the network, every seed is one episode. The
+    agents learn from the behaviour policy's actions, rewards are found by each agent so its own reward settings
+    apply.
+
+    :param dataset_dir: The directory of the dataset.
+    :param path_agent: A path agent that has been set up, if any.
+    :param core_agent: A core agent that has been set up, if any.
+    """
+    info_dict = read_dataset_info(dataset_dir=dataset_dir)
+    for iteration, seed in enumerate(info_dict['seeds']):
+        for data_df in iter_dataset(dataset_dir=dataset_dir, seed=seed):
+            _replay_rows(data_df=data_df, info_dict=info_dict, iteration=iteration, path_agent=path_agent,
+                         core_agent=core_agent)
+
+        for agent in (path_agent, core_agent):
+            if agent is not None:
+                agent.end_iter()
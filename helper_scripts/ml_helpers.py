@@ -6,11 +6,16 @@ import matplotlib.pyplot as plt
 import joblib
 import seaborn as sns
 
+from scipy.spatial import cKDTree
 from sklearn.inspection import permutation_importance
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
 
 from helper_scripts.os_helpers import create_dir
-from helper_scripts.sim_helpers import find_path_len, find_core_cong
+from helper_scripts.sim_helpers import find_path_len, get_link_spectrum
+from arg_scripts.ml_args import BANDWIDTH_PREFIX, ML_FEATURES_LIST
 
 
 def _plot_pie(input_df: pd.DataFrame, erlang: float, save_fp: str):
@@ -61,64 +66,263 @@ def plot_data(sim_dict: dict, input_df: pd.DataFrame, erlang: float):
     _plot_hist(erlang=erlang, input_df=input_df, save_fp=save_fp)
 
 
-def _get_ml_obs(tmp_dict: dict, engine_props: dict, sdn_props: object):
-    df_processed = pd.DataFrame(tmp_dict, index=[0])
-    df_processed = pd.get_dummies(df_processed, columns=['old_bandwidth'])
+class MLObsEncoder:
+    """
+    Encodes the observations of a request on its paths directly into preallocated rows in a fixed column order.
+    """
 
-    for col in df_processed.columns:
-        if df_processed[col].dtype == bool:
-            df_processed[col] = df_processed[col].astype(int)
+    def __init__(self, engine_props: dict, feature_names_list: list = None):
+        self.engine_props = engine_props
+        self.feature_names_list = ML_FEATURES_LIST if feature_names_list is None else list(feature_names_list)
+        # One row for every candidate path
+        num_rows = max(1, engine_props.get('k_paths') or 1)
+        self.obs_mat = np.zeros((num_rows, len(self.feature_names_list)), dtype=np.float64)
+
+        column_dict = {name: index for index, name in enumerate(self.feature_names_list)}
+        self.path_len_index = column_dict['path_length']
+        self.reach_index = column_dict['longest_reach']
+        self.cong_index = column_dict['ave_cong']
+        # Bandwidths the model wasn't trained with have no column and are left as zeros
+        self.bw_index_dict = {name[len(BANDWIDTH_PREFIX):]: index for name, index in column_dict.items()
+                              if name.startswith(BANDWIDTH_PREFIX)}
+        self.bw_indexes_list = list(self.bw_index_dict.values())
+
+    @staticmethod
+    def get_ave_cong(path_list: list, net_spec_dict: dict):
+        """
+        Finds the congestion of every core along a path, averaged over the cores.
+
+        :param path_list: The path.
+        :param net_spec_dict: The network spectrum database.
+        :return: The average congestion as a decimal.
+        :rtype: float
+        """
+        # The mean over cores of each core's mean over links, is the mean over links of the link's taken fraction
+        links_cong = 0.0
+        for src, dest in zip(path_list, path_list[1:]):
+            spectrum_arr, _ = get_link_spectrum(link_dict=net_spec_dict[(src, dest)])
+            links_cong += np.count_nonzero(spectrum_arr) / spectrum_arr.size
+
+        return links_cong / (len(path_list) - 1)
+
+    def update_obs(self, req_obj: object, path_list: list, net_spec_dict: dict, row_index: int = 0):
+        """
+        Encodes the observation of a request on a path.
+
+        :param req_obj: The request.
+        :param path_list: The path.
+        :param net_spec_dict: The network spectrum database.
+        :param row_index: The row to encode the observation in.
+        :return: The observation as a single row, overwritten by the next call.
+        :rtype: np.array
+        """
+        obs_arr = self.obs_mat[row_index]
+        obs_arr[self.path_len_index] = find_path_len(path_list=path_list, topology=self.engine_props['topology'])
+        obs_arr[self.reach_index] = req_obj.mod_formats['QPSK']['max_length']
+        obs_arr[self.cong_index] = self.get_ave_cong(path_list=path_list, net_spec_dict=net_spec_dict)
+
+        obs_arr[self.bw_indexes_list] = 0.0
+        bw_index = self.bw_index_dict.get(str(req_obj.bandwidth))
+        if bw_index is not None:
+            obs_arr[bw_index] = 1.0
+
+        return self.obs_mat[row_index:row_index + 1]
+
+    def update_obs_matrix(self, req_obj: object, paths_matrix: list, net_spec_dict: dict):
+        """
+        Encodes the observations of a request on every one of its paths.
+
+        :param req_obj: The request.
+        :param paths_matrix: The paths.
+        :param net_spec_dict: The network spectrum database.
+        :return: One row for every path, overwritten by the next call.
+        :rtype: np.array
+        """
+        if len(paths_matrix) > len(self.obs_mat):
+            self.obs_mat = np.zeros((len(paths_matrix), len(self.feature_names_list)), dtype=np.float64)
+
+        for row_index, path_list in enumerate(paths_matrix):
+            self.update_obs(req_obj=req_obj, path_list=path_list, net_spec_dict=net_spec_dict,
+                            row_index=row_index)
+
+        return self.obs_mat[:len(paths_matrix)]
+
+
+class MLPredictor:  # pylint: disable=too-few-public-methods
+    """
+    Makes predictions with a trained model from raw observation arrays.
+    """
 
-    for bandwidth, percent in engine_props['request_distribution'].items():
-        if percent > 0:
-            if bandwidth != sdn_props.bandwidth:
-                df_processed[f'old_bandwidth_{bandwidth}'] = 0
+    def __init__(self, ml_model: object):
+        self.ml_model = ml_model
+        self.feature_names_list = list(getattr(ml_model, 'feature_names_in_', ML_FEATURES_LIST))
+        # Models fit on a DataFrame check the column names of every input, observations are encoded in their order
+        if hasattr(ml_model, 'feature_names_in_'):
+            del ml_model.feature_names_in_
 
-    column_order_list = ['path_length', 'longest_reach', 'ave_cong', 'old_bandwidth_50',
-                         'old_bandwidth_100', 'old_bandwidth_200', 'old_bandwidth_400']
-    df_processed = df_processed.reindex(columns=column_order_list)
+    def predict(self, obs_mat: np.array):
+        """
+        Predicts one value for every observation.
 
-    return df_processed
+        :param obs_mat: The observations, one row each in the model's feature order.
+        :return: The predictions.
+        :rtype: np.array
+        """
+        return self.ml_model.predict(obs_mat)
 
 
-def get_ml_obs(req_dict: dict, engine_props: dict, sdn_props: object):
+class TreePredictor:  # pylint: disable=too-few-public-methods
+    """
+    Makes predictions with a decision tree flattened into node arrays.
     """
-    Creates a single entry or observation structured properly for a machine learning model to make a prediction.
 
-    :param req_dict: Holds request information.
-    :param engine_props: Engine properties.
-    :param sdn_props: SDN controller properties.
-    :return: The correctly formatted observation.
-    :rtype: pd.DataFrame
+    def __init__(self, model_dict: dict):
+        self.feature_names_list = list(model_dict['feature_names'])
+        self.classes_arr = model_dict['classes']
+        # Plain lists are faster than arrays to walk one node at a time
+        self.left_list = model_dict['children_left'].tolist()
+        self.right_list = model_dict['children_right'].tolist()
+        self.feature_list = model_dict['feature'].tolist()
+        self.threshold_list = model_dict['threshold'].tolist()
+        self.leaf_class_list = model_dict['leaf_class'].tolist()
+
+    def predict(self, obs_mat: np.array):
+        """
+        Predicts one value for every observation.
+
+        :param obs_mat: The observations, one row each in the model's feature order.
+        :return: The predictions.
+        :rtype: np.array
+        """
+        class_indexes_list = list()
+        # Trees are fit and split on single precision features
+        for obs_list in obs_mat.astype(np.float32).tolist():
+            node = 0
+            while self.left_list[node] != -1:
+                if obs_list[self.feature_list[node]] <= self.threshold_list[node]:
+                    node = self.left_list[node]
+                else:
+                    node = self.right_list[node]
+            class_indexes_list.append(self.leaf_class_list[node])
+
+        return self.classes_arr[class_indexes_list]
+
+
+class LinearPredictor:  # pylint: disable=too-few-public-methods
+    """
+    Makes predictions with a logistic regression's weight vectors.
+    """
+
+    def __init__(self, model_dict: dict):
+        self.feature_names_list = list(model_dict['feature_names'])
+        self.classes_arr = model_dict['classes']
+        self.coef_mat = model_dict['coef'].T
+        self.intercept_arr = model_dict['intercept']
+
+    def predict(self, obs_mat: np.array):
+        """
+        Predicts one value for every observation.
+
+        :param obs_mat: The observations, one row each in the model's feature order.
+        :return: The predictions.
+        :rtype: np.array
+        """
+        scores_mat = obs_mat @ self.coef_mat + self.intercept_arr
+        # A binary model only has the weights of the second class
+        if scores_mat.shape[1] == 1:
+            return self.classes_arr[(scores_mat[:, 0] > 0).astype(int)]
+
+        return self.classes_arr[np.argmax(scores_mat, axis=1)]
+
+
+class KNNPredictor:  # pylint: disable=too-few-public-methods
+    """
+    Makes predictions with a k-nearest neighbors model's training points in a KD-tree.
+    """
+
+    def __init__(self, model_dict: dict):
+        self.feature_names_list = list(model_dict['feature_names'])
+        self.classes_arr = model_dict['classes']
+        self.labels_arr = model_dict['labels']
+        self.n_neighbors = int(model_dict['n_neighbors'])
+        self.tree_obj = cKDTree(model_dict['fit_points'])
+
+    def predict(self, obs_mat: np.array):
+        """
+        Predicts one value for every observation.
+
+        :param obs_mat: The observations, one row each in the model's feature order.
+        :return: The predictions.
+        :rtype: np.array
+        """
+        _, neighbors_mat = self.tree_obj.query(obs_mat, k=self.n_neighbors)
+        neighbors_mat = np.reshape(neighbors_mat, (len(obs_mat), self.n_neighbors))
+
+        # The most common class of the neighbors, ties go to the first class like scikit-learn
+        votes_mat = np.zeros((len(obs_mat), len(self.classes_arr)), dtype=np.int64)
+        np.add.at(votes_mat, (np.arange(len(obs_mat))[:, None], self.labels_arr[neighbors_mat]), 1)
+        return self.classes_arr[np.argmax(votes_mat, axis=1)]
+
+
+COMPILED_PREDICTORS_DICT = {'decision_tree': TreePredictor, 'logistic_regression': LinearPredictor,
+                            'knn': KNNPredictor}
+
+
+def compile_model(model: object):
+    """
+    Converts a trained scikit-learn model to flat arrays, which predict without scikit-learn's input checks.
+
+    :param model: The trained model.
+    :return: The model's arrays and type, None if the model can't be compiled.
+    :rtype: dict
+    """
+    model_dict = {'feature_names': np.array(list(getattr(model, 'feature_names_in_', ML_FEATURES_LIST)), dtype=str),
+                  'classes': model.classes_}
+    if isinstance(model, DecisionTreeClassifier) and model.n_outputs_ == 1:
+        tree_obj = model.tree_
+        model_dict.update({'model_type': 'decision_tree', 'children_left': tree_obj.children_left,
+                           'children_right': tree_obj.children_right, 'feature': tree_obj.feature,
+                           'threshold': tree_obj.threshold, 'leaf_class': np.argmax(tree_obj.value[:, 0], axis=1)})
+    elif isinstance(model, LogisticRegression):
+        model_dict.update({'model_type': 'logistic_regression', 'coef': model.coef_, 'intercept': model.intercept_})
+    # Only the default uniform euclidean neighbors are supported by the KD-tree
+    elif isinstance(model, KNeighborsClassifier) and model.weights == 'uniform' and \
+            model.effective_metric_ == 'euclidean' and model.outputs_2d_ is False:
+        model_dict.update({'model_type': 'knn', 'fit_points': model._fit_X,  # pylint: disable=protected-access
+                           'labels': model._y, 'n_neighbors': model.n_neighbors})  # pylint: disable=protected-access
+    else:
+        return None
+
+    return model_dict
+
+
+def load_compiled_model(model_fp: str):
     """
-    path_length = find_path_len(path_list=sdn_props.path_list, topology=engine_props['topology'])
-    cong_arr = np.array([])
-    for core_num in range(engine_props['cores_per_link']):
-        curr_cong = find_core_cong(core_index=core_num, net_spec_dict=sdn_props.net_spec_dict,
-                                   path_list=sdn_props.path_list)
-        cong_arr = np.append(cong_arr, curr_cong)
+    Loads a compiled model.
 
-    tmp_dict = {
-        'old_bandwidth': req_dict['bandwidth'],
-        'path_length': path_length,
-        'longest_reach': req_dict['mod_formats']['QPSK']['max_length'],
-        'ave_cong': float(np.mean(cong_arr)),
-    }
+    :param model_fp: The compiled model's file path.
+    :return: The model, ready to predict from raw arrays.
+    :rtype: object
+    """
+    with np.load(model_fp, allow_pickle=False) as file_obj:
+        model_dict = dict(file_obj)
 
-    return _get_ml_obs(engine_props=engine_props, sdn_props=sdn_props, tmp_dict=tmp_dict)
+    return COMPILED_PREDICTORS_DICT[str(model_dict['model_type'])](model_dict=model_dict)
 
 
 def load_model(engine_props: dict):
     """
-    Loads a trained machine learning model.
+    Loads a trained machine learning model, its compiled version if it has one.
 
     :param engine_props: Properties from engine.
-    :return: The trained model.
+    :return: The trained model, wrapped to predict from raw arrays.
     """
-
     model_fp = os.path.join('logs', engine_props['ml_model'], engine_props['train_file_path'],
-                            f"{engine_props['ml_model']}_{str(int(engine_props['erlang']))}.joblib")
-    resp = joblib.load(filename=model_fp)
+                            f"{engine_props['ml_model']}_{str(int(engine_props['erlang']))}")
+    if os.path.exists(f'{model_fp}.npz'):
+        return load_compiled_model(model_fp=f'{model_fp}.npz')
+
+    resp = MLPredictor(ml_model=joblib.load(filename=f'{model_fp}.joblib'))
 
     return resp
 
@@ -138,6 +342,15 @@ def save_model(sim_dict: dict, model, algorithm: str, erlang: str):
     save_fp = os.path.join(base_fp, f'{algorithm}_{erlang}.joblib')
     joblib.dump(model, save_fp)
 
+    # Deployed models are loaded from the compiled version when there is one
+    compiled_fp = os.path.join(base_fp, f'{algorithm}_{erlang}.npz')
+    model_dict = compile_model(model=model)
+    if model_dict is not None:
+        np.savez(compiled_fp, **model_dict)
+    # The compiled version of a previous model would be deployed instead of this one
+    elif os.path.exists(compiled_fp):
+        os.remove(compiled_fp)
+
 
 def process_data(sim_dict: dict, input_df: pd.DataFrame, erlang: float):
     """
@@ -149,7 +362,8 @@ def process_data(sim_dict: dict, input_df: pd.DataFrame, erlang: float):
     :return: Modified processed dataframe.
     :rtype: pd.DataFrame
     """
-    plot_data(input_df=input_df, erlang=erlang, sim_dict=sim_dict)
+    if sim_dict.get('plot_ml'):
+        plot_data(input_df=input_df, erlang=erlang, sim_dict=sim_dict)
     df_processed = pd.get_dummies(input_df, columns=['old_bandwidth'])
 
     for col in df_processed.columns:
@@ -3,7 +3,7 @@ import os
 import numpy as np
 from gymnasium import spaces
 
-from .ql_helpers import QLearningHelpers
+from .ql_helpers import QLearningHelpers, load_q_table
 from .bandit_helpers import EpsilonGreedyBandit
 from .bandit_helpers import UCBBandit
 
@@ -59,7 +59,8 @@ class PathAgent:
 
         return self.engine_props['penalty'] - path_length
 
-    def update(self, was_allocated: bool, net_spec_dict: dict, iteration: int, path_length: int):
+    def update(self, was_allocated: bool, net_spec_dict: dict, iteration: int, path_length: int,
+               next_level_index: int = None):
         """
         Makes updates to the agent for each time step.
 
@@ -67,13 +68,14 @@ class PathAgent:
         :param net_spec_dict: The current network spectrum database.
         :param path_length: Length of the path.
         :param iteration: The current iteration.
+        :param next_level_index: The congestion level after the action, found from the spectrum database if not given.
         """
         reward = self.get_reward(was_allocated=was_allocated, path_length=path_length)
 
         self.agent_obj.iteration = iteration
         if self.path_algorithm == 'q_learning':
             self.agent_obj.update_routes_matrix(reward=reward, level_index=self.level_index,
-                                                net_spec_dict=net_spec_dict)
+                                                net_spec_dict=net_spec_dict, next_level_index=next_level_index)
         elif self.path_algorithm == 'epsilon_greedy_bandit':
             self.agent_obj.update(reward=reward, arm=self.rl_props.chosen_path_index, iteration=iteration)
         elif self.path_algorithm == 'ucb_bandit':
@@ -97,13 +99,10 @@ class PathAgent:
 
     def _ql_route(self):
         random_float = float(np.round(np.random.uniform(0, 1), decimals=1))
-        routes_matrix = self.agent_obj.props.routes_matrix
-        self.rl_props.paths_list = routes_matrix[self.rl_props.source][self.rl_props.destination]['path']
+        paths_matrix = self.agent_obj.props.paths_matrix
+        self.rl_props.paths_list = paths_matrix[self.rl_props.source, self.rl_props.destination]
 
         self.cong_list = self.rl_help_obj.classify_paths(paths_list=self.rl_props.paths_list)
-        if self.rl_props.paths_list.ndim != 1:
-            self.rl_props.paths_list = self.rl_props.paths_list[:, 0]
-
         self.__ql_route(random_float=random_float)
 
         if len(self.rl_props.chosen_path_list) == 0:
@@ -139,7 +138,7 @@ class PathAgent:
         self.setup_env()
         if self.engine_props['path_algorithm'] == 'q_learning':
             model_path = os.path.join('logs', model_path, f'e{erlang}_routes_c{num_cores}.npy')
-            self.agent_obj.props.routes_matrix = np.load(model_path, allow_pickle=True)
+            self.agent_obj.props.routes_matrix = load_q_table(model_fp=model_path)
 
 
 class CoreAgent:
@@ -207,15 +206,18 @@ class CoreAgent:
 
         return core_decay * request_weight
 
-    def get_reward(self, was_allocated: bool):
+    def get_reward(self, was_allocated: bool, req_id: int = None):
         """
         Gets the core agent's reward based on the last action taken.
 
         :param was_allocated: If the last request was allocated.
+        :param req_id: The last request's ID, taken from the SDN controller if not given.
         :return: The reward.
         :rtype: float
         """
-        req_id = float(self.rl_help_obj.route_obj.sdn_props['req_id'])
+        if req_id is None:
+            req_id = self.rl_help_obj.route_obj.sdn_props.req_id
+        req_id = float(req_id)
         core_index = self.rl_props.core_index
 
         if was_allocated:
@@ -231,21 +233,24 @@ class CoreAgent:
             penalty = self.engine_props['penalty']
         return penalty
 
-    def update(self, was_allocated: bool, net_spec_dict: dict, iteration: int):
+    def update(self, was_allocated: bool, net_spec_dict: dict, iteration: int, req_id: int = None,
+               next_level_index: int = None):
         """
         Makes updates to the core agent after each time step.
 
         :param was_allocated: If the request was allocated.
         :param net_spec_dict: The current network spectrum database.
         :param iteration: The current iteration
+        :param req_id: The request's ID, taken from the SDN controller if not given.
+        :param next_level_index: The congestion level after the action, found from the spectrum database if not given.
         """
-        reward = self.get_reward(was_allocated=was_allocated)
+        reward = self.get_reward(was_allocated=was_allocated, req_id=req_id)
 
         self.agent_obj.iteration = iteration
         if self.core_algorithm == 'q_learning':
-            print('Core Index:', self.rl_props.core_index)
             self.agent_obj.update_cores_matrix(reward=reward, level_index=self.level_index,
-                                               net_spec_dict=net_spec_dict, core_index=self.rl_props.core_index)
+                                               net_spec_dict=net_spec_dict, core_index=self.rl_props.core_index,
+                                               next_level_index=next_level_index)
         elif self.core_algorithm == 'epsilon_greedy_bandit':
             self.agent_obj.update(reward=reward, arm=self.rl_props.core_index, iteration=iteration)
         elif self.core_algorithm == 'ucb_bandit':
@@ -255,10 +260,10 @@ class CoreAgent:
 
     def _ql_core(self):
         random_float = np.round(np.random.uniform(0, 1), decimals=1)
-        cores_matrix = self.agent_obj.props.cores_matrix
-        cores_matrix = cores_matrix[self.rl_props.source][self.rl_props.destination]
-        self.rl_props.cores_list = cores_matrix[self.rl_props.chosen_path_index]
-        self.cong_list = self.rl_help_obj.classify_cores(cores_list=self.rl_props.cores_list)
+        source, dest = self.rl_props.source, self.rl_props.destination
+        self.rl_props.cores_list = self.agent_obj.props.cores_matrix[source, dest, self.rl_props.chosen_path_index]
+        path_list = self.agent_obj.props.paths_matrix[source, dest, self.rl_props.chosen_path_index]
+        self.cong_list = self.rl_help_obj.classify_cores(cores_list=self.rl_props.cores_list, path_list=path_list)
 
         if random_float < self.agent_obj.props.epsilon:
             self.rl_props.core_index = np.random.randint(0, self.engine_props['cores_per_link'])
@@ -299,7 +304,7 @@ class CoreAgent:
         self.setup_env()
         if self.core_algorithm == 'q_learning':
             model_path = os.path.join('logs', model_path, f'e{erlang}_cores_c{num_cores}.npy')
-            self.agent_obj.props.cores_matrix = np.load(model_path, allow_pickle=True)
+            self.agent_obj.props.cores_matrix = load_q_table(model_fp=model_path)
 
 
 # TODO: No longer supported/functional
@@ -326,7 +331,7 @@ class SpectrumAgent:
             'slots_needed': spaces.Discrete(15 + 1),
             'source': spaces.MultiBinary(self.rl_props.num_nodes),
             'destination': spaces.MultiBinary(self.rl_props.num_nodes),
-            'super_channels': spaces.Box(-0.01, 100.0, shape=(3,), dtype=np.float32)
+            'super_channels': spaces.Box(-0.01, 100.0, shape=(self.rl_props.super_channel_space,), dtype=np.float32)
         })
 
         return resp_obs
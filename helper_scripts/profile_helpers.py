@@ -0,0 +1,67 @@
+import time
+
+from arg_scripts.stats_args import PHASE_KEYS_LIST
+
+
+class PhaseProfiler:
+    """
+    Records wall-clock durations and call counts for the main phases of a simulation.
+    """
+
+    def __init__(self, is_enabled: bool = False):
+        self.is_enabled = is_enabled
+
+        self.times_dict = dict()
+        self.calls_dict = dict()
+        self.reset()
+
+    def reset(self):
+        """
+        Clears every phase timer, typically at the start of an iteration.
+        """
+        self.times_dict = {phase: 0 for phase in PHASE_KEYS_LIST}
+        self.calls_dict = {phase: 0 for phase in PHASE_KEYS_LIST}
+
+    def start(self):
+        """
+        Starts timing a phase.
+
+        :return: The current performance counter in nanoseconds, zero if profiling is disabled.
+        :rtype: int
+        """
+        if not self.is_enabled:
+            return 0
+
+        return time.perf_counter_ns()
+
+    def stop(self, phase: str, start_ns: int):
+        """
+        Stops timing a phase and adds the elapsed time to its total.
+
+        :param phase: The phase being timed.
+        :param start_ns: The value returned by the matching start call.
+        """
+        if not self.is_enabled:
+            return
+
+        self.times_dict[phase] += time.perf_counter_ns() - start_ns
+        self.calls_dict[phase] += 1
+
+    def get_phase_stats(self):
+        """
+        Summarizes the time spent in every phase since the last reset.
+
+        :return: The total time, number of calls, and mean time per call for each phase.
+        :rtype: dict
+        """
+        resp_dict = dict()
+        for phase in PHASE_KEYS_LIST:
+            num_calls = self.calls_dict[phase]
+            total_ns = self.times_dict[phase]
+            resp_dict[phase] = {
+                'calls': num_calls,
+                'total_ns': total_ns,
+                'mean_ns': total_ns / num_calls if num_calls else None,
+            }
+
+        return resp_dict
@@ -1,14 +1,29 @@
-# pylint: disable=unsupported-assignment-operation
-
 import os
 import json
 
-import networkx as nx
 import numpy as np
 
 from arg_scripts.rl_args import QProps
-from helper_scripts.sim_helpers import find_path_cong, classify_cong, calc_matrix_stats, find_core_cong
+from arg_scripts.routing_args import K_PATHS_CACHE_DIR
+from helper_scripts.sim_helpers import find_path_cong, classify_cong, get_matrix_stats, find_core_cong
 from helper_scripts.os_helpers import create_dir
+from helper_scripts.routing_helpers import get_k_paths_cache
+
+
+def load_q_table(model_fp: str):
+    """
+    Loads a previously saved q-table.
+
+    :param model_fp: The file path of the saved q-table.
+    :return: The q-values of the table.
+    :rtype: np.ndarray
+    """
+    q_table = np.load(model_fp, allow_pickle=True)
+    # Older models stored the path alongside every q-value
+    if q_table.dtype.names is not None:
+        q_table = np.ascontiguousarray(q_table['q_value'])
+
+    return q_table
 
 
 class QLearningHelpers:
@@ -26,39 +41,28 @@ class QLearningHelpers:
         self.iteration = 0
 
     def _init_q_tables(self):
-        for source in range(0, self.rl_props.num_nodes):
-            for destination in range(0, self.rl_props.num_nodes):
-                # A node cannot be attached to itself
-                if source == destination:
-                    continue
-
-                shortest_paths = nx.shortest_simple_paths(G=self.engine_props['topology'],
-                                                          source=str(source), target=str(destination), weight='length')
-                for k, curr_path in enumerate(shortest_paths):
-                    if k >= self.rl_props.k_paths:
-                        break
-
-                    for level_index in range(self.path_levels):
-                        self.props.routes_matrix[source, destination, k, level_index] = (curr_path, 0.0)
-
-                        for core_action in range(self.engine_props['cores_per_link']):
-                            core_tuple = (curr_path, core_action, 0.0)
-                            self.props.cores_matrix[source, destination, k, core_action, level_index] = core_tuple
+        # Routes are precomputed for every pair at once and shared across environment setups
+        k_paths_cache = get_k_paths_cache(topology=self.engine_props['topology'], k_paths=self.rl_props.k_paths,
+                                          cache_dir=K_PATHS_CACHE_DIR)
+        for (source, destination, _), paths_list in k_paths_cache.items():
+            for k, (curr_path, _) in enumerate(paths_list):
+                self.props.paths_matrix[int(source), int(destination), k] = curr_path
 
     def setup_env(self):
         """
         Sets up the q-learning environments.
         """
         self.props.epsilon = self.engine_props['epsilon_start']
-        route_types = [('path', 'O'), ('q_value', 'f8')]
-        core_types = [('path', 'O'), ('core_action', 'i8'), ('q_value', 'f8')]
+        # Paths are stored once, the q-tables only hold q-values
+        self.props.paths_matrix = np.empty((self.rl_props.num_nodes, self.rl_props.num_nodes, self.rl_props.k_paths),
+                                           dtype=object)
 
-        self.props.routes_matrix = np.empty((self.rl_props.num_nodes, self.rl_props.num_nodes,
-                                             self.rl_props.k_paths, self.path_levels), dtype=route_types)
+        self.props.routes_matrix = np.zeros((self.rl_props.num_nodes, self.rl_props.num_nodes,
+                                             self.rl_props.k_paths, self.path_levels), dtype=np.float64)
 
-        self.props.cores_matrix = np.empty((self.rl_props.num_nodes, self.rl_props.num_nodes,
+        self.props.cores_matrix = np.zeros((self.rl_props.num_nodes, self.rl_props.num_nodes,
                                             self.rl_props.k_paths, self.engine_props['cores_per_link'],
-                                            self.path_levels), dtype=core_types)
+                                            self.path_levels), dtype=np.float64)
 
         self._init_q_tables()
 
@@ -68,7 +72,7 @@ class QLearningHelpers:
 
         :param path_list: The current path.
         :param net_spec_dict: The network spectrum database.
-        :param matrix: The matrix to find the maximum current q-value in.
+        :param matrix: The q-values to find the maximum future q-value in.
         :param flag: A flag to determine whether the matrix is for the path or core agent.
         :param core_index: The index of the core selected.
         :return: The maximum future q.
@@ -77,40 +81,44 @@ class QLearningHelpers:
         if flag == 'path':
             new_cong = find_path_cong(path_list=path_list, net_spec_dict=net_spec_dict)
             new_cong_index = classify_cong(curr_cong=new_cong)
-            max_future_q = matrix[self.rl_props.chosen_path_index][new_cong_index]['q_value']
+            max_future_q = matrix[self.rl_props.chosen_path_index, new_cong_index]
         elif flag == 'core':
             new_cong = find_core_cong(core_index=core_index, net_spec_dict=net_spec_dict, path_list=path_list)
             new_cong_index = classify_cong(curr_cong=new_cong)
-            max_future_q = matrix[core_index][new_cong_index]['q_value']
+            max_future_q = matrix[core_index, new_cong_index]
         else:
             raise NotImplementedError
 
         return max_future_q
 
-    def update_routes_matrix(self, reward: float, level_index: int, net_spec_dict: dict):
+    def update_routes_matrix(self, reward: float, level_index: int, net_spec_dict: dict, next_level_index: int = None):
         """
         Updates the q-table for the path/routing agent.
 
         :param reward: The reward received from the last action.
         :param level_index: Index to determine the current state.
         :param net_spec_dict: The network spectrum database.
+        :param next_level_index: Index of the next state, found from the network spectrum database if not given.
         """
-        routes_matrix = self.props.routes_matrix[self.rl_props.source][self.rl_props.destination]
-        path_list = routes_matrix[self.rl_props.chosen_path_index][level_index]
-        current_q = path_list['q_value']
-
-        max_future_q = self.get_max_future_q(path_list=routes_matrix[self.rl_props.chosen_path_index][0][0],
-                                             net_spec_dict=net_spec_dict, matrix=routes_matrix, flag='path')
+        routes_matrix = self.props.routes_matrix[self.rl_props.source, self.rl_props.destination]
+        current_q = routes_matrix[self.rl_props.chosen_path_index, level_index]
+        if next_level_index is None:
+            path_list = self.props.paths_matrix[self.rl_props.source, self.rl_props.destination,
+                                                self.rl_props.chosen_path_index]
+            max_future_q = self.get_max_future_q(path_list=path_list, net_spec_dict=net_spec_dict,
+                                                 matrix=routes_matrix, flag='path')
+        else:
+            max_future_q = routes_matrix[self.rl_props.chosen_path_index, next_level_index]
 
         delta = reward + self.engine_props['discount_factor'] * max_future_q
         td_error = current_q - (reward + self.engine_props['discount_factor'] * max_future_q)
         self.update_q_stats(reward=reward, stats_flag='routes_dict', td_error=td_error)
         new_q = ((1.0 - self.engine_props['learn_rate']) * current_q) + (self.engine_props['learn_rate'] * delta)
 
-        routes_matrix = self.props.routes_matrix[self.rl_props.source][self.rl_props.destination]
-        routes_matrix[self.rl_props.chosen_path_index][level_index]['q_value'] = new_q
+        routes_matrix[self.rl_props.chosen_path_index, level_index] = new_q
 
-    def update_cores_matrix(self, reward: float, core_index: int, level_index: int, net_spec_dict: dict):
+    def update_cores_matrix(self, reward: float, core_index: int, level_index: int, net_spec_dict: dict,
+                            next_level_index: int = None):
         """
         Updates the q-table for the core agent.
 
@@ -118,21 +126,25 @@ class QLearningHelpers:
         :param core_index: The index of the core selected.
         :param level_index: Index to determine the current state.
         :param net_spec_dict: The network spectrum database.
+        :param next_level_index: Index of the next state, found from the network spectrum database if not given.
         """
-        cores_matrix = self.props.cores_matrix[self.rl_props.source][self.rl_props.destination]
-        cores_matrix = cores_matrix[self.rl_props.chosen_path_index]
-        cores_list = cores_matrix[self.rl_props.core_index][level_index]
-        current_q = cores_list['q_value']
-
-        max_future_q = self.get_max_future_q(path_list=cores_list['path'], net_spec_dict=net_spec_dict,
-                                             matrix=cores_matrix, flag='core', core_index=core_index)
+        cores_matrix = self.props.cores_matrix[self.rl_props.source, self.rl_props.destination,
+                                               self.rl_props.chosen_path_index]
+        current_q = cores_matrix[self.rl_props.core_index, level_index]
+        if next_level_index is None:
+            path_list = self.props.paths_matrix[self.rl_props.source, self.rl_props.destination,
+                                                self.rl_props.chosen_path_index]
+            max_future_q = self.get_max_future_q(path_list=path_list, net_spec_dict=net_spec_dict,
+                                                 matrix=cores_matrix, flag='core', core_index=core_index)
+        else:
+            max_future_q = cores_matrix[core_index, next_level_index]
 
         delta = reward + self.engine_props['discount_factor'] * max_future_q
         td_error = current_q - (reward + self.engine_props['discount_factor'] * max_future_q)
         self.update_q_stats(reward=reward, stats_flag='cores_dict', td_error=td_error)
         new_q = ((1.0 - self.engine_props['learn_rate']) * current_q) + (self.engine_props['learn_rate'] * delta)
 
-        cores_matrix[core_index][level_index]['q_value'] = new_q
+        cores_matrix[core_index, level_index] = new_q
 
     def get_max_curr_q(self, cong_list: list, matrix_flag: str):
         """
@@ -143,45 +155,41 @@ class QLearningHelpers:
         :return: The maximum q-value index (state) and an object
         :rtype: tuple
         """
-        q_values = list()
-        for obj_index, _, level_index in cong_list:
-            if matrix_flag == 'routes_matrix':
-                matrix = self.props.routes_matrix[self.rl_props.source][self.rl_props.destination]
-                sub_flag = 'paths_list'
-            elif matrix_flag == 'cores_matrix':
-                matrix = self.props.cores_matrix[self.rl_props.source][self.rl_props.destination]
-                matrix = matrix[self.rl_props.chosen_path_index]
-                sub_flag = 'cores_list'
-            else:
-                raise ValueError
+        if matrix_flag == 'routes_matrix':
+            matrix = self.props.routes_matrix[self.rl_props.source, self.rl_props.destination]
+            objs_list = self.rl_props.paths_list
+        elif matrix_flag == 'cores_matrix':
+            matrix = self.props.cores_matrix[self.rl_props.source, self.rl_props.destination,
+                                             self.rl_props.chosen_path_index]
+            objs_list = self.rl_props.cores_list
+        else:
+            raise ValueError
 
-            curr_q = matrix[obj_index][level_index]['q_value']
-            q_values.append(curr_q)
+        obj_indexes = [obj_index for obj_index, _, _ in cong_list]
+        level_indexes = [level_index for _, _, level_index in cong_list]
+        q_values = matrix[obj_indexes, level_indexes]
 
         max_index = np.argmax(q_values)
-        if sub_flag == 'cores_list':
-            max_obj = self.rl_props.cores_list[max_index]
-        else:
-            max_obj = self.rl_props.paths_list[max_index]
-        return max_index, max_obj
+        return max_index, objs_list[max_index]
 
-    def _calc_q_averages(self, stats_flag: str, episode: str):
-        len_rewards = len(self.props.rewards_dict[stats_flag]['rewards'][episode])
+    def _calc_q_averages(self, stats_flag: str):
+        stats_count = self.props.stats_count_dict[stats_flag][self.iteration]
 
         max_iters = self.engine_props['max_iters']
         num_requests = self.engine_props['num_requests']
 
-        if (self.iteration in (max_iters - 1, (max_iters - 1) % 10)) and len_rewards == num_requests:
-            rewards_dict = self.props.rewards_dict[stats_flag]['rewards']
-            errors_dict = self.props.errors_dict[stats_flag]['errors']
+        if (self.iteration in (max_iters - 1, (max_iters - 1) % 10)) and stats_count == num_requests:
+            # Only complete episodes are summarized
+            rewards_matrix = self.props.rewards_matrix_dict[stats_flag][:self.iteration + 1]
+            errors_matrix = self.props.errors_matrix_dict[stats_flag][:self.iteration + 1]
 
             if self.iteration == (max_iters - 1):
                 self.completed_sim = True
-                self.props.rewards_dict[stats_flag] = calc_matrix_stats(input_dict=rewards_dict)
-                self.props.errors_dict[stats_flag] = calc_matrix_stats(input_dict=errors_dict)
+                self.props.rewards_dict[stats_flag] = get_matrix_stats(input_matrix=rewards_matrix)
+                self.props.errors_dict[stats_flag] = get_matrix_stats(input_matrix=errors_matrix)
             else:
-                self.props.rewards_dict[stats_flag]['training'] = calc_matrix_stats(input_dict=rewards_dict)
-                self.props.errors_dict[stats_flag]['training'] = calc_matrix_stats(input_dict=errors_dict)
+                self.props.rewards_dict[stats_flag]['training'] = get_matrix_stats(input_matrix=rewards_matrix)
+                self.props.errors_dict[stats_flag]['training'] = get_matrix_stats(input_matrix=errors_matrix)
 
             if not self.engine_props['is_training']:
                 self.save_model(path_algorithm=self.engine_props['path_algorithm'], core_algorithm='first_fit')
@@ -190,6 +198,13 @@ class QLearningHelpers:
                 self.save_model(path_algorithm=self.engine_props['path_algorithm'],
                                 core_algorithm=self.engine_props['core_algorithm'])
 
+    def _init_q_stats(self, stats_flag: str):
+        # Every reward and error of the simulation fits without growing a list
+        matrix_shape = (self.engine_props['max_iters'], self.engine_props['num_requests'])
+        self.props.rewards_matrix_dict[stats_flag] = np.zeros(matrix_shape, dtype=np.float32)
+        self.props.errors_matrix_dict[stats_flag] = np.zeros(matrix_shape, dtype=np.float32)
+        self.props.stats_count_dict[stats_flag] = np.zeros(self.engine_props['max_iters'], dtype=np.int64)
+
     def update_q_stats(self, reward: float, td_error: float, stats_flag: str):
         """
         Update relevant statistics for both q-learning agents.
@@ -202,19 +217,34 @@ class QLearningHelpers:
         if self.completed_sim:
             return
 
+        if self.props.stats_count_dict[stats_flag] is None:
+            self._init_q_stats(stats_flag=stats_flag)
+
+        stats_count = self.props.stats_count_dict[stats_flag][self.iteration]
+        self.props.rewards_matrix_dict[stats_flag][self.iteration, stats_count] = reward
+        self.props.errors_matrix_dict[stats_flag][self.iteration, stats_count] = td_error
+        self.props.stats_count_dict[stats_flag][self.iteration] += 1
+
         episode = str(self.iteration)
-        if episode not in self.props.rewards_dict[stats_flag]['rewards'].keys():
-            self.props.rewards_dict[stats_flag]['rewards'][episode] = [reward]
-            self.props.errors_dict[stats_flag]['errors'][episode] = [td_error]
+        if episode not in self.props.sum_rewards_dict:
             self.props.sum_rewards_dict[episode] = reward
             self.props.sum_errors_dict[episode] = td_error
         else:
-            self.props.rewards_dict[stats_flag]['rewards'][episode].append(reward)
-            self.props.errors_dict[stats_flag]['errors'][episode].append(td_error)
             self.props.sum_rewards_dict[episode] += reward
             self.props.sum_errors_dict[episode] += td_error
 
-        self._calc_q_averages(stats_flag=stats_flag, episode=episode)
+        self._calc_q_averages(stats_flag=stats_flag)
+
+    def _save_stats(self, save_dir: str, stats_flag: str):
+        if self.props.stats_count_dict[stats_flag] is None:
+            return
+
+        erlang = self.engine_props['erlang']
+        cores_per_link = self.engine_props['cores_per_link']
+        agent_type = stats_flag.split('_', maxsplit=1)[0]
+        stats_fp = os.path.join(save_dir, f"e{erlang}_{agent_type}_stats_c{cores_per_link}.npz")
+        np.savez(stats_fp, rewards=self.props.rewards_matrix_dict[stats_flag],
+                 errors=self.props.errors_matrix_dict[stats_flag], counts=self.props.stats_count_dict[stats_flag])
 
     def _save_params(self, save_dir: str):
         params_dict = dict()
@@ -248,17 +278,16 @@ class QLearningHelpers:
         cores_per_link = self.engine_props['cores_per_link']
 
         if path_algorithm == 'q_learning':
-            save_fp = f"e{erlang}_routes_c{cores_per_link}.npy"
+            save_fp = os.path.join(os.getcwd(), save_dir, f"e{erlang}_routes_c{cores_per_link}.npy")
+            np.save(save_fp, self.props.routes_matrix)
+            self._save_stats(save_dir=save_dir, stats_flag='routes_dict')
         elif core_algorithm == 'q_learning':
-            save_fp = f"e{erlang}_cores_c{cores_per_link}.npy"
+            save_fp = os.path.join(os.getcwd(), save_dir, f"e{erlang}_cores_c{cores_per_link}.npy")
+            np.save(save_fp, self.props.cores_matrix)
+            self._save_stats(save_dir=save_dir, stats_flag='cores_dict')
         else:
             raise NotImplementedError
 
-        save_fp = os.path.join(os.getcwd(), save_dir, save_fp)
-        if save_fp.split('_')[1] == 'routes':
-            np.save(save_fp, self.props.routes_matrix)
-        else:
-            np.save(save_fp, self.props.cores_matrix)
         self._save_params(save_dir=save_dir)
 
     def decay_epsilon(self):
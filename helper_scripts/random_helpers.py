@@ -10,27 +10,43 @@ def set_seed(seed: int):
     np.random.seed(seed)
 
 
-def get_uniform_rv(scale_param: float = None):
+def get_rng(seed: int):
+    """
+    Creates an independent random number generator, producing the same values as the global one seeded by set_seed.
+
+    :param seed: The seed
+    :return: A random number generator
+    :rtype: np.random.RandomState
+    """
+    return np.random.RandomState(seed)  # pylint: disable=no-member
+
+
+def get_uniform_rv(scale_param: float = None, rng: object = None):
     """
     Generates a value from a uniform distribution. Optional scale parameter.
 
     :param scale_param: A scale parameter
+    :param rng: The random number generator to draw from, the global one if None
     :return: A uniform random variable
     :rtype: int
     """
+    if rng is None:
+        rng = np.random
+
     if scale_param is None:
-        return np.random.uniform(0, 1)
+        return rng.uniform(0, 1)
 
-    return int(np.random.uniform(0, 1) * scale_param)
+    return int(rng.uniform(0, 1) * scale_param)
 
 
-def get_exponential_rv(scale_param: float):
+def get_exponential_rv(scale_param: float, rng: object = None):
     """
     Generates a value from an exponential distribution.
 
     :param scale_param: A scale parameter
+    :param rng: The random number generator to draw from, the global one if None
     :return: An exponential random variable
     :rtype: float
     """
     # np.log is the natural logarithm
-    return ((-1.0) / float(scale_param)) * np.log(get_uniform_rv())
+    return ((-1.0) / float(scale_param)) * np.log(get_uniform_rv(rng=rng))
@@ -1,8 +1,8 @@
 import numpy as np
 
 from src.spectrum_assignment import SpectrumAssignment
-from helper_scripts.sim_helpers import find_path_len, get_path_mod, get_hfrag
-from helper_scripts.sim_helpers import find_path_cong, classify_cong, find_core_cong
+from helper_scripts.sim_helpers import find_path_len, get_path_mod, get_hfrag_mat
+from helper_scripts.sim_helpers import find_path_cong, classify_cong, find_cores_cong
 from arg_scripts.sdn_args import SDNProps
 
 
@@ -20,9 +20,11 @@ class RLHelpers:
         self.topology = None
 
         self.core_num = None
+        self.band = None
         self.super_channel = None
         self.super_channel_indexes = list()
         self.mod_format = None
+        self.obs_obj = None
         self._last_processed_index = 0
 
     def update_snapshots(self):
@@ -45,29 +47,15 @@ class RLHelpers:
         :return: A matrix of super-channels with their fragmentation score.
         :rtype: list
         """
-        # TODO: 'c' band by default
+        # Super-channels are observed, and the chosen one allocated, on the first band searched
+        self.band = self.engine_obj.engine_props['band_list'][0]
         path_list = self.rl_props.chosen_path_list[0]
-        sc_index_mat, hfrag_arr = get_hfrag(path_list=path_list, net_spec_dict=self.engine_obj.net_spec_dict,
-                                            spectral_slots=self.rl_props.spectral_slots, core_num=self.core_num,
-                                            slots_needed=slots_needed, band='c')
+        no_penalty = self.obs_obj.update_super_channels(path_list=path_list, core_num=self.core_num, band=self.band,
+                                                        slots_needed=slots_needed, num_channels=num_channels,
+                                                        net_spec_dict=self.engine_obj.net_spec_dict)
+        self.super_channel_indexes = self.obs_obj.sc_index_mat[:self.obs_obj.num_channels]
 
-        self.super_channel_indexes = sc_index_mat[:num_channels]
-        # There were not enough super-channels, do not penalize the agent
-        no_penalty = len(self.super_channel_indexes) == 0
-
-        resp_frag_mat = list()
-        for channel in self.super_channel_indexes:
-            start_index = channel[0]
-            resp_frag_mat.append(hfrag_arr[start_index])
-
-        resp_frag_mat = np.where(np.isinf(resp_frag_mat), 100.0, resp_frag_mat)
-        difference = self.rl_props.super_channel_space - len(resp_frag_mat)
-
-        if len(resp_frag_mat) < self.rl_props.super_channel_space or np.any(np.isinf(resp_frag_mat)):
-            for _ in range(difference):
-                resp_frag_mat = np.append(resp_frag_mat, 100.0)
-
-        return resp_frag_mat, no_penalty
+        return self.obs_obj.super_channels, no_penalty
 
     def classify_paths(self, paths_list: list):
         """
@@ -78,7 +66,6 @@ class RLHelpers:
         :rtype: list
         """
         info_list = list()
-        paths_list = paths_list[:, 0]
         for path_index, curr_path in enumerate(paths_list):
             curr_cong = find_path_cong(path_list=curr_path, net_spec_dict=self.engine_obj.net_spec_dict)
             cong_index = classify_cong(curr_cong=curr_cong)
@@ -87,21 +74,21 @@ class RLHelpers:
 
         return info_list
 
-    def classify_cores(self, cores_list: list):
+    def classify_cores(self, cores_list: list, path_list: list):
         """
         Classify cores by their congestion level.
 
-        :param cores_list: A list of cores.
-        :return: The core index, the core itself, and the congestion level of that core for every core.
+        :param cores_list: The q-values of every core for each congestion level.
+        :param path_list: The path the cores belong to.
+        :return: The core index, the core's q-value, and the congestion level of that core for every core.
         :rtype: list
         """
         info_list = list()
 
+        # Every core's congestion is found in one pass over the path
+        cong_arr = find_cores_cong(path_list=path_list, net_spec_dict=self.engine_obj.net_spec_dict)
         for core_index, curr_core in enumerate(cores_list):
-            path_list = curr_core['path'][0]
-            curr_cong = find_core_cong(core_index=core_index, net_spec_dict=self.engine_obj.net_spec_dict,
-                                       path_list=path_list)
-            cong_index = classify_cong(curr_cong=curr_cong)
+            cong_index = classify_cong(curr_cong=cong_arr[core_index])
 
             info_list.append((core_index, curr_core[cong_index], cong_index))
 
@@ -125,44 +112,47 @@ class RLHelpers:
         Checks if a request or multiple requests need to be released.
         """
         curr_time = self.rl_props.arrival_list[min(self.rl_props.arrival_count,
-                                                   len(self.rl_props.arrival_list) - 1)]['arrive']
+                                                   len(self.rl_props.arrival_list) - 1)].arrive
 
         depart_list = self.rl_props.depart_list
         while self._last_processed_index < len(depart_list):
             req_obj = depart_list[self._last_processed_index]
-            if req_obj['depart'] > curr_time:
+            if req_obj.depart > curr_time:
                 break
 
-            self.engine_obj.handle_release(curr_time=req_obj['depart'])
+            self.engine_obj.handle_release(curr_time=req_obj.depart)
             self._last_processed_index += 1
 
     def allocate(self):
         """
         Attempts to allocate a request.
         """
-        curr_time = self.rl_props.arrival_list[self.rl_props.arrival_count]['arrive']
+        curr_time = self.rl_props.arrival_list[self.rl_props.arrival_count].arrive
         if self.rl_props.forced_index is not None:
             try:
                 forced_index = self.super_channel_indexes[self.rl_props.forced_index][0]
             # DRL agent picked a super-channel that is not available, block
             except IndexError:
                 self.engine_obj.stats_obj.blocked_reqs += 1
-                self.engine_obj.stats_obj.stats_props['block_reasons_dict']['congestion'] += 1
-                bandwidth = self.rl_props.arrival_list[self.rl_props.arrival_count]['bandwidth']
-                self.engine_obj.stats_obj.stats_props['block_bw_dict'][bandwidth] += 1
+                self.engine_obj.stats_obj.stats_props.block_reasons_dict['congestion'] += 1
+                bandwidth = self.rl_props.arrival_list[self.rl_props.arrival_count].bandwidth
+                self.engine_obj.stats_obj.stats_props.block_bw_dict[bandwidth] += 1
                 return
+            force_band = self.band
         else:
             forced_index = None
+            force_band = None
 
         # TODO: This is an inconsistency
         # TODO: If route object isn't the same in sdn controller...
         force_mod_format = self.route_obj.route_props.mod_formats_matrix[0]
         self.engine_obj.handle_arrival(curr_time=curr_time, force_route_matrix=self.rl_props.chosen_path_list,
-                                       force_core=self.rl_props.core_index,
-                                       forced_index=forced_index, force_mod_format=force_mod_format)
+                                       force_core=self.rl_props.core_index, forced_index=forced_index,
+                                       force_mod_format=force_mod_format, force_band=force_band)
 
     @staticmethod
-    def mock_handle_arrival(engine_props: dict, sdn_props: dict, path_list: list, mod_format_list: list):
+    def mock_handle_arrival(engine_props: dict, sdn_props: dict, path_list: list, mod_format_list: list,
+                            config_obj: object = None):
         """
         Function to mock an arrival process or allocation in the network.
 
@@ -170,10 +160,11 @@ class RLHelpers:
         :param sdn_props: Properties of the SDN controller.
         :param path_list: List of nodes, the current path.
         :param mod_format_list: Valid modulation formats.
+        :param config_obj: The engine's compiled configuration, compiled from its properties if not given.
         :return: If there are available spectral slots.
         :rtype: bool
         """
-        spectrum_obj = SpectrumAssignment(engine_props=engine_props, sdn_props=sdn_props)
+        spectrum_obj = SpectrumAssignment(engine_props=engine_props, sdn_props=sdn_props, config_obj=config_obj)
 
         spectrum_obj.spectrum_props.forced_index = None
         spectrum_obj.spectrum_props.forced_core = None
@@ -195,13 +186,13 @@ class RLHelpers:
         """
         mock_sdn = SDNProps()
         params = {
-            'req_id': curr_req['req_id'],
-            'source': curr_req['source'],
-            'destination': curr_req['destination'],
-            'bandwidth': curr_req['bandwidth'],
+            'req_id': curr_req.req_id,
+            'source': curr_req.source,
+            'destination': curr_req.destination,
+            'bandwidth': curr_req.bandwidth,
             'net_spec_dict': self.engine_obj.net_spec_dict,
             'topology': self.topology,
-            'mod_formats_dict': curr_req['mod_formats'],
+            'mod_formats_dict': curr_req.mod_formats,
             'num_trans': 1.0,
             'block_reason': None,
             'modulation_list': list(),
@@ -227,7 +218,105 @@ class RLHelpers:
         self.engine_obj.generate_requests(seed=seed)
 
         for req_time in self.engine_obj.reqs_dict:
-            if self.engine_obj.reqs_dict[req_time]['request_type'] == 'arrival':
+            if self.engine_obj.reqs_dict[req_time].request_type == 'arrival':
                 self.rl_props.arrival_list.append(self.engine_obj.reqs_dict[req_time])
             else:
                 self.rl_props.depart_list.append(self.engine_obj.reqs_dict[req_time])
+
+
+class SpectrumObsBuilder:
+    """
+    Builds the spectrum agent's observation in preallocated buffers, directly from the live spectrum database.
+
+    The same buffers are overwritten at every step, anything that keeps an observation must copy it.
+    """
+
+    def __init__(self, num_nodes: int, super_channel_space: int, spectral_slots: int, fill_value: float = 100.0):
+        self.spectral_slots = spectral_slots
+        self.fill_value = fill_value
+
+        self.source_obs = np.zeros(num_nodes, dtype=np.int8)
+        self.dest_obs = np.zeros(num_nodes, dtype=np.int8)
+        self.super_channels = np.full(super_channel_space, fill_value, dtype=np.float32)
+        # Start and end slots of every super-channel in the observation, valid up to the number of channels found
+        self.sc_index_mat = np.zeros((super_channel_space, 2), dtype=np.int64)
+        self.num_channels = 0
+
+        # Slots taken on any link of the last path, for every core
+        self.occupied_mat = None
+        self._link_mat = None
+        self._source = 0
+        self._dest = 0
+
+    def update_nodes(self, source: int, destination: int):
+        """
+        Updates the one-hot source and destination observations.
+
+        :param source: The source node of the current request.
+        :param destination: The destination node of the current request.
+        """
+        self.source_obs[self._source] = 0
+        self.dest_obs[self._dest] = 0
+        self.source_obs[source] = 1
+        self.dest_obs[destination] = 1
+        self._source, self._dest = source, destination
+
+    def get_path_mask(self, path_list: list, band: str, net_spec_dict: dict):
+        """
+        Gets the slots taken on any link of a path, for every core, without allocating new arrays.
+
+        :param path_list: The current path.
+        :param band: The band to check.
+        :param net_spec_dict: The up-to-date network spectrum database.
+        :return: Whether each slot of each core is taken somewhere along the path.
+        :rtype: np.array
+        """
+        first_mat = net_spec_dict[(path_list[0], path_list[1])]['cores_matrix'][band]
+        if self.occupied_mat is None or self.occupied_mat.shape != first_mat.shape:
+            self.occupied_mat = np.empty(first_mat.shape, dtype=bool)
+            self._link_mat = np.empty(first_mat.shape, dtype=bool)
+
+        np.not_equal(first_mat, 0, out=self.occupied_mat)
+        for source, dest in zip(path_list[1:], path_list[2:]):
+            np.not_equal(net_spec_dict[(source, dest)]['cores_matrix'][band], 0, out=self._link_mat)
+            self.occupied_mat |= self._link_mat
+
+        return self.occupied_mat
+
+    def clear_super_channels(self):
+        """
+        Clears the super-channels observation when the request can't be allocated.
+        """
+        self.super_channels.fill(self.fill_value)
+        self.num_channels = 0
+
+    def update_super_channels(self, path_list: list, core_num: int, band: str, *, slots_needed: int,
+                              num_channels: int, net_spec_dict: dict):
+        """
+        Updates the first 'J' super-channels on a core of a path and their fragmentation scores.
+
+        :param path_list: The current path.
+        :param core_num: The core number, the first core if none was chosen.
+        :param band: The band to check.
+        :param slots_needed: The slots needed by the request.
+        :param num_channels: The maximum number of super-channels to observe.
+        :param net_spec_dict: The up-to-date network spectrum database.
+        :return: Whether no super-channels were found, the agent should not be penalized if so.
+        :rtype: bool
+        """
+        if core_num is None:
+            core_num = 0
+
+        occupied_mat = self.get_path_mask(path_list=path_list, band=band, net_spec_dict=net_spec_dict)
+        is_start_mat, resp_frag_mat = get_hfrag_mat(occupied_mat=occupied_mat[core_num], slots_needed=slots_needed,
+                                                    spectral_slots=self.spectral_slots)
+        start_arr = np.flatnonzero(is_start_mat[0])[:min(num_channels, len(self.super_channels))]
+
+        self.clear_super_channels()
+        self.num_channels = len(start_arr)
+        frag_arr = resp_frag_mat[0, start_arr]
+        self.super_channels[:self.num_channels] = np.where(np.isinf(frag_arr), self.fill_value, frag_arr)
+        self.sc_index_mat[:self.num_channels, 0] = start_arr
+        self.sc_index_mat[:self.num_channels, 1] = start_arr + slots_needed
+
+        return self.num_channels == 0
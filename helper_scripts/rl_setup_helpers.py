@@ -1,5 +1,6 @@
 import os
 
+from torch import nn  # pylint: disable=unused-import
 from stable_baselines3 import PPO
 
 from helper_scripts.sim_helpers import parse_yaml_file
@@ -43,6 +44,19 @@ def print_info(sim_dict: dict):
                          f'{sim_dict["core_algorithm"]}, {sim_dict["spectrum_algorithm"]}')
 
 
+def get_ppo_params():
+    """
+    Gets the PPO hyperparameters of the environment in the RL Zoo configuration file.
+
+    :return: The environment's hyperparameters, including its number of training timesteps.
+    :rtype: dict
+    """
+    yaml_path = os.path.join('sb3_scripts', 'yml', 'ppo.yml')
+    yaml_dict = parse_yaml_file(yaml_path)
+    env_name = list(yaml_dict.keys())[0]
+    return yaml_dict[env_name]
+
+
 def setup_ppo(env: object, device: str):
     """
     Setups up the StableBaselines3 PPO model.
@@ -52,17 +66,16 @@ def setup_ppo(env: object, device: str):
     :return: A PPO model.
     :rtype: object
     """
-    yaml_path = os.path.join('sb3_scripts', 'yml', 'ppo.yml')
-    yaml_dict = parse_yaml_file(yaml_path)
-    env_name = list(yaml_dict.keys())[0]
-    kwargs_dict = eval(yaml_dict[env_name]['policy_kwargs'])  # pylint: disable=eval-used
-    model = PPO(env=env, device=device, policy=yaml_dict[env_name]['policy'],
-                n_steps=yaml_dict[env_name]['n_steps'],
-                batch_size=yaml_dict[env_name]['batch_size'], gae_lambda=yaml_dict[env_name]['gae_lambda'],
-                gamma=yaml_dict[env_name]['gamma'], n_epochs=yaml_dict[env_name]['n_epochs'],
-                vf_coef=yaml_dict[env_name]['vf_coef'], ent_coef=yaml_dict[env_name]['ent_coef'],
-                max_grad_norm=yaml_dict[env_name]['max_grad_norm'],
-                learning_rate=yaml_dict[env_name]['learning_rate'], clip_range=yaml_dict[env_name]['clip_range'],
+    params_dict = get_ppo_params()
+    # The policy's activation function is named from torch.nn
+    kwargs_dict = eval(params_dict['policy_kwargs'])  # pylint: disable=eval-used
+    model = PPO(env=env, device=device, policy=params_dict['policy'],
+                n_steps=params_dict['n_steps'],
+                batch_size=params_dict['batch_size'], gae_lambda=params_dict['gae_lambda'],
+                gamma=params_dict['gamma'], n_epochs=params_dict['n_epochs'],
+                vf_coef=params_dict['vf_coef'], ent_coef=params_dict['ent_coef'],
+                max_grad_norm=params_dict['max_grad_norm'],
+                learning_rate=params_dict['learning_rate'], clip_range=params_dict['clip_range'],
                 policy_kwargs=kwargs_dict)
 
     return model
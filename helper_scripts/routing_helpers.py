@@ -1,10 +1,17 @@
+import os
 import copy
+import json
 import math
+import hashlib
+import itertools
+import multiprocessing
+import concurrent.futures
 
 import numpy as np
 import networkx as nx
 
-from helper_scripts.sim_helpers import find_free_channels, find_taken_channels
+from helper_scripts.sim_helpers import find_free_channels, find_taken_channels, find_path_len
+from helper_scripts.os_helpers import create_dir
 
 
 class RoutingHelpers:
@@ -85,8 +92,7 @@ class RoutingHelpers:
         link_cost = nli_cost / num_channels
         return link_cost
 
-    # TODO: Default to 'c' band
-    def find_worst_nli(self, num_span: float, band: str = 'c'):
+    def find_worst_nli(self, num_span: float, band: str):
         """
         Finds the worst possible non-linear impairment cost.
 
@@ -108,7 +114,8 @@ class RoutingHelpers:
         nli_worst = self._find_link_cost(free_channels_dict=free_channels_dict, taken_channels_dict=taken_channels_dict,
                                          num_span=num_span)
 
-        self.sdn_props.net_spec_dict[links_list[0]]['cores_matrix'][band] = orig_link_list
+        # Restored in place, the band may be a view of the link's stacked spectrum
+        self.sdn_props.net_spec_dict[links_list[0]]['cores_matrix'][band][:] = orig_link_list
         return nli_worst
 
     @staticmethod
@@ -227,3 +234,65 @@ class RoutingHelpers:
         nli_cost += ((1 - self.engine_props['beta']) * link_cost)
 
         return nli_cost
+
+
+def _get_topology_hash(topology: nx.Graph):
+    links_list = sorted((*sorted((str(source), str(dest))), float(link_data['length']))
+                        for source, dest, link_data in topology.edges(data=True))
+    return hashlib.sha1(json.dumps(links_list).encode('utf-8')).hexdigest()[:16]
+
+
+def _find_source_paths(topology: nx.Graph, source: str, k_paths: int):
+    source_list = []
+    for dest in topology.nodes:
+        if dest == source:
+            continue
+
+        # This networkx function will always return the shortest paths in order
+        paths_obj = nx.shortest_simple_paths(G=topology, source=source, target=dest, weight='length')
+        paths_list = [(path_list, find_path_len(path_list=path_list, topology=topology))
+                      for path_list in itertools.islice(paths_obj, k_paths)]
+        source_list.append((source, dest, paths_list))
+
+    return source_list
+
+
+def get_k_paths_cache(topology: nx.Graph, k_paths: int, cache_dir: str = None, max_workers: int = None):
+    """
+    Finds the k-shortest paths between every ordered pair of nodes, searching from each source node in parallel.
+
+    :param topology: The network topology.
+    :param k_paths: The number of shortest paths to find per pair.
+    :param cache_dir: Directory to save and load results from per topology and k, nothing is saved if None.
+    :param max_workers: The maximum number of processes, one searches in the current process as do daemon processes.
+    :return: Every (path, length) list keyed by (source, destination, k_paths), the format of Routing.k_paths_cache.
+    :rtype: dict
+    """
+    cache_fp = None
+    if cache_dir is not None:
+        cache_fp = os.path.join(cache_dir, f'{_get_topology_hash(topology=topology)}_k{k_paths}.json')
+        if os.path.exists(cache_fp):
+            with open(cache_fp, 'r', encoding='utf-8') as file_obj:
+                cache_list = json.load(file_obj)
+            return {(source, dest, k_paths): list(map(tuple, paths_list))
+                    for source, dest, paths_list in cache_list}
+
+    nodes_list = list(topology.nodes)
+    # Workers of a vectorized environment are daemon processes, which aren't allowed to start processes of their own
+    if max_workers == 1 or multiprocessing.current_process().daemon:
+        results_list = [_find_source_paths(topology=topology, source=source, k_paths=k_paths) for source in nodes_list]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results_list = list(executor.map(_find_source_paths, itertools.repeat(topology), nodes_list,
+                                             itertools.repeat(k_paths)))
+
+    cache_list = list(itertools.chain.from_iterable(results_list))
+    if cache_fp is not None:
+        create_dir(file_path=cache_dir)
+        # Written then renamed so simulations running in parallel never read a partial file
+        tmp_fp = f'{cache_fp}.{os.getpid()}.tmp'
+        with open(tmp_fp, 'w', encoding='utf-8') as file_obj:
+            json.dump(cache_list, file_obj)
+        os.replace(tmp_fp, cache_fp)
+
+    return {(source, dest, k_paths): paths_list for source, dest, paths_list in cache_list}
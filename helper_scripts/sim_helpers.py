@@ -1,10 +1,14 @@
 import copy
+import math
 from datetime import datetime
 
 import networkx as nx
 import numpy as np
 import yaml
 
+from data_scripts.structure_data import create_network
+from data_scripts.generate_data import create_bw_info, create_pt
+
 
 def get_path_mod(mods_dict: dict, path_len: int):
     """
@@ -88,38 +92,162 @@ def find_path_len(path_list: list, topology: nx.Graph):
     return path_len
 
 
-# TODO: Defaulting to 'c' band
-def find_path_cong(path_list: list, net_spec_dict: dict, band: str = 'c'):
+def create_link_spectrum(num_cores: int, band_slots_dict: dict):
+    """
+    Creates the spectrum of a link as one array holding every band side by side, each band is a view of its slots.
+
+    :param num_cores: The number of cores on the link.
+    :param band_slots_dict: The number of spectral slots in each band, in the order they're stacked.
+    :return: The link's cores matrix of band views, its stacked spectrum, and each band's start and stop slot in it.
+    :rtype: dict
+    """
+    band_offsets_dict = dict()
+    total_slots = 0
+    for band, band_slots in band_slots_dict.items():
+        band_offsets_dict[band] = (total_slots, total_slots + band_slots)
+        total_slots += band_slots
+
+    spectrum_arr = np.zeros((num_cores, total_slots))
+    cores_matrix = {band: spectrum_arr[:, start:stop] for band, (start, stop) in band_offsets_dict.items()}
+    return {'cores_matrix': cores_matrix, 'spectrum_arr': spectrum_arr, 'band_offsets': band_offsets_dict}
+
+
+def get_link_spectrum(link_dict: dict):
+    """
+    Gets the whole spectrum of a link with every band side by side.
+
+    :param link_dict: The link's entry in the network spectrum database, made by create_link_spectrum.
+    :return: The stacked spectrum and each band's start and stop slot in it.
+    :rtype: tuple
+    """
+    if 'spectrum_arr' not in link_dict:
+        raise ValueError('Link has no stacked spectrum, links must be created with create_link_spectrum.')
+
+    return link_dict['spectrum_arr'], link_dict['band_offsets']
+
+
+def get_band_slots(band_offsets_dict: dict, band_list: list):
+    """
+    Gets the slots of a stacked spectrum in the order its bands are searched.
+
+    :param band_offsets_dict: Each band's start and stop slot in the stacked spectrum.
+    :param band_list: The bands to search, in order.
+    :return: Each slot's index in the stacked spectrum, the index of its band in the band list, and the start and stop
+             slot of its band.
+    :rtype: tuple
+    """
+    offsets_arr = np.array([band_offsets_dict[band] for band in band_list]).reshape(-1, 2)
+    length_arr = offsets_arr[:, 1] - offsets_arr[:, 0]
+    band_index_arr = np.repeat(np.arange(len(band_list)), length_arr)
+
+    # Slots run on from the start of each band, wherever it is in the stacked spectrum
+    shift_arr = offsets_arr[:, 0] - (np.cumsum(length_arr) - length_arr)
+    slot_arr = np.arange(length_arr.sum()) + shift_arr[band_index_arr]
+    return slot_arr, band_index_arr, offsets_arr[band_index_arr, 0], offsets_arr[band_index_arr, 1]
+
+
+def find_window_fits(free_arr: np.array, window: int, slot_arr: np.array, stop_arr: np.array):
+    """
+    Finds where a window of slots fits, searching every band of a stacked spectrum at once.
+
+    :param free_arr: If each slot is free, with the stacked slots on the last axis.
+    :param window: The number of slots in the window.
+    :param slot_arr: The slots the window may start from, in the order they're searched.
+    :param stop_arr: The stop slot of each one's band, a window can't cross into the next band.
+    :return: If the window fits from each slot, with the slots searched on the last axis.
+    :rtype: np.array
+    """
+    # Count of free slots before each index, a window fits where all of its slots are free
+    count_arr = np.zeros(free_arr.shape[:-1] + (free_arr.shape[-1] + 1,), dtype=np.int32)
+    np.cumsum(free_arr, axis=-1, out=count_arr[..., 1:])
+
+    end_arr = slot_arr + window
+    is_inside_arr = end_arr <= stop_arr
+    end_arr = np.where(is_inside_arr, end_arr, slot_arr)
+    return is_inside_arr & ((count_arr[..., end_arr] - count_arr[..., slot_arr]) == window)
+
+
+def find_free_runs(free_mat: np.array, band_offsets_dict: dict):
+    """
+    Finds the runs of free slots on every core of a stacked spectrum at once. A run can't continue from the last slot
+    of one band into the next.
+
+    :param free_mat: If each slot is free, shaped (cores, stacked slots).
+    :param band_offsets_dict: Each band's start and stop slot in the stacked spectrum.
+    :return: The core, index of the band in the stacked spectrum, start slot in the band, and length of every run,
+             ordered by core and then slot.
+    :rtype: tuple
+    """
+    offsets_arr = np.array(list(band_offsets_dict.values()))
+    prev_free_mat = np.zeros_like(free_mat)
+    prev_free_mat[:, 1:] = free_mat[:, :-1]
+    prev_free_mat[:, offsets_arr[:, 0]] = False
+    next_free_mat = np.zeros_like(free_mat)
+    next_free_mat[:, :-1] = free_mat[:, 1:]
+    next_free_mat[:, offsets_arr[:, 1] - 1] = False
+
+    core_arr, start_arr = np.nonzero(free_mat & ~prev_free_mat)
+    length_arr = np.nonzero(free_mat & ~next_free_mat)[1] + 1 - start_arr
+    band_index_arr = np.searchsorted(offsets_arr[:, 0], start_arr, side='right') - 1
+    start_arr -= offsets_arr[band_index_arr, 0]
+    return core_arr, band_index_arr, start_arr, length_arr
+
+
+def get_path_taken(path_list: list, net_spec_dict: dict):
     """
-    Finds the average percentage of congestion for a given path.
+    Counts the slots taken in each band of every core, on all links of a path at once.
 
     :param path_list: The path to be analyzed.
     :param net_spec_dict: The current up-to-date network spectrum database.
-    :param band: Band to find congestion on.
-    :return: The average congestion as a decimal.
-    :rtype: float
+    :return: The slots taken shaped (links, cores, bands) and the number of slots in each band.
+    :rtype: tuple
     """
-    # Divide by the total length of that array
-    links_cong_list = list()
+    occupied_list = list()
     for src, dest in zip(path_list, path_list[1:]):
-        src_dest = (src, dest)
-        cores_matrix = net_spec_dict[src_dest]['cores_matrix']
-        cores_per_link = float(len(cores_matrix[band]))
+        spectrum_arr, band_offsets_dict = get_link_spectrum(link_dict=net_spec_dict[(src, dest)])
+        occupied_list.append(spectrum_arr != 0)
+
+    # Every link has the same bands, taken slots are summed between band boundaries
+    offsets_arr = np.array(list(band_offsets_dict.values()))
+    taken_mat = np.add.reduceat(np.stack(occupied_list), offsets_arr[:, 0], axis=2, dtype=np.int64)
+    return taken_mat, offsets_arr[:, 1] - offsets_arr[:, 0]
 
-        for curr_band in net_spec_dict[src_dest]['cores_matrix']:
-            # Every core will have the same number of spectral slots
-            total_slots = len(cores_matrix[curr_band][0])
-            slots_taken = 0
-            for curr_core in cores_matrix[curr_band]:
-                core_slots_taken = float(len(np.where(curr_core != 0.0)[0]))
-                slots_taken += core_slots_taken
 
-            links_cong_list.append(slots_taken / (total_slots * cores_per_link))
+def find_path_cong(path_list: list, net_spec_dict: dict):
+    """
+    Finds the average percentage of congestion for a given path, over every band of its links.
+
+    :param path_list: The path to be analyzed.
+    :param net_spec_dict: The current up-to-date network spectrum database.
+    :return: The average congestion as a decimal.
+    :rtype: float
+    """
+    taken_mat, band_slots_arr = get_path_taken(path_list=path_list, net_spec_dict=net_spec_dict)
+    # Each link's cores are the rows of its stacked spectrum
+    num_cores = taken_mat.shape[1]
 
-    average_path_cong = np.mean(links_cong_list)
+    # The congestion of every band on each link, averaged over links and bands alike
+    links_cong_mat = taken_mat.sum(axis=1) / (band_slots_arr * float(num_cores))
+    average_path_cong = np.mean(links_cong_mat)
     return average_path_cong
 
 
+def find_cores_cong(path_list: list, net_spec_dict: dict):
+    """
+    Finds the current percentage of congestion on every core along a path.
+
+    :param path_list: Current path.
+    :param net_spec_dict: Network spectrum database.
+    :return: The average congestion percentage on each core.
+    :rtype: np.array
+    """
+    taken_mat, band_slots_arr = get_path_taken(path_list=path_list, net_spec_dict=net_spec_dict)
+    links_cong_mat = taken_mat.sum(axis=2) / band_slots_arr.sum()
+
+    # Each core's links are contiguous, so they're summed the same way as a single core's list of links would be
+    return np.mean(links_cong_mat.T.copy(), axis=1)
+
+
 def find_core_cong(core_index: int, net_spec_dict: dict, path_list: list):
     """
     Finds the current percentage of congestion on a core along a path.
@@ -132,64 +260,52 @@ def find_core_cong(core_index: int, net_spec_dict: dict, path_list: list):
     """
     links_cong_list = list()
     for src, dest in zip(path_list, path_list[1:]):
-        src_dest = (src, dest)
-        cores_matrix = net_spec_dict[src_dest]['cores_matrix']
-        total_slots = 0
-        slots_taken = 0
-        for band in cores_matrix:
-            # Every core will have the same number of spectral slots
-            total_slots += len(cores_matrix[band][0])
-            core_slots_taken = float(len(np.where(cores_matrix[band][core_index] != 0.0)[0]))
-            slots_taken += core_slots_taken
-
-        links_cong_list.append(slots_taken / total_slots)
+        spectrum_arr, _ = get_link_spectrum(link_dict=net_spec_dict[(src, dest)])
+        core_arr = spectrum_arr[core_index]
+        links_cong_list.append(np.count_nonzero(core_arr) / core_arr.shape[0])
 
     average_core_cong = np.mean(links_cong_list)
     return average_core_cong
 
 
-def find_core_frag_cong(net_spec_db: dict, path: list, core: int, band: str):
+def find_cores_frag_cong(net_spec_db: dict, path: list, band: str):
     """
-    Finds the congestion and fragmentation scores for a specific request.
+    Finds the congestion and fragmentation scores of every core along a path, for any number of spectral slots.
 
     :param net_spec_db: Current network spectrum database.
     :param path: Current path.
-    :param core: Current core.
     :param band: Current allocated band.
-    :return: The congestion and fragmentation scores.
-    :rtype: float
+    :return: The fragmentation and congestion scores of each core.
+    :rtype: tuple
     """
-    frag_resp = 0.0
-    cong_resp = 0.0
-    for src, dest in zip(path, path[1:]):
-        src_dest = (src, dest)
-        core_arr = net_spec_db[src_dest]['cores_matrix'][band][core]
-
-        if len(core_arr) != 256:
-            raise NotImplementedError('Only works for 256 spectral slots.')
+    occupied_mat = np.stack([np.asarray(net_spec_db[(src, dest)]['cores_matrix'][band]) != 0
+                             for src, dest in zip(path, path[1:])])
+    num_slots = occupied_mat.shape[-1]
 
-        cong_resp += len(np.where(core_arr != 0)[0])
+    # A group of free slots is a fragment when a taken slot follows it
+    frag_arr = np.count_nonzero(~occupied_mat[..., :-1] & occupied_mat[..., 1:], axis=(0, 2))
+    cong_arr = np.count_nonzero(occupied_mat, axis=(0, 2))
 
-        count = 0
-        in_zero_group = False
+    num_links = len(path) - 1
+    # The lowest number of slots a request can take is 2, the max number of times [1, 1, 0, 2, 2, 0, ..., 5, 5, 0]
+    # fragmentation can happen is once every three slots e.g., 86 times for 256 spectral slots (Rounded up)
+    max_frag = math.ceil(num_slots / 3)
+    return frag_arr / max_frag / num_links, cong_arr / num_slots / num_links
 
-        for number in core_arr:
-            if number == 0:
-                if not in_zero_group:
-                    in_zero_group = True
-            else:
-                if in_zero_group:
-                    count += 1
-                    in_zero_group = False
 
-        frag_resp += count
+def find_core_frag_cong(net_spec_db: dict, path: list, core: int, band: str):
+    """
+    Finds the congestion and fragmentation scores for a specific request.
 
-    num_links = len(path) - 1
-    # The lowest number of slots a request can take is 2, the max number of times [1, 1, 0, 2, 2, 0, ..., 5, 5, 0]
-    # fragmentation can happen is 43 for 128 spectral slots and 86 for 256 spectral slots (Rounded)
-    frag_resp = frag_resp / 86.0 / num_links
-    cong_resp = cong_resp / 256.0 / num_links
-    return frag_resp, cong_resp
+    :param net_spec_db: Current network spectrum database.
+    :param path: Current path.
+    :param core: Current core.
+    :param band: Current allocated band.
+    :return: The congestion and fragmentation scores.
+    :rtype: float
+    """
+    frag_arr, cong_arr = find_cores_frag_cong(net_spec_db=net_spec_db, path=path, band=band)
+    return frag_arr[core], cong_arr[core]
 
 
 def get_channel_overlaps(free_channels_dict: dict, free_slots_dict: dict):
@@ -248,14 +364,12 @@ def find_free_slots(net_spec_dict: dict, link_tuple: tuple):
     :return: The indexes of the free spectral slots on the link for each core.
     :rtype: dict
     """
-    resp_dict = {}
-    for band in net_spec_dict[link_tuple]['cores_matrix'].keys():
-        resp_dict[band] = dict()
+    spectrum_arr, band_offsets_dict = get_link_spectrum(link_dict=net_spec_dict[link_tuple])
+    free_mat = spectrum_arr == 0
 
-        num_cores = len(net_spec_dict[link_tuple]['cores_matrix'][band])
-        for core_num in range(num_cores):  # pylint: disable=consider-using-enumerate
-            free_slots_list = np.where(net_spec_dict[link_tuple]['cores_matrix'][band][core_num] == 0)[0]
-            resp_dict[band].update({core_num: free_slots_list})
+    resp_dict = {}
+    for band, (start, stop) in band_offsets_dict.items():
+        resp_dict[band] = {core_num: np.flatnonzero(core_arr[start:stop]) for core_num, core_arr in enumerate(free_mat)}
 
     return resp_dict
 
@@ -404,24 +518,18 @@ def list_to_title(input_list: list):
     return unique_list[0]
 
 
-def calc_matrix_stats(input_dict: dict):
+def get_matrix_stats(input_matrix: np.array):
     """
-    Creates a matrix based on dict values and takes the min, max, and average of columns.
-    :param input_dict: The input dict with values as lists.
+    Takes the min, max, and average of matrix columns in a single pass.
+
+    :param input_matrix: The input matrix, one row per episode.
     :return: The min, max, and average of columns.
     :rtype: dict
     """
     resp_dict = dict()
-    tmp_matrix = np.array([])
-    for episode, curr_list in input_dict.items():
-        if episode == '0':
-            tmp_matrix = np.array([curr_list])
-        else:
-            tmp_matrix = np.vstack((tmp_matrix, curr_list))
-
-    resp_dict['min'] = tmp_matrix.min(axis=0, initial=np.inf).tolist()
-    resp_dict['max'] = tmp_matrix.max(axis=0, initial=np.inf * -1.0).tolist()
-    resp_dict['average'] = tmp_matrix.mean(axis=0).tolist()
+    resp_dict['min'] = input_matrix.min(axis=0, initial=np.inf).tolist()
+    resp_dict['max'] = input_matrix.max(axis=0, initial=np.inf * -1.0).tolist()
+    resp_dict['average'] = input_matrix.mean(axis=0, dtype=np.float64).tolist()
 
     return resp_dict
 
@@ -459,6 +567,32 @@ def get_start_time(sim_dict: dict):
     return sim_dict
 
 
+def create_engine_props(engine_props: dict, date: str, sim_start: str):
+    """
+    Sets up the properties of a single simulation run without saving its input files.
+
+    :param engine_props: Properties of the simulation, updated in place.
+    :param date: The date directory the simulation saves its output in.
+    :param sim_start: The run directory the simulation saves its output in.
+    :return: The engine properties with the arrival rate, bandwidth, and physical topology information.
+    :rtype: dict
+    """
+    engine_props['arrival_rate'] = (engine_props['cores_per_link'] * engine_props['erlang']) / \
+                                   engine_props['holding_time']
+    engine_props['band_list'] = list()
+    engine_props['thread_num'] = 's1'
+    engine_props['date'] = date
+    engine_props['sim_start'] = sim_start
+
+    engine_props['mod_per_bw'] = create_bw_info(mod_assumption=engine_props['mod_assumption'],
+                                                mod_assumptions_path=engine_props['mod_assumptions_path'])
+    network_dict = create_network(const_weight=engine_props['const_link_weight'], net_name=engine_props['network'])
+    engine_props['topology_info'] = create_pt(cores_per_link=engine_props['cores_per_link'],
+                                              net_spec_dict=network_dict)
+
+    return engine_props
+
+
 def min_max_scale(value: float, min_value: float, max_value: float):
     """
     Scales a value with respect to a min and a max value.
@@ -472,6 +606,35 @@ def min_max_scale(value: float, min_value: float, max_value: float):
     return (value - min_value) / (max_value - min_value)
 
 
+def _get_free_runs(occupied_mat: np.array):
+    free_mat = occupied_mat == 0
+    num_rows, num_slots = free_mat.shape
+    # A padding slot after every row keeps runs of free slots from continuing onto the next row
+    padded_arr = np.zeros((num_rows, num_slots + 1), dtype=np.int8)
+    padded_arr[:, :num_slots] = free_mat
+    edges_arr = np.diff(padded_arr.ravel(), prepend=0)
+
+    # Run zero is empty and covers taken slots before the first free one
+    run_starts_arr = np.flatnonzero(edges_arr == 1)
+    run_lens_arr = np.concatenate(([0], np.flatnonzero(edges_arr == -1) - run_starts_arr))
+    run_starts_arr = np.concatenate(([0], run_starts_arr))
+    run_ids_arr = np.cumsum(edges_arr == 1)
+
+    # Offset of every slot within its run and the length of that run, only meaningful for free slots
+    offset_mat = (np.arange(padded_arr.size) - run_starts_arr[run_ids_arr]).reshape(padded_arr.shape)[:, :num_slots]
+    len_mat = run_lens_arr[run_ids_arr].reshape(padded_arr.shape)[:, :num_slots]
+    return free_mat, offset_mat, len_mat
+
+
+def _get_sc_index_mat(start_arr: np.array, slots_needed: int):
+    if len(start_arr) == 0:
+        return np.array([])
+    if slots_needed == 0:
+        return start_arr[:, np.newaxis]
+
+    return np.column_stack((start_arr, start_arr + slots_needed))
+
+
 def get_super_channels(input_arr: np.array, slots_needed: int):
     """
     Gets available super-channels w.r.t. the current request's needs.
@@ -481,37 +644,62 @@ def get_super_channels(input_arr: np.array, slots_needed: int):
     :return: A matrix of positions of available super-channels.
     :rtype: np.array
     """
-    potential_super_channels = []
-    consecutive_zeros = 0
+    free_mat, offset_mat, len_mat = _get_free_runs(occupied_mat=np.asarray(input_arr)[np.newaxis, :])
+    # Plus one to account for the guard band
+    is_start_mat = free_mat & (offset_mat + slots_needed < len_mat)
+    return _get_sc_index_mat(start_arr=np.flatnonzero(is_start_mat[0]), slots_needed=slots_needed)
 
-    for i in range(len(input_arr)):  # pylint: disable=consider-using-enumerate
-        if input_arr[i] == 0:
-            consecutive_zeros += 1
-            # Plus one to account for the guard band
-            if consecutive_zeros >= (slots_needed + 1):
-                start_position = i - slots_needed
-                end_position = i
 
-                if start_position == end_position:
-                    potential_super_channels.append([start_position])
-                else:
-                    potential_super_channels.append([start_position, end_position])
-        else:
-            consecutive_zeros = 0
+def get_hfrag_mat(occupied_mat: np.array, slots_needed: int, spectral_slots: int):
+    """
+    Gets the shannon entropy fragmentation scores of every super-channel in one or more spectrums at once.
+
+    Every super-channel a request could use, plus one guard band, is a window inside a run of free slots. Allocating
+    one only changes the windows of its own run, therefore, the change in score is found from run lengths directly.
+
+    :param occupied_mat: Non-zero where a slot is taken, one spectrum per row (e.g., every core of a path).
+    :param slots_needed: The slots needed by the request.
+    :param spectral_slots: The number of spectral slots used to normalize the score.
+    :return: Where super-channels start and the fragmentation score of allocating each, infinite elsewhere.
+    :rtype: tuple
+    """
+    free_mat, offset_mat, len_mat = _get_free_runs(occupied_mat=np.atleast_2d(occupied_mat))
+    is_start_mat = free_mat & (offset_mat + slots_needed < len_mat)
+
+    # Allocating a super-channel takes its first and last slot, splitting its run on both sides
+    after_mat = len_mat - offset_mat - slots_needed - 1
+    removed_mat = np.maximum(len_mat - slots_needed, 0) - np.maximum(offset_mat - slots_needed, 0) - \
+        np.maximum(after_mat - slots_needed, 0)
+    num_before_arr = is_start_mat.sum(axis=1, keepdims=True)
+    num_after_mat = num_before_arr - removed_mat
+
+    channel_len = 2 if slots_needed else 1
+    ratio = channel_len / spectral_slots
+    hfrag_before_arr = (-1.0 * num_before_arr * ratio) * np.log(ratio)
+    hfrag_after_mat = (-1.0 * num_after_mat * ratio) * np.log(ratio)
+    delta_mat = np.where(num_after_mat == 0, -np.inf, hfrag_before_arr - hfrag_after_mat)
 
-    return np.array(potential_super_channels)
+    resp_frag_mat = np.where(is_start_mat, np.round(delta_mat, 3), np.inf)
+    resp_frag_mat[resp_frag_mat == 1] = np.inf
+    return is_start_mat, resp_frag_mat
 
 
-# TODO: Add reference
-# Please refer to this paper for the formulation:
-def _get_hfrag_score(sc_index_mat: np.array, spectral_slots: int):
-    big_n = len(sc_index_mat) * -1.0
-    if big_n == 0.0:
-        return np.inf
+def get_path_occupancy(path_list: list, band: str, net_spec_dict: dict):
+    """
+    Gets the slots taken on any link of a path, for every core.
+
+    :param path_list: The current path.
+    :param band: The band to check.
+    :param net_spec_dict: The up-to-date network spectrum database.
+    :return: Whether each slot of each core is taken somewhere along the path.
+    :rtype: np.array
+    """
+    occupied_mat = None
+    for source, dest in zip(path_list, path_list[1:]):
+        link_mat = net_spec_dict[(source, dest)]['cores_matrix'][band] != 0
+        occupied_mat = link_mat if occupied_mat is None else occupied_mat | link_mat
 
-    channel_len = len(sc_index_mat[0])
-    resp_score = big_n * (channel_len / spectral_slots) * np.log((channel_len / spectral_slots))
-    return resp_score
+    return occupied_mat
 
 
 def get_hfrag(path_list: list, core_num: int, band: str, slots_needed: int, spectral_slots: int, net_spec_dict: dict):
@@ -526,32 +714,16 @@ def get_hfrag(path_list: list, core_num: int, band: str, slots_needed: int, spec
     :param net_spec_dict: The up-to-date network spectrum database.
     :return: An array with all shannon entropy fragmentation scores.
     """
-    path_alloc_arr = np.zeros(spectral_slots)
-    resp_frag_arr = np.ones(spectral_slots)
     # TODO: First fit for core, only use in testing
     if core_num is None:
         core_num = 0
 
-    for source, dest in zip(path_list, path_list[1:]):
-        core_arr = net_spec_dict[(source, dest)]['cores_matrix'][band][core_num]
-        path_alloc_arr = combine_and_one_hot(path_alloc_arr, core_arr)
+    occupied_mat = get_path_occupancy(path_list=path_list, band=band, net_spec_dict=net_spec_dict)
+    is_start_mat, resp_frag_mat = get_hfrag_mat(occupied_mat=occupied_mat[core_num], slots_needed=slots_needed,
+                                                spectral_slots=spectral_slots)
+    sc_index_mat = _get_sc_index_mat(start_arr=np.flatnonzero(is_start_mat[0]), slots_needed=slots_needed)
 
-    sc_index_mat = get_super_channels(input_arr=path_alloc_arr, slots_needed=slots_needed)
-    hfrag_before = _get_hfrag_score(sc_index_mat=sc_index_mat, spectral_slots=spectral_slots)
-    for super_channel in sc_index_mat:
-        mock_alloc_arr = copy.deepcopy(path_alloc_arr)
-        for index in super_channel:
-            mock_alloc_arr[index] = 1
-
-        tmp_sc_mat = get_super_channels(input_arr=mock_alloc_arr, slots_needed=slots_needed)
-        hfrag_after = _get_hfrag_score(sc_index_mat=tmp_sc_mat, spectral_slots=spectral_slots)
-        delta_hfrag = hfrag_before - hfrag_after
-        start_index = super_channel[0]
-        resp_frag_arr[start_index] = np.round(delta_hfrag, 3)
-
-    resp_frag_arr = np.where(resp_frag_arr == 1, np.inf, resp_frag_arr)
-
-    return sc_index_mat, resp_frag_arr
+    return sc_index_mat, resp_frag_mat[0]
 
 
 def classify_cong(curr_cong: float):
@@ -570,6 +742,46 @@ def classify_cong(curr_cong: float):
     return cong_index
 
 
+def get_erlang_bracket(points_dict: dict, target_blocking: float):
+    """
+    Finds the closest traffic volumes simulated below and above a target blocking probability.
+
+    :param points_dict: Blocking probability for every traffic volume simulated so far.
+    :param target_blocking: The target blocking probability.
+    :return: The highest Erlang below the target and the lowest Erlang at or above it, None if either is missing.
+    :rtype: tuple
+    """
+    below_list = [erlang for erlang, blocking in points_dict.items() if blocking < target_blocking]
+    above_list = [erlang for erlang, blocking in points_dict.items() if blocking >= target_blocking]
+
+    low_erlang = max(below_list) if below_list else None
+    high_erlang = min(above_list) if above_list else None
+    return low_erlang, high_erlang
+
+
+def get_next_erlang(points_dict: dict, target_blocking: float):
+    """
+    Proposes the next traffic volume to simulate when searching for a target blocking probability.
+
+    :param points_dict: Blocking probability for every traffic volume simulated so far.
+    :param target_blocking: The target blocking probability.
+    :return: The next Erlang to simulate.
+    :rtype: float
+    """
+    low_erlang, high_erlang = get_erlang_bracket(points_dict=points_dict, target_blocking=target_blocking)
+    # The target hasn't been bracketed yet, expand the search
+    if high_erlang is None:
+        return max(points_dict) * 2.0
+    if low_erlang is None:
+        return min(points_dict) / 2.0
+
+    low_blocking, high_blocking = points_dict[low_erlang], points_dict[high_erlang]
+    # Secant step, kept away from the edges of the bracket so it always shrinks
+    erlang = low_erlang + (target_blocking - low_blocking) * (high_erlang - low_erlang) / (high_blocking - low_blocking)
+    margin = 0.1 * (high_erlang - low_erlang)
+    return min(max(erlang, low_erlang + margin), high_erlang - margin)
+
+
 def parse_yaml_file(yaml_file: str):
     """
     Parses a YAML file.
@@ -2,7 +2,10 @@ import copy
 
 import numpy as np
 
-from helper_scripts.sim_helpers import find_free_channels, find_free_slots, get_channel_overlaps
+from arg_scripts.engine_args import EngineConfig, AllocationMethod
+from arg_scripts.spectrum_args import PRIORITY_CORES_LIST
+from helper_scripts.sim_helpers import find_free_channels, find_free_slots, get_channel_overlaps, get_link_spectrum, \
+    get_band_slots, find_window_fits, find_free_runs
 
 
 class SpectrumHelpers:
@@ -10,7 +13,8 @@ class SpectrumHelpers:
     Contains methods that assist with the spectrum assignment class.
     """
 
-    def __init__(self, engine_props: dict, sdn_props: object, spectrum_props: object):
+    def __init__(self, engine_props: dict, sdn_props: object, spectrum_props: object,
+                 config_obj: EngineConfig = None):
         self.engine_props = engine_props
         self.spectrum_props = spectrum_props
         self.sdn_props = sdn_props
@@ -20,16 +24,34 @@ class SpectrumHelpers:
         self.core_num = None
         self.curr_band = None
 
-    def _check_free_spectrum(self, link_tuple: tuple, rev_link_tuple: tuple):
-        core_arr = self.sdn_props.net_spec_dict[link_tuple]['cores_matrix'][self.curr_band][self.core_num]
-        spectrum_set = core_arr[self.start_index:self.end_index + self.engine_props['guard_slots']]
-        rev_core_arr = self.sdn_props.net_spec_dict[rev_link_tuple]['cores_matrix'][self.curr_band][self.core_num]
-        rev_spectrum_set = rev_core_arr[self.start_index:self.end_index + self.engine_props['guard_slots']]
+        self.config_obj = None
+        self.guard_slots = None
+        self.is_last_fit = None
+        self.update_config(config_obj=config_obj)
+
+    def update_config(self, config_obj: EngineConfig = None):
+        """
+        Updates the compiled configuration the spectrum search reads.
+
+        :param config_obj: The compiled configuration, compiled from the engine properties if not given.
+        """
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
 
-        if set(spectrum_set) == {0.0} and set(rev_spectrum_set) == {0.0}:
-            return True
+        self.config_obj = config_obj
+        self.guard_slots = config_obj.guard_slots
+        self.is_last_fit = config_obj.allocation_method == AllocationMethod.LAST_FIT
 
-        return False
+    def _check_free_spectrum(self, link_tuple: tuple, rev_link_tuple: tuple):
+        for curr_tuple in (link_tuple, rev_link_tuple):
+            spectrum_arr, band_offsets_dict = get_link_spectrum(link_dict=self.sdn_props.net_spec_dict[curr_tuple])
+            band_start, band_stop = band_offsets_dict[self.curr_band]
+            stop_slot = min(band_start + self.end_index + self.guard_slots, band_stop)
+            spectrum_set = spectrum_arr[self.core_num, band_start + self.start_index:stop_slot]
+            if not spectrum_set.size or spectrum_set.any():
+                return False
+
+        return True
 
     def check_other_links(self):
         """
@@ -51,49 +73,102 @@ class SpectrumHelpers:
         if self.spectrum_props.forced_band is not None:
             self.curr_band = self.spectrum_props.forced_band
 
-        if self.engine_props['allocation_method'] == 'last_fit':
+        if self.is_last_fit:
             self.spectrum_props.start_slot = self.end_index
-            self.spectrum_props.end_slot = self.start_index + self.engine_props['guard_slots']
+            self.spectrum_props.end_slot = self.start_index + self.guard_slots
         else:
             self.spectrum_props.start_slot = self.start_index
-            self.spectrum_props.end_slot = self.end_index + self.engine_props['guard_slots']
+            self.spectrum_props.end_slot = self.end_index + self.guard_slots
 
         self.spectrum_props.core_num = self.core_num
         self.spectrum_props.curr_band = self.curr_band
         return self.spectrum_props
 
-    def check_super_channels(self, open_slots_matrix: list, flag: str):
+    def _get_path_free(self, core_list: list):
+        free_mat = None
+        arrays_list = list()
+        path_list = self.spectrum_props.path_list
+        for source, dest in zip(path_list, path_list[1:]):
+            for link_tuple in ((source, dest), (dest, source)):
+                spectrum_arr, _ = get_link_spectrum(link_dict=self.sdn_props.net_spec_dict[link_tuple])
+                # Both directions of a link usually share their arrays
+                if any(spectrum_arr is other_arr for other_arr in arrays_list):
+                    continue
+
+                arrays_list.append(spectrum_arr)
+                link_mat = spectrum_arr[core_list] == 0
+                free_mat = link_mat if free_mat is None else free_mat & link_mat
+
+        return free_mat
+
+    def find_super_channel(self, core_list: list, band_list: list, flag: str):
         """
-        Given a matrix of available super-channels, find one that can allocate the current request.
+        Finds the first super-channel that can allocate the current request, searching cores in order and the bands of
+        each core in order. Every core and band is searched at once on the stacked spectrum of the path's first link.
 
-        :param open_slots_matrix: A matrix where each entry is an available super-channel's indexes.
+        :param core_list: The cores to search, in order.
+        :param band_list: The bands to search, in order.
+        :param flag: The allocation flag, reversed flags take a window from the end of a free run.
         :return: If the request can be successfully allocated.
         :rtype: bool
         """
-        for super_channel in open_slots_matrix:
-            if len(super_channel) >= (self.spectrum_props.slots_needed + self.engine_props['guard_slots']):
-                for start_index in super_channel:
-                    if flag == 'forced_index' and start_index != self.spectrum_props.forced_index:
-                        continue
-                    self.start_index = start_index
-                    if self.engine_props['allocation_method'] == 'last_fit':
-                        self.end_index = (self.start_index - self.spectrum_props.slots_needed - self.engine_props[
-                            'guard_slots']) + 1
-                    else:
-                        self.end_index = (self.start_index + self.spectrum_props.slots_needed + self.engine_props[
-                            'guard_slots']) - 1
-                    if self.end_index not in super_channel:
-                        break
-                    self.spectrum_props.is_free = True
-
-                    if len(self.spectrum_props.path_list) > 2:
-                        self.check_other_links()
-
-                    if self.spectrum_props.is_free is not False or len(self.spectrum_props.path_list) <= 2:
-                        self._update_spec_props()
-                        return True
-
-        return False
+        path_list = self.spectrum_props.path_list
+        window = self.spectrum_props.slots_needed + self.guard_slots
+        is_reversed = flag in ('last_fit', 'priority_last')
+        forced_index = self.spectrum_props.forced_index if flag == 'forced_index' else None
+
+        # Last-fit windows end before they start, and a reversed run only fits one slot windows, so neither is ever
+        # found free on the other links of a path
+        if len(path_list) > 2 and (is_reversed or self.is_last_fit):
+            return False
+        # A run searched against the direction of the window only fits one slot windows
+        if is_reversed != self.is_last_fit and forced_index is None and window != 1:
+            return False
+
+        spectrum_arr, band_offsets_dict = get_link_spectrum(
+            link_dict=self.sdn_props.net_spec_dict[(path_list[0], path_list[1])])
+        slot_arr, band_index_arr, band_start_arr, band_stop_arr = get_band_slots(band_offsets_dict=band_offsets_dict,
+                                                                                 band_list=band_list)
+        free_mat = spectrum_arr[core_list] == 0
+        fits_mat = find_window_fits(free_arr=free_mat, window=window, slot_arr=slot_arr, stop_arr=band_stop_arr)
+
+        if forced_index is not None:
+            # A forced last-fit window ends on the forced slot
+            first_slot = forced_index - window + 1 if self.is_last_fit else forced_index
+            fits_mat &= (slot_arr - band_start_arr) == first_slot
+
+        if len(path_list) > 2:
+            # The window and the guard band after it, up to the end of the band, must be free on every link
+            count_mat = np.zeros((len(core_list), spectrum_arr.shape[-1] + 1), dtype=np.int32)
+            np.cumsum(self._get_path_free(core_list=core_list), axis=-1, out=count_mat[:, 1:])
+            check_stop_arr = np.minimum(slot_arr + window - 1 + self.guard_slots, band_stop_arr)
+            is_free_mat = (count_mat[:, check_stop_arr] - count_mat[:, slot_arr]) == (check_stop_arr - slot_arr)
+            fits_mat &= is_free_mat & (check_stop_arr > slot_arr)
+
+        # The first fit in core order and then band order
+        first_index = int(np.argmax(fits_mat))
+        if not fits_mat.flat[first_index]:
+            return False
+
+        core_index, slot_index = divmod(first_index, len(slot_arr))
+        start_slot = int(slot_arr[slot_index])
+        if is_reversed:
+            run_arr = free_mat[core_index, start_slot:band_stop_arr[slot_index]]
+            start_slot += int(np.argmin(np.append(run_arr, False))) - 1
+        elif self.is_last_fit:
+            start_slot += window - 1
+
+        self.core_num = core_list[core_index]
+        self.curr_band = band_list[band_index_arr[slot_index]]
+        self.start_index = start_slot - int(band_start_arr[slot_index])
+        if self.is_last_fit:
+            self.end_index = self.start_index - window + 1
+        else:
+            self.end_index = self.start_index + window - 1
+
+        self.spectrum_props.is_free = True
+        self._update_spec_props()
+        return True
 
     @staticmethod
     def _find_link_inters(info_dict: dict, source_dest: tuple):
@@ -163,3 +238,222 @@ class SpectrumHelpers:
             if 6 in sorted_cores:
                 sorted_cores.remove(6)
         return sorted_cores[0]
+
+
+class FeasibilityOracle:
+    """
+    Checks every core and band of a request's candidate paths at once, without a spectrum search per path.
+    """
+
+    def __init__(self, engine_props: dict, config_obj: EngineConfig = None):
+        self.engine_props = engine_props
+
+        self.net_spec_dict = None
+        # The stacked spectrum of each path's links, valid for as long as the spectrum database is
+        self.links_dict = dict()
+
+        self.config_obj = None
+        self.update_config(config_obj=config_obj)
+
+    def update_config(self, config_obj: EngineConfig = None):
+        """
+        Updates the compiled configuration the oracle reads.
+
+        :param config_obj: The compiled configuration, compiled from the engine properties if not given.
+        """
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
+
+        self.config_obj = config_obj
+
+    def is_supported(self):
+        """
+        Checks if the oracle gives the same answer as a full spectrum search for the current configuration.
+
+        :return: If the allocation method only needs free slots and no SNR check is done.
+        :rtype: bool
+        """
+        if self.config_obj.is_snr:
+            return False
+
+        return self.config_obj.allocation_method in (AllocationMethod.FIRST_FIT, AllocationMethod.LAST_FIT,
+                                                     AllocationMethod.PRIORITY_FIRST, AllocationMethod.PRIORITY_LAST)
+
+    def _get_links(self, path_list: list):
+        path_tuple = tuple(path_list)
+        if path_tuple not in self.links_dict:
+            self.links_dict[path_tuple] = [get_link_spectrum(link_dict=self.net_spec_dict[(source, dest)])
+                                           for source, dest in zip(path_list, path_list[1:])]
+
+        return self.links_dict[path_tuple]
+
+    def _get_free_arr(self, paths_matrix: list):
+        free_list = list()
+        for path_list in paths_matrix:
+            occupied_mat = None
+            for spectrum_arr, _ in self._get_links(path_list=path_list):
+                link_mat = spectrum_arr != 0
+                occupied_mat = link_mat if occupied_mat is None else occupied_mat | link_mat
+            free_list.append(~occupied_mat)
+
+        return np.stack(free_list)
+
+    @staticmethod
+    def _get_first_fit(free_arr: np.array, window: int, slots_tuple: tuple):
+        slot_arr, band_index_arr, band_start_arr, band_stop_arr = slots_tuple
+        fits_arr = find_window_fits(free_arr=free_arr, window=window, slot_arr=slot_arr, stop_arr=band_stop_arr)
+
+        # The first slot searched in each band that the window fits from, bands are searched one after the other
+        num_searched = len(slot_arr)
+        searched_arr = np.where(fits_arr, np.arange(num_searched), num_searched)
+        split_arr = np.searchsorted(band_index_arr, np.arange(band_index_arr[-1] + 1))
+        first_arr = np.minimum.reduceat(searched_arr, split_arr, axis=-1)
+
+        start_arr = np.append(slot_arr - band_start_arr, -1)
+        return start_arr[first_arr]
+
+    def get_feasibility(self, net_spec_dict: dict, paths_matrix: list, mod_formats_matrix: list,
+                        mod_formats_dict: dict):
+        """
+        Finds where a request fits on every core and band of each candidate path. Modulation formats are tried in
+        order for each core and band, as they are when allocating a request to a forced core. Every band is searched
+        at once on the stacked spectrum of the paths.
+
+        :param net_spec_dict: The up-to-date network spectrum database.
+        :param paths_matrix: The candidate paths.
+        :param mod_formats_matrix: The valid modulation formats of each path.
+        :param mod_formats_dict: The slots needed by each modulation format.
+        :return: If the request fits, shaped (paths, cores, bands), and the first-fit start slot or -1 where it
+                 doesn't.
+        :rtype: tuple
+        """
+        if net_spec_dict is not self.net_spec_dict:
+            self.net_spec_dict = net_spec_dict
+            self.links_dict = dict()
+
+        free_arr = self._get_free_arr(paths_matrix=paths_matrix)
+        band_offsets_dict = self._get_links(path_list=paths_matrix[0])[0][1]
+        slots_tuple = get_band_slots(band_offsets_dict=band_offsets_dict, band_list=self.config_obj.band_list)
+
+        start_arr = np.full((len(paths_matrix), free_arr.shape[1], len(self.config_obj.band_list)), -1)
+        # Paths often share modulation formats, each window size is only searched once for every path
+        fit_dict = dict()
+        for path_index, mod_format_list in enumerate(mod_formats_matrix):
+            path_start_arr = start_arr[path_index]
+            for modulation in mod_format_list:
+                if modulation is False:
+                    continue
+
+                window = mod_formats_dict[modulation]['slots_needed'] + self.config_obj.guard_slots
+                if window not in fit_dict:
+                    fit_dict[window] = self._get_first_fit(free_arr=free_arr, window=window, slots_tuple=slots_tuple)
+
+                mod_start_arr = fit_dict[window][path_index]
+                is_open_arr = path_start_arr == -1
+                path_start_arr[is_open_arr] = mod_start_arr[is_open_arr]
+
+        return start_arr != -1, start_arr
+
+
+class SlicingPlanner:
+    """
+    Finds every light segment of a sliced request in one search of a path's free spectrum, before any is allocated.
+    """
+
+    def __init__(self, engine_props: dict, config_obj: EngineConfig = None):
+        self.engine_props = engine_props
+
+        # Free runs of the current path as (core, band, start slots, run lengths), in the order they're searched
+        self.runs_list = list()
+
+        self.config_obj = None
+        self.core_list = None
+        self.update_config(config_obj=config_obj)
+
+    def update_config(self, config_obj: EngineConfig = None):
+        """
+        Updates the compiled configuration the planner reads.
+
+        :param config_obj: The compiled configuration, compiled from the engine properties if not given.
+        """
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
+
+        self.config_obj = config_obj
+        if config_obj.allocation_method == AllocationMethod.PRIORITY_FIRST:
+            self.core_list = PRIORITY_CORES_LIST
+        else:
+            self.core_list = list(range(config_obj.cores_per_link or 0))
+
+    def is_supported(self, spectrum_props: object):
+        """
+        Checks if the planned segments are the ones a spectrum search per segment would allocate.
+
+        :param spectrum_props: The spectrum assignment properties.
+        :return: If segments are first-fit with one guard slot, no SNR check is done and nothing is forced.
+        :rtype: bool
+        """
+        config_obj = self.config_obj
+        if config_obj.is_snr or config_obj.guard_slots != 1:
+            return False
+        if config_obj.allocation_method not in (AllocationMethod.FIRST_FIT, AllocationMethod.PRIORITY_FIRST):
+            return False
+
+        return spectrum_props.forced_index is None and spectrum_props.forced_core is None and \
+            spectrum_props.forced_band is None
+
+    def set_path(self, net_spec_dict: dict, path_list: list):
+        """
+        Finds the slots free on every link of a path. Nothing is allocated until a plan is found, so the runs are
+        shared by every bandwidth the request is sliced to.
+
+        :param net_spec_dict: The up-to-date network spectrum database.
+        :param path_list: The path to slice the request on.
+        """
+        occupied_mat = None
+        arrays_list = list()
+        for source, dest in zip(path_list, path_list[1:]):
+            for link_tuple in ((source, dest), (dest, source)):
+                spectrum_arr, band_offsets_dict = get_link_spectrum(link_dict=net_spec_dict[link_tuple])
+                # Both directions of a link usually share their arrays
+                if any(spectrum_arr is other_arr for other_arr in arrays_list):
+                    continue
+
+                arrays_list.append(spectrum_arr)
+                link_mat = spectrum_arr != 0
+                occupied_mat = link_mat if occupied_mat is None else occupied_mat | link_mat
+
+        free_mat = ~occupied_mat
+        core_arr, band_index_arr, start_arr, length_arr = find_free_runs(free_mat=free_mat,
+                                                                         band_offsets_dict=band_offsets_dict)
+
+        # Runs are found core by core and band by band, so they're split by core and band in one go
+        num_bands = len(band_offsets_dict)
+        split_list = np.searchsorted(core_arr * num_bands + band_index_arr, np.arange(1, free_mat.shape[0] * num_bands))
+        runs_list = list(zip(np.split(start_arr, split_list), np.split(length_arr, split_list)))
+
+        band_indexes_dict = {band: band_index for band_index, band in enumerate(band_offsets_dict)}
+        self.runs_list = [(core_num, band) + runs_list[core_num * num_bands + band_indexes_dict[band]]
+                          for core_num in self.core_list for band in self.config_obj.band_list]
+
+    def plan(self, window: int, num_segments: int):
+        """
+        Places segments first-fit on the current path, each one after the last. Windows are packed from the start of
+        each free run, as first-fit would allocate them one at a time.
+
+        :param window: The slots taken by one segment, including its guard band.
+        :param num_segments: The number of segments to place.
+        :return: The core, band and start slot of every segment, or None if they can't all be placed.
+        :rtype: list
+        """
+        segments_list = list()
+        for core_num, band, start_arr, length_arr in self.runs_list:
+            count_arr = length_arr // window
+            is_open_arr = count_arr > 0
+            for start_slot, count in zip(start_arr[is_open_arr].tolist(), count_arr[is_open_arr].tolist()):
+                count = min(count, num_segments - len(segments_list))
+                segments_list.extend((core_num, band, start_slot + index * window) for index in range(count))
+                if len(segments_list) == num_segments:
+                    return segments_list
+
+        return None
@@ -9,7 +9,7 @@ import pandas as pd
 
 from arg_scripts.stats_args import StatsProps
 from arg_scripts.stats_args import SNAP_KEYS_LIST
-from helper_scripts.sim_helpers import find_path_len, find_core_cong
+from helper_scripts.sim_helpers import find_path_len, find_cores_cong, get_link_spectrum
 from helper_scripts.os_helpers import create_dir
 
 
@@ -63,13 +63,11 @@ class SimStats:
         for link in list(net_spec_dict.keys())[::2]:
             if path_list is not None and link not in path_list:
                 continue
-            link_data = net_spec_dict[link]
-            for core in link_data['cores_matrix']:
-                requests_set = set(core[core > 0])
-                for curr_req in requests_set:
-                    active_reqs_set.add(curr_req)
-                occupied_slots += len(np.where(core != 0)[0])
-                guard_slots += len(np.where(core < 0)[0])
+            # Every core and band of the link is counted at once
+            spectrum_arr, _ = get_link_spectrum(link_dict=net_spec_dict[link])
+            active_reqs_set.update(spectrum_arr[spectrum_arr > 0].tolist())
+            occupied_slots += np.count_nonzero(spectrum_arr)
+            guard_slots += np.count_nonzero(spectrum_arr < 0)
 
         return occupied_slots, guard_slots, len(active_reqs_set)
 
@@ -82,17 +80,14 @@ class SimStats:
         :param net_spec_dict: Network spectrum database.
         """
         path_list = req_info_dict['path']
-        cong_arr = np.array([])
-
-        for core_num in range(self.engine_props['cores_per_link']):
-            curr_cong = find_core_cong(core_index=core_num, net_spec_dict=net_spec_dict, path_list=path_list)
-            cong_arr = np.append(cong_arr, curr_cong)
+        cong_arr = find_cores_cong(path_list=path_list, net_spec_dict=net_spec_dict)
+        cong_arr = cong_arr[:self.engine_props['cores_per_link']]
 
         path_length = find_path_len(path_list=path_list, topology=self.engine_props['topology'])
         tmp_info_dict = {
-            'old_bandwidth': old_req_info_dict['bandwidth'],
+            'old_bandwidth': old_req_info_dict.bandwidth,
             'path_length': path_length,
-            'longest_reach': np.max(old_req_info_dict['mod_formats']['QPSK']['max_length']),
+            'longest_reach': np.max(old_req_info_dict.mod_formats['QPSK']['max_length']),
             'ave_cong': float(np.mean(cong_arr)),
             'num_segments': self.curr_trans,
         }
@@ -146,6 +141,8 @@ class SimStats:
                 self.stats_props.cores_dict = {core: 0 for core in range(self.engine_props['cores_per_link'])}
             elif stat_key == 'block_reasons_dict':
                 self.stats_props.block_reasons_dict = {'distance': 0, 'congestion': 0, 'xt_threshold': 0}
+            elif stat_key == 'phase_times_dict':
+                self.stats_props.phase_times_dict = dict()
             elif stat_key != 'iter_stats':
                 raise ValueError('Dictionary statistic was not reset in props.')
 
@@ -209,7 +206,7 @@ class SimStats:
         if not sdn_data.was_routed:
             self.blocked_reqs += 1
             self.stats_props.block_reasons_dict[sdn_data.block_reason] += 1
-            self.stats_props.block_bw_dict[req_data['bandwidth']] += 1
+            self.stats_props.block_bw_dict[req_data.bandwidth] += 1
         else:
             num_hops = len(sdn_data.path_list) - 1
             self.stats_props.hops_list.append(num_hops)
@@ -302,8 +299,8 @@ class SimStats:
         """
         if self.iteration == (self.engine_props['max_iters'] - 1):
             save_df = pd.DataFrame(self.train_data_list)
-            save_df.to_csv(f"{base_fp}/output/{self.sim_info}/{self.engine_props['erlang']}_train_data.csv",
-                           index=False)
+            save_df.to_parquet(f"{base_fp}/output/{self.sim_info}/{self.engine_props['erlang']}_train_data.parquet",
+                               index=False)
 
     def save_stats(self, base_fp: str):
         """
@@ -366,3 +363,23 @@ class SimStats:
             print(f"Iteration {self.iteration + 1} out of {max_iters} completed for "
                   f"Erlang: {self.engine_props['erlang']}")
             print(f"Mean of blocking: {round(mean(self.stats_props.sim_block_list), 4)}")
+
+
+def get_paired_stats(block_one_list: list, block_two_list: list):
+    """
+    Compares the blocking of two policies that were evaluated on identical requests (common random numbers).
+
+    :param block_one_list: Blocking probability per iteration of the first policy.
+    :param block_two_list: Blocking probability per iteration of the second policy.
+    :return: The mean difference in blocking, its confidence interval, and whether the policies differ.
+    :rtype: dict
+    """
+    diff_list = [block_one - block_two for block_one, block_two in zip(block_one_list, block_two_list)]
+    resp_dict = {'mean_diff': mean(diff_list), 'ci_diff': None, 'is_separated': False, 'num_iters': len(diff_list)}
+    if len(diff_list) <= 1:
+        return resp_dict
+
+    # Same confidence level as the single simulation confidence interval
+    resp_dict['ci_diff'] = 1.645 * (math.sqrt(variance(diff_list)) / math.sqrt(len(diff_list)))
+    resp_dict['is_separated'] = abs(resp_dict['mean_diff']) > resp_dict['ci_diff']
+    return resp_dict
@@ -0,0 +1,168 @@
+import os
+
+import numpy as np
+
+from arg_scripts.trace_args import TRACE_MAGIC, TRACE_VERSION, TRACE_HEADER, TRACE_RECORD, TRACE_RECORD_DTYPE
+from arg_scripts.trace_args import REQ_TYPE_LIST, OUTCOME_LIST
+from arg_scripts.request_args import REQUEST_DTYPE, EVENT_DTYPE
+from helper_scripts.os_helpers import create_dir
+from src.request_generator import RequestTable
+
+
+def get_trace_fp(base_dir: str, erlang: float, iteration: int):
+    """
+    Gets the file path of a trace for one iteration of a simulation.
+
+    :param base_dir: The directory the trace is saved in.
+    :param erlang: The traffic volume of the simulation.
+    :param iteration: The iteration number.
+    :return: The trace file path.
+    :rtype: str
+    """
+    return os.path.join(base_dir, f'{erlang}_erlang_trace_{iteration}.bin')
+
+
+class TraceRecorder:
+    """
+    Writes every simulation event to a compact binary file of fixed-size records.
+    """
+
+    def __init__(self, engine_props: dict, save_fp: str, buffer_size: int = 1 << 20):
+        self.engine_props = engine_props
+        self.save_fp = save_fp
+
+        nodes_list = list(self.engine_props['topology_info']['nodes'].keys())
+        self.nodes_dict = {node: node_index for node_index, node in enumerate(nodes_list)}
+
+        save_dir = os.path.dirname(save_fp)
+        if save_dir:
+            create_dir(file_path=save_dir)
+        self.file_obj = open(save_fp, 'wb', buffering=buffer_size)  # pylint: disable=consider-using-with
+        self.file_obj.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, TRACE_RECORD.size))
+
+    def _write(self, req_obj: object, req_type: str, outcome: str, spectrum_tuple: tuple = (-1, -1, -1, -1, -1),
+               bandwidth: str = None):
+        self.file_obj.write(TRACE_RECORD.pack(
+            req_obj.arrive if req_type == 'arrival' else req_obj.depart,
+            REQ_TYPE_LIST.index(req_type),
+            req_obj.req_id,
+            self.nodes_dict[req_obj.source],
+            self.nodes_dict[req_obj.destination],
+            int(req_obj.bandwidth if bandwidth is None else bandwidth),
+            *spectrum_tuple,
+            OUTCOME_LIST.index(outcome),
+        ))
+
+    def write_arrival(self, req_obj: object, sdn_props: object):
+        """
+        Records the outcome of an arrival request.
+
+        :param req_obj: The request.
+        :param sdn_props: Properties of the SDN controller after handling the request.
+        """
+        if not sdn_props.was_routed:
+            if sdn_props.block_reason in OUTCOME_LIST:
+                outcome = sdn_props.block_reason
+            else:
+                outcome = 'blocked'
+            self._write(req_obj=req_obj, req_type='arrival', outcome=outcome)
+            return
+
+        # Sliced requests record every segment under the same request ID, failed slicing attempts come before them
+        num_segments = sdn_props.num_trans
+        for bandwidth, core_num, band, start_slot, end_slot in zip(
+                sdn_props.bandwidth_list[-num_segments:], sdn_props.core_list[-num_segments:],
+                sdn_props.band_list[-num_segments:], sdn_props.start_slot_list[-num_segments:],
+                sdn_props.end_slot_list[-num_segments:]):
+            num_slots = end_slot - start_slot
+            if not self.engine_props['guard_slots']:
+                num_slots += 1
+            spectrum_tuple = (sdn_props.path_index, core_num, self.engine_props['band_list'].index(band), start_slot,
+                              num_slots)
+            self._write(req_obj=req_obj, req_type='arrival', outcome='routed', spectrum_tuple=spectrum_tuple,
+                        bandwidth=bandwidth)
+
+    def write_release(self, req_obj: object, was_routed: bool):
+        """
+        Records a release request.
+
+        :param req_obj: The request.
+        :param was_routed: Whether the request was allocated and its resources were released.
+        """
+        self._write(req_obj=req_obj, req_type='release', outcome='routed' if was_routed else 'blocked')
+
+    def close(self):
+        """
+        Flushes any buffered records and closes the trace file.
+        """
+        if not self.file_obj.closed:
+            self.file_obj.close()
+
+
+def read_trace(trace_fp: str):
+    """
+    Reads a binary trace for post-hoc analysis.
+
+    :param trace_fp: The trace file path.
+    :return: Every recorded event, one structured record per event.
+    :rtype: np.ndarray
+    """
+    with open(trace_fp, 'rb') as file_obj:
+        magic, version, record_size = TRACE_HEADER.unpack(file_obj.read(TRACE_HEADER.size))
+        if magic != TRACE_MAGIC:
+            raise ValueError(f'{trace_fp} is not a simulation trace.')
+        if version != TRACE_VERSION or record_size != TRACE_RECORD_DTYPE.itemsize:
+            raise ValueError(f'Trace version {version} with record size {record_size} is not supported, expected '
+                             f'version {TRACE_VERSION} with record size {TRACE_RECORD_DTYPE.itemsize}.')
+
+        records_arr = np.fromfile(file_obj, dtype=TRACE_RECORD_DTYPE)
+
+    return records_arr
+
+
+def load_trace_requests(trace_fp: str, engine_props: dict):
+    """
+    Rebuilds the requests of a simulation from a trace, so a recorded workload can be replayed without the RNG.
+
+    :param trace_fp: The trace file path.
+    :param engine_props: Properties from the engine class.
+    :return: The requests and request information, in the same format as the request generator.
+    :rtype: RequestTable
+    """
+    records_arr = read_trace(trace_fp=trace_fp)
+    bandwidth_list = [int(bandwidth) for bandwidth in engine_props['mod_per_bw']]
+
+    # Every segment of a sliced request has its own arrival record, they're merged back into the whole request
+    is_arrival_arr = records_arr['req_type'] == REQ_TYPE_LIST.index('arrival')
+    is_segment_arr = np.zeros(len(records_arr), dtype=bool)
+    is_segment_arr[1:] = is_arrival_arr[1:] & is_arrival_arr[:-1] & (records_arr['req_id'][1:] ==
+                                                                      records_arr['req_id'][:-1])
+    first_indexes_arr = np.flatnonzero(~is_segment_arr)
+    bandwidth_arr = np.add.reduceat(records_arr['bandwidth'].astype(np.int64), first_indexes_arr)
+    records_arr = records_arr[first_indexes_arr]
+    records_arr['bandwidth'] = bandwidth_arr
+
+    is_arrival_arr = records_arr['req_type'] == REQ_TYPE_LIST.index('arrival')
+    arrivals_arr = records_arr[is_arrival_arr]
+    releases_arr = records_arr[~is_arrival_arr]
+
+    requests_arr = np.zeros(len(arrivals_arr), dtype=REQUEST_DTYPE)
+    for field in ('req_id', 'source', 'destination'):
+        requests_arr[field] = arrivals_arr[field]
+    requests_arr['arrive'] = arrivals_arr['time']
+    requests_arr['bandwidth'] = [bandwidth_list.index(bandwidth) for bandwidth in arrivals_arr['bandwidth'].tolist()]
+
+    # Releases are matched to their arrival by request ID, a request without one never departs
+    req_index_dict = {req_id: req_index for req_index, req_id in enumerate(arrivals_arr['req_id'].tolist())}
+    release_indexes_list = [req_index_dict[req_id] for req_id in releases_arr['req_id'].tolist()]
+    requests_arr['depart'] = np.nan
+    requests_arr['depart'][release_indexes_list] = releases_arr['time']
+
+    events_arr = np.zeros(len(records_arr), dtype=EVENT_DTYPE)
+    events_arr['time'] = records_arr['time']
+    events_arr['req_index'] = [req_index_dict[req_id] for req_id in records_arr['req_id'].tolist()]
+    events_arr['req_type'] = records_arr['req_type']
+
+    return RequestTable(requests_arr=requests_arr, events_arr=events_arr,
+                        nodes_list=list(engine_props['topology_info']['nodes'].keys()),
+                        mod_per_bw=engine_props['mod_per_bw'])
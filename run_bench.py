@@ -0,0 +1,59 @@
+import os
+import argparse
+
+from arg_scripts.bench_args import BENCH_CASES_LIST
+from helper_scripts.bench_helpers import run_bench_suite, save_bench_results, load_bench_results
+from helper_scripts.bench_helpers import compare_to_baseline
+
+
+def parse_bench_args():
+    """
+    Parse command line arguments for the benchmark suite.
+
+    :return: The values for each benchmark parameter.
+    :rtype: dict
+    """
+    parser = argparse.ArgumentParser(description='Software-Defined Networking Simulator benchmarks.')
+    parser.add_argument('--network', type=str, default=None, help='Only run cases on this network.')
+    parser.add_argument('--save_fp', type=str, default=os.path.join('data', 'bench', 'bench_results.json'),
+                        help='Where to save the results, the file can be used as a future baseline.')
+    parser.add_argument('--baseline_fp', type=str, default=None, help='A previous results file to compare to.')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Allowed fractional drop in throughput before a case is reported.')
+    args = parser.parse_args()
+
+    return vars(args)
+
+
+def run_bench(bench_dict: dict):
+    """
+    Runs the benchmark suite and optionally compares it to a baseline.
+
+    :param bench_dict: The benchmark parameters.
+    :return: Every case that regressed with respect to the baseline.
+    :rtype: dict
+    """
+    cases_list = [case_dict for case_dict in BENCH_CASES_LIST
+                  if bench_dict['network'] is None or case_dict['network'] == bench_dict['network']]
+    results_dict = run_bench_suite(cases_list=cases_list)
+    save_bench_results(results_dict=results_dict, save_fp=bench_dict['save_fp'])
+
+    for case_id, case_dict in results_dict.items():
+        print(f"{case_id}: {round(case_dict['requests_per_sec'], 2)} requests/s, "
+              f"peak RSS: {case_dict['peak_rss_mb']} MB")
+
+    regressions_dict = dict()
+    if bench_dict['baseline_fp'] is not None:
+        baseline_dict = load_bench_results(load_fp=bench_dict['baseline_fp'])
+        regressions_dict = compare_to_baseline(results_dict=results_dict, baseline_dict=baseline_dict,
+                                               tolerance=bench_dict['tolerance'])
+        for case_id, issues_list in regressions_dict.items():
+            print(f"Regression in {case_id}: {', '.join(issues_list)}")
+
+    return regressions_dict
+
+
+if __name__ == '__main__':
+    regressions = run_bench(bench_dict=parse_bench_args())
+    if regressions:
+        raise SystemExit(1)
@@ -0,0 +1,55 @@
+import os
+import argparse
+
+from arg_scripts.config_args import COMMAND_LINE_PARAMS
+from arg_scripts.dataset_args import DATASET_DIR, DATASET_CHUNK_SIZE
+from config_scripts.setup_config import read_config
+from helper_scripts.dataset_helpers import generate_dataset
+
+
+def parse_dataset_args():
+    """
+    Parse command line arguments for generating an offline dataset.
+
+    :return: The values for each dataset parameter.
+    :rtype: dict
+    """
+    parser = argparse.ArgumentParser(description='Software-Defined Networking Simulator offline datasets.')
+    parser.add_argument('--config_path', type=str, default=None, help='The configuration file to simulate.')
+    parser.add_argument('--erlang', type=float, required=True, help='The traffic volume to simulate.')
+    parser.add_argument('--seeds', type=int, nargs='+', required=True, help='Seeds to simulate, one per episode.')
+    parser.add_argument('--max_workers', type=int, default=None, help='The maximum number of processes.')
+    parser.add_argument('--chunk_size', type=int, default=DATASET_CHUNK_SIZE, help='Rows written to each file.')
+    parser.add_argument('--save_dir', type=str, default=None, help='Where to save the dataset.')
+    args = parser.parse_args()
+
+    return vars(args)
+
+
+def run_dataset(dataset_dict: dict):
+    """
+    Generates an offline dataset from the first simulation of a configuration file.
+
+    :param dataset_dict: The dataset parameters.
+    :return: The dataset's information.
+    :rtype: dict
+    """
+    # Every option is taken from the configuration file
+    args_dict = {args_list[0]: None for args_list in COMMAND_LINE_PARAMS}
+    args_dict['optimize'] = None
+    engine_props = read_config(args_dict=args_dict, config_path=dataset_dict['config_path'])['s1']
+    engine_props['erlang'] = dataset_dict['erlang']
+
+    save_dir = dataset_dict['save_dir']
+    if save_dir is None:
+        save_dir = os.path.join(DATASET_DIR, engine_props['network'], f"e{dataset_dict['erlang']}")
+
+    info_dict = generate_dataset(engine_props=engine_props, seeds_list=dataset_dict['seeds'], save_dir=save_dir,
+                                 max_workers=dataset_dict['max_workers'], chunk_size=dataset_dict['chunk_size'])
+    print(f"Saved {sum(info_dict['num_rows'].values())} rows from {len(info_dict['seeds'])} seeds to: {save_dir}")
+
+    return info_dict
+
+
+if __name__ == '__main__':
+    run_dataset(dataset_dict=parse_dataset_args())
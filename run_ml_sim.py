@@ -1,7 +1,9 @@
 import os
 import glob
+import concurrent.futures
 
 import pandas as pd
+from sklearn.metrics import accuracy_score
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.model_selection import train_test_split
@@ -13,48 +15,33 @@ from helper_scripts.ml_helpers import process_data, plot_confusion
 from helper_scripts.ml_helpers import save_model
 
 
-def _train_test_knn(df_processed: pd.DataFrame, sim_dict: dict, erlang: str):
-    predictor_df = df_processed['num_segments']
-    feature_df = df_processed.drop('num_segments', axis=1)
-
-    x_train, x_test, y_train, y_test = train_test_split(feature_df, predictor_df,
-                                                        test_size=sim_dict['test_size'], random_state=42)
-    knn = KNeighborsClassifier(n_neighbors=5)
-    knn.fit(x_train, y_train)
-
-    y_pred = knn.predict(x_test)
-    plot_confusion(sim_dict=sim_dict, y_test=y_test, y_pred=y_pred, erlang=erlang, algorithm='KNN')
+def _get_model(ml_model: str):
+    if ml_model == 'knn':
+        return KNeighborsClassifier(n_neighbors=5), 'KNN'
+    if ml_model == 'logistic_regression':
+        return LogisticRegression(random_state=0), 'Logistic Regression'
+    if ml_model == 'decision_tree':
+        return DecisionTreeClassifier(random_state=0), 'Decision Tree'
 
-    save_model(sim_dict=sim_dict, model=knn, algorithm='knn', erlang=erlang)
+    raise NotImplementedError
 
 
-def _train_test_dt(df_processed: pd.DataFrame, sim_dict: dict, erlang: str):
+def _train_test(df_processed: pd.DataFrame, sim_dict: dict, erlang: str):
     predictor_df = df_processed['num_segments']
     feature_df = df_processed.drop('num_segments', axis=1)
 
     x_train, x_test, y_train, y_test = train_test_split(feature_df, predictor_df, test_size=sim_dict['test_size'],
                                                         random_state=42)
-    dt_obj = DecisionTreeClassifier(random_state=0)
-    dt_obj.fit(x_train, y_train)
-    y_pred = dt_obj.predict(x_test)
-    plot_confusion(sim_dict=sim_dict, y_test=y_test, y_pred=y_pred, erlang=erlang, algorithm='Decision Tree')
+    model, algorithm = _get_model(ml_model=sim_dict['ml_model'])
+    model.fit(x_train, y_train)
 
-    save_model(sim_dict=sim_dict, model=dt_obj, algorithm='decision_tree', erlang=erlang)
-
-
-def _train_test_lr(df_processed: pd.DataFrame, sim_dict: dict, erlang: str):
-    predictor_df = df_processed['num_segments']
-    feature_df = df_processed.drop('num_segments', axis=1)
-
-    x_train, x_test, y_train, y_test = train_test_split(feature_df, predictor_df, test_size=sim_dict['test_size'],
-                                                        random_state=42)
-    lr_obj = LogisticRegression(random_state=0, n_jobs=-1)
-    lr_obj.fit(x_train, y_train)
-    y_pred = lr_obj.predict(x_test)
-    plot_confusion(sim_dict=sim_dict, y_test=y_test, y_pred=y_pred, erlang=erlang,
-                   algorithm='Logistic Regression')
+    y_pred = model.predict(x_test)
+    if sim_dict['plot_ml']:
+        plot_confusion(sim_dict=sim_dict, y_test=y_test, y_pred=y_pred, erlang=erlang, algorithm=algorithm)
+    else:
+        print(f'{algorithm} accuracy for Erlang {erlang}: {accuracy_score(y_test, y_pred):.4f}')
 
-    save_model(sim_dict=sim_dict, model=lr_obj, algorithm='logistic_regression', erlang=erlang)
+    save_model(sim_dict=sim_dict, model=model, algorithm=sim_dict['ml_model'], erlang=erlang)
 
 
 def extract_value(path: str):
@@ -74,19 +61,43 @@ def extract_value(path: str):
     return value
 
 
+def read_train_data(file_path: str):
+    """
+    Reads a training data file, either columnar or CSV.
+
+    :param file_path: The training data file.
+    :return: The training data.
+    :rtype: pd.DataFrame
+    """
+    if file_path.endswith('.parquet'):
+        return pd.read_parquet(file_path)
+
+    return pd.read_csv(file_path)
+
+
 def _handle_training(sim_dict: dict, file_path: str):
-    data_frame = pd.read_csv(file_path)
+    data_frame = read_train_data(file_path=file_path)
 
     erlang = extract_value(path=file_path)
     df_processed = process_data(sim_dict=sim_dict, input_df=data_frame, erlang=erlang)
-    if sim_dict['ml_model'] == 'knn':
-        _train_test_knn(df_processed=df_processed, sim_dict=sim_dict, erlang=erlang)
-    elif sim_dict['ml_model'] == 'logistic_regression':
-        _train_test_lr(df_processed=df_processed, sim_dict=sim_dict, erlang=erlang)
-    elif sim_dict['ml_model'] == 'decision_tree':
-        _train_test_dt(df_processed=df_processed, sim_dict=sim_dict, erlang=erlang)
-    else:
-        raise NotImplementedError
+    _train_test(df_processed=df_processed, sim_dict=sim_dict, erlang=erlang)
+
+
+def get_train_files(train_dir: str):
+    """
+    Finds the training data file of every Erlang, columnar files are used over CSV files of the same Erlang.
+
+    :param train_dir: The directory of the training data.
+    :return: The training data files.
+    :rtype: list
+    """
+    train_files = sorted(glob.glob(os.path.join(train_dir, '*_train_data.parquet')))
+    parquet_erlangs = {extract_value(path=train_fp) for train_fp in train_files}
+    for train_fp in sorted(glob.glob(os.path.join(train_dir, '*.csv'))):
+        if extract_value(path=train_fp) not in parquet_erlangs:
+            train_files.append(train_fp)
+
+    return train_files
 
 
 def _run(sim_dict: dict):
@@ -100,10 +111,18 @@ def _run(sim_dict: dict):
     base_fp = 'data/output/'
 
     train_dir = os.path.join(base_fp, sim_dict['train_file_path'])
-    train_files = glob.glob(os.path.join(train_dir, "*.csv"))
+    train_files = get_train_files(train_dir=train_dir)
 
-    for train_fp in train_files:
-        _handle_training(sim_dict=sim_dict, file_path=train_fp)
+    # Every Erlang is trained independently
+    if sim_dict['ml_workers'] == 1:
+        for train_fp in train_files:
+            _handle_training(sim_dict=sim_dict, file_path=train_fp)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=sim_dict['ml_workers']) as executor:
+            future_list = [executor.submit(_handle_training, sim_dict=sim_dict, file_path=train_fp)
+                           for train_fp in train_files]
+            for future in concurrent.futures.as_completed(future_list):
+                future.result()
 
 
 def _setup_ml_sim():
@@ -4,19 +4,25 @@ import subprocess
 
 from torch import nn  # pylint: disable=unused-import
 import gymnasium as gym
-import numpy as np
 from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import SubprocVecEnv
 
 from src.engine import Engine
 from src.routing import Routing
-from helper_scripts.rl_setup_helpers import setup_rl_sim, print_info, setup_ppo
+from helper_scripts.rl_setup_helpers import setup_rl_sim, print_info, setup_ppo, get_ppo_params
 from helper_scripts.setup_helpers import create_input, save_input
-from helper_scripts.rl_helpers import RLHelpers
+from helper_scripts.rl_helpers import RLHelpers, SpectrumObsBuilder
+from helper_scripts.spectrum_helpers import FeasibilityOracle
 from helper_scripts.callback_helpers import GetModelParams
 from helper_scripts.sim_helpers import get_start_time, find_path_len, get_path_mod
+from helper_scripts.routing_helpers import get_k_paths_cache
+from helper_scripts.random_helpers import set_seed
+from helper_scripts.stats_helpers import SimStats
 from helper_scripts.multi_agent_helpers import PathAgent, CoreAgent, SpectrumAgent
 from arg_scripts.rl_args import RLProps, LOCAL_RL_COMMANDS_LIST, VALID_PATH_ALGORITHMS, VALID_CORE_ALGORITHMS
 from arg_scripts.rl_args import VALID_SPECTRUM_ALGORITHMS
+from arg_scripts.engine_args import RouteMethod
+from arg_scripts.routing_args import K_PATHS_CACHE_DIR
 
 
 class SimEnv(gym.Env):  # pylint: disable=abstract-method
@@ -26,7 +32,7 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
     metadata = dict()
 
     def __init__(self, render_mode: str = None, custom_callback: object = None, sim_dict: dict = None,
-                 **kwargs):  # pylint: disable=unused-argument
+                 env_index: int = 0, **kwargs):  # pylint: disable=unused-argument
         super().__init__()
 
         self.rl_props = RLProps()
@@ -38,6 +44,8 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
         self.rl_props.super_channel_space = self.sim_dict['super_channel_space']
 
         self.iteration = 0
+        # Identifies this simulator when several run in parallel, keeps their files and requests apart
+        self.env_index = env_index
         self.options = None
         self.optimize = None
         self.callback = custom_callback
@@ -45,6 +53,7 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
 
         self.engine_obj = None
         self.route_obj = None
+        self.oracle_obj = None
 
         # TODO: Change all inputs to account for the new object
         self.rl_help_obj = RLHelpers(rl_props=self.rl_props, engine_obj=self.engine_obj, route_obj=self.route_obj)
@@ -104,7 +113,8 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
             elif self.sim_dict['core_algorithm'] in VALID_CORE_ALGORITHMS:
                 self.core_agent.update(was_allocated=was_allocated, net_spec_dict=self.engine_obj.net_spec_dict,
                                        iteration=self.iteration)
-            else:
+            # The DRL spectrum agent is trained by stable baselines from the rewards returned
+            elif self.sim_dict['spectrum_algorithm'] not in VALID_SPECTRUM_ALGORITHMS:
                 raise NotImplementedError
         else:
             self.path_agent.update(was_allocated=was_allocated, net_spec_dict=self.engine_obj.net_spec_dict,
@@ -120,9 +130,9 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
         :return: The new observation, reward, if terminated, if truncated, and misc. info.
         :rtype: tuple
         """
-        req_info_dict = self.rl_props.arrival_list[self.rl_props.arrival_count]
-        req_id = req_info_dict['req_id']
-        bandwidth = req_info_dict['bandwidth']
+        req_obj = self.rl_props.arrival_list[self.rl_props.arrival_count]
+        req_id = req_obj.req_id
+        bandwidth = req_obj.bandwidth
 
         self._update_helper_obj(action=action, bandwidth=bandwidth)
         self.rl_help_obj.allocate()
@@ -149,8 +159,7 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
     def _handle_path_train_test(self):
         if 'bandit' in self.sim_dict['path_algorithm']:
             self.route_obj.sdn_props = self.rl_props.mock_sdn_dict
-            self.route_obj.engine_props['route_method'] = 'k_shortest_path'
-            self.route_obj.get_route()
+            self.route_obj.get_route(route_method=RouteMethod.K_SHORTEST_PATH)
 
         self.path_agent.get_route(route_obj=self.route_obj)
         # TODO: Update to chosen path list, be very careful as this affects results easily for the agents if done wrong
@@ -163,12 +172,27 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
         # Default to first fit if all paths fail
         self.rl_props.chosen_path = [self.route_obj.route_props.paths_matrix[0]]
         self.rl_props.chosen_path_index = 0
-        for path_index, path_list in enumerate(self.route_obj.route_props.paths_matrix):
-            mod_format_list = self.route_obj.route_props.mod_formats_matrix[path_index]
+        paths_matrix = self.route_obj.route_props.paths_matrix
+        mod_formats_matrix = self.route_obj.route_props.mod_formats_matrix
+
+        # Every candidate path is checked in one call unless a full spectrum search is needed
+        if self.oracle_obj.is_supported():
+            feasible_arr, _ = self.oracle_obj.get_feasibility(
+                net_spec_dict=self.rl_props.mock_sdn_dict.net_spec_dict, paths_matrix=paths_matrix,
+                mod_formats_matrix=mod_formats_matrix, mod_formats_dict=self.rl_props.mock_sdn_dict.mod_formats_dict)
+            feasible_list = feasible_arr.any(axis=(1, 2)).tolist()
+        else:
+            feasible_list = None
 
-            was_allocated = self.rl_help_obj.mock_handle_arrival(engine_props=self.engine_obj.engine_props,
-                                                                 sdn_props=self.rl_props.mock_sdn_dict,
-                                                                 mod_format_list=mod_format_list, path_list=path_list)
+        for path_index, path_list in enumerate(paths_matrix):
+            if feasible_list is not None:
+                was_allocated = feasible_list[path_index]
+            else:
+                was_allocated = self.rl_help_obj.mock_handle_arrival(engine_props=self.engine_obj.engine_props,
+                                                                     sdn_props=self.rl_props.mock_sdn_dict,
+                                                                     mod_format_list=mod_formats_matrix[path_index],
+                                                                     path_list=path_list,
+                                                                     config_obj=self.engine_obj.config_obj)
 
             if was_allocated:
                 self.rl_props.chosen_path_list = [path_list]
@@ -180,8 +204,7 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
 
     def _handle_core_train(self):
         self.route_obj.sdn_props = self.rl_props.mock_sdn_dict
-        self.route_obj.engine_props['route_method'] = 'k_shortest_path'
-        self.route_obj.get_route()
+        self.route_obj.get_route(route_method=RouteMethod.K_SHORTEST_PATH)
         self._determine_core_penalty()
 
         self.rl_props.forced_index = None
@@ -195,11 +218,10 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
 
     def _handle_spectrum_train(self):
         self.route_obj.sdn_props = self.rl_props.mock_sdn_dict
-        self.route_obj.engine_props['route_method'] = 'shortest_path'
-        self.route_obj.get_route()
+        self.route_obj.get_route(route_method=RouteMethod.SHORTEST_PATH)
         # TODO: Change name in rl props eventually
         self.rl_props.paths_list = self.route_obj.route_props.paths_matrix
-        self.rl_props.chosen_path = self.route_obj.route_props.paths_matrix
+        self.rl_props.chosen_path_list = self.route_obj.route_props.paths_matrix
         self.rl_props.path_index = 0
         self.rl_props.core_index = None
 
@@ -219,31 +241,31 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
 
         path_len = find_path_len(path_list=self.rl_props.chosen_path_list[0],
                                  topology=self.engine_obj.topology)
-        path_mod = get_path_mod(mods_dict=curr_req['mod_formats'], path_len=path_len)
+        path_mod = get_path_mod(mods_dict=curr_req.mod_formats, path_len=path_len)
 
         return path_mod
 
-    # fixme
-    def _get_spectrum_obs(self, curr_req: dict):  # pylint: disable=unused-argument
-        # path_mod = self._handle_test_train_obs(curr_req=curr_req)
-        # if path_mod is not False:
-        #     slots_needed = curr_req['mod_formats'][path_mod]['slots_needed']
-        # super_channels, no_penalty = self.rl_help_obj.get_super_channels(slots_needed=slots_needed,
-        #                                                                  num_channels=self.rl_props[
-        #                                                                      'super_channel_space'])
+    def _get_spectrum_obs(self, curr_req: dict):
+        path_mod = self._handle_test_train_obs(curr_req=curr_req)
+        obs_obj = self.rl_help_obj.obs_obj
+        if path_mod is not False:
+            slots_needed = curr_req.mod_formats[path_mod]['slots_needed']
+            # Only a DRL spectrum agent uses the super-channels, others skip the fragmentation scores
+            if self.sim_dict['spectrum_algorithm'] in VALID_SPECTRUM_ALGORITHMS:
+                _, no_penalty = self.rl_help_obj.get_super_channels(slots_needed=slots_needed,
+                                                                    num_channels=self.rl_props.super_channel_space)
+            else:
+                no_penalty = True
         # No penalty for DRL agent, mistake not made by it
-        # else:
-        slots_needed = -1
-        no_penalty = True
-        super_channels = np.array([100.0, 100.0, 100.0])
+        else:
+            slots_needed = -1
+            no_penalty = True
+            obs_obj.clear_super_channels()
 
         self.spectrum_agent.no_penalty = no_penalty
-        source_obs = np.zeros(self.rl_props.num_nodes)
-        source_obs[self.rl_props.source] = 1.0
-        dest_obs = np.zeros(self.rl_props.num_nodes)
-        dest_obs[self.rl_props.destination] = 1.0
+        obs_obj.update_nodes(source=self.rl_props.source, destination=self.rl_props.destination)
 
-        return slots_needed, source_obs, dest_obs, super_channels
+        return slots_needed, obs_obj.source_obs, obs_obj.dest_obs, obs_obj.super_channels
 
     def _get_obs(self):
         # Used when we reach a reset after a simulation has finished (reset automatically called by gymnasium, use
@@ -254,8 +276,8 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
             curr_req = self.rl_props.arrival_list[self.rl_props.arrival_count]
 
         self.rl_help_obj.handle_releases()
-        self.rl_props.source = int(curr_req['source'])
-        self.rl_props.destination = int(curr_req['destination'])
+        self.rl_props.source = int(curr_req.source)
+        self.rl_props.destination = int(curr_req.destination)
         self.rl_props.mock_sdn_dict = self.rl_help_obj.update_mock_sdn(curr_req=curr_req)
 
         slots_needed, source_obs, dest_obs, super_channels = self._get_spectrum_obs(curr_req=curr_req)
@@ -278,16 +300,16 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
 
     def _create_input(self):
         base_fp = os.path.join('data')
-        self.sim_dict['thread_num'] = 's1'
-        # fixme
-        # Added only for structure consistency
-        # time.sleep(20)
-        get_start_time(sim_dict={'s1': self.sim_dict})
-        file_name = "sim_input_s1.json"
+        self.sim_dict['thread_num'] = f's{self.env_index + 1}'
+        # Simulators launched together share one start time given to them
+        if self.sim_dict.get('sim_start') is None:
+            get_start_time(sim_dict={'s1': self.sim_dict})
+        file_name = f"sim_input_{self.sim_dict['thread_num']}.json"
 
         self.engine_obj = Engine(engine_props=self.sim_dict)
         self.route_obj = Routing(engine_props=self.engine_obj.engine_props,
                                  sdn_props=self.rl_props.mock_sdn_dict)
+        self.oracle_obj = FeasibilityOracle(engine_props=self.engine_obj.engine_props)
 
         # fixme
         # time.sleep(30)
@@ -335,12 +357,25 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
         self.engine_obj.engine_props['erlang'] = start_arr_rate / self.sim_dict['holding_time']
         self.engine_obj.engine_props['arrival_rate'] = start_arr_rate * self.sim_dict['cores_per_link']
 
-    def _init_props_envs(self):
+    def _init_props_envs(self, seed: int):
         self.rl_props.arrival_count = 0
-        self.engine_obj.init_iter(iteration=self.iteration)
-        self.engine_obj.create_topology()
+        if self.engine_obj.net_spec_dict:
+            # The topology never changes between episodes, only the last episode's allocations are cleared
+            self.engine_obj.clear_spectrum()
+        else:
+            self.engine_obj.create_topology()
+            self.route_obj.update_config(config_obj=self.engine_obj.config_obj)
+            self.oracle_obj.update_config(config_obj=self.engine_obj.config_obj)
         self.rl_help_obj.topology = self.engine_obj.topology
         self.rl_props.num_nodes = len(self.engine_obj.topology.nodes)
+        if self.rl_help_obj.obs_obj is None:
+            self.rl_help_obj.obs_obj = SpectrumObsBuilder(num_nodes=self.rl_props.num_nodes,
+                                                          super_channel_space=self.rl_props.super_channel_space,
+                                                          spectral_slots=self.rl_props.spectral_slots)
+        if not self.route_obj.k_paths_cache:
+            self.route_obj.k_paths_cache = get_k_paths_cache(topology=self.engine_obj.topology,
+                                                             k_paths=self.rl_props.k_paths,
+                                                             cache_dir=K_PATHS_CACHE_DIR)
 
         if self.iteration == 0:
             self._init_envs()
@@ -349,6 +384,10 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
         self.rl_help_obj.engine_obj = self.engine_obj
         self.rl_help_obj.route_obj = self.route_obj
 
+        # Requests are generated once per episode and shared with the engine
+        self.rl_help_obj.reset_reqs_dict(seed=seed)
+        self.engine_obj.init_iter(iteration=self.iteration, reqs_dict=self.engine_obj.reqs_dict)
+
     def reset(self, seed: int = None, options: dict = None):  # pylint: disable=arguments-differ
         """
         Resets necessary variables after each iteration of the simulation.
@@ -362,24 +401,56 @@ class SimEnv(gym.Env):  # pylint: disable=abstract-method
         self.rl_props.arrival_list = list()
         self.rl_props.depart_list = list()
 
-        if self.optimize or self.optimize is None:
-            self.iteration = 0
+        if self.engine_obj is None:
             self.setup()
+        elif self.optimize or self.optimize is None:
+            # Every episode is a new simulation, the inputs, topology and routes built for the first one are reused
+            self.iteration = 0
+            self.engine_obj.stats_obj = SimStats(engine_props=self.engine_obj.engine_props,
+                                                 sim_info=self.engine_obj.sim_info)
+            self.engine_obj.stats_obj.topology = self.engine_obj.topology
 
-        self._init_props_envs()
-        if not self.sim_dict['is_training'] and self.iteration == 0:
-            self._load_models()
         if seed is None:
             # fixme
             # seed = self.iteration + 1
-            seed = 0
+            seed = self.env_index
+
+        # Requests have their own generator, the agents explore with the global one
+        set_seed(seed=seed)
+        self._init_props_envs(seed=seed)
+        if not self.sim_dict['is_training'] and self.iteration == 0:
+            self._load_models()
 
-        self.rl_help_obj.reset_reqs_dict(seed=seed)
         obs = self._get_obs()
         info = self._get_info()
         return obs, info
 
 
+def _make_env(sim_dict: dict, env_index: int):
+    def _init_env():
+        return SimEnv(render_mode=None, sim_dict={'s1': copy.deepcopy(sim_dict)}, env_index=env_index)
+
+    return _init_env
+
+
+def make_vec_env(sim_dict: dict):
+    """
+    Creates simulators in parallel worker processes to collect experience from, one per environment.
+
+    :param sim_dict: The simulation dictionary (engine props).
+    :return: The vectorized environment.
+    :rtype: SubprocVecEnv
+    """
+    # Callbacks belong to the model in the main process, not the workers
+    worker_dict = {key: value for key, value in sim_dict.items() if key != 'callback'}
+    if worker_dict.get('sim_start') is None:
+        get_start_time(sim_dict={'s1': worker_dict})
+
+    env_fns_list = [_make_env(sim_dict=worker_dict, env_index=env_index)
+                    for env_index in range(sim_dict['num_envs'])]
+    return SubprocVecEnv(env_fns=env_fns_list)
+
+
 def _run_iters(env: object, sim_dict: dict, is_training: bool, model=None):
     completed_episodes = 0
     obs, _ = env.reset()
@@ -401,18 +472,13 @@ def _run_iters(env: object, sim_dict: dict, is_training: bool, model=None):
 
 
 def _get_model(algorithm: str, device: str, env: object):
-    model = None
-    yaml_dict = None
-    env_name = None
-
-    if algorithm == 'dqn':
-        model = None
-    elif algorithm == 'ppo':
+    if algorithm == 'ppo':
         model = setup_ppo(env=env, device=device)
-    elif algorithm == 'a2c':
-        model = None
+        yaml_dict = get_ppo_params()
+    else:
+        raise NotImplementedError(f'Spectrum Algorithm has not been implemented: {algorithm}')
 
-    return model, yaml_dict[env_name]
+    return model, yaml_dict
 
 
 def _get_trained_model(env: object, sim_dict: dict):
@@ -449,10 +515,17 @@ def _run_spectrum(sim_dict: dict, env: object):
     if sim_dict['optimize_hyperparameters']:
         _run_rl_zoo(sim_dict=sim_dict)
     else:
+        if sim_dict['num_envs'] is not None and sim_dict['num_envs'] > 1:
+            train_env = make_vec_env(sim_dict=sim_dict)
+        else:
+            train_env = env
+
         model, yaml_dict = _get_model(algorithm=sim_dict['spectrum_algorithm'], device=sim_dict['device'],
-                                      env=env)
+                                      env=train_env)
         model.learn(total_timesteps=yaml_dict['n_timesteps'], log_interval=sim_dict['print_step'],
                     callback=sim_dict['callback'])
+        if train_env is not env:
+            train_env.close()
 
         save_fp = os.path.join('logs', 'ppo', env.modified_props['network'], env.modified_props['date'],
                                env.modified_props['sim_start'], 'ppo_model.zip')
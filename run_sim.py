@@ -1,6 +1,9 @@
 # Standard library imports
+import os
 import time
 import copy
+import json
+from statistics import mean
 from datetime import datetime
 
 # Third-party library imports
@@ -8,7 +11,10 @@ import concurrent.futures
 
 # Local application imports
 from helper_scripts.setup_helpers import create_input, save_input
+from helper_scripts.sim_helpers import get_erlang_bracket, get_next_erlang
+from helper_scripts.os_helpers import create_dir
 from src.engine import Engine
+from src.multi_policy_engine import MultiPolicyEngine
 from config_scripts.setup_config import read_config
 from config_scripts.parse_args import parse_args
 
@@ -24,9 +30,12 @@ class NetworkSimulator:
         """
         # Contains all the desired network simulator parameters for every simulation
         self.properties = None
+        # Parameters of every simulation when policies are compared on common random numbers
+        self.compare_props_dict = None
 
-    def _run_generic_sim(self, erlang: float, first_erlang: bool):
-        engine_props = copy.deepcopy(self.properties)
+    @staticmethod
+    def _create_engine_props(properties: dict, erlang: float, first_erlang: bool):
+        engine_props = copy.deepcopy(properties)
         engine_props['arrival_rate'] = (engine_props['cores_per_link'] * erlang) / engine_props['holding_time']
         engine_props['erlang'] = erlang
         engine_props['band_list'] = list()
@@ -36,9 +45,95 @@ class NetworkSimulator:
             save_input(base_fp='data', properties=engine_props, file_name=f"sim_input_{local_props['thread_num']}.json",
                        data_dict=local_props)
 
+        return engine_props
+
+    def _run_compare_sim(self, erlang: float, first_erlang: bool):
+        engine_props_dict = {thread_num: self._create_engine_props(properties=properties, erlang=erlang,
+                                                                   first_erlang=first_erlang)
+                             for thread_num, properties in self.compare_props_dict.items()}
+        multi_engine = MultiPolicyEngine(engine_props_dict=engine_props_dict)
+        multi_engine.run()
+
+    def _run_engine_sim(self, erlang: float, first_erlang: bool, is_pilot: bool = False):
+        engine_props = self._create_engine_props(properties=self.properties, erlang=erlang, first_erlang=first_erlang)
+        # A single iteration is enough to roughly locate where blocking crosses a target
+        if is_pilot:
+            engine_props['max_iters'] = 1
         engine = Engine(engine_props=engine_props)
         engine.run()
 
+        return mean(engine.stats_obj.stats_props.sim_block_list)
+
+    def _run_generic_sim(self, erlang: float, first_erlang: bool):
+        if self.compare_props_dict is not None:
+            self._run_compare_sim(erlang=erlang, first_erlang=first_erlang)
+        else:
+            self._run_engine_sim(erlang=erlang, first_erlang=first_erlang)
+
+    def _save_search(self, search_dict: dict):
+        save_fp = os.path.join('data', 'output', self.properties['network'], self.properties['date'],
+                               self.properties['sim_start'], self.properties['thread_num'])
+        create_dir(file_path=save_fp)
+        with open(os.path.join(save_fp, 'erlang_search.json'), 'w', encoding='utf-8') as file_obj:
+            json.dump(search_dict, file_obj, indent=4)
+
+    def run_search_sim(self):
+        """
+        Searches for the traffic volume where blocking reaches a target, instead of sweeping every Erlang. Pilot
+        simulations bracket the target and full simulations are only run near the crossover.
+
+        :return: The Erlang with blocking closest to the target and every simulated point.
+        :rtype: dict
+        """
+        if self.compare_props_dict is not None:
+            raise ValueError('A target blocking search can not be combined with comparing policies.')
+
+        target_blocking = self.properties['target_blocking']
+        search_tol = self.properties.get('search_tol') or 0.1
+        max_pilots = self.properties.get('max_pilots') or 8
+        max_full = self.properties.get('max_full') or 3
+        erlang_dict = self.properties['erlangs']
+
+        pilot_dict = dict()
+        for erlang in (float(erlang_dict['start']), float(erlang_dict['stop'])):
+            pilot_dict[erlang] = self._run_engine_sim(erlang=erlang, first_erlang=not pilot_dict, is_pilot=True)
+
+        # The sweep step is the resolution we would have had without a search
+        while len(pilot_dict) < max_pilots:
+            low_erlang, high_erlang = get_erlang_bracket(points_dict=pilot_dict, target_blocking=target_blocking)
+            if low_erlang is not None and high_erlang is not None and high_erlang - low_erlang <= erlang_dict['step']:
+                break
+
+            erlang = round(get_next_erlang(points_dict=pilot_dict, target_blocking=target_blocking), 2)
+            if erlang in pilot_dict:
+                break
+            pilot_dict[erlang] = self._run_engine_sim(erlang=erlang, first_erlang=False, is_pilot=True)
+
+        search_dict = {'target_blocking': target_blocking, 'erlang': None, 'pilot_points': pilot_dict,
+                       'full_points': dict()}
+        if None in get_erlang_bracket(points_dict=pilot_dict, target_blocking=target_blocking):
+            self._save_search(search_dict=search_dict)
+            print(f"Target blocking of {target_blocking} was not reached between Erlang: {min(pilot_dict)} and "
+                  f"{max(pilot_dict)}.")
+            return search_dict
+
+        # Completed full simulations replace pilots at the same traffic volume
+        full_dict = search_dict['full_points']
+        while len(full_dict) < max_full:
+            erlang = round(get_next_erlang(points_dict={**pilot_dict, **full_dict}, target_blocking=target_blocking), 2)
+            if erlang in full_dict:
+                break
+
+            full_dict[erlang] = self._run_engine_sim(erlang=erlang, first_erlang=False)
+            if abs(full_dict[erlang] - target_blocking) <= search_tol * target_blocking:
+                break
+
+        search_dict['erlang'] = min(full_dict, key=lambda curr_erlang: abs(full_dict[curr_erlang] - target_blocking))
+        self._save_search(search_dict=search_dict)
+        print(f"Blocking of {search_dict['full_points'][search_dict['erlang']]} found at Erlang: "
+              f"{search_dict['erlang']}, target was {target_blocking}.")
+        return search_dict
+
     def run_generic_sim(self):
         """
         Runs a generic simulation. Using Arash's assumptions c.
@@ -46,6 +141,10 @@ class NetworkSimulator:
         Other assumptions include Yue's. Reference: Wang, Yue. Dynamic Traffic Scheduling
         Frameworks with Spectral and Spatial Flexibility in Sdm-Eons. Diss. University of Massachusetts Lowell, 2022.
         """
+        if self.properties.get('target_blocking') is not None:
+            self.run_search_sim()
+            return
+
         erlang_dict = self.properties['erlangs']
         start, stop, step = erlang_dict['start'], erlang_dict['stop'], erlang_dict['step']
         erlang_list = [float(erlang) for erlang in range(start, stop, step)]
@@ -66,21 +165,38 @@ class NetworkSimulator:
                 first_erlang = erlang == erlang_list[0]
                 self._run_generic_sim(erlang=erlang, first_erlang=first_erlang)
 
-    def run_sim(self, **kwargs):
-        """
-        Runs all simulations.
-        """
-        self.properties = kwargs['thread_params']
+    @staticmethod
+    def _setup_properties(thread_params: dict, thread_num: str, sim_start: str):
+        properties = thread_params
         # The date and current time derived from the simulation start
-        self.properties['date'] = kwargs['sim_start'].split('_')[0]
+        properties['date'] = sim_start.split('_')[0]
 
-        tmp_list = kwargs['sim_start'].split('_')
+        tmp_list = sim_start.split('_')
         time_string = f'{tmp_list[1]}_{tmp_list[2]}_{tmp_list[3]}_{tmp_list[4]}'
-        self.properties['sim_start'] = time_string
+        properties['sim_start'] = time_string
 
         # To keep track of each thread run and save results
-        self.properties['thread_num'] = kwargs['thread_num']
+        properties['thread_num'] = thread_num
+        return properties
+
+    def run_sim(self, **kwargs):
+        """
+        Runs all simulations.
+        """
+        self.properties = self._setup_properties(thread_params=kwargs['thread_params'], thread_num=kwargs['thread_num'],
+                                                 sim_start=kwargs['sim_start'])
+        self.run_generic_sim()
 
+    def run_compare_sim(self, **kwargs):
+        """
+        Runs every simulation in lockstep on the same requests, to compare their policies.
+        """
+        self.compare_props_dict = {thread_num: self._setup_properties(thread_params=thread_params,
+                                                                      thread_num=thread_num,
+                                                                      sim_start=kwargs['sim_start'])
+                                   for thread_num, thread_params in kwargs['sims_dict'].items()}
+        # The traffic settings are identical for every simulation
+        self.properties = next(iter(self.compare_props_dict.values()))
         self.run_generic_sim()
 
 
@@ -90,10 +206,14 @@ def run(sims_dict: dict):
 
     :param sims_dict: Contains the parameters for each simulation.
     """
+    sim_start = datetime.now().strftime("%m%d_%H_%M_%S_%f")
+    if sims_dict['s1'].get('compare_policies'):
+        NetworkSimulator().run_compare_sim(sims_dict=sims_dict, sim_start=sim_start)
+        return
+
     with concurrent.futures.ProcessPoolExecutor() as executor:
         futures_list = []
 
-        sim_start = datetime.now().strftime("%m%d_%H_%M_%S_%f")
         for thread_num, thread_params in sims_dict.items():
             curr_sim = NetworkSimulator()
             class_inst = curr_sim.run_sim
@@ -5,13 +5,16 @@ import signal
 
 # Third party library imports
 import networkx as nx
-import numpy as np
 
 # Local application imports
 from src.request_generator import get_requests
 from src.sdn_controller import SDNController
+from arg_scripts.engine_args import EngineConfig
 from helper_scripts.stats_helpers import SimStats
+from helper_scripts.sim_helpers import create_link_spectrum
 from helper_scripts.ml_helpers import load_model
+from helper_scripts.profile_helpers import PhaseProfiler
+from helper_scripts.trace_helpers import TraceRecorder, get_trace_fp, load_trace_requests
 
 
 class Engine:
@@ -30,10 +33,17 @@ class Engine:
         self.sim_info = os.path.join(self.engine_props['network'], self.engine_props['date'],
                                      self.engine_props['sim_start'])
 
-        self.sdn_obj = SDNController(engine_props=self.engine_props)
+        self.config_obj = EngineConfig(engine_props=self.engine_props)
+        self.sdn_obj = SDNController(engine_props=self.engine_props, config_obj=self.config_obj)
         self.stats_obj = SimStats(engine_props=self.engine_props, sim_info=self.sim_info)
 
         self.ml_model = None
+        self.trace_obj = None
+
+        # Per-phase timing is opt-in, every object shares the same profiler
+        self.profiler = PhaseProfiler(is_enabled=bool(self.engine_props.get('profile_phases')))
+        self.sdn_obj.profiler = self.profiler
+        self.sdn_obj.spectrum_obj.profiler = self.profiler
 
     def update_arrival_params(self, curr_time: float):
         """
@@ -42,11 +52,16 @@ class Engine:
         :param curr_time: The current simulated time.
         """
         sdn_props = self.sdn_obj.sdn_props
-        self.stats_obj.iter_update(req_data=self.reqs_dict[curr_time], sdn_data=sdn_props)
+        req_obj = self.reqs_dict[curr_time]
+        start_ns = self.profiler.start()
+        self.stats_obj.iter_update(req_data=req_obj, sdn_data=sdn_props)
+        self.profiler.stop(phase='stats', start_ns=start_ns)
+        if self.trace_obj is not None:
+            self.trace_obj.write_arrival(req_obj=req_obj, sdn_props=sdn_props)
         if sdn_props.was_routed:
             self.stats_obj.curr_trans = sdn_props.num_trans
 
-            self.reqs_status_dict.update({self.reqs_dict[curr_time]['req_id']: {
+            self.reqs_status_dict.update({req_obj.req_id: {
                 "mod_format": sdn_props.spectrum_object.modulation,
                 "path": sdn_props.path_list,
                 "is_sliced": sdn_props.is_sliced,
@@ -57,7 +72,8 @@ class Engine:
             }})
 
     def handle_arrival(self, curr_time: float, force_route_matrix: list = None, force_core: int = None,
-                       force_slicing: bool = False, forced_index: int = None, force_mod_format: str = None):
+                       force_slicing: bool = False, forced_index: int = None, force_mod_format: str = None,
+                       force_band: str = None):
         """
         Updates the SDN controller to handle an arrival request and retrieves relevant request statistics.
 
@@ -67,17 +83,15 @@ class Engine:
         :param forced_index: Forces an index in the SDN controller.
         :param force_mod_format: Forces a modulation format.
         :param force_core: Force a certain core for allocation.
+        :param force_band: Force a certain band for allocation.
         """
-        for req_key, req_value in self.reqs_dict[curr_time].items():
-            # TODO: This should be changed in reqs_dict eventually
-            if req_key == 'mod_formats':
-                req_key = 'mod_formats_dict'
-            self.sdn_obj.sdn_props.update_params(key=req_key, spectrum_key=None, spectrum_obj=None, value=req_value)
+        req_obj = self.reqs_dict[curr_time]
+        self.sdn_obj.sdn_props.bind_request(req_obj=req_obj)
 
         self.sdn_obj.handle_event(request_type='arrival', force_route_matrix=force_route_matrix,
                                   force_slicing=force_slicing, forced_index=forced_index, force_core=force_core,
-                                  ml_model=self.ml_model, req_dict=self.reqs_dict[curr_time],
-                                  force_mod_format=force_mod_format)
+                                  ml_model=self.ml_model, req_dict=req_obj,
+                                  force_mod_format=force_mod_format, forced_band=force_band)
         self.net_spec_dict = self.sdn_obj.sdn_props.net_spec_dict
         self.update_arrival_params(curr_time=curr_time)
 
@@ -87,15 +101,16 @@ class Engine:
 
         :param curr_time: The arrival time of the request.
         """
-        for req_key, req_value in self.reqs_dict[curr_time].items():
-            # TODO: This should be changed in reqs_dict eventually
-            if req_key == 'mod_formats':
-                req_key = 'mod_formats_dict'
-            self.sdn_obj.sdn_props.update_params(key=req_key, spectrum_key=None, spectrum_obj=None, value=req_value)
+        req_obj = self.reqs_dict[curr_time]
+        self.sdn_obj.sdn_props.bind_request(req_obj=req_obj)
+
+        was_routed = req_obj.req_id in self.reqs_status_dict
+        if self.trace_obj is not None:
+            self.trace_obj.write_release(req_obj=req_obj, was_routed=was_routed)
 
-        if self.reqs_dict[curr_time]['req_id'] in self.reqs_status_dict:
-            self.sdn_obj.sdn_props.path_list = self.reqs_status_dict[self.reqs_dict[curr_time]['req_id']]['path']
-            self.sdn_obj.handle_event(req_dict=self.reqs_dict[curr_time], request_type='release')
+        if was_routed:
+            self.sdn_obj.sdn_props.path_list = self.reqs_status_dict[req_obj.req_id]['path']
+            self.sdn_obj.handle_event(req_dict=req_obj, request_type='release')
             self.net_spec_dict = self.sdn_obj.sdn_props.net_spec_dict
         # Request was blocked, nothing to release
         else:
@@ -120,14 +135,15 @@ class Engine:
             source = link_data['source']
             dest = link_data['destination']
 
-            cores_matrix = dict()
-            for band in self.engine_props['band_list']:
-                # TODO: We might want to name it the same thing
-                band_slots = self.engine_props[f'{band}_band']
-                cores_matrix[band] = np.zeros((link_data['fiber']['num_cores'], band_slots))
+            # TODO: We might want to name it the same thing
+            band_slots_dict = {band: self.engine_props[f'{band}_band'] for band in self.engine_props['band_list']}
+            # Every band is a view of one array, both directions share it
+            link_dict = create_link_spectrum(num_cores=link_data['fiber']['num_cores'],
+                                             band_slots_dict=band_slots_dict)
+            link_dict['link_num'] = int(link_num)
 
-            self.net_spec_dict[(source, dest)] = {'cores_matrix': cores_matrix, 'link_num': int(link_num)}
-            self.net_spec_dict[(dest, source)] = {'cores_matrix': cores_matrix, 'link_num': int(link_num)}
+            self.net_spec_dict[(source, dest)] = link_dict
+            self.net_spec_dict[(dest, source)] = dict(link_dict)
             self.topology.add_edge(source, dest, length=link_data['length'], nli_cost=None)
 
         self.engine_props['topology'] = self.topology
@@ -135,6 +151,20 @@ class Engine:
         self.sdn_obj.sdn_props.net_spec_dict = self.net_spec_dict
         self.sdn_obj.sdn_props.topology = self.topology
 
+        # The bands and topology are only known now, the configuration is compiled once for the whole simulation
+        self.config_obj = EngineConfig(engine_props=self.engine_props)
+        self.sdn_obj.update_config(config_obj=self.config_obj)
+
+    def clear_spectrum(self):
+        """
+        Frees every slot of the network in place, so the same topology can be simulated again from the start.
+        """
+        for link_dict in self.net_spec_dict.values():
+            for cores_arr in link_dict['cores_matrix'].values():
+                cores_arr.fill(0)
+
+        self.reqs_status_dict = dict()
+
     def generate_requests(self, seed: int):
         """
         Calls the request generator to generate requests.
@@ -144,7 +174,6 @@ class Engine:
         # TODO: Needs to be a flag for artificial intelligence (especially RL) simulations
         # seed = 0
         self.reqs_dict = get_requests(seed=seed, engine_props=self.engine_props)
-        self.reqs_dict = dict(sorted(self.reqs_dict.items()))
 
     def handle_request(self, curr_time: float, req_num: int):
         """
@@ -153,19 +182,25 @@ class Engine:
         :param curr_time: The current simulated time.
         :param req_num: The request number.
         """
-        req_type = self.reqs_dict[curr_time]["request_type"]
+        req_obj = self.reqs_dict[curr_time]
+        req_type = req_obj.request_type
         if req_type == "arrival":
-            old_net_spec_dict = copy.deepcopy(self.net_spec_dict)
-            old_req_info_dict = copy.deepcopy(self.reqs_dict[curr_time])
+            # The state before the arrival is only needed to save training data
+            old_net_spec_dict, old_req_info_dict = None, None
+            if self.engine_props['output_train_data']:
+                old_net_spec_dict = copy.deepcopy(self.net_spec_dict)
+                old_req_info_dict = copy.deepcopy(req_obj)
             self.handle_arrival(curr_time=curr_time)
 
             if self.engine_props['save_snapshots'] and req_num % self.engine_props['snapshot_step'] == 0:
+                start_ns = self.profiler.start()
                 self.stats_obj.update_snapshot(net_spec_dict=self.net_spec_dict, req_num=req_num)
+                self.profiler.stop(phase='snapshot', start_ns=start_ns)
 
             if self.engine_props['output_train_data']:
                 was_routed = self.sdn_obj.sdn_props.was_routed
                 if was_routed:
-                    req_info_dict = self.reqs_status_dict[self.reqs_dict[curr_time]['req_id']]
+                    req_info_dict = self.reqs_status_dict[req_obj.req_id]
                     self.stats_obj.update_train_data(old_req_info_dict=old_req_info_dict, req_info_dict=req_info_dict,
                                                      net_spec_dict=old_net_spec_dict)
 
@@ -183,8 +218,14 @@ class Engine:
         :param print_flag: Whether to print or not.
         :param base_fp: The base file path to save output statistics.
         """
+        if self.trace_obj is not None:
+            self.trace_obj.close()
+            self.trace_obj = None
+
         self.stats_obj.get_blocking()
         self.stats_obj.end_iter_update()
+        if self.profiler.is_enabled:
+            self.stats_obj.stats_props.phase_times_dict = self.profiler.get_phase_stats()
         # Some form of ML/RL is being used, ignore confidence intervals for training and testing
         if not self.engine_props['is_training']:
             return bool(self.stats_obj.get_conf_inter())
@@ -195,16 +236,19 @@ class Engine:
         self.stats_obj.save_stats(base_fp=base_fp)
         return False
 
-    def init_iter(self, iteration: int):
+    def init_iter(self, iteration: int, reqs_dict: dict = None, base_fp: str = None):
         """
         Initializes an iteration.
 
         :param iteration: The current iteration number.
+        :param reqs_dict: Requests shared with other engines, generated for this iteration if not given.
+        :param base_fp: The base file path to save the iteration's trace.
         """
         self.iteration = iteration
 
         self.stats_obj.iteration = iteration
         self.stats_obj.init_iter_stats()
+        self.profiler.reset()
         # To prevent incomplete saves
         try:
             signal.signal(signal.SIGINT, self.stats_obj.save_stats)
@@ -220,8 +264,29 @@ class Engine:
             if self.engine_props['deploy_model']:
                 self.ml_model = load_model(engine_props=self.engine_props)
 
-        seed = self.engine_props["seeds"][iteration] if self.engine_props["seeds"] else iteration + 1
-        self.generate_requests(seed)
+        replay_fp = None
+        if self.engine_props.get('replay_trace'):
+            replay_fp = get_trace_fp(base_dir=self.engine_props['replay_trace'], erlang=self.engine_props['erlang'],
+                                     iteration=iteration)
+
+        if self.engine_props.get('save_trace'):
+            if base_fp is None:
+                base_fp = 'data'
+            trace_dir = os.path.join(base_fp, 'output', self.sim_info, self.engine_props['thread_num'])
+            trace_fp = get_trace_fp(base_dir=trace_dir, erlang=self.engine_props['erlang'], iteration=iteration)
+            # Opening the new trace would truncate the one about to be replayed
+            if replay_fp is not None and os.path.abspath(trace_fp) == os.path.abspath(replay_fp):
+                raise ValueError(f'Can not record a trace over the trace being replayed: {replay_fp}.')
+            self.trace_obj = TraceRecorder(engine_props=self.engine_props, save_fp=trace_fp)
+
+        if reqs_dict is not None:
+            self.reqs_dict = reqs_dict
+        # Replay a previously recorded workload instead of generating a new one
+        elif replay_fp is not None:
+            self.reqs_dict = load_trace_requests(trace_fp=replay_fp, engine_props=self.engine_props)
+        else:
+            seed = self.engine_props["seeds"][iteration] if self.engine_props["seeds"] else iteration + 1
+            self.generate_requests(seed)
 
     def run(self):
         """
@@ -231,10 +296,10 @@ class Engine:
         for iteration in range(self.engine_props["max_iters"]):
             self.init_iter(iteration=iteration)
             req_num = 1
-            for curr_time in self.reqs_dict:
+            for curr_time, req_obj in self.reqs_dict.items():
                 self.handle_request(curr_time=curr_time, req_num=req_num)
 
-                if self.reqs_dict[curr_time]['request_type'] == 'arrival':
+                if req_obj.request_type == 'arrival':
                     req_num += 1
 
             end_iter = self.end_iter(iteration=iteration)
@@ -0,0 +1,122 @@
+import os
+import json
+import itertools
+
+from src.engine import Engine
+from helper_scripts.stats_helpers import get_paired_stats
+from helper_scripts.os_helpers import create_dir
+from arg_scripts.config_args import WORKLOAD_OPTIONS_LIST
+
+
+class MultiPolicyEngine:
+    """
+    Evaluates several policies in lockstep on one shared stream of requests (common random numbers).
+    """
+
+    def __init__(self, engine_props_dict: dict):
+        if len(engine_props_dict) < 2:
+            raise ValueError(f"At least two policies are needed to be compared, got: {len(engine_props_dict)}.")
+
+        self.engine_props_dict = engine_props_dict
+        self._check_workloads()
+
+        self.engines_dict = {thread_num: Engine(engine_props=engine_props)
+                             for thread_num, engine_props in self.engine_props_dict.items()}
+        self.base_engine = next(iter(self.engines_dict.values()))
+        self.compare_dict = dict()
+
+        # Every policy sees the same topology, routes only have to be found once
+        k_paths_cache = dict()
+        for engine in self.engines_dict.values():
+            engine.sdn_obj.route_obj.k_paths_cache = k_paths_cache
+
+    def _check_workloads(self):
+        base_props = next(iter(self.engine_props_dict.values()))
+        for thread_num, engine_props in self.engine_props_dict.items():
+            for option in WORKLOAD_OPTIONS_LIST:
+                if engine_props.get(option) != base_props.get(option):
+                    raise ValueError(f"Policies must share the same workload to be compared, '{option}' differs "
+                                     f"for simulation: {thread_num}.")
+
+    def update_compare(self):
+        """
+        Updates the paired blocking comparison of every pair of policies.
+
+        :return: Whether every pair of policies is statistically separated.
+        :rtype: bool
+        """
+        for (thread_one, engine_one), (thread_two, engine_two) in itertools.combinations(self.engines_dict.items(), 2):
+            self.compare_dict[f'{thread_one}_vs_{thread_two}'] = get_paired_stats(
+                block_one_list=engine_one.stats_obj.stats_props.sim_block_list,
+                block_two_list=engine_two.stats_obj.stats_props.sim_block_list,
+            )
+
+        return all(pair_dict['is_separated'] for pair_dict in self.compare_dict.values())
+
+    def end_iter(self, iteration: int, base_fp: str = 'data'):
+        """
+        Updates iteration statistics for every policy.
+
+        :param iteration: The current iteration.
+        :param base_fp: The base file path to save output statistics.
+        :return: Whether the policies have been separated and the simulation can end.
+        :rtype: bool
+        """
+        for engine in self.engines_dict.values():
+            engine.end_iter(iteration=iteration, print_flag=False, base_fp=base_fp)
+            # Engines in training have already saved their statistics
+            if not engine.engine_props['is_training']:
+                engine.stats_obj.save_stats(base_fp=base_fp)
+
+        return self.update_compare()
+
+    def save_compare(self, base_fp: str = 'data'):
+        """
+        Saves the paired blocking comparison of every pair of policies.
+
+        :param base_fp: The base file path to save the comparison.
+        """
+        save_fp = os.path.join(base_fp, 'output', self.base_engine.sim_info, 'compare')
+        create_dir(file_path=save_fp)
+
+        save_dict = {
+            'policies': {thread_num: {'allocation_method': engine.engine_props['allocation_method'],
+                                      'route_method': engine.engine_props['route_method'],
+                                      'sim_block_list': engine.stats_obj.stats_props.sim_block_list}
+                         for thread_num, engine in self.engines_dict.items()},
+            'pairs': self.compare_dict,
+        }
+        with open(os.path.join(save_fp, f"{self.base_engine.engine_props['erlang']}_erlang.json"), 'w',
+                  encoding='utf-8') as file_obj:
+            json.dump(save_dict, file_obj, indent=4)
+
+    def run(self):
+        """
+        Controls the MultiPolicyEngine class methods.
+        """
+        for engine in self.engines_dict.values():
+            engine.create_topology()
+
+        for iteration in range(self.base_engine.engine_props['max_iters']):
+            # Requests are generated once and shared by every policy
+            self.base_engine.init_iter(iteration=iteration)
+            for engine in self.engines_dict.values():
+                if engine is not self.base_engine:
+                    engine.init_iter(iteration=iteration, reqs_dict=self.base_engine.reqs_dict)
+
+            req_num = 1
+            for curr_time, req_obj in self.base_engine.reqs_dict.items():
+                for engine in self.engines_dict.values():
+                    engine.handle_request(curr_time=curr_time, req_num=req_num)
+
+                if req_obj.request_type == 'arrival':
+                    req_num += 1
+
+            if self.end_iter(iteration=iteration):
+                print(f"Every policy separated after {iteration + 1} iterations for "
+                      f"Erlang: {self.base_engine.engine_props['erlang']}.")
+                break
+
+        self.save_compare()
+        print(f"Erlang: {self.base_engine.engine_props['erlang']} finished comparing simulations: "
+              f"{', '.join(self.engines_dict.keys())}.")
@@ -1,4 +1,62 @@
-from helper_scripts.random_helpers import set_seed, get_uniform_rv, get_exponential_rv
+import math
+from collections.abc import Mapping
+
+import numpy as np
+
+from arg_scripts.request_args import REQUEST_DTYPE, EVENT_DTYPE, Request
+from arg_scripts.trace_args import REQ_TYPE_LIST
+from helper_scripts.random_helpers import get_rng, get_uniform_rv, get_exponential_rv
+
+
+class RequestTable(Mapping):
+    """
+    Every request of a simulation stored in compact arrays, each event is read as a Request keyed by its time.
+    """
+
+    def __init__(self, requests_arr: np.ndarray, events_arr: np.ndarray, nodes_list: list, mod_per_bw: dict):
+        self.requests_arr = requests_arr
+        self.events_arr = events_arr[np.argsort(events_arr['time'], kind='stable')]
+        self.times_arr = self.events_arr['time']
+        self.nodes_list = nodes_list
+        self.bandwidth_list = list(mod_per_bw.keys())
+        self.mod_per_bw = mod_per_bw
+
+        # Events are mostly read in order, and several times each, the last one read is kept
+        self.last_index = -1
+        self.last_time = None
+        self.last_req = None
+
+    def _find_event(self, curr_time: float):
+        event_index = self.last_index + 1
+        if event_index >= len(self.times_arr) or self.times_arr[event_index] != curr_time:
+            event_index = int(np.searchsorted(self.times_arr, curr_time))
+            if event_index >= len(self.times_arr) or self.times_arr[event_index] != curr_time:
+                raise KeyError(curr_time)
+
+        return event_index
+
+    def __getitem__(self, curr_time: float):
+        if curr_time == self.last_time:
+            return self.last_req
+
+        event_index = self._find_event(curr_time=curr_time)
+        _, req_index, req_type = self.events_arr.item(event_index)
+        req_id, source, dest, arrive, depart, bandwidth_index = self.requests_arr.item(req_index)
+        bandwidth = self.bandwidth_list[bandwidth_index]
+
+        self.last_req = Request(req_id=req_id, source=self.nodes_list[source], destination=self.nodes_list[dest],
+                                arrive=arrive, depart=None if math.isnan(depart) else depart,
+                                request_type=REQ_TYPE_LIST[req_type], bandwidth=bandwidth,
+                                mod_formats=self.mod_per_bw[bandwidth])
+        self.last_index = event_index
+        self.last_time = curr_time
+        return self.last_req
+
+    def __iter__(self):
+        return iter(self.times_arr.tolist())
+
+    def __len__(self):
+        return len(self.events_arr)
 
 
 def get_requests(seed: int, engine_props: dict):
@@ -8,18 +66,22 @@ def get_requests(seed: int, engine_props: dict):
     :param seed: Seed for random generation.
     :param engine_props: Properties from the engine class.
     :return: The generated requests and request information.
-    :rtype: dict
+    :rtype: RequestTable
     """
-    requests_dict = {}
+    requests_list = list()
+    times_set = set()
     current_time = 0
     request_id = 1
 
     nodes_list = list(engine_props['topology_info']['nodes'].keys())
-    set_seed(seed=seed)
+    nodes_dict = {node: node_index for node_index, node in enumerate(nodes_list)}
+    # Each simulation draws from its own generator, so several may run in one process
+    rng = get_rng(seed=seed)
 
     bw_counts_dict = {bandwidth: int(engine_props['request_distribution'][bandwidth] * engine_props['num_requests'])
                       for bandwidth in engine_props['mod_per_bw']}
     bandwidth_list = list(engine_props['mod_per_bw'].keys())
+    bandwidths_dict = {bandwidth: bw_index for bw_index, bandwidth in enumerate(bandwidth_list)}
 
     # Check to see if the number of requests can be distributed
     difference = engine_props['num_requests'] - sum(bw_counts_dict.values())
@@ -28,48 +90,38 @@ def get_requests(seed: int, engine_props: dict):
                          'either change the number of requests, or change the percentages for the bandwidth values'
                          'selected.')
 
-    # Generate requests, multiply the number of requests by two since we have arrival and departure types
-    while len(requests_dict) < (engine_props['num_requests'] * 2):
-        current_time += get_exponential_rv(scale_param=engine_props['arrival_rate'])
+    # Generate requests, each one has an arrival and a departure
+    while len(requests_list) < engine_props['num_requests']:
+        current_time += get_exponential_rv(scale_param=engine_props['arrival_rate'], rng=rng)
 
-        depart_time = current_time + get_exponential_rv(scale_param=1 / engine_props['holding_time'])
+        depart_time = current_time + get_exponential_rv(scale_param=1 / engine_props['holding_time'], rng=rng)
 
-        source = nodes_list[get_uniform_rv(scale_param=len(nodes_list))]
-        dest = nodes_list[get_uniform_rv(scale_param=len(nodes_list))]
+        source = nodes_list[get_uniform_rv(scale_param=len(nodes_list), rng=rng)]
+        dest = nodes_list[get_uniform_rv(scale_param=len(nodes_list), rng=rng)]
 
         while dest == source:
-            dest = nodes_list[get_uniform_rv(scale_param=len(nodes_list))]
+            dest = nodes_list[get_uniform_rv(scale_param=len(nodes_list), rng=rng)]
 
         while True:
-            chosen_bandwidth = bandwidth_list[get_uniform_rv(scale_param=len(bandwidth_list))]
+            chosen_bandwidth = bandwidth_list[get_uniform_rv(scale_param=len(bandwidth_list), rng=rng)]
             if bw_counts_dict[chosen_bandwidth] > 0:
                 bw_counts_dict[chosen_bandwidth] -= 1
                 break
 
-        if current_time not in requests_dict and depart_time not in requests_dict:
-            requests_dict.update({current_time: {
-                "req_id": request_id,
-                "source": source,
-                "destination": dest,
-                "arrive": current_time,
-                "depart": depart_time,
-                "request_type": "arrival",
-                "bandwidth": chosen_bandwidth,
-                "mod_formats": engine_props['mod_per_bw'][chosen_bandwidth],
-            }})
-            requests_dict.update({depart_time: {
-                "req_id": request_id,
-                "source": source,
-                "destination": dest,
-                "arrive": current_time,
-                "depart": depart_time,
-                "request_type": "release",
-                "bandwidth": chosen_bandwidth,
-                "mod_formats": engine_props['mod_per_bw'][chosen_bandwidth],
-            }})
+        if current_time not in times_set and depart_time not in times_set:
+            times_set.update((current_time, depart_time))
+            requests_list.append((request_id, nodes_dict[source], nodes_dict[dest], current_time, depart_time,
+                                  bandwidths_dict[chosen_bandwidth]))
             request_id += 1
         # Bandwidth was not chosen due to either arrival or depart time already existing, add back to distribution
         else:
             bw_counts_dict[chosen_bandwidth] += 1
 
-    return requests_dict
+    requests_arr = np.array(requests_list, dtype=REQUEST_DTYPE)
+    events_arr = np.zeros(len(requests_arr) * 2, dtype=EVENT_DTYPE)
+    events_arr['time'] = np.concatenate((requests_arr['arrive'], requests_arr['depart']))
+    events_arr['req_index'] = np.tile(np.arange(len(requests_arr)), 2)
+    events_arr['req_type'][len(requests_arr):] = REQ_TYPE_LIST.index('release')
+
+    return RequestTable(requests_arr=requests_arr, events_arr=events_arr, nodes_list=nodes_list,
+                        mod_per_bw=engine_props['mod_per_bw'])
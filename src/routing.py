@@ -1,9 +1,13 @@
+import itertools
+from functools import partial
+
 import networkx as nx
 import numpy as np
 
+from arg_scripts.engine_args import EngineConfig, RouteMethod
 from arg_scripts.routing_args import RoutingProps
 from helper_scripts.routing_helpers import RoutingHelpers
-from helper_scripts.sim_helpers import find_path_len, get_path_mod, find_free_slots, sort_nested_dict_vals
+from helper_scripts.sim_helpers import find_path_len, get_path_mod, find_free_slots, sort_nested_dict_vals, get_link_spectrum
 
 
 class Routing:
@@ -11,25 +15,47 @@ class Routing:
     This class contains methods related to routing network requests.
     """
 
-    def __init__(self, engine_props: dict, sdn_props: object):
+    def __init__(self, engine_props: dict, sdn_props: object, config_obj: EngineConfig = None):
         self.engine_props = engine_props
         self.sdn_props = sdn_props
         self.route_props = RoutingProps()
+        # The topology never changes, may be shared by several routing objects
+        self.k_paths_cache = dict()
 
         self.route_help_obj = RoutingHelpers(engine_props=self.engine_props, sdn_props=self.sdn_props,
                                              route_props=self.route_props)
 
+        self.route_funcs_dict = {
+            RouteMethod.NLI_AWARE: self.find_least_nli,
+            RouteMethod.XT_AWARE: self.find_least_xt,
+            RouteMethod.LEAST_CONGESTED: self.find_least_cong,
+            RouteMethod.SHORTEST_PATH: partial(self.find_least_weight, weight='length'),
+            RouteMethod.K_SHORTEST_PATH: self.find_k_shortest,
+        }
+        self.config_obj = None
+        self.route_func = None
+        self.update_config(config_obj=config_obj)
+
+    def update_config(self, config_obj: EngineConfig = None):
+        """
+        Updates the compiled configuration and the routing function it selects.
+
+        :param config_obj: The compiled configuration, compiled from the engine properties if not given.
+        """
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
+
+        self.config_obj = config_obj
+        self.route_func = self.route_funcs_dict.get(config_obj.route_method)
+
     def _find_most_cong_link(self, path_list: list):
         most_cong_link = None
         most_cong_slots = -1
 
         for i in range(len(path_list) - 1):
             link_dict = self.sdn_props.net_spec_dict[(path_list[i], path_list[i + 1])]
-            free_slots = 0
-            for band in link_dict['cores_matrix']:
-                cores_matrix = link_dict['cores_matrix'][band]
-                for core_arr in cores_matrix:
-                    free_slots += np.sum(core_arr == 0)
+            spectrum_arr, _ = get_link_spectrum(link_dict=link_dict)
+            free_slots = spectrum_arr.size - np.count_nonzero(spectrum_arr)
 
             if free_slots < most_cong_slots or most_cong_link is None:
                 most_cong_slots = free_slots
@@ -97,7 +123,7 @@ class Routing:
                 self.route_props.mod_formats_matrix.append(mod_format_list)
             else:
                 resp_weight = find_path_len(path_list=path_list, topology=self.sdn_props.topology)
-                mod_format = get_path_mod(self.sdn_props.mod_formats, resp_weight)
+                mod_format = get_path_mod(self.sdn_props.mod_formats_dict, resp_weight)
                 self.route_props.mod_formats_matrix.append([mod_format])
 
             self.route_props.weights_list.append(resp_weight)
@@ -108,14 +134,17 @@ class Routing:
         """
         Finds the k-shortest paths with respect to length from source to destination.
         """
-        # This networkx function will always return the shortest paths in order
-        paths_obj = nx.shortest_simple_paths(G=self.engine_props['topology'], source=self.sdn_props.source,
-                                             target=self.sdn_props.destination, weight='length')
-
-        for k, path_list in enumerate(paths_obj):
-            if k > self.engine_props['k_paths'] - 1:
-                break
-            path_len = find_path_len(path_list=path_list, topology=self.engine_props['topology'])
+        cache_key = (self.sdn_props.source, self.sdn_props.destination, self.config_obj.k_paths)
+        if cache_key not in self.k_paths_cache:
+            # This networkx function will always return the shortest paths in order
+            paths_obj = nx.shortest_simple_paths(G=self.config_obj.topology, source=self.sdn_props.source,
+                                                 target=self.sdn_props.destination, weight='length')
+            self.k_paths_cache[cache_key] = [
+                (path_list, find_path_len(path_list=path_list, topology=self.config_obj.topology))
+                for path_list in itertools.islice(paths_obj, self.config_obj.k_paths)
+            ]
+
+        for path_list, path_len in self.k_paths_cache[cache_key]:
             chosen_bw = self.sdn_props.bandwidth
             mod_format = get_path_mod(mods_dict=self.engine_props['mod_per_bw'][chosen_bw], path_len=path_len)
 
@@ -180,23 +209,17 @@ class Routing:
         self.route_props.mod_formats_matrix = list()
         self.route_props.weights_list = list()
 
-    def get_route(self):
+    def get_route(self, route_method: RouteMethod = None):
         """
         Controls the class by finding the appropriate routing function.
 
+        :param route_method: Overrides the configured routing method for this request.
         :return: None
         """
         self._init_route_info()
 
-        if self.engine_props['route_method'] == 'nli_aware':
-            self.find_least_nli()
-        elif self.engine_props['route_method'] == 'xt_aware':
-            self.find_least_xt()
-        elif self.engine_props['route_method'] == 'least_congested':
-            self.find_least_cong()
-        elif self.engine_props['route_method'] == 'shortest_path':
-            self.find_least_weight(weight='length')
-        elif self.engine_props['route_method'] == 'k_shortest_path':
-            self.find_k_shortest()
-        else:
-            raise NotImplementedError(f"Routing method not recognized, got: {self.engine_props['route_method']}.")
+        route_func = self.route_func if route_method is None else self.route_funcs_dict.get(route_method)
+        if route_func is None:
+            raise NotImplementedError(f"Routing method not recognized, got: {self.config_obj.route_method_name}.")
+
+        route_func()
@@ -2,8 +2,11 @@ import time
 
 import numpy as np
 
-from helper_scripts.sim_helpers import sort_dict_keys, get_path_mod, find_path_len
-from helper_scripts.ml_helpers import get_ml_obs
+from helper_scripts.sim_helpers import sort_dict_keys, get_path_mod, find_path_len, get_link_spectrum
+from helper_scripts.ml_helpers import MLObsEncoder
+from helper_scripts.profile_helpers import PhaseProfiler
+from helper_scripts.spectrum_helpers import SlicingPlanner
+from arg_scripts.engine_args import EngineConfig
 from arg_scripts.sdn_args import SDNProps
 from src.routing import Routing
 from src.spectrum_assignment import SpectrumAssignment
@@ -14,31 +17,52 @@ class SDNController:
     This class contains methods to support software-defined network controller functionality.
     """
 
-    def __init__(self, engine_props: dict):
+    def __init__(self, engine_props: dict, config_obj: EngineConfig = None):
         self.engine_props = engine_props
         self.sdn_props = SDNProps()
 
         self.ai_obj = None
-        self.route_obj = Routing(engine_props=self.engine_props, sdn_props=self.sdn_props)
-        self.spectrum_obj = SpectrumAssignment(engine_props=self.engine_props, sdn_props=self.sdn_props)
+        self.ml_obs_obj = None
+        self.profiler = PhaseProfiler()
+
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
+        self.config_obj = config_obj
+        self.route_obj = Routing(engine_props=self.engine_props, sdn_props=self.sdn_props, config_obj=config_obj)
+        self.spectrum_obj = SpectrumAssignment(engine_props=self.engine_props, sdn_props=self.sdn_props,
+                                               config_obj=config_obj)
+        self.slicing_obj = SlicingPlanner(engine_props=self.engine_props, config_obj=config_obj)
+
+    def update_config(self, config_obj: EngineConfig = None):
+        """
+        Updates the compiled configuration of the controller, its routing and its spectrum assignment.
+
+        :param config_obj: The compiled configuration, compiled from the engine properties if not given.
+        """
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
+
+        self.config_obj = config_obj
+        self.route_obj.update_config(config_obj=config_obj)
+        self.spectrum_obj.update_config(config_obj=config_obj)
+        self.slicing_obj.update_config(config_obj=config_obj)
 
     def release(self):
         """
         Removes a previously allocated request from the network.
         """
+        req_id = self.sdn_props.req_id
         for source, dest in zip(self.sdn_props.path_list, self.sdn_props.path_list[1:]):
-            for band in self.engine_props['band_list']:
-                for core_num in range(self.engine_props['cores_per_link']):
-                    core_arr = self.sdn_props.net_spec_dict[(source, dest)]['cores_matrix'][band][core_num]
-                    req_id_arr = np.where(core_arr == self.sdn_props.req_id)
-                    gb_arr = np.where(core_arr == (self.sdn_props.req_id * -1))
-
-                    for req_index in req_id_arr:
-                        self.sdn_props.net_spec_dict[(source, dest)]['cores_matrix'][band][core_num][req_index] = 0
-                        self.sdn_props.net_spec_dict[(dest, source)]['cores_matrix'][band][core_num][req_index] = 0
-                    for gb_index in gb_arr:
-                        self.sdn_props.net_spec_dict[(source, dest)]['cores_matrix'][band][core_num][gb_index] = 0
-                        self.sdn_props.net_spec_dict[(dest, source)]['cores_matrix'][band][core_num][gb_index] = 0
+            released_list = list()
+            for link_tuple in ((source, dest), (dest, source)):
+                spectrum_arr, _ = get_link_spectrum(link_dict=self.sdn_props.net_spec_dict[link_tuple])
+                # Both directions of a link usually share their arrays
+                if any(spectrum_arr is released_arr for released_arr in released_list):
+                    continue
+
+                # The request's slots hold its ID and its guard bands the negative of it
+                spectrum_arr[np.abs(spectrum_arr) == req_id] = 0
+                released_list.append(spectrum_arr)
 
     def _allocate_gb(self, band: str, core_matrix: list, rev_core_matrix: list, core_num: int, end_slot: int):
         if core_matrix[band][core_num][end_slot] != 0.0 or rev_core_matrix[band][core_num][end_slot] != 0.0:
@@ -57,7 +81,7 @@ class SDNController:
         band = self.spectrum_obj.spectrum_props.curr_band
         self.sdn_props.curr_band = band
 
-        if self.engine_props['guard_slots']:
+        if self.config_obj.guard_slots:
             end_slot = end_slot - 1
         else:
             end_slot += 1
@@ -78,21 +102,20 @@ class SDNController:
             core_matrix[band][core_num][start_slot:end_slot] = self.sdn_props.req_id
             rev_core_matrix[band][core_num][start_slot:end_slot] = self.sdn_props.req_id
 
-            if self.engine_props['guard_slots']:
+            if self.config_obj.guard_slots:
                 self._allocate_gb(core_matrix=core_matrix, rev_core_matrix=rev_core_matrix, end_slot=end_slot,
                                   core_num=core_num, band=band)
 
     # TODO: No support for multi-band
     def _update_req_stats(self, bandwidth: str):
+        spectrum_props = self.spectrum_obj.spectrum_props
         self.sdn_props.bandwidth_list.append(bandwidth)
-        for stat_key in self.sdn_props.stat_key_list:
-            spectrum_key = stat_key.split('_')[0]  # pylint: disable=use-maxsplit-arg
-            if spectrum_key == 'xt':
-                spectrum_key = 'xt_cost'
-            elif spectrum_key == 'core':
-                spectrum_key = 'core_num'
-
-            self.sdn_props.update_params(key=stat_key, spectrum_key=spectrum_key, spectrum_obj=self.spectrum_obj)
+        self.sdn_props.modulation_list.append(spectrum_props.modulation)
+        self.sdn_props.xt_list.append(spectrum_props.xt_cost)
+        self.sdn_props.core_list.append(spectrum_props.core_num)
+        self.sdn_props.band_list.append(spectrum_props.curr_band)
+        self.sdn_props.start_slot_list.append(spectrum_props.start_slot)
+        self.sdn_props.end_slot_list.append(spectrum_props.end_slot)
 
     def _allocate_slicing(self, num_segments: int, mod_format: str, path_list: list, bandwidth: str):
         self.sdn_props.num_trans = num_segments
@@ -101,7 +124,9 @@ class SDNController:
         for _ in range(num_segments):
             self.spectrum_obj.get_spectrum(mod_format_list=mod_format_list, slice_bandwidth=bandwidth)
             if self.spectrum_obj.spectrum_props.is_free:
+                start_ns = self.profiler.start()
                 self.allocate()
+                self.profiler.stop(phase='allocation', start_ns=start_ns)
                 self._update_req_stats(bandwidth=bandwidth)
             else:
                 self.sdn_props.was_routed = False
@@ -109,21 +134,58 @@ class SDNController:
                 self.release()
                 break
 
+    def _allocate_planned(self, num_segments: int, mod_format: str, path_list: list, bandwidth: str):
+        self.sdn_props.num_trans = num_segments
+        spectrum_props = self.spectrum_obj.spectrum_props
+        spectrum_props.path_list = path_list
+        slots_needed = self.config_obj.slots_needed_dict[(bandwidth, mod_format)]
+        guard_slots = self.config_obj.guard_slots
+
+        start_ns = self.profiler.start()
+        segments_list = self.slicing_obj.plan(window=slots_needed + guard_slots, num_segments=num_segments)
+        self.profiler.stop(phase='spectrum', start_ns=start_ns)
+        if segments_list is None:
+            spectrum_props.is_free = False
+            self.sdn_props.was_routed = False
+            self.sdn_props.block_reason = 'congestion'
+            return
+
+        spectrum_props.slots_needed = slots_needed
+        spectrum_props.modulation = mod_format
+        spectrum_props.is_free = True
+        # Every segment fits, they're only committed now so nothing has to be released
+        for core_num, band, start_slot in segments_list:
+            spectrum_props.core_num = core_num
+            spectrum_props.curr_band = band
+            spectrum_props.start_slot = start_slot
+            spectrum_props.end_slot = start_slot + slots_needed + 2 * guard_slots - 1
+
+            start_ns = self.profiler.start()
+            self.allocate()
+            self.profiler.stop(phase='allocation', start_ns=start_ns)
+            self._update_req_stats(bandwidth=bandwidth)
+
     def _handle_slicing(self, path_list: list, forced_segments: int):
+        is_planned = self.slicing_obj.is_supported(spectrum_props=self.spectrum_obj.spectrum_props)
+        if is_planned:
+            start_ns = self.profiler.start()
+            self.slicing_obj.set_path(net_spec_dict=self.sdn_props.net_spec_dict, path_list=path_list)
+            self.profiler.stop(phase='spectrum', start_ns=start_ns)
+
+        path_len = find_path_len(path_list=path_list, topology=self.config_obj.topology)
         bw_mod_dict = sort_dict_keys(dictionary=self.engine_props['mod_per_bw'])
         for bandwidth, mods_dict in bw_mod_dict.items():
             # We can't slice to a larger or equal bandwidth
             if int(bandwidth) >= int(self.sdn_props.bandwidth):
                 continue
 
-            path_len = find_path_len(path_list=path_list, topology=self.engine_props['topology'])
             mod_format = get_path_mod(mods_dict=mods_dict, path_len=path_len)
             if not mod_format:
                 continue
 
             self.sdn_props.was_routed = True
             num_segments = int(int(self.sdn_props.bandwidth) / int(bandwidth))
-            if num_segments > self.engine_props['max_segments']:
+            if num_segments > self.config_obj.max_segments:
                 self.sdn_props.was_routed = False
                 self.sdn_props.block_reason = 'max_segments'
                 break
@@ -132,8 +194,12 @@ class SDNController:
                 self.sdn_props.was_routed = False
                 continue
 
-            self._allocate_slicing(num_segments=num_segments, mod_format=mod_format, path_list=path_list,
-                                   bandwidth=bandwidth)
+            if is_planned:
+                self._allocate_planned(num_segments=num_segments, mod_format=mod_format, path_list=path_list,
+                                       bandwidth=bandwidth)
+            else:
+                self._allocate_slicing(num_segments=num_segments, mod_format=mod_format, path_list=path_list,
+                                       bandwidth=bandwidth)
 
             if self.sdn_props.was_routed:
                 self.sdn_props.is_sliced = True
@@ -145,6 +211,24 @@ class SDNController:
         self.sdn_props.bandwidth_list = list()
         self.sdn_props.reset_params()
 
+    def _get_ml_segments(self, ml_model: object, req_obj: object, route_matrix: list):
+        if self.ml_obs_obj is None:
+            self.ml_obs_obj = MLObsEncoder(engine_props=self.engine_props,
+                                           feature_names_list=ml_model.feature_names_list)
+
+        segments_list = [-1.0] * len(route_matrix)
+        path_indexes_list = [path_index for path_index, path_list in enumerate(route_matrix) if path_list is not False]
+        if path_indexes_list:
+            # Every path is predicted in one call
+            obs_mat = self.ml_obs_obj.update_obs_matrix(req_obj=req_obj,
+                                                        paths_matrix=[route_matrix[path_index]
+                                                                      for path_index in path_indexes_list],
+                                                        net_spec_dict=self.sdn_props.net_spec_dict)
+            for path_index, forced_segments in zip(path_indexes_list, ml_model.predict(obs_mat)):
+                segments_list[path_index] = forced_segments
+
+        return segments_list
+
     def handle_event(self, req_dict: dict, request_type: str, force_slicing: bool = False,
                      # pylint: disable=too-many-statements
                      force_route_matrix: list = None, forced_index: int = None,
@@ -167,12 +251,16 @@ class SDNController:
         self.sdn_props.num_trans = 1
 
         if request_type == "release":
+            start_ns = self.profiler.start()
             self.release()
+            self.profiler.stop(phase='release', start_ns=start_ns)
             return
 
         start_time = time.time()
         if force_route_matrix is None:
+            start_ns = self.profiler.start()
             self.route_obj.get_route()
+            self.profiler.stop(phase='routing', start_ns=start_ns)
             route_matrix = self.route_obj.route_props.paths_matrix
         else:
             route_matrix = force_route_matrix
@@ -182,54 +270,58 @@ class SDNController:
             self.route_obj.route_props.weights_list = [0]
         route_time = time.time() - start_time
 
-        segment_slicing = False
-        while True:
+        # Predictions are made once for the request, not every time a path is tried
+        if ml_model is not None:
+            segments_list = self._get_ml_segments(ml_model=ml_model, req_obj=req_dict, route_matrix=route_matrix)
+        else:
+            segments_list = [-1.0] * len(route_matrix)
+
+        # Whole requests are tried on every path before any is sliced, paths already sliced aren't tried again
+        sliced_set = set()
+        for segment_slicing in (False, True):
+            if segment_slicing and (self.config_obj.max_segments <= 1 or self.sdn_props.bandwidth == '25'):
+                break
+
             for path_index, path_list in enumerate(route_matrix):
-                if path_list is not False:
-                    self.sdn_props.path_list = path_list
-                    mod_format_list = self.route_obj.route_props.mod_formats_matrix[path_index]
-
-                    if ml_model is not None:
-                        input_df = get_ml_obs(req_dict=req_dict, engine_props=self.engine_props,
-                                              sdn_props=self.sdn_props)
-                        forced_segments = ml_model.predict(input_df)[0]
-                    else:
-                        forced_segments = -1.0
-
-                    # fixme: Looping twice (Due to segment slicing flag)
-                    if segment_slicing or force_slicing or forced_segments > 1:
-                        force_slicing = True
-
-                        self._handle_slicing(path_list=path_list, forced_segments=forced_segments)
-                        if not self.sdn_props.was_routed:
-                            self.sdn_props.num_trans = 1
-                            continue
-                    else:
-                        self.spectrum_obj.spectrum_props.forced_index = forced_index
-                        self.spectrum_obj.spectrum_props.forced_core = force_core
-                        self.spectrum_obj.spectrum_props.path_list = path_list
-                        self.spectrum_obj.spectrum_props.forced_band = forced_band
-                        self.spectrum_obj.get_spectrum(mod_format_list=mod_format_list)
-                        # Request was blocked for this path
-                        if self.spectrum_obj.spectrum_props.is_free is not True:
-                            self.sdn_props.block_reason = 'congestion'
-                            continue
-                        self._update_req_stats(bandwidth=self.sdn_props.bandwidth)
-
-                    self.sdn_props.was_routed = True
-                    self.sdn_props.route_time = route_time
-                    self.sdn_props.path_weight = self.route_obj.route_props.weights_list[path_index]
-                    self.sdn_props.spectrum_object = self.spectrum_obj.spectrum_props
-
-                    if not segment_slicing and not force_slicing:
-                        self.sdn_props.is_sliced = False
-                        self.allocate()
-                    return
-
-            if self.engine_props['max_segments'] > 1 and self.sdn_props.bandwidth != '25' and not segment_slicing:
-                segment_slicing = True
-                continue
+                if path_list is False or path_index in sliced_set:
+                    continue
+
+                self.sdn_props.path_list = path_list
+                mod_format_list = self.route_obj.route_props.mod_formats_matrix[path_index]
+
+                forced_segments = segments_list[path_index]
+                if segment_slicing or force_slicing or forced_segments > 1:
+                    force_slicing = True
+                    sliced_set.add(path_index)
+
+                    self._handle_slicing(path_list=path_list, forced_segments=forced_segments)
+                    if not self.sdn_props.was_routed:
+                        self.sdn_props.num_trans = 1
+                        continue
+                else:
+                    self.spectrum_obj.spectrum_props.forced_index = forced_index
+                    self.spectrum_obj.spectrum_props.forced_core = force_core
+                    self.spectrum_obj.spectrum_props.path_list = path_list
+                    self.spectrum_obj.spectrum_props.forced_band = forced_band
+                    self.spectrum_obj.get_spectrum(mod_format_list=mod_format_list)
+                    # Request was blocked for this path
+                    if self.spectrum_obj.spectrum_props.is_free is not True:
+                        self.sdn_props.block_reason = 'congestion'
+                        continue
+                    self._update_req_stats(bandwidth=self.sdn_props.bandwidth)
+
+                self.sdn_props.was_routed = True
+                self.sdn_props.path_index = path_index
+                self.sdn_props.route_time = route_time
+                self.sdn_props.path_weight = self.route_obj.route_props.weights_list[path_index]
+                self.sdn_props.spectrum_object = self.spectrum_obj.spectrum_props
+
+                if not force_slicing:
+                    self.sdn_props.is_sliced = False
+                    start_ns = self.profiler.start()
+                    self.allocate()
+                    self.profiler.stop(phase='allocation', start_ns=start_ns)
+                return
 
-            self.sdn_props.block_reason = 'distance'
-            self.sdn_props.was_routed = False
-            return
+        self.sdn_props.block_reason = 'distance'
+        self.sdn_props.was_routed = False
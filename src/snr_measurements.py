@@ -3,6 +3,7 @@ import math
 import numpy as np
 import networkx as nx
 
+from arg_scripts.engine_args import EngineConfig
 from arg_scripts.snr_args import SNRProps
 
 
@@ -12,7 +13,8 @@ class SnrMeasurements:
     Handles signal-to-noise ratio calculations for a given request.
     """
 
-    def __init__(self, engine_props: dict, sdn_props: object, spectrum_props: object):
+    def __init__(self, engine_props: dict, sdn_props: object, spectrum_props: object,
+                 config_obj: EngineConfig = None):
         self.snr_props = SNRProps()
         self.engine_props = engine_props
         self.sdn_props = sdn_props
@@ -22,6 +24,23 @@ class SnrMeasurements:
         self.link_id = None
         self.num_slots = None
 
+        self.snr_funcs_dict = {'snr_calc_nli': self.check_snr, 'xt_calculation': self.check_xt}
+        self.config_obj = None
+        self.snr_func = None
+        self.update_config(config_obj=config_obj)
+
+    def update_config(self, config_obj: EngineConfig = None):
+        """
+        Updates the compiled configuration and the signal-to-noise ratio check it selects.
+
+        :param config_obj: The compiled configuration, compiled from the engine properties if not given.
+        """
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
+
+        self.config_obj = config_obj
+        self.snr_func = self.snr_funcs_dict.get(config_obj.snr_type)
+
     def _calculate_sci_psd(self):
         """
         Calculates the self-phase power spectral density.
@@ -44,10 +63,10 @@ class SnrMeasurements:
         :rtype: float
         """
         channel_bw = len(np.where(req_id == curr_link[self.spectrum_props.core_num])[0])
-        channel_bw *= self.engine_props['bw_per_slot']
-        channel_freq = ((slot_index * self.engine_props['bw_per_slot']) + (channel_bw / 2)) * 10 ** 9
+        channel_bw *= self.config_obj.bw_per_slot
+        channel_freq = ((slot_index * self.config_obj.bw_per_slot) + (channel_bw / 2)) * 10 ** 9
         channel_bw *= 10 ** 9
-        channel_psd = self.engine_props['input_power'] / channel_bw
+        channel_psd = self.config_obj.input_power / channel_bw
 
         if self.snr_props.center_freq != channel_freq:
             log_term = abs(self.snr_props.center_freq - channel_freq) + (channel_bw / 2)
@@ -69,11 +88,11 @@ class SnrMeasurements:
         self.channels_list = []
         # Cross-phase modulation noise
         xci_noise = 0
-        # TODO: Only works for c-band
-        for slot_index in range(self.engine_props['c_band']):
-            source = self.spectrum_props.path_list[link_num]
-            dest = self.spectrum_props.path_list[link_num + 1]
-            curr_link = self.sdn_props.net_spec_dict[(source, dest)]['cores_matrix']['c']
+        source = self.spectrum_props.path_list[link_num]
+        dest = self.spectrum_props.path_list[link_num + 1]
+        # Noise is only from channels in the band the request was allocated to
+        curr_link = self.sdn_props.net_spec_dict[(source, dest)]['cores_matrix'][self.spectrum_props.curr_band]
+        for slot_index in range(curr_link.shape[-1]):
             req_id = curr_link[self.spectrum_props.core_num][slot_index]
 
             # Spectrum is occupied
@@ -96,7 +115,7 @@ class SnrMeasurements:
         mean_xt *= self.snr_props.link_dict['mode_coupling_co'] ** 2
         mean_xt /= (self.snr_props.link_dict['propagation_const'] * self.snr_props.link_dict['core_pitch'])
         # The cross-talk noise power
-        power_xt = num_adjacent * mean_xt * self.snr_props.length * 1e3 * self.engine_props['input_power']
+        power_xt = num_adjacent * mean_xt * self.snr_props.length * 1e3 * self.config_obj.input_power
 
         return power_xt
 
@@ -178,12 +197,12 @@ class SnrMeasurements:
         """
         Updates variables for the center frequency, bandwidth, and PSD for the current request.
         """
-        self.snr_props.center_freq = self.spectrum_props.start_slot * self.engine_props['bw_per_slot']
-        self.snr_props.center_freq += ((self.num_slots * self.engine_props['bw_per_slot']) / 2)
+        self.snr_props.center_freq = self.spectrum_props.start_slot * self.config_obj.bw_per_slot
+        self.snr_props.center_freq += ((self.num_slots * self.config_obj.bw_per_slot) / 2)
         self.snr_props.center_freq *= 10 ** 9
 
-        self.snr_props.bandwidth = self.num_slots * self.engine_props['bw_per_slot'] * 10 ** 9
-        self.snr_props.center_psd = self.engine_props['input_power'] / self.snr_props.bandwidth
+        self.snr_props.bandwidth = self.num_slots * self.config_obj.bw_per_slot * 10 ** 9
+        self.snr_props.center_psd = self.config_obj.input_power / self.snr_props.bandwidth
 
     def check_snr(self):
         """
@@ -314,11 +333,7 @@ class SnrMeasurements:
         :rtype: tuple
         """
         self.num_slots = self.spectrum_props.end_slot - self.spectrum_props.start_slot + 1
-        if self.engine_props['snr_type'] == "snr_calc_nli":
-            snr_check, xt_cost = self.check_snr()
-        elif self.engine_props['snr_type'] == "xt_calculation":
-            snr_check, xt_cost = self.check_xt()
-        else:
-            raise NotImplementedError(f"Unexpected snr_type flag got: {self.engine_props['snr_type']}")
+        if self.snr_func is None:
+            raise NotImplementedError(f"Unexpected snr_type flag got: {self.config_obj.snr_type}")
 
-        return snr_check, xt_cost
+        return self.snr_func()
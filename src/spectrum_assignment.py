@@ -1,10 +1,12 @@
-import itertools
-from operator import itemgetter
+from functools import partial
 
 import numpy as np
 
-from arg_scripts.spectrum_args import SpectrumProps
+from arg_scripts.engine_args import EngineConfig, AllocationMethod
+from arg_scripts.spectrum_args import SpectrumProps, PRIORITY_CORES_LIST
 from helper_scripts.spectrum_helpers import SpectrumHelpers
+from helper_scripts.sim_helpers import get_link_spectrum, find_free_runs
+from helper_scripts.profile_helpers import PhaseProfiler
 from src.snr_measurements import SnrMeasurements
 
 
@@ -13,20 +15,49 @@ class SpectrumAssignment:
     Attempt to find the available spectrum for a given request.
     """
 
-    def __init__(self, engine_props: dict, sdn_props: object):
+    def __init__(self, engine_props: dict, sdn_props: object, config_obj: EngineConfig = None):
         self.spectrum_props = SpectrumProps()
         self.engine_props = engine_props
         self.sdn_props = sdn_props
+        self.profiler = PhaseProfiler()
 
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
         self.snr_obj = SnrMeasurements(engine_props=self.engine_props, sdn_props=self.sdn_props,
-                                       spectrum_props=self.spectrum_props)
+                                       spectrum_props=self.spectrum_props, config_obj=config_obj)
         self.spec_help_obj = SpectrumHelpers(engine_props=self.engine_props, sdn_props=self.sdn_props,
-                                             spectrum_props=self.spectrum_props)
+                                             spectrum_props=self.spectrum_props, config_obj=config_obj)
+
+        self.config_obj = None
+        self.alloc_func = None
+        self.update_config(config_obj=config_obj)
+
+    def update_config(self, config_obj: EngineConfig = None):
+        """
+        Updates the compiled configuration and the allocation function it selects.
+
+        :param config_obj: The compiled configuration, compiled from the engine properties if not given.
+        """
+        if config_obj is None:
+            config_obj = EngineConfig(engine_props=self.engine_props)
+
+        self.config_obj = config_obj
+        self.snr_obj.update_config(config_obj=config_obj)
+        self.spec_help_obj.update_config(config_obj=config_obj)
+
+        if config_obj.allocation_method == AllocationMethod.BEST_FIT:
+            self.alloc_func = self.find_best_fit
+        elif config_obj.allocation_method == AllocationMethod.XT_AWARE:
+            self.alloc_func = self.xt_aware
+        elif config_obj.allocation_method is not None:
+            self.alloc_func = partial(self.handle_first_last, flag=config_obj.allocation_method_name)
+        else:
+            self.alloc_func = None
 
     def _allocate_best_fit(self, channels_list: list):
         for channel_dict in channels_list:
             for start_index in channel_dict['channel']:
-                end_index = (start_index + self.spectrum_props.slots_needed + self.engine_props['guard_slots']) - 1
+                end_index = (start_index + self.spectrum_props.slots_needed + self.config_obj.guard_slots) - 1
                 if end_index not in channel_dict['channel']:
                     break
 
@@ -41,62 +72,67 @@ class SpectrumAssignment:
                 if self.spectrum_props.is_free or len(self.spectrum_props.path_list) <= 2:
                     self.spectrum_props.is_free = True
                     self.spectrum_props.start_slot = start_index
-                    self.spectrum_props.end_slot = end_index + self.engine_props['guard_slots']
+                    self.spectrum_props.end_slot = end_index + self.config_obj.guard_slots
                     self.spectrum_props.core_num = channel_dict['core']
                     # TODO: This needs to be checked
                     self.spectrum_props.curr_band = channel_dict['band']
                     return
 
-    # TODO: No support for multi-band
     def find_best_fit(self):
         """
         Searches for and allocates the best-fit super channel on each link along the path.
         """
         channels_list = list()
+        if self.spectrum_props.forced_core is not None:
+            core_list = [self.spectrum_props.forced_core]
+        else:
+            core_list = list(range(self.config_obj.cores_per_link))
 
-        # Get all potential super channels
-        for (src, dest) in zip(self.spectrum_props.path_list[:-1], self.spectrum_props.path_list[1:]):
-            for core_num in range(self.engine_props['cores_per_link']):
-                if self.spectrum_props.forced_core is not None and self.spectrum_props.forced_core != core_num:
-                    continue
-
-                for band in self.engine_props['band_list']:
-                    if self.spectrum_props.forced_band is not None and self.spectrum_props.forced_band != band:
-                        continue
-
-                    core_arr = self.sdn_props.net_spec_dict[(src, dest)]['cores_matrix'][band][core_num]
-                    open_slots_arr = np.where(core_arr == 0)[0]
+        if self.spectrum_props.forced_band is not None:
+            band_list = [self.spectrum_props.forced_band]
+        else:
+            band_list = self.config_obj.band_list
 
-                    tmp_matrix = [list(map(itemgetter(1), g)) for k, g in
-                                  itertools.groupby(enumerate(open_slots_arr), lambda i_x: i_x[0] - i_x[1])]
-                    for channel_list in tmp_matrix:
-                        if len(channel_list) >= self.spectrum_props.slots_needed:
-                            channels_list.append(
-                                {'link': (src, dest), 'core': core_num, 'channel': channel_list, 'band': band})
+        # Get all potential super channels, every core and band of a link at once
+        for (src, dest) in zip(self.spectrum_props.path_list[:-1], self.spectrum_props.path_list[1:]):
+            spectrum_arr, band_offsets_dict = get_link_spectrum(link_dict=self.sdn_props.net_spec_dict[(src, dest)])
+            core_arr, band_index_arr, start_arr, length_arr = find_free_runs(free_mat=spectrum_arr[core_list] == 0,
+                                                                             band_offsets_dict=band_offsets_dict)
+
+            # Runs are kept in core order and then band order, bands not searched are dropped
+            stacked_list = list(band_offsets_dict)
+            rank_arr = np.array([band_list.index(band) if band in band_list else -1 for band in stacked_list])
+            band_rank_arr = rank_arr[band_index_arr]
+            is_open_arr = (length_arr >= self.spectrum_props.slots_needed) & (band_rank_arr != -1)
+            order_arr = np.lexsort((start_arr, band_rank_arr, core_arr))
+            order_arr = order_arr[is_open_arr[order_arr]]
+
+            for core_index, band_index, start_slot, length in zip(core_arr[order_arr].tolist(),
+                                                                  band_index_arr[order_arr].tolist(),
+                                                                  start_arr[order_arr].tolist(),
+                                                                  length_arr[order_arr].tolist()):
+                channels_list.append({'link': (src, dest), 'core': core_list[core_index],
+                                      'channel': range(start_slot, start_slot + length),
+                                      'band': stacked_list[band_index]})
 
         # Sort the list of candidate super channels
         channels_list = sorted(channels_list, key=lambda d: len(d['channel']))
         self._allocate_best_fit(channels_list=channels_list)
 
     def _setup_first_last(self):
-        core_matrix = list()
-
         if self.spectrum_props.forced_core is not None:
             core_list = [self.spectrum_props.forced_core]
-        elif self.engine_props['allocation_method'] in ('priority_first', 'priority_last'):
-            core_list = [0, 2, 4, 1, 3, 5, 6]
+        elif self.config_obj.allocation_method in (AllocationMethod.PRIORITY_FIRST, AllocationMethod.PRIORITY_LAST):
+            core_list = PRIORITY_CORES_LIST
         else:
-            core_list = list(range(0, self.engine_props['cores_per_link']))
+            core_list = list(range(0, self.config_obj.cores_per_link))
 
         if self.spectrum_props.forced_band is not None:
             band_list = [self.spectrum_props.forced_band]
         else:
-            band_list = self.engine_props['band_list']
-
-        for curr_core in core_list:
-            core_matrix.append([self.spectrum_props.cores_matrix[band][curr_core] for band in band_list])
+            band_list = self.config_obj.band_list
 
-        return core_matrix, core_list, self.engine_props['band_list']
+        return core_list, band_list
 
     def handle_first_last(self, flag: str):
         """
@@ -104,28 +140,11 @@ class SpectrumAssignment:
 
         :param flag: A flag to determine which allocation method to be used.
         """
-        # TODO: Cores matrix is now a dictionary, change name
-        core_matrix, core_list, band_list = self._setup_first_last()
-
-        for core_arr, core_num in zip(core_matrix, core_list):
-            for band_index in range(len(band_list)):  # pylint: disable=consider-using-enumerate
-                open_slots_arr = np.where(core_arr[band_index] == 0)[0]
-
-                # Source: https://stackoverflow.com/questions/3149440/splitting-list-based-on-missing-numbers-in-a-sequence
-                if flag in ('last_fit', 'priority_last'):
-                    open_slots_matrix = [list(map(itemgetter(1), g))[::-1] for k, g in
-                                         itertools.groupby(enumerate(open_slots_arr), lambda i_x: i_x[0] - i_x[1])]
-                elif flag in ('first_fit', 'priority_first', 'forced_index'):
-                    open_slots_matrix = [list(map(itemgetter(1), g)) for k, g in
-                                         itertools.groupby(enumerate(open_slots_arr), lambda i_x: i_x[0] - i_x[1])]
-                else:
-                    raise NotImplementedError(f'Invalid flag, got: {flag} and expected last_fit or first_fit.')
-
-                self.spec_help_obj.core_num = core_num
-                self.spec_help_obj.curr_band = band_list[band_index]
-                was_allocated = self.spec_help_obj.check_super_channels(open_slots_matrix=open_slots_matrix, flag=flag)
-                if was_allocated:
-                    return
+        if flag not in ('first_fit', 'last_fit', 'priority_first', 'priority_last', 'forced_index'):
+            raise NotImplementedError(f'Invalid flag, got: {flag} and expected last_fit or first_fit.')
+
+        core_list, band_list = self._setup_first_last()
+        self.spec_help_obj.find_super_channel(core_list=core_list, band_list=band_list, flag=flag)
 
     # fixme: Only works for 7 cores
     def xt_aware(self):
@@ -145,14 +164,10 @@ class SpectrumAssignment:
     def _get_spectrum(self):
         if self.spectrum_props.forced_index is not None:
             self.handle_first_last(flag='forced_index')
-        elif self.engine_props['allocation_method'] == 'best_fit':
-            self.find_best_fit()
-        elif self.engine_props['allocation_method'] in ('first_fit', 'last_fit', 'priority_first', 'priority_last'):
-            self.handle_first_last(flag=self.engine_props['allocation_method'])
-        elif self.engine_props['allocation_method'] == 'xt_aware':
-            self.xt_aware()
+        elif self.alloc_func is not None:
+            self.alloc_func()
         else:
-            raise NotImplementedError(f"Expected first_fit or best_fit, got: {self.engine_props['allocation_method']}")
+            raise NotImplementedError(f"Expected first_fit or best_fit, got: {self.config_obj.allocation_method_name}")
 
     def _init_spectrum_info(self):
         link_tuple = (self.spectrum_props.path_list[0], self.spectrum_props.path_list[1])
@@ -175,16 +190,19 @@ class SpectrumAssignment:
                 continue
 
             if slice_bandwidth:
-                bandwidth_dict = self.engine_props['mod_per_bw'][slice_bandwidth]
-                self.spectrum_props.slots_needed = bandwidth_dict[modulation]['slots_needed']
+                self.spectrum_props.slots_needed = self.config_obj.slots_needed_dict[(slice_bandwidth, modulation)]
             else:
                 self.spectrum_props.slots_needed = self.sdn_props.mod_formats_dict[modulation]['slots_needed']
+            start_ns = self.profiler.start()
             self._get_spectrum()
+            self.profiler.stop(phase='spectrum', start_ns=start_ns)
 
             if self.spectrum_props.is_free:
                 self.spectrum_props.modulation = modulation
-                if self.engine_props['snr_type'] != 'None' and self.engine_props['snr_type'] is not None:
+                if self.config_obj.is_snr:
+                    start_ns = self.profiler.start()
                     snr_check, xt_cost = self.snr_obj.handle_snr()
+                    self.profiler.stop(phase='snr', start_ns=start_ns)
                     self.spectrum_props.xt_cost = xt_cost
                     if not snr_check:
                         self.spectrum_props.is_free = False
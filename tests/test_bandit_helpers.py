@@ -14,16 +14,27 @@ class TestBanditHelpers(unittest.TestCase):
     Unit tests for the functions in the bandit_helpers script.
     """
 
-    @patch('builtins.open', new_callable=mock_open, read_data='{"state1": [1, 2, 3]}')
-    def test_load_model(self, mock_file):
+    @patch('builtins.open', new_callable=mock_open, read_data='{"(0, 1)": [1, 2, 3], "(1, 0)": [4, 5, 6]}')
+    def test_load_model_json(self, mock_file):
         """
-        Test loading a model from a JSON file.
+        Test loading an older model saved as a JSON file.
         """
-        expected_output = {'state1': [1, 2, 3]}
         result = load_model('model.json')
-        self.assertEqual(result, expected_output)
+        np.testing.assert_array_equal(result, [[[0, 0, 0], [1, 2, 3]], [[4, 5, 6], [0, 0, 0]]])
         mock_file.assert_called_once_with(os.path.join('logs', 'model.json'), 'r', encoding='utf-8')
 
+    def test_load_model_npz(self):
+        """
+        Test loading a model saved as an NPZ file.
+        """
+        values_arr = np.arange(12, dtype=np.float64).reshape((2, 2, 3))
+        save_dir = os.path.join('logs', 'alg')
+        os.makedirs(save_dir)
+        np.savez(os.path.join(save_dir, 'model.npz'), values=values_arr, counts=np.ones((2, 2, 3)))
+
+        result = load_model(os.path.join('alg', 'model.npz'))
+        np.testing.assert_array_equal(result, values_arr)
+
     def test_get_base_fp(self):
         """
         Test the generation of the base file path based on input parameters.
@@ -31,18 +42,19 @@ class TestBanditHelpers(unittest.TestCase):
         self.assertEqual(_get_base_fp(True, 10.0, 2), "e10.0_routes_c2.npy")
         self.assertEqual(_get_base_fp(False, 10.0, 2), "e10.0_cores_c2.npy")
 
-    @patch('json.dump')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_save_model(self, mock_file, mock_json_dump):
+    @patch('numpy.savez')
+    def test_save_model(self, mock_savez):
         """
-        Test saving a model to a JSON file.
+        Test saving a model to an NPZ file.
         """
-        state_values_dict = {('a', 'b'): np.array([1, 2, 3]), ('c', 'd'): np.array([4, 5, 6])}
-        expected_output = {"('a', 'b')": [1, 2, 3], "('c', 'd')": [4, 5, 6]}
-        _save_model(state_values_dict, 10.0, 2, 'save_dir', True)
-        mock_file.assert_called_once_with(os.path.join(os.getcwd(), 'save_dir', 'state_vals_e10.0_routes_c2.json'), 'w',
-                                          encoding='utf-8')
-        mock_json_dump.assert_called_once_with(expected_output, mock_file())
+        self_obj = MagicMock()
+        self_obj.engine_props = {'erlang': 10.0, 'cores_per_link': 2}
+        self_obj.is_path = True
+        self_obj.values = np.array([[1, 2, 3], [4, 5, 6]])
+        self_obj.counts = np.array([[1, 0, 0], [0, 2, 0]])
+        _save_model(self_obj, 'save_dir')
+        mock_savez.assert_called_once_with(os.path.join(os.getcwd(), 'save_dir', 'state_vals_e10.0_routes_c2.npz'),
+                                           values=self_obj.values, counts=self_obj.counts)
 
     @patch('helper_scripts.bandit_helpers.create_dir')
     @patch('numpy.save')
@@ -66,14 +78,15 @@ class TestBanditHelpers(unittest.TestCase):
         }
         props = MagicMock()
 
-        rewards_matrix = [[1] * num_requests for _ in range(iteration + 1)]
-        props.rewards_matrix = rewards_matrix
+        props.rewards_matrix = np.ones((max_iters, num_requests))
+        props.rewards_count = np.full(max_iters, num_requests)
 
         self_obj = MagicMock()
         self_obj.engine_props = engine_props
         self_obj.props = props
         self_obj.is_path = True
-        self_obj.values = {('a', 'b'): np.array([1, 2, 3]), ('c', 'd'): np.array([4, 5, 6])}
+        self_obj.values = np.array([[1, 2, 3], [4, 5, 6]])
+        self_obj.counts = np.array([[1, 1, 1], [1, 1, 1]])
 
         save_model(iteration, 'alg', self_obj)
 
@@ -86,28 +99,31 @@ class TestBanditHelpers(unittest.TestCase):
         np.testing.assert_array_equal(args[1], np.mean(props.rewards_matrix, axis=0))
         self.assertEqual(args[0], abs_rewards_fp)
 
-        # Print actual call arguments for debugging
-        print("Actual call arguments for _save_model:", mock_save_model.call_args)
+        mock_save_model.assert_called_once_with(self=self_obj, save_dir=save_dir)
 
-        actual_call = mock_save_model.call_args
-        expected_state_values_dict = {('a', 'b'): np.array([1, 2, 3]), ('c', 'd'): np.array([4, 5, 6])}
-        actual_state_values_dict = actual_call[1]['state_values_dict']
-
-        for key in expected_state_values_dict:  # pylint: disable=consider-using-dict-items
-            np.testing.assert_array_equal(expected_state_values_dict[key], actual_state_values_dict[key])
+    @patch('helper_scripts.bandit_helpers.save_model')
+    def test_update_bandit(self, mock_save_model):
+        """
+        Test updating the state-action values and the preallocated rewards.
+        """
+        rl_props = MagicMock()
+        rl_props.num_nodes = 3
+        engine_props = {'k_paths': 2, 'cores_per_link': 2, 'epsilon_start': 0.0, 'max_iters': 2,
+                        'num_requests': 4}
+        bandit = EpsilonGreedyBandit(rl_props, engine_props, is_path=False)
+        self.assertEqual(bandit.values.shape, (3, 3, 2, 2))
+        self.assertEqual(bandit.props.rewards_matrix.shape, (2, 4))
 
-        expected_call_kwargs = {
-            'state_values_dict': expected_state_values_dict,
-            'erlang': 10.0,
-            'cores_per_link': 2,
-            'save_dir': save_dir,
-            'is_path': True
-        }
+        bandit.select_core_arm(source=0, dest=2, path_index=1)
+        bandit.update(arm=1, reward=10.0, iteration=0)
+        bandit.update(arm=1, reward=4.0, iteration=0)
 
-        self.assertEqual(expected_call_kwargs['erlang'], actual_call[1]['erlang'])
-        self.assertEqual(expected_call_kwargs['cores_per_link'], actual_call[1]['cores_per_link'])
-        self.assertEqual(expected_call_kwargs['save_dir'], actual_call[1]['save_dir'])
-        self.assertEqual(expected_call_kwargs['is_path'], actual_call[1]['is_path'])
+        self.assertEqual(bandit.counts[0, 2, 1, 1], 2)
+        self.assertEqual(bandit.values[0, 2, 1, 1], 7.0)
+        self.assertEqual(bandit.counts.sum(), 2)
+        np.testing.assert_array_equal(bandit.props.rewards_matrix[0], [10.0, 4.0, 0.0, 0.0])
+        self.assertEqual(bandit.props.rewards_count.tolist(), [2, 0])
+        self.assertEqual(mock_save_model.call_count, 2)
 
     def tearDown(self):
         """
@@ -129,7 +145,8 @@ class TestEpsilonGreedyBandit(unittest.TestCase):
         """
         self.rl_props = MagicMock()
         self.rl_props.num_nodes = 3
-        self.engine_props = {'k_paths': 3, 'cores_per_link': 2, 'epsilon_start': 0.0}  # No randomness for testing
+        self.engine_props = {'k_paths': 3, 'cores_per_link': 2, 'epsilon_start': 0.0,  # No randomness for testing
+                             'max_iters': 2, 'num_requests': 10}
         self.q_table_mock = (np.zeros((3, 3)), np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]]))
 
     def create_bandit(self, is_path=True):
@@ -170,7 +187,7 @@ class TestUCBBandit(unittest.TestCase):
         """
         self.rl_props = MagicMock()
         self.rl_props.num_nodes = 3
-        self.engine_props = {'k_paths': 3, 'cores_per_link': 2}
+        self.engine_props = {'k_paths': 3, 'cores_per_link': 2, 'max_iters': 2, 'num_requests': 10}
 
         self.counts_mock = np.array([[[1, 2, 3]], [[1, 1, 1]], [[1, 1, 1]]])
         self.q_table_mock = np.array(
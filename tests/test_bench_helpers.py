@@ -0,0 +1,92 @@
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+from helper_scripts.bench_helpers import get_case_id, get_bench_props, run_bench_case, compare_to_baseline
+from helper_scripts.bench_helpers import save_bench_results, load_bench_results
+
+
+class TestBenchHelpers(unittest.TestCase):
+    """
+    Tests bench_helpers.py
+    """
+
+    def setUp(self):
+        self.case_dict = {'network': 'NSFNet', 'allocation_method': 'first_fit', 'route_method': 'k_shortest_path',
+                          'snr_type': None, 'cores_per_link': 2, 'erlang': 50.0}
+        self.save_fp = os.path.join('tests', 'bench_test', 'bench_results.json')
+
+    def tearDown(self):
+        if os.path.exists(self.save_fp):
+            os.remove(self.save_fp)
+            os.rmdir(os.path.dirname(self.save_fp))
+
+    def test_get_case_id(self):
+        """
+        Tests the case identifier.
+        """
+        self.assertEqual(get_case_id(case_dict=self.case_dict), 'NSFNet_first_fit_k_shortest_path_None_2_50.0')
+
+    def test_get_bench_props(self):
+        """
+        Tests building engine properties for a case.
+        """
+        engine_props = get_bench_props(case_dict=self.case_dict)
+
+        self.assertEqual(engine_props['arrival_rate'], 100.0)
+        self.assertEqual(engine_props['cores_per_link'], 2)
+        self.assertIn('400', engine_props['mod_per_bw'])
+        self.assertEqual(len(engine_props['topology_info']['links']), 44)
+        self.assertEqual(engine_props['topology_info']['links'][1]['fiber']['num_cores'], 2)
+
+    @patch('helper_scripts.bench_helpers.Engine')
+    def test_run_bench_case(self, mock_engine):
+        """
+        Tests running a single case.
+        """
+        engine_obj = MagicMock()
+        engine_obj.stats_obj.stats_props.sim_block_list = [0.1]
+        engine_obj.stats_obj.stats_props.phase_times_dict = {'routing': {}}
+        mock_engine.return_value = engine_obj
+
+        resp_dict = run_bench_case(case_dict=self.case_dict)
+
+        engine_obj.run.assert_called_once()
+        self.assertEqual(resp_dict['num_requests'], 2000)
+        self.assertEqual(resp_dict['blocking_mean'], 0.1)
+        self.assertGreater(resp_dict['requests_per_sec'], 0.0)
+        self.assertEqual(resp_dict['phase_times_dict'], {'routing': {}})
+
+    def test_compare_to_baseline(self):
+        """
+        Tests comparing results to a baseline.
+        """
+        baseline_dict = {
+            'case_a': {'requests_per_sec': 100.0, 'blocking_mean': 0.1},
+            'case_b': {'requests_per_sec': 100.0, 'blocking_mean': 0.1},
+            'case_c': {'requests_per_sec': 100.0, 'blocking_mean': 0.1},
+        }
+        results_dict = {
+            'case_a': {'requests_per_sec': 95.0, 'blocking_mean': 0.1},
+            'case_b': {'requests_per_sec': 50.0, 'blocking_mean': 0.1},
+            'case_c': {'requests_per_sec': 120.0, 'blocking_mean': 0.2},
+            'case_d': {'requests_per_sec': 1.0, 'blocking_mean': 0.5},
+        }
+        resp_dict = compare_to_baseline(results_dict=results_dict, baseline_dict=baseline_dict, tolerance=0.1)
+
+        self.assertEqual(list(resp_dict.keys()), ['case_b', 'case_c'])
+        self.assertIn('throughput', resp_dict['case_b'][0])
+        self.assertIn('blocking', resp_dict['case_c'][0])
+
+    def test_save_load_results(self):
+        """
+        Tests saving and loading results.
+        """
+        results_dict = {'case_a': {'requests_per_sec': 100.0, 'blocking_mean': 0.1}}
+        save_bench_results(results_dict=results_dict, save_fp=self.save_fp)
+
+        self.assertEqual(load_bench_results(load_fp=self.save_fp), results_dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import json
+import shutil
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from arg_scripts.dataset_args import DATASET_INFO_FILE
+from helper_scripts.dataset_helpers import get_dataset_columns, DatasetRecorder, load_dataset, get_path_matrix
+from helper_scripts.dataset_helpers import replay_dataset
+
+
+class TestDatasetHelpers(unittest.TestCase):
+    """
+    Tests dataset_helpers.py
+    """
+
+    def setUp(self):
+        self.dataset_dir = os.path.join('tests', 'dataset_test')
+        self.k_paths, self.cores_per_link = 2, 3
+        self.recorder_obj = DatasetRecorder(save_dir=os.path.join(self.dataset_dir, 'seed_1'), k_paths=self.k_paths,
+                                            cores_per_link=self.cores_per_link, chunk_size=2)
+        for req_id in range(1, 4):
+            request_dict = {'seed': 1, 'req_id': req_id, 'source': 0, 'destination': 2, 'bandwidth': 50,
+                            'path_index': req_id % 2, 'core_num': 2, 'was_allocated': req_id != 3,
+                            'next_path_level': 1, 'next_core_level': 0}
+            path_dict = {'path_level': [0, 1], 'path_len': [100.0, 250.0 * req_id], 'path_feasible': [True, False]}
+            core_dict = {'core_level': np.full((2, 3), req_id % 2), 'core_feasible': np.eye(2, 3, dtype=bool)}
+            self.recorder_obj.write_row(request_dict=request_dict, path_dict=path_dict, core_dict=core_dict)
+        self.recorder_obj.flush()
+
+        info_dict = {'seeds': [1], 'k_paths': self.k_paths, 'cores_per_link': self.cores_per_link}
+        with open(os.path.join(self.dataset_dir, DATASET_INFO_FILE), 'w', encoding='utf-8') as file_obj:
+            json.dump(info_dict, file_obj)
+
+    def tearDown(self):
+        shutil.rmtree(self.dataset_dir, ignore_errors=True)
+
+    def test_get_dataset_columns(self):
+        """
+        Tests that every candidate path and core has its own column.
+        """
+        columns_dict = get_dataset_columns(k_paths=self.k_paths, cores_per_link=self.cores_per_link)
+        self.assertEqual(columns_dict['path_len_1'], 'float32')
+        self.assertEqual(columns_dict['core_feasible_1_2'], 'bool')
+        self.assertNotIn('path_len_2', columns_dict)
+        self.assertEqual(len(columns_dict), 10 + 3 * 2 + 2 * 2 * 3)
+
+    def test_recorder(self):
+        """
+        Tests that rows are written in chunks and read back in order.
+        """
+        self.assertEqual(sorted(os.listdir(os.path.join(self.dataset_dir, 'seed_1'))),
+                         ['part_00000.parquet', 'part_00001.parquet'])
+
+        data_df = load_dataset(dataset_dir=self.dataset_dir)
+        self.assertEqual(list(data_df['req_id']), [1, 2, 3])
+        self.assertEqual(list(data_df.columns), list(get_dataset_columns(k_paths=2, cores_per_link=3)))
+
+        path_len_mat = get_path_matrix(data_df=data_df, column='path_len', k_paths=self.k_paths)
+        self.assertTrue(np.array_equal(path_len_mat, [[100.0, 250.0], [100.0, 500.0], [100.0, 750.0]]))
+        core_feasible_mat = get_path_matrix(data_df=data_df, column='core_feasible', k_paths=self.k_paths,
+                                            cores_per_link=self.cores_per_link)
+        self.assertTrue(np.array_equal(core_feasible_mat[2], np.eye(2, 3, dtype=bool)))
+
+    def test_replay_dataset(self):
+        """
+        Tests that agents are updated with the logged action and next state of every row.
+        """
+        rl_props = MagicMock()
+        path_agent = MagicMock(path_algorithm='q_learning', rl_props=rl_props)
+        core_agent = MagicMock(core_algorithm='q_learning', rl_props=rl_props)
+
+        replay_dataset(dataset_dir=self.dataset_dir, path_agent=path_agent, core_agent=core_agent)
+
+        self.assertEqual(path_agent.update.call_count, 3)
+        path_agent.update.assert_called_with(was_allocated=False, net_spec_dict=None, iteration=0, path_length=750.0,
+                                             next_level_index=1)
+        core_agent.update.assert_called_with(was_allocated=False, net_spec_dict=None, iteration=0, req_id=3,
+                                             next_level_index=0)
+        self.assertEqual(rl_props.chosen_path_index, 1)
+        self.assertEqual(path_agent.level_index, 1)
+        self.assertEqual(core_agent.level_index, 1)
+        path_agent.end_iter.assert_called_once()
+        core_agent.end_iter.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import os
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -5,6 +6,7 @@ import numpy as np
 import networkx as nx
 
 from src.engine import Engine
+from arg_scripts.request_args import Request
 
 
 class TestEngine(unittest.TestCase):
@@ -43,7 +45,8 @@ class TestEngine(unittest.TestCase):
             },
         }
         self.engine = Engine(engine_props=engine_props)
-        self.engine.reqs_dict = {1.0: {'req_id': 10, 'request_type': 'arrival'}}
+        self.engine.reqs_dict = {1.0: Request(req_id=10, source='A', destination='C', arrive=1.0, depart=2.0,
+                                              request_type='arrival', bandwidth='50', mod_formats={})}
 
         # Mocking sdn_obj and stats_obj
         self.engine.sdn_obj = MagicMock()
@@ -95,6 +98,23 @@ class TestEngine(unittest.TestCase):
         self.assertEqual(self.engine.sdn_obj.sdn_props.net_spec_dict, self.engine.net_spec_dict)
         self.assertEqual(self.engine.sdn_obj.sdn_props.topology, self.engine.topology)
 
+    def test_clear_spectrum(self):
+        """
+        Tests that clearing the spectrum frees every slot without rebuilding the topology.
+        """
+        cores_matrix = {'c': np.array([[0, 1, 1, -1], [2, -2, 0, 0]])}
+        self.engine.net_spec_dict = {('A', 'B'): {'cores_matrix': cores_matrix, 'link_num': 1},
+                                     ('B', 'A'): {'cores_matrix': cores_matrix, 'link_num': 1}}
+        self.engine.reqs_status_dict = {1: {}, 2: {}}
+        net_spec_dict = self.engine.net_spec_dict
+
+        self.engine.clear_spectrum()
+
+        self.assertIs(self.engine.net_spec_dict, net_spec_dict)
+        self.assertIs(self.engine.net_spec_dict[('B', 'A')]['cores_matrix']['c'], cores_matrix['c'])
+        self.assertFalse(cores_matrix['c'].any())
+        self.assertEqual(self.engine.reqs_status_dict, {})
+
     def test_end_iter(self):
         """
         Tests the end_iter method.
@@ -115,7 +135,7 @@ class TestEngine(unittest.TestCase):
         Test handle release with an existing request in the reqs_status_dict.
         """
         curr_time = 1.0
-        req_id = self.engine.reqs_dict[curr_time]['req_id']
+        req_id = self.engine.reqs_dict[curr_time].req_id
         self.engine.reqs_status_dict[req_id] = {
             'path': ['A', 'B', 'C']
         }
@@ -149,6 +169,26 @@ class TestEngine(unittest.TestCase):
             else:
                 mock_load_model.assert_not_called()
 
+    @patch('src.engine.load_trace_requests')
+    @patch('src.engine.TraceRecorder')
+    def test_init_iter_trace(self, mock_recorder, mock_load):
+        """
+        Tests that traces are saved under the base file path and never over the trace being replayed.
+        """
+        self.engine.engine_props['save_trace'] = True
+        self.engine.engine_props['thread_num'] = 's1'
+        self.engine.init_iter(iteration=0, reqs_dict=self.engine.reqs_dict, base_fp='tests_data')
+        trace_dir = os.path.join('tests_data', 'output', self.engine.sim_info, 's1')
+        self.assertEqual(mock_recorder.call_args.kwargs['save_fp'], os.path.join(trace_dir, '10_erlang_trace_0.bin'))
+
+        mock_recorder.reset_mock()
+        self.engine.engine_props['replay_trace'] = trace_dir
+        with self.assertRaises(ValueError):
+            self.engine.init_iter(iteration=0, base_fp='tests_data')
+        mock_recorder.assert_not_called()
+        mock_load.assert_not_called()
+
+
 
 if __name__ == '__main__':
     unittest.main()
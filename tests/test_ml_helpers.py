@@ -0,0 +1,178 @@
+import os
+import shutil
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import networkx as nx
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from arg_scripts.ml_args import ML_FEATURES_LIST
+from helper_scripts.ml_helpers import MLObsEncoder, MLPredictor, compile_model, load_compiled_model, load_model
+from helper_scripts.ml_helpers import save_model
+from helper_scripts.sim_helpers import create_link_spectrum
+
+
+class TestMLHelpers(unittest.TestCase):
+    """
+    Tests ml_helpers.py
+    """
+
+    def setUp(self):
+        topology = nx.Graph()
+        topology.add_edge('A', 'B', length=100.0)
+        topology.add_edge('B', 'C', length=300.0)
+        self.engine_props = {'topology': topology}
+
+        self.net_spec_dict = {link_tuple: create_link_spectrum(num_cores=2, band_slots_dict={'c': 4})
+                              for link_tuple in [('A', 'B'), ('B', 'C')]}
+        self.net_spec_dict[('A', 'B')]['cores_matrix']['c'][0, :2] = [1, -1]
+        self.net_spec_dict[('B', 'C')]['cores_matrix']['c'][1, :] = [2, 2, 2, -2]
+        self.req_obj = SimpleNamespace(bandwidth='100', mod_formats={'QPSK': {'max_length': 2000}})
+
+    def test_update_obs(self):
+        """
+        Tests that an observation is encoded in the model's column order.
+        """
+        encoder_obj = MLObsEncoder(engine_props=self.engine_props)
+        obs_mat = encoder_obj.update_obs(req_obj=self.req_obj, path_list=['A', 'B', 'C'],
+                                         net_spec_dict=self.net_spec_dict)
+
+        # Core congestion is 1/2 and 0 on the first link, 0 and 1 on the second
+        self.assertEqual(obs_mat.shape, (1, len(ML_FEATURES_LIST)))
+        self.assertTrue(np.allclose(obs_mat[0], [400.0, 2000.0, 0.375, 0.0, 1.0, 0.0, 0.0]))
+
+        self.req_obj.bandwidth = '25'
+        obs_mat = encoder_obj.update_obs(req_obj=self.req_obj, path_list=['A', 'B'],
+                                         net_spec_dict=self.net_spec_dict)
+        self.assertTrue(np.allclose(obs_mat[0], [100.0, 2000.0, 0.25, 0.0, 0.0, 0.0, 0.0]))
+
+    def test_update_obs_feature_names(self):
+        """
+        Tests that the column order follows the model's feature names.
+        """
+        encoder_obj = MLObsEncoder(engine_props=self.engine_props,
+                                   feature_names_list=['old_bandwidth_100', 'ave_cong', 'longest_reach',
+                                                       'path_length'])
+        obs_mat = encoder_obj.update_obs(req_obj=self.req_obj, path_list=['A', 'B'],
+                                         net_spec_dict=self.net_spec_dict)
+        self.assertTrue(np.allclose(obs_mat[0], [1.0, 0.25, 2000.0, 100.0]))
+
+    def test_update_obs_matrix(self):
+        """
+        Tests that every path of a request is encoded in its own row.
+        """
+        self.engine_props['k_paths'] = 1
+        encoder_obj = MLObsEncoder(engine_props=self.engine_props)
+        obs_mat = encoder_obj.update_obs_matrix(req_obj=self.req_obj, paths_matrix=[['A', 'B'], ['B', 'C']],
+                                                net_spec_dict=self.net_spec_dict)
+
+        self.assertEqual(obs_mat.shape, (2, len(ML_FEATURES_LIST)))
+        self.assertTrue(np.allclose(obs_mat[:, :3], [[100.0, 2000.0, 0.25], [300.0, 2000.0, 0.5]]))
+
+    def test_predictor(self):
+        """
+        Tests that predictions are made from raw arrays in the model's feature order.
+        """
+        ml_model = MagicMock(feature_names_in_=np.array(['path_length', 'ave_cong']))
+        ml_model.predict.return_value = np.array([2])
+        predictor_obj = MLPredictor(ml_model=ml_model)
+
+        self.assertEqual(predictor_obj.feature_names_list, ['path_length', 'ave_cong'])
+        self.assertFalse(hasattr(ml_model, 'feature_names_in_'))
+        obs_mat = np.zeros((1, 2))
+        self.assertEqual(predictor_obj.predict(obs_mat=obs_mat)[0], 2)
+        ml_model.predict.assert_called_once_with(obs_mat)
+
+
+
+class TestCompiledModels(unittest.TestCase):
+    """
+    Tests compiling trained models in ml_helpers.py
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.feature_df = pd.DataFrame(rng.random((300, len(ML_FEATURES_LIST))), columns=ML_FEATURES_LIST)
+        self.segments_arr = rng.choice([1, 2, 4, 8], size=300)
+        self.obs_mat = rng.random((50, len(ML_FEATURES_LIST)))
+        self.model_dir = os.path.join('tests', 'compiled_test')
+        os.makedirs(self.model_dir, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir, ignore_errors=True)
+
+    def _check_compiled(self, model: object):
+        model.fit(self.feature_df, self.segments_arr)
+        model_fp = os.path.join(self.model_dir, 'model.npz')
+        np.savez(model_fp, **compile_model(model=model))
+        compiled_obj = load_compiled_model(model_fp=model_fp)
+
+        self.assertEqual(compiled_obj.feature_names_list, ML_FEATURES_LIST)
+        expected_arr = model.predict(pd.DataFrame(self.obs_mat, columns=ML_FEATURES_LIST))
+        self.assertTrue(np.array_equal(compiled_obj.predict(obs_mat=self.obs_mat), expected_arr))
+
+    def test_decision_tree(self):
+        """
+        Tests that a compiled decision tree predicts like the original.
+        """
+        self._check_compiled(model=DecisionTreeClassifier(random_state=0))
+
+    def test_logistic_regression(self):
+        """
+        Tests that a compiled logistic regression predicts like the original, with two classes or more.
+        """
+        self._check_compiled(model=LogisticRegression(max_iter=1000))
+        self.segments_arr = np.where(self.segments_arr > 2, 4, 1)
+        self._check_compiled(model=LogisticRegression(max_iter=1000))
+
+    def test_knn(self):
+        """
+        Tests that a compiled k-nearest neighbors model predicts like the original.
+        """
+        self._check_compiled(model=KNeighborsClassifier(n_neighbors=5))
+
+    def test_compile_unsupported(self):
+        """
+        Tests that models without a compiled version are not compiled.
+        """
+        model = KNeighborsClassifier(n_neighbors=5, weights='distance').fit(self.feature_df, self.segments_arr)
+        self.assertIsNone(compile_model(model=model))
+
+    def test_save_model(self):
+        """
+        Tests that a model without a compiled version replaces the compiled version of a previous one.
+        """
+        sim_dict = {'train_file_path': 'compiled_test'}
+        save_dir = os.path.join('logs', 'test_knn', 'compiled_test')
+        try:
+            model = KNeighborsClassifier(n_neighbors=5).fit(self.feature_df, self.segments_arr)
+            save_model(sim_dict=sim_dict, model=model, algorithm='test_knn', erlang='300.0')
+            self.assertTrue(os.path.exists(os.path.join(save_dir, 'test_knn_300.0.npz')))
+
+            model.set_params(weights='distance')
+            save_model(sim_dict=sim_dict, model=model, algorithm='test_knn', erlang='300.0')
+            self.assertFalse(os.path.exists(os.path.join(save_dir, 'test_knn_300.0.npz')))
+            self.assertTrue(os.path.exists(os.path.join(save_dir, 'test_knn_300.0.joblib')))
+        finally:
+            shutil.rmtree(os.path.join('logs', 'test_knn'), ignore_errors=True)
+
+    def test_load_model(self):
+        """
+        Tests that the compiled version of a model is loaded when there is one.
+        """
+        engine_props = {'ml_model': 'decision_tree', 'train_file_path': 'compiled_test', 'erlang': 300.0}
+        with patch('helper_scripts.ml_helpers.os.path.exists', return_value=True), \
+                patch('helper_scripts.ml_helpers.load_compiled_model') as mock_load:
+            load_model(engine_props=engine_props)
+
+        mock_load.assert_called_once_with(
+            model_fp=os.path.join('logs', 'decision_tree', 'compiled_test', 'decision_tree_300.npz'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,6 +22,7 @@ class TestPathAgent(unittest.TestCase):
             'path_levels': 2,
             'epsilon_start': 0.01,
             'cores_per_link': 4,
+            'topology': None,
         }
         self.path_agent = PathAgent(path_algorithm='q_learning', rl_props=self.rl_props, rl_help_obj=self.rl_help_obj)
         self.path_agent.engine_props = self.engine_props
@@ -89,7 +90,8 @@ class TestPathAgent(unittest.TestCase):
         Test load_model method when path_algorithm is 'q_learning'.
         """
         self.engine_props['path_algorithm'] = 'q_learning'
-        with patch('numpy.load') as mock_load:
+        with patch('numpy.load') as mock_load, \
+                patch('helper_scripts.ql_helpers.get_k_paths_cache', return_value=dict()):
             self.path_agent.load_model(model_path='model', erlang=10.0, num_cores=4)
             mock_load.assert_called_once()
 
@@ -125,6 +127,7 @@ class TestCoreAgent(unittest.TestCase):
             'cores_per_link': 4,
             'path_levels': 2,
             'epsilon_start': 1.0,
+            'topology': None,
         }
         self.core_agent = CoreAgent(core_algorithm='q_learning', rl_props=self.rl_props, rl_help_obj=self.rl_help_obj)
         self.core_agent.engine_props = self.engine_props
@@ -188,7 +191,7 @@ class TestCoreAgent(unittest.TestCase):
         Test get_reward method when the request is allocated.
         """
         self.rl_props.core_index = 1
-        self.rl_help_obj.route_obj.sdn_props = {'req_id': 50}
+        self.rl_help_obj.route_obj.sdn_props = MagicMock(req_id=50)
         reward = self.core_agent.get_reward(was_allocated=True)
         self.assertAlmostEqual(reward, self.core_agent.calculate_dynamic_reward(1, 50))
 
@@ -197,10 +200,19 @@ class TestCoreAgent(unittest.TestCase):
         Test get_reward method when the request is not allocated.
         """
         self.rl_props.core_index = 1
-        self.rl_help_obj.route_obj.sdn_props = {'req_id': 50}
+        self.rl_help_obj.route_obj.sdn_props = MagicMock(req_id=50)
         reward = self.core_agent.get_reward(was_allocated=False)
         self.assertAlmostEqual(reward, self.core_agent.calculate_dynamic_penalty(1, 50))
 
+    def test_get_reward_req_id(self):
+        """
+        Test get_reward method when the request ID is given, as it is when replaying a dataset.
+        """
+        self.rl_props.core_index = 1
+        self.rl_help_obj.route_obj = None
+        reward = self.core_agent.get_reward(was_allocated=True, req_id=50)
+        self.assertAlmostEqual(reward, self.core_agent.calculate_dynamic_reward(1, 50))
+
     def test_update_q_learning(self):
         """
         Test update method for 'q_learning' algorithm.
@@ -244,7 +256,8 @@ class TestCoreAgent(unittest.TestCase):
         Test load_model method when core_algorithm is 'q_learning'.
         """
         self.core_agent.core_algorithm = 'q_learning'
-        with patch('numpy.load') as mock_load:
+        with patch('numpy.load') as mock_load, \
+                patch('helper_scripts.ql_helpers.get_k_paths_cache', return_value=dict()):
             self.core_agent.load_model(model_path='model', erlang=10.0, num_cores=4)
             mock_load.assert_called_once()
 
@@ -0,0 +1,110 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+from src.multi_policy_engine import MultiPolicyEngine
+
+
+class TestMultiPolicyEngine(unittest.TestCase):
+    """
+    Tests multi_policy_engine.py
+    """
+
+    def setUp(self):
+        self.engine_props_dict = {
+            's1': {'network': 'NSFNet', 'num_requests': 100, 'allocation_method': 'first_fit', 'max_iters': 2,
+                   'erlang': 10.0},
+            's2': {'network': 'NSFNet', 'num_requests': 100, 'allocation_method': 'best_fit', 'max_iters': 2,
+                   'erlang': 10.0},
+        }
+
+    @patch('src.multi_policy_engine.Engine')
+    def test_init(self, mock_engine):
+        """
+        Tests that every policy shares one routing cache.
+        """
+        mock_engine.side_effect = lambda engine_props: MagicMock()
+        multi_engine = MultiPolicyEngine(engine_props_dict=self.engine_props_dict)
+
+        cache_one = multi_engine.engines_dict['s1'].sdn_obj.route_obj.k_paths_cache
+        cache_two = multi_engine.engines_dict['s2'].sdn_obj.route_obj.k_paths_cache
+        self.assertIs(cache_one, cache_two)
+        self.assertIs(multi_engine.base_engine, multi_engine.engines_dict['s1'])
+
+    def test_check_workloads(self):
+        """
+        Tests that policies with different workloads can't be compared.
+        """
+        self.engine_props_dict['s2']['num_requests'] = 200
+        with self.assertRaises(ValueError):
+            MultiPolicyEngine(engine_props_dict=self.engine_props_dict)
+
+    def test_init_single_policy(self):
+        """
+        Tests that a single policy can't be compared.
+        """
+        del self.engine_props_dict['s2']
+        with self.assertRaises(ValueError):
+            MultiPolicyEngine(engine_props_dict=self.engine_props_dict)
+
+    @patch('src.multi_policy_engine.Engine')
+    def test_end_iter(self, mock_engine):
+        """
+        Tests that statistics are saved once per iteration.
+        """
+        mock_engine.side_effect = lambda engine_props: MagicMock()
+        multi_engine = MultiPolicyEngine(engine_props_dict=self.engine_props_dict)
+        multi_engine.engines_dict['s1'].engine_props = {'is_training': True}
+        multi_engine.engines_dict['s2'].engine_props = {'is_training': False}
+
+        with patch.object(multi_engine, 'update_compare', return_value=False):
+            multi_engine.end_iter(iteration=0)
+
+        multi_engine.engines_dict['s1'].stats_obj.save_stats.assert_not_called()
+        multi_engine.engines_dict['s2'].stats_obj.save_stats.assert_called_once_with(base_fp='data')
+
+    @patch('src.multi_policy_engine.Engine')
+    def test_update_compare(self, mock_engine):
+        """
+        Tests the paired comparison of every pair of policies.
+        """
+        mock_engine.side_effect = lambda engine_props: MagicMock()
+        self.engine_props_dict['s3'] = dict(self.engine_props_dict['s1'])
+        multi_engine = MultiPolicyEngine(engine_props_dict=self.engine_props_dict)
+        multi_engine.engines_dict['s1'].stats_obj.stats_props.sim_block_list = [0.2, 0.3]
+        multi_engine.engines_dict['s2'].stats_obj.stats_props.sim_block_list = [0.1, 0.2]
+        multi_engine.engines_dict['s3'].stats_obj.stats_props.sim_block_list = [0.2, 0.3]
+
+        is_separated = multi_engine.update_compare()
+
+        self.assertEqual(list(multi_engine.compare_dict.keys()), ['s1_vs_s2', 's1_vs_s3', 's2_vs_s3'])
+        self.assertTrue(multi_engine.compare_dict['s1_vs_s2']['is_separated'])
+        self.assertFalse(multi_engine.compare_dict['s1_vs_s3']['is_separated'])
+        self.assertFalse(is_separated)
+
+    @patch('src.multi_policy_engine.Engine')
+    def test_run(self, mock_engine):
+        """
+        Tests that every policy handles the same requests in lockstep.
+        """
+        mock_engine.side_effect = lambda engine_props: MagicMock()
+        multi_engine = MultiPolicyEngine(engine_props_dict=self.engine_props_dict)
+        base_engine = multi_engine.base_engine
+        base_engine.engine_props = self.engine_props_dict['s1']
+        base_engine.reqs_dict = {0.1: SimpleNamespace(request_type='arrival'),
+                                 0.2: SimpleNamespace(request_type='release')}
+
+        with patch.object(multi_engine, 'end_iter', return_value=False) as mock_end_iter, \
+                patch.object(multi_engine, 'save_compare') as mock_save:
+            multi_engine.run()
+
+        other_engine = multi_engine.engines_dict['s2']
+        other_engine.init_iter.assert_called_with(iteration=1, reqs_dict=base_engine.reqs_dict)
+        self.assertEqual(other_engine.handle_request.call_count, 4)
+        other_engine.handle_request.assert_any_call(curr_time=0.2, req_num=2)
+        self.assertEqual(mock_end_iter.call_count, 2)
+        mock_save.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
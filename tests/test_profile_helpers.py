@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+from helper_scripts.profile_helpers import PhaseProfiler
+from arg_scripts.stats_args import PHASE_KEYS_LIST
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    """
+    Tests profile_helpers.py
+    """
+
+    def setUp(self):
+        self.profiler = PhaseProfiler(is_enabled=True)
+
+    def test_disabled_profiler(self):
+        """
+        Tests that a disabled profiler records nothing.
+        """
+        profiler = PhaseProfiler()
+        start_ns = profiler.start()
+        profiler.stop(phase='routing', start_ns=start_ns)
+
+        self.assertEqual(start_ns, 0)
+        self.assertEqual(profiler.calls_dict['routing'], 0)
+        self.assertEqual(profiler.times_dict['routing'], 0)
+
+    @patch('helper_scripts.profile_helpers.time.perf_counter_ns')
+    def test_start_stop(self, mock_counter):
+        """
+        Tests timing a phase multiple times.
+        """
+        mock_counter.side_effect = [100, 350, 400, 450]
+        for _ in range(2):
+            start_ns = self.profiler.start()
+            self.profiler.stop(phase='spectrum', start_ns=start_ns)
+
+        self.assertEqual(self.profiler.times_dict['spectrum'], 300)
+        self.assertEqual(self.profiler.calls_dict['spectrum'], 2)
+
+    @patch('helper_scripts.profile_helpers.time.perf_counter_ns')
+    def test_get_phase_stats(self, mock_counter):
+        """
+        Tests the phase summary.
+        """
+        mock_counter.side_effect = [0, 1000]
+        start_ns = self.profiler.start()
+        self.profiler.stop(phase='release', start_ns=start_ns)
+
+        resp_dict = self.profiler.get_phase_stats()
+        self.assertEqual(list(resp_dict.keys()), PHASE_KEYS_LIST)
+        self.assertEqual(resp_dict['release'], {'calls': 1, 'total_ns': 1000, 'mean_ns': 1000.0})
+        self.assertIsNone(resp_dict['routing']['mean_ns'])
+
+    def test_reset(self):
+        """
+        Tests resetting the profiler.
+        """
+        self.profiler.times_dict['stats'] = 10
+        self.profiler.calls_dict['stats'] = 1
+        self.profiler.reset()
+
+        self.assertEqual(self.profiler.times_dict['stats'], 0)
+        self.assertEqual(self.profiler.calls_dict['stats'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 import numpy as np
 import networkx as nx
-from helper_scripts.ql_helpers import QLearningHelpers
+from helper_scripts.ql_helpers import QLearningHelpers, load_q_table
 
 
 class TestQLearningHelpers(unittest.TestCase):
@@ -33,11 +33,20 @@ class TestQLearningHelpers(unittest.TestCase):
         self.engine_props['topology'].add_nodes_from([str(i) for i in range(5)])  # Add nodes 0 to 4 as strings
         self.engine_props['topology'].add_edges_from([
             ('0', '1'), ('1', '2'), ('2', '3'), ('3', '4'), ('4', '0')
-        ])  # Add some edges
+        ], length=1.0)  # Add some edges
 
         self.rl_props = MagicMock()
         self.rl_props.num_nodes = 5
         self.rl_props.k_paths = 3
+        self.rl_props.source = 0
+        self.rl_props.destination = 2
+        self.rl_props.chosen_path_index = 1
+        self.rl_props.core_index = 1
+
+        # Routes are only precomputed in memory for tests
+        cache_patcher = patch('helper_scripts.ql_helpers.K_PATHS_CACHE_DIR', None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
 
         # Initialize QLearningHelpers with mocked objects
         self.q_learning_helpers = QLearningHelpers(rl_props=self.rl_props, engine_props=self.engine_props)
@@ -83,11 +92,11 @@ class TestQLearningHelpers(unittest.TestCase):
         net_spec_dict = MagicMock()
 
         # Manually set up the routes_matrix with known values
-        self.q_learning_helpers.props.routes_matrix[self.rl_props.source][self.rl_props.destination][
-            self.rl_props.chosen_path_index][level_index] = ('path', 1.0)
+        self.q_learning_helpers.props.routes_matrix[self.rl_props.source, self.rl_props.destination,
+                                                    self.rl_props.chosen_path_index, level_index] = 1.0
 
         # Mock the methods called within update_routes_matrix
-        with patch.object(self.q_learning_helpers, 'get_max_future_q', return_value=5.0):
+        with patch.object(self.q_learning_helpers, 'get_max_future_q', return_value=5.0) as mock_future_q:
             with patch.object(self.q_learning_helpers, 'update_q_stats') as mock_update_q_stats:
                 self.q_learning_helpers.update_routes_matrix(reward=reward, level_index=level_index,
                                                              net_spec_dict=net_spec_dict)
@@ -105,10 +114,25 @@ class TestQLearningHelpers(unittest.TestCase):
                 # Verify that the q_value was updated correctly in the routes_matrix
                 new_q_value = ((1.0 - self.engine_props['learn_rate']) * current_q) + (
                         self.engine_props['learn_rate'] * (reward + discount_factor * max_future_q))
-                updated_q_value = \
-                    self.q_learning_helpers.props.routes_matrix[self.rl_props.source][self.rl_props.destination][
-                        self.rl_props.chosen_path_index][level_index]['q_value']
+                updated_q_value = self.q_learning_helpers.props.routes_matrix[
+                    self.rl_props.source, self.rl_props.destination, self.rl_props.chosen_path_index, level_index]
                 self.assertAlmostEqual(updated_q_value, new_q_value)
+                # The path comes from the route table, not the q-table
+                self.assertEqual(mock_future_q.call_args.kwargs['path_list'], ['0', '4', '3', '2'])
+
+    def test_update_routes_matrix_next_level(self):
+        """Test the update_routes_matrix method with a logged next state."""
+        self.q_learning_helpers.setup_env()
+        routes_matrix = self.q_learning_helpers.props.routes_matrix[self.rl_props.source, self.rl_props.destination]
+        routes_matrix[self.rl_props.chosen_path_index, 1] = 5.0
+
+        with patch.object(self.q_learning_helpers, 'get_max_future_q') as mock_future_q:
+            self.q_learning_helpers.update_routes_matrix(reward=10.0, level_index=0, net_spec_dict=None,
+                                                         next_level_index=1)
+
+        mock_future_q.assert_not_called()
+        expected_q = self.engine_props['learn_rate'] * (10.0 + self.engine_props['discount_factor'] * 5.0)
+        self.assertAlmostEqual(routes_matrix[self.rl_props.chosen_path_index, 0], expected_q)
 
     def test_update_cores_matrix(self):
         """Test the update_cores_matrix method."""
@@ -133,6 +157,28 @@ class TestQLearningHelpers(unittest.TestCase):
                 mock_update_q_stats.assert_called_once_with(reward=reward, stats_flag='cores_dict',
                                                             td_error=expected_td_error)
 
+    def test_update_q_stats(self):
+        """Test that rewards and errors are stored in place and summarized once an episode is complete."""
+        self.q_learning_helpers.iteration = 9
+        self.engine_props.update({'path_algorithm': 'q_learning', 'core_algorithm': 'first_fit'})
+        with patch.object(self.q_learning_helpers, 'save_model') as mock_save_model:
+            for request_num in range(self.engine_props['num_requests']):
+                self.q_learning_helpers.update_q_stats(reward=float(request_num), td_error=-1.0,
+                                                       stats_flag='routes_dict')
+
+        rewards_matrix = self.q_learning_helpers.props.rewards_matrix_dict['routes_dict']
+        self.assertEqual(rewards_matrix.shape, (self.engine_props['max_iters'], self.engine_props['num_requests']))
+        self.assertEqual(rewards_matrix[9].tolist(), list(range(10)))
+        self.assertEqual(self.q_learning_helpers.props.stats_count_dict['routes_dict'][9], 10)
+        self.assertIsNone(self.q_learning_helpers.props.stats_count_dict['cores_dict'])
+        self.assertEqual(self.q_learning_helpers.props.sum_rewards_dict['9'], 45.0)
+
+        # Episodes before the current one are part of the summary
+        training_dict = self.q_learning_helpers.props.rewards_dict['routes_dict']['training']
+        self.assertEqual(training_dict['max'], list(range(10)))
+        self.assertEqual(training_dict['average'][4], 0.4)
+        mock_save_model.assert_called_once()
+
     @patch('helper_scripts.ql_helpers.create_dir')
     @patch('helper_scripts.ql_helpers.np.save')
     @patch('builtins.open', new_callable=MagicMock)
@@ -159,6 +205,43 @@ class TestQLearningHelpers(unittest.TestCase):
                                 f"e{self.engine_props['erlang']}_params_c{self.engine_props['cores_per_link']}.json")
         mock_open_func.assert_called_once_with(param_fp, 'w', encoding='utf-8')
 
+    def test_init_q_tables(self):
+        """Test that q-tables only hold q-values and paths are stored once."""
+        self.q_learning_helpers.setup_env()
+
+        self.assertEqual(self.q_learning_helpers.props.routes_matrix.shape, (5, 5, 3, 2))
+        self.assertEqual(self.q_learning_helpers.props.cores_matrix.shape, (5, 5, 3, 2, 2))
+        self.assertEqual(self.q_learning_helpers.props.routes_matrix.dtype, np.float64)
+        self.assertEqual(self.q_learning_helpers.props.paths_matrix.shape, (5, 5, 3))
+        self.assertEqual(self.q_learning_helpers.props.paths_matrix[0, 2, 0], ['0', '1', '2'])
+        self.assertEqual(self.q_learning_helpers.props.paths_matrix[0, 2, 1], ['0', '4', '3', '2'])
+        # Only two paths exist between these nodes
+        self.assertIsNone(self.q_learning_helpers.props.paths_matrix[0, 2, 2])
+
+    def test_get_max_curr_q_values(self):
+        """Test the get_max_curr_q method with real q-values."""
+        self.q_learning_helpers.setup_env()
+        self.rl_props.paths_list = self.q_learning_helpers.props.paths_matrix[0, 2]
+        routes_matrix = self.q_learning_helpers.props.routes_matrix
+        routes_matrix[0, 2, 0, 1] = 5.0
+        routes_matrix[0, 2, 1, 0] = 3.0
+
+        max_index, max_obj = self.q_learning_helpers.get_max_curr_q(cong_list=[(0, None, 0), (1, None, 0)],
+                                                                    matrix_flag='routes_matrix')
+        self.assertEqual(max_index, 1)
+        self.assertEqual(max_obj, ['0', '4', '3', '2'])
+
+    @patch('helper_scripts.ql_helpers.np.load')
+    def test_load_legacy_q_table(self, mock_load):
+        """Test loading a q-table saved with the older structured layout."""
+        legacy_table = np.empty((2, 2), dtype=[('path', 'O'), ('q_value', 'f8')])
+        legacy_table['q_value'] = [[1.0, 2.0], [3.0, 4.0]]
+        mock_load.return_value = legacy_table
+
+        q_table = load_q_table(model_fp='model.npy')
+        self.assertEqual(q_table.dtype, np.float64)
+        self.assertEqual(q_table.tolist(), [[1.0, 2.0], [3.0, 4.0]])
+
     def test_get_max_curr_q(self):
         """Test the get_max_curr_q method."""
         cong_list = [(0, 0, 0), (1, 1, 1)]
@@ -166,7 +249,7 @@ class TestQLearningHelpers(unittest.TestCase):
 
         with patch.object(self.q_learning_helpers, 'rl_props') as mock_rl_props:
             mock_rl_props.paths_list = ['path1', 'path2']
-            self.q_learning_helpers.props.routes_matrix = MagicMock()
+            self.q_learning_helpers.props.routes_matrix = np.zeros((5, 5, 3, 2))
 
             with patch.object(np, 'argmax', return_value=1):
                 max_index, max_obj = self.q_learning_helpers.get_max_curr_q(cong_list=cong_list,
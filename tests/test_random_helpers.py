@@ -1,5 +1,5 @@
 import unittest
-from helper_scripts.random_helpers import set_seed, get_uniform_rv, get_exponential_rv
+from helper_scripts.random_helpers import set_seed, get_rng, get_uniform_rv, get_exponential_rv
 
 
 class TestRandomGenerators(unittest.TestCase):
@@ -42,3 +42,17 @@ class TestRandomGenerators(unittest.TestCase):
         scale_param = 5
         result = get_exponential_rv(scale_param)
         self.assertTrue(result >= 0, "The result should be non-negative.")
+
+    def test_get_rng(self):
+        """
+        Tests that an independent generator matches the seeded global one without changing it.
+        """
+        set_seed(42)
+        expected_list = [get_uniform_rv(10), get_exponential_rv(5)]
+
+        set_seed(7)
+        global_value = get_uniform_rv()
+        set_seed(7)
+        rng = get_rng(42)
+        self.assertEqual([get_uniform_rv(10, rng=rng), get_exponential_rv(5, rng=rng)], expected_list)
+        self.assertEqual(get_uniform_rv(), global_value)
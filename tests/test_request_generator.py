@@ -1,5 +1,8 @@
 import unittest
 
+import numpy as np
+
+from arg_scripts.request_args import REQUEST_DTYPE
 from src.request_generator import get_requests
 
 
@@ -42,7 +45,7 @@ class TestGetRequests(unittest.TestCase):
         """
         requests = get_requests(seed=self.seed, engine_props=self.engine_props)
         for _, value in requests.items():
-            self.assertNotEqual(value['source'], value['destination'])
+            self.assertNotEqual(value.source, value.destination)
 
     def test_correct_bandwidth_distribution(self):
         """
@@ -51,17 +54,53 @@ class TestGetRequests(unittest.TestCase):
         requests = get_requests(seed=self.seed, engine_props=self.engine_props)
         bw_distribution = {bw: 0 for bw in self.engine_props['mod_per_bw']}
         for _, value in requests.items():
-            if value['request_type'] == 'arrival':
-                bw_distribution[value['bandwidth']] += 1
+            if value.request_type == 'arrival':
+                bw_distribution[value.bandwidth] += 1
         for bandwidth, count in self.engine_props['request_distribution'].items():
             expected_count = int(count * self.engine_props['num_requests'])
             self.assertEqual(bw_distribution[bandwidth], expected_count)
 
+    def test_independent_of_global_seed(self):
+        """
+        Tests that requests only depend on their own seed, so several simulations may share a process.
+        """
+        np.random.seed(1)
+        requests_one = get_requests(seed=self.seed, engine_props=self.engine_props)
+        global_value = np.random.uniform()
+
+        np.random.seed(2)
+        requests_two = get_requests(seed=self.seed, engine_props=self.engine_props)
+        self.assertEqual(requests_one, requests_two)
+
+        np.random.seed(1)
+        self.assertEqual(np.random.uniform(), global_value)
+
     def test_arrival_departure_times(self):
         """
         Test arrival and departure times.
         """
         requests = get_requests(seed=self.seed, engine_props=self.engine_props)
         for _, value in requests.items():
-            if value['request_type'] == 'arrival':
-                self.assertLess(value['arrive'], value['depart'])
+            if value.request_type == 'arrival':
+                self.assertLess(value.arrive, value.depart)
+
+    def test_request_table(self):
+        """
+        Tests that requests are stored once in compact arrays and read back by event time, in any order.
+        """
+        requests = get_requests(seed=self.seed, engine_props=self.engine_props)
+        self.assertEqual(requests.requests_arr.dtype, REQUEST_DTYPE)
+        self.assertEqual(len(requests.requests_arr), self.engine_props['num_requests'])
+
+        times_list = list(requests)
+        self.assertEqual(times_list, sorted(times_list))
+        last_req = requests[times_list[-1]]
+        self.assertEqual(last_req.request_type, 'release')
+        self.assertEqual(last_req.depart, times_list[-1])
+        self.assertIs(last_req.mod_formats, self.engine_props['mod_per_bw'][last_req.bandwidth])
+
+        first_req = requests[times_list[0]]
+        self.assertEqual((first_req.request_type, first_req.arrive), ('arrival', times_list[0]))
+        self.assertIn(first_req.depart, requests)
+        with self.assertRaises(KeyError):
+            _ = requests[-1.0]
@@ -1,9 +1,10 @@
 # pylint: disable=protected-access
 
 import unittest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 import numpy as np
-from helper_scripts.rl_helpers import RLHelpers
+from helper_scripts.rl_helpers import RLHelpers, SpectrumObsBuilder
 
 
 class TestRLHelpers(unittest.TestCase):
@@ -29,21 +30,25 @@ class TestRLHelpers(unittest.TestCase):
 
     def test_get_super_channels(self):
         """Test the get_super_channels method."""
-        self.rl_props.chosen_path_list = [MagicMock()]
-        self.rl_props.spectral_slots = 10
-        self.rl_props.super_channel_space = 2  # Set a valid integer value for super_channel_space
-        self.rl_helpers.core_num = 2
-
-        # Mock get_hfrag to return valid indexes and a matching hfrag_arr size
-        with patch('helper_scripts.rl_helpers.get_hfrag',
-                   return_value=(np.array([[0, 1], [1, 2]]), np.array([0.1, 0.2, 0.3]))):
-            frag_matrix, no_penalty = self.rl_helpers.get_super_channels(slots_needed=5, num_channels=2)
-            self.assertEqual(frag_matrix.tolist(), [0.1, 0.2])
-            self.assertFalse(no_penalty)
+        self.rl_props.chosen_path_list = [[1, 2]]
+        self.rl_helpers.core_num = 0
+        cores_matrix = {'c': np.array([[0, 0, 0, 1, 0, 0, 0, 0, 1, 1]])}
+        self.engine_obj.net_spec_dict = {(1, 2): {'cores_matrix': cores_matrix}}
+        self.engine_obj.engine_props = {'band_list': ['c']}
+        self.rl_helpers.obs_obj = SpectrumObsBuilder(num_nodes=3, super_channel_space=3, spectral_slots=10)
+
+        frag_matrix, no_penalty = self.rl_helpers.get_super_channels(slots_needed=2, num_channels=3)
+        self.assertTrue(np.allclose(frag_matrix, [0.322, 0.644, 0.644]))
+        self.assertEqual(self.rl_helpers.super_channel_indexes.tolist(), [[0, 2], [4, 6], [5, 7]])
+        self.assertFalse(no_penalty)
+
+        frag_matrix, no_penalty = self.rl_helpers.get_super_channels(slots_needed=6, num_channels=3)
+        self.assertEqual(len(self.rl_helpers.super_channel_indexes), 0)
+        self.assertTrue(no_penalty)
 
     def test_classify_paths(self):
         """Test the classify_paths method."""
-        paths_list = np.array([['path1'], ['path2']])
+        paths_list = np.array(['path1', 'path2'])
         with patch('helper_scripts.rl_helpers.find_path_cong', return_value=0.2):
             with patch('helper_scripts.rl_helpers.classify_cong', return_value=1):
                 result = self.rl_helpers.classify_paths(paths_list)
@@ -51,11 +56,12 @@ class TestRLHelpers(unittest.TestCase):
 
     def test_classify_cores(self):
         """Test the classify_cores method."""
-        cores_list = [{'path': ['path1'], 2: 'congestion_level'}]  # Ensure the dictionary has the expected keys
-        with patch('helper_scripts.rl_helpers.find_core_cong', return_value=0.3):
+        cores_list = np.array([[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]])
+        with patch('helper_scripts.rl_helpers.find_cores_cong', return_value=np.array([0.3, 0.3])) as mock_core_cong:
             with patch('helper_scripts.rl_helpers.classify_cong', return_value=2):
-                result = self.rl_helpers.classify_cores(cores_list)
-                self.assertEqual(result, [(0, 'congestion_level', 2)])
+                result = self.rl_helpers.classify_cores(cores_list=cores_list, path_list=['A', 'B'])
+                self.assertEqual(result, [(0, 2.0, 2), (1, 5.0, 2)])
+                self.assertEqual(mock_core_cong.call_args.kwargs['path_list'], ['A', 'B'])
 
     def test_update_route_props(self):
         """Test the update_route_props method."""
@@ -74,9 +80,9 @@ class TestRLHelpers(unittest.TestCase):
 
     def test_handle_releases(self):
         """Test the handle_releases method."""
-        self.rl_props.arrival_list = [{'arrive': 5}]
+        self.rl_props.arrival_list = [SimpleNamespace(arrive=5)]
         self.rl_props.arrival_count = 0
-        self.rl_props.depart_list = [{'depart': 4}, {'depart': 6}]
+        self.rl_props.depart_list = [SimpleNamespace(depart=4), SimpleNamespace(depart=6)]
         self.rl_helpers._last_processed_index = 0
 
         self.rl_helpers.handle_releases()
@@ -85,10 +91,11 @@ class TestRLHelpers(unittest.TestCase):
 
     def test_allocate(self):
         """Test the allocate method."""
-        self.rl_props.arrival_list = [{'arrive': 5}]
+        self.rl_props.arrival_list = [SimpleNamespace(arrive=5)]
         self.rl_props.arrival_count = 0
         self.rl_props.forced_index = 0
         self.rl_helpers.super_channel_indexes = [[1, 2], [3, 4]]
+        self.rl_helpers.band = 'l'
 
         with patch('helper_scripts.rl_helpers.SpectrumAssignment') as mock_spectrum_assignment:
             mock_spectrum_assignment_instance = mock_spectrum_assignment.return_value
@@ -96,6 +103,9 @@ class TestRLHelpers(unittest.TestCase):
 
             self.rl_helpers.allocate()
             self.engine_obj.handle_arrival.assert_called_once()
+            # The super-channel is allocated on the band it was observed on
+            call_kwargs = self.engine_obj.handle_arrival.call_args.kwargs
+            self.assertEqual((call_kwargs['forced_index'], call_kwargs['force_band']), (1, 'l'))
 
     @patch('helper_scripts.rl_helpers.SpectrumAssignment')
     def test_mock_handle_arrival(self, mock_spectrum_assignment):
@@ -115,13 +125,7 @@ class TestRLHelpers(unittest.TestCase):
     @patch('helper_scripts.rl_helpers.SDNProps')
     def test_update_mock_sdn(self, mock_sdn_props):
         """Test the update_mock_sdn method."""
-        curr_req = {
-            'req_id': 1,
-            'source': 'A',
-            'destination': 'B',
-            'bandwidth': '100G',
-            'mod_formats': [1, 2, 3]
-        }
+        curr_req = SimpleNamespace(req_id=1, source='A', destination='B', bandwidth='100G', mod_formats=[1, 2, 3])
 
         # Mock SDNProps
         mock_sdn_instance = mock_sdn_props.return_value
@@ -133,11 +137,11 @@ class TestRLHelpers(unittest.TestCase):
         self.assertEqual(result, mock_sdn_instance)
 
         # Verify that the attributes were set correctly on the mock
-        self.assertEqual(mock_sdn_instance.req_id, curr_req['req_id'])
-        self.assertEqual(mock_sdn_instance.source, curr_req['source'])
-        self.assertEqual(mock_sdn_instance.destination, curr_req['destination'])
-        self.assertEqual(mock_sdn_instance.bandwidth, curr_req['bandwidth'])
-        self.assertEqual(mock_sdn_instance.mod_formats_dict, curr_req['mod_formats'])
+        self.assertEqual(mock_sdn_instance.req_id, curr_req.req_id)
+        self.assertEqual(mock_sdn_instance.source, curr_req.source)
+        self.assertEqual(mock_sdn_instance.destination, curr_req.destination)
+        self.assertEqual(mock_sdn_instance.bandwidth, curr_req.bandwidth)
+        self.assertEqual(mock_sdn_instance.mod_formats_dict, curr_req.mod_formats)
 
     def test_reset_reqs_dict(self):
         """Test the reset_reqs_dict method."""
@@ -147,8 +151,8 @@ class TestRLHelpers(unittest.TestCase):
 
         # Mock the reqs_dict that generate_requests would populate
         self.engine_obj.reqs_dict = {
-            1: {'request_type': 'arrival', 'req_id': 1, 'arrive': 10, 'depart': 20},
-            2: {'request_type': 'departure', 'req_id': 1, 'arrive': 10, 'depart': 20}
+            1: SimpleNamespace(request_type='arrival', req_id=1, arrive=10, depart=20),
+            2: SimpleNamespace(request_type='departure', req_id=1, arrive=10, depart=20)
         }
 
         # Mock generate_requests to populate reqs_dict based on the mock above
@@ -164,5 +168,53 @@ class TestRLHelpers(unittest.TestCase):
             self.assertEqual(self.rl_helpers._last_processed_index, 0)
 
 
+class TestSpectrumObsBuilder(unittest.TestCase):
+    """Unit tests for the SpectrumObsBuilder class."""
+
+    def setUp(self):
+        """Set up a two link path with two cores."""
+        self.net_spec_dict = {
+            (1, 2): {'cores_matrix': {'c': np.zeros((2, 8))}},
+            (2, 3): {'cores_matrix': {'c': np.zeros((2, 8))}},
+        }
+        self.obs_obj = SpectrumObsBuilder(num_nodes=4, super_channel_space=2, spectral_slots=8)
+
+    def test_update_nodes(self):
+        """Test that the one-hot node observations are updated in place."""
+        source_obs = self.obs_obj.source_obs
+        self.obs_obj.update_nodes(source=1, destination=3)
+        self.obs_obj.update_nodes(source=2, destination=0)
+
+        self.assertIs(self.obs_obj.source_obs, source_obs)
+        self.assertEqual(self.obs_obj.source_obs.tolist(), [0, 0, 1, 0])
+        self.assertEqual(self.obs_obj.dest_obs.tolist(), [1, 0, 0, 0])
+
+    def test_get_path_mask(self):
+        """Test the slots taken on any link of a path."""
+        self.net_spec_dict[(1, 2)]['cores_matrix']['c'][0, 1] = 3
+        self.net_spec_dict[(2, 3)]['cores_matrix']['c'][1, 6] = -4
+
+        occupied_mat = self.obs_obj.get_path_mask(path_list=[1, 2, 3], band='c', net_spec_dict=self.net_spec_dict)
+        self.assertEqual(np.argwhere(occupied_mat).tolist(), [[0, 1], [1, 6]])
+
+        occupied_mat = self.obs_obj.get_path_mask(path_list=[2, 3], band='c', net_spec_dict=self.net_spec_dict)
+        self.assertEqual(np.argwhere(occupied_mat).tolist(), [[1, 6]])
+
+    def test_update_super_channels(self):
+        """Test that only the first super-channels are observed and the rest are cleared."""
+        self.net_spec_dict[(2, 3)]['cores_matrix']['c'][1, 3] = 1
+
+        no_penalty = self.obs_obj.update_super_channels(path_list=[1, 2, 3], core_num=1, band='c', slots_needed=1,
+                                                        num_channels=5, net_spec_dict=self.net_spec_dict)
+        self.assertFalse(no_penalty)
+        self.assertEqual(self.obs_obj.num_channels, 2)
+        self.assertEqual(self.obs_obj.sc_index_mat.tolist(), [[0, 1], [1, 2]])
+
+        self.obs_obj.update_super_channels(path_list=[1, 2, 3], core_num=1, band='c', slots_needed=5,
+                                           num_channels=5, net_spec_dict=self.net_spec_dict)
+        self.assertEqual(self.obs_obj.num_channels, 0)
+        self.assertEqual(self.obs_obj.super_channels.tolist(), [100.0, 100.0])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,8 @@ import numpy as np
 import networkx as nx
 
 from src.routing import Routing
+from helper_scripts.sim_helpers import create_link_spectrum
+from arg_scripts.engine_args import RouteMethod
 from arg_scripts.routing_args import RoutingProps
 
 
@@ -29,15 +31,13 @@ class TestRouting(unittest.TestCase):
         self.engine_props['topology'].add_edge('A', 'C', weight=3, xt_cost=100, length=2)
 
         self.sdn_props = MagicMock()
-        self.sdn_props.net_spec_dict = {
-            ('A', 'B'): {'cores_matrix': {'c': np.zeros((1, 10))}},
-            ('B', 'C'): {'cores_matrix': {'c': np.ones((1, 10))}},
-            ('A', 'C'): {'cores_matrix': {'c': np.zeros((1, 10))}}
-        }
+        self.sdn_props.net_spec_dict = {link_tuple: create_link_spectrum(num_cores=1, band_slots_dict={'c': 10})
+                                        for link_tuple in [('A', 'B'), ('B', 'C'), ('A', 'C')]}
+        self.sdn_props.net_spec_dict[('B', 'C')]['spectrum_arr'][:] = 1
         self.sdn_props.source = 'A'
         self.sdn_props.destination = 'C'
         self.sdn_props.topology = self.engine_props['topology']
-        self.sdn_props.mod_formats = {
+        self.sdn_props.mod_formats_dict = {
             'QPSK': {'max_length': 10},
             '16-QAM': {'max_length': 20},
             '64-QAM': {'max_length': 30}
@@ -109,6 +109,22 @@ class TestRouting(unittest.TestCase):
         for weight in self.instance.route_props.weights_list:
             self.assertIsInstance(weight, (int, float), "Each weight should be a number")
 
+    def test_find_k_shortest_cache(self):
+        """
+        Test that k-shortest paths are only searched for once per node pair.
+        """
+        self.engine_props['mod_per_bw'] = {
+            '50GHz': {'QPSK': {'max_length': 10}, '16-QAM': {'max_length': 20}, '64-QAM': {'max_length': 40}},
+        }
+        with patch('src.routing.nx.shortest_simple_paths', wraps=nx.shortest_simple_paths) as mock_paths:
+            self.instance.find_k_shortest()
+            first_paths_list = self.instance.route_props.paths_matrix
+            self.instance._init_route_info()  # pylint: disable=protected-access
+            self.instance.find_k_shortest()
+
+        mock_paths.assert_called_once()
+        self.assertEqual(self.instance.route_props.paths_matrix, first_paths_list)
+
     def test_find_least_nli(self):
         """
         Test find the least non-linear impairment cost method.
@@ -139,6 +155,24 @@ class TestRouting(unittest.TestCase):
                 source, destination = link_list
                 self.assertIn('xt_cost', self.sdn_props.topology[source][destination], "XT cost not set for link")
 
+    def test_get_route(self):
+        """
+        Test that the configured routing method is used unless it's overridden for a request.
+        """
+        self.engine_props['mod_per_bw'] = {'50GHz': {'QPSK': {'max_length': 10}, '16-QAM': {'max_length': 20},
+                                                     '64-QAM': {'max_length': 40}}}
+        self.assertEqual(self.instance.config_obj.route_method, RouteMethod.K_SHORTEST_PATH)
+        self.instance.get_route()
+        self.assertEqual(len(self.instance.route_props.paths_matrix), self.engine_props['k_paths'])
+
+        self.instance.get_route(route_method=RouteMethod.SHORTEST_PATH)
+        self.assertEqual(len(self.instance.route_props.paths_matrix), 1)
+
+        self.engine_props['route_method'] = 'unknown'
+        self.instance.update_config()
+        with self.assertRaises(NotImplementedError):
+            self.instance.get_route()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,14 @@
 # pylint: disable=protected-access
 # pylint: disable=too-few-public-methods
 
+import os
+import shutil
 import unittest
+import multiprocessing
 from unittest.mock import patch, call
 import networkx as nx
 import numpy as np
-from helper_scripts.routing_helpers import RoutingHelpers
+from helper_scripts.routing_helpers import RoutingHelpers, get_k_paths_cache
 
 
 class RouteProps:
@@ -162,7 +165,7 @@ class TestRoutingHelpers(unittest.TestCase):
             }
 
             # Call the function under test
-            nli_worst = self.helpers.find_worst_nli(num_span=num_span)
+            nli_worst = self.helpers.find_worst_nli(num_span=num_span, band='c')
 
             # Expected NLI value (mocked based on previous calculation)
             expected_nli_worst = 2.19e-10
@@ -262,5 +265,75 @@ class TestRoutingHelpers(unittest.TestCase):
             self.assertAlmostEqual(nli_cost, expected_nli_cost, msg="NLI cost calculation is incorrect")
 
 
+
+class TestGetKPathsCache(unittest.TestCase):
+    """
+    Tests the all-pairs k-shortest path precomputation.
+    """
+
+    def setUp(self):
+        self.topology = nx.Graph()
+        self.topology.add_edge('A', 'B', length=1.0)
+        self.topology.add_edge('B', 'C', length=1.0)
+        self.topology.add_edge('A', 'C', length=5.0)
+        self.cache_dir = os.path.join('tests', 'k_paths_test')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_get_k_paths_cache(self):
+        """
+        Tests that every ordered pair holds its k-shortest paths in order.
+        """
+        k_paths_cache = get_k_paths_cache(topology=self.topology, k_paths=2, max_workers=1)
+
+        self.assertEqual(len(k_paths_cache), 6)
+        self.assertEqual(k_paths_cache[('A', 'C', 2)], [(['A', 'B', 'C'], 2.0), (['A', 'C'], 5.0)])
+        self.assertEqual(k_paths_cache[('C', 'A', 2)], [(['C', 'B', 'A'], 2.0), (['C', 'A'], 5.0)])
+
+    def test_get_k_paths_cache_parallel(self):
+        """
+        Tests that searching in parallel finds the same paths.
+        """
+        serial_cache = get_k_paths_cache(topology=self.topology, k_paths=2, max_workers=1)
+        parallel_cache = get_k_paths_cache(topology=self.topology, k_paths=2, max_workers=2)
+        self.assertEqual(serial_cache, parallel_cache)
+
+    def test_get_k_paths_cache_disk(self):
+        """
+        Tests that paths are saved per topology and k, then loaded instead of searched.
+        """
+        k_paths_cache = get_k_paths_cache(topology=self.topology, k_paths=2, cache_dir=self.cache_dir, max_workers=1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        with patch('helper_scripts.routing_helpers._find_source_paths') as mock_find:
+            loaded_cache = get_k_paths_cache(topology=self.topology, k_paths=2, cache_dir=self.cache_dir,
+                                             max_workers=1)
+        mock_find.assert_not_called()
+        self.assertEqual(loaded_cache, k_paths_cache)
+
+        # A different k or topology must not reuse the saved paths
+        get_k_paths_cache(topology=self.topology, k_paths=1, cache_dir=self.cache_dir, max_workers=1)
+        self.topology['A']['C']['length'] = 0.5
+        changed_cache = get_k_paths_cache(topology=self.topology, k_paths=2, cache_dir=self.cache_dir, max_workers=1)
+        self.assertEqual(changed_cache[('A', 'C', 2)][0], (['A', 'C'], 0.5))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+
+    def test_get_k_paths_cache_daemon(self):
+        """
+        Tests that paths are searched in the current process when it's a daemon process.
+        """
+        process_obj = multiprocessing.Process(target=_get_cache_size, args=(self.topology, self.cache_dir), daemon=True)
+        process_obj.start()
+        process_obj.join(timeout=60)
+
+        self.assertEqual(process_obj.exitcode, 0)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+
+def _get_cache_size(topology: nx.Graph, cache_dir: str):
+    return len(get_k_paths_cache(topology=topology, k_paths=2, cache_dir=cache_dir))
+
+
 if __name__ == '__main__':
     unittest.main()
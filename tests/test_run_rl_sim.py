@@ -0,0 +1,75 @@
+import os
+import shutil
+import unittest
+from collections import defaultdict
+from importlib.util import find_spec
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from config_scripts.setup_config import read_config
+from helper_scripts.sim_helpers import get_start_time
+
+HAS_DRL = find_spec('stable_baselines3') is not None and find_spec('torch') is not None
+
+
+@unittest.skipUnless(HAS_DRL, 'stable_baselines3 and torch are required')
+class TestMakeVecEnv(unittest.TestCase):
+    """
+    Tests make_vec_env in run_rl_sim.py
+    """
+
+    def setUp(self):
+        config_path = os.path.join('tests', 'fixtures', 'valid_config.ini')
+        self.sim_dict = read_config(args_dict=defaultdict(lambda: None), config_path=config_path)['s1']
+        mod_fp = os.path.join('json_input', 'example_mods', 'example_mod_formats.json')
+        self.sim_dict.update({'num_envs': 2, 'num_requests': 10, 'max_iters': 1, 'arrival_rate': 300.0,
+                              'spectral_slots': 128, 'is_training': True, 'optimize': False, 'band_list': [],
+                              'path_algorithm': 'first_fit', 'core_algorithm': 'first_fit',
+                              'spectrum_algorithm': 'ppo', 'mod_assumptions_path': mod_fp})
+        get_start_time(sim_dict={'s1': self.sim_dict})
+
+    def tearDown(self):
+        for directory in ('input', 'output'):
+            shutil.rmtree(os.path.join('data', directory, self.sim_dict['network'], self.sim_dict['date'],
+                                       self.sim_dict['sim_start']), ignore_errors=True)
+        shutil.rmtree(os.path.join('logs', 'ppo', self.sim_dict['network'], self.sim_dict['date'],
+                                   self.sim_dict['sim_start']), ignore_errors=True)
+
+    def test_make_vec_env(self):
+        """
+        Tests every worker process can reset and step its own simulator.
+        """
+        from run_rl_sim import make_vec_env  # pylint: disable=import-outside-toplevel
+
+        vec_env = make_vec_env(sim_dict=self.sim_dict)
+        try:
+            obs = vec_env.reset()
+            self.assertEqual(vec_env.num_envs, 2)
+            for obs_arr in obs.values():
+                self.assertEqual(len(obs_arr), 2)
+            vec_env.step([0, 0])
+        finally:
+            vec_env.close()
+
+    def test_run_spectrum(self):
+        """
+        Tests a PPO model is trained on every worker process and saved.
+        """
+        from run_rl_sim import _run_spectrum  # pylint: disable=import-outside-toplevel
+        from helper_scripts.rl_setup_helpers import get_ppo_params  # pylint: disable=import-outside-toplevel
+
+        # A single short rollout on each worker
+        params_dict = dict(get_ppo_params(), n_timesteps=16, n_steps=8, batch_size=8, n_epochs=1)
+        self.sim_dict.update({'optimize_hyperparameters': False, 'device': 'cpu', 'print_step': 1, 'callback': None})
+        env = SimpleNamespace(modified_props=self.sim_dict)
+        with patch('helper_scripts.rl_setup_helpers.get_ppo_params', return_value=params_dict), \
+                patch('run_rl_sim.get_ppo_params', return_value=params_dict):
+            _run_spectrum(sim_dict=self.sim_dict, env=env)
+
+        save_fp = os.path.join('logs', 'ppo', self.sim_dict['network'], self.sim_dict['date'],
+                               self.sim_dict['sim_start'], 'ppo_model.zip')
+        self.assertTrue(os.path.exists(save_fp))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,15 @@
 # pylint: disable=protected-access
 
 import unittest
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
 import numpy as np
+import networkx as nx
 
 from src.sdn_controller import SDNController
 from arg_scripts.sdn_args import SDNProps  # Class import for sdn_props
+from arg_scripts.request_args import Request
+from helper_scripts.sim_helpers import create_link_spectrum
 
 
 class TestSDNController(unittest.TestCase):
@@ -28,10 +32,8 @@ class TestSDNController(unittest.TestCase):
         self.controller.sdn_props.path_list = ['A', 'B', 'C']
         self.controller.sdn_props.req_id = 1
         self.controller.sdn_props.net_spec_dict = {
-            ('A', 'B'): {'cores_matrix': {'c': np.zeros((7, 10))}},
-            ('B', 'A'): {'cores_matrix': {'c': np.zeros((7, 10))}},
-            ('B', 'C'): {'cores_matrix': {'c': np.zeros((7, 10))}},
-            ('C', 'B'): {'cores_matrix': {'c': np.zeros((7, 10))}}
+            link_tuple: create_link_spectrum(num_cores=7, band_slots_dict={'c': 10})
+            for link_tuple in [('A', 'B'), ('B', 'A'), ('B', 'C'), ('C', 'B')]
         }
 
     def test_release(self):
@@ -47,6 +49,21 @@ class TestSDNController(unittest.TestCase):
                 core_arr = self.controller.sdn_props.net_spec_dict[link]['cores_matrix']['c'][core_num]
                 self.assertTrue(np.all(core_arr[:4] == 0), "Request and guard band not properly cleared")
 
+    def test_release_stacked(self):
+        """
+        Test that a request is released from every band of a link's stacked spectrum.
+        """
+        self.engine_props['band_list'] = ['c', 'l']
+        self.controller.update_config()
+        link_dict = create_link_spectrum(num_cores=2, band_slots_dict={'c': 4, 'l': 4})
+        link_dict['spectrum_arr'][:] = [[1, 1, -1, 2, 0, 1, -1, 0], [2, -2, 0, 0, 0, 0, 0, 0]]
+        self.controller.sdn_props.path_list = ['A', 'B']
+        self.controller.sdn_props.net_spec_dict = {('A', 'B'): link_dict, ('B', 'A'): dict(link_dict)}
+        self.controller.release()
+
+        self.assertEqual(link_dict['spectrum_arr'].tolist(), [[0, 0, 0, 2, 0, 0, 0, 0], [2, -2, 0, 0, 0, 0, 0, 0]])
+        self.assertEqual(link_dict['cores_matrix']['l'][0].tolist(), [0, 0, 0, 0])
+
     def test_allocate(self):
         """
         Test the allocate method.
@@ -56,6 +73,7 @@ class TestSDNController(unittest.TestCase):
         self.controller.spectrum_obj.spectrum_props.core_num = 0
         self.controller.spectrum_obj.spectrum_props.curr_band = 'c'
         self.controller.engine_props['guard_slots'] = True
+        self.controller.update_config()
         self.controller.allocate()
 
         for link in zip(self.controller.sdn_props.path_list, self.controller.sdn_props.path_list[1:]):
@@ -66,26 +84,42 @@ class TestSDNController(unittest.TestCase):
             self.assertEqual(core_matrix[2], self.controller.sdn_props.req_id * -1,
                              msg="Guard band not properly allocated.")
 
+    def test_bind_request(self):
+        """
+        Test that a request is bound to the controller's properties with plain attribute assignments.
+        """
+        req_obj = Request(req_id=5, source='A', destination='C', arrive=1.0, depart=2.0, request_type='arrival',
+                          bandwidth='100', mod_formats={'QPSK': {'max_length': 2000}})
+        self.controller.sdn_props.bind_request(req_obj=req_obj)
+
+        self.assertEqual((self.controller.sdn_props.req_id, self.controller.sdn_props.source), (5, 'A'))
+        self.assertEqual(self.controller.sdn_props.depart, 2.0)
+        self.assertIs(self.controller.sdn_props.mod_formats_dict, req_obj.mod_formats)
+        with self.assertRaises(AttributeError):
+            self.controller.sdn_props.unknown_key = 1
+
     def test_update_req_stats(self):
         """
         Test the update request statistics method.
         """
-        # Properly initialize sdn_props with necessary attributes
-        self.controller.sdn_props.xt_cost = []
-        self.controller.sdn_props.core_num = []
+        self.controller.spectrum_obj.spectrum_props.modulation = 'QPSK'
         self.controller.spectrum_obj.spectrum_props.xt_cost = 10
         self.controller.spectrum_obj.spectrum_props.core_num = 2
-
-        # Set sdn_props.stat_key_list to ensure the relevant keys are present
-        self.controller.sdn_props.stat_key_list = ['xt_cost', 'core_num']
+        self.controller.spectrum_obj.spectrum_props.curr_band = 'c'
+        self.controller.spectrum_obj.spectrum_props.start_slot = 5
+        self.controller.spectrum_obj.spectrum_props.end_slot = 9
 
         # Call the method to update request statistics
         self.controller._update_req_stats(bandwidth='100G')
 
         # Verify that the bandwidth and other stats are updated correctly
-        self.assertIn('100G', self.controller.sdn_props.bandwidth_list)
-        self.assertIn(10, self.controller.sdn_props.xt_cost)  # Check if xt_cost was updated correctly
-        self.assertIn(2, self.controller.sdn_props.core_num)  # Check if core_num was updated correctly
+        self.assertEqual(self.controller.sdn_props.bandwidth_list, ['100G'])
+        self.assertEqual(self.controller.sdn_props.modulation_list, ['QPSK'])
+        self.assertEqual(self.controller.sdn_props.xt_list, [10])
+        self.assertEqual(self.controller.sdn_props.core_list, [2])
+        self.assertEqual(self.controller.sdn_props.band_list, ['c'])
+        self.assertEqual(self.controller.sdn_props.start_slot_list, [5])
+        self.assertEqual(self.controller.sdn_props.end_slot_list, [9])
 
     @patch('src.sdn_controller.SDNController.allocate')
     @patch('src.sdn_controller.SDNController._update_req_stats')
@@ -105,6 +139,34 @@ class TestSDNController(unittest.TestCase):
         mock_allocate.assert_called()
         mock_update_req_stats.assert_called_with(bandwidth='50G')
 
+    def test_handle_slicing_planned(self):
+        """
+        Tests that planned segments are only allocated when every one of them fits.
+        """
+        mods_dict = {'QPSK': {'max_length': 2000, 'slots_needed': 3}, '16-QAM': {'max_length': 200},
+                     '64-QAM': {'max_length': 100}}
+        self.engine_props.update({'allocation_method': 'first_fit', 'max_segments': 4, 'cores_per_link': 1,
+                                  'mod_per_bw': {'100': mods_dict, '50': mods_dict},
+                                  'topology': nx.Graph([('A', 'B', {'length': 100.0}),
+                                                        ('B', 'C', {'length': 200.0})])})
+        self.controller.update_config()
+        self.controller.sdn_props.bandwidth = '100'
+        self.controller.sdn_props.net_spec_dict[('B', 'C')]['cores_matrix']['c'][0, 3] = 2
+
+        # Only one segment of four slots fits on the path
+        self.controller._handle_slicing(path_list=['A', 'B', 'C'], forced_segments=-1)
+        self.assertFalse(self.controller.sdn_props.was_routed)
+        self.assertEqual(self.controller.sdn_props.block_reason, 'congestion')
+        self.assertFalse(np.any(self.controller.sdn_props.net_spec_dict[('A', 'B')]['cores_matrix']['c'] == 1))
+        self.assertEqual(self.controller.sdn_props.bandwidth_list, [])
+
+        self.controller.sdn_props.net_spec_dict[('B', 'C')]['cores_matrix']['c'][0, 3] = 0
+        self.controller._handle_slicing(path_list=['A', 'B', 'C'], forced_segments=-1)
+        self.assertTrue(self.controller.sdn_props.is_sliced)
+        self.assertEqual(self.controller.sdn_props.bandwidth_list, ['50', '50'])
+        core_arr = self.controller.sdn_props.net_spec_dict[('B', 'C')]['cores_matrix']['c'][0]
+        self.assertEqual(core_arr[:8].tolist(), [1, 1, 1, -1, 1, 1, 1, -1])
+
     @patch('src.sdn_controller.SDNController.allocate')
     @patch('src.sdn_controller.SDNController._update_req_stats')
     @patch('src.routing.Routing.get_route')
@@ -126,6 +188,24 @@ class TestSDNController(unittest.TestCase):
         mock_allocate.assert_called_once()
         self.assertTrue(self.controller.sdn_props.was_routed)
 
+    def test_get_ml_segments(self):
+        """
+        Tests that every candidate path is predicted in a single call.
+        """
+        self.engine_props['topology'] = nx.Graph([('A', 'B', {'length': 100.0}), ('B', 'C', {'length': 200.0})])
+        self.engine_props['k_paths'] = 3
+        ml_model = MagicMock(feature_names_list=['path_length', 'longest_reach', 'ave_cong'])
+        ml_model.predict.return_value = np.array([2, 4])
+        req_obj = SimpleNamespace(bandwidth='100', mod_formats={'QPSK': {'max_length': 2000}})
+
+        segments_list = self.controller._get_ml_segments(ml_model=ml_model, req_obj=req_obj,
+                                                         route_matrix=[['A', 'B', 'C'], False, ['C', 'B']])
+
+        self.assertEqual(segments_list, [2, -1.0, 4])
+        ml_model.predict.assert_called_once()
+        obs_mat = ml_model.predict.call_args.args[0]
+        self.assertTrue(np.array_equal(obs_mat, [[300.0, 2000.0, 0.0], [200.0, 2000.0, 0.0]]))
+
 
 if __name__ == '__main__':
     unittest.main()
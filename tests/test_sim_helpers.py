@@ -12,12 +12,26 @@ from helper_scripts.sim_helpers import (
     get_path_mod, find_max_path_len, sort_dict_keys, sort_nested_dict_vals,
     find_path_len, find_path_cong, find_free_slots,
     find_free_channels, find_taken_channels, snake_to_title, int_to_string,
-    dict_to_list, list_to_title, calc_matrix_stats, combine_and_one_hot,
+    dict_to_list, list_to_title, get_matrix_stats, combine_and_one_hot,
     get_start_time, find_core_cong, find_core_frag_cong, min_max_scale,
-    get_super_channels, get_hfrag, classify_cong, parse_yaml_file
+    get_super_channels, get_hfrag, classify_cong, parse_yaml_file, get_erlang_bracket,
+    get_next_erlang, get_hfrag_mat, get_path_occupancy, create_link_spectrum, get_link_spectrum,
+    find_cores_cong, find_cores_frag_cong, create_engine_props, get_band_slots, find_window_fits, find_free_runs
 )
 
 
+def _stack_links(links_dict: dict):
+    """Creates a network spectrum database with a stacked c-band spectrum holding each link's slots."""
+    net_spec_dict = dict()
+    for link_tuple, slots_list in links_dict.items():
+        slots_arr = np.array(slots_list)
+        net_spec_dict[link_tuple] = create_link_spectrum(num_cores=slots_arr.shape[0],
+                                                         band_slots_dict={'c': slots_arr.shape[1]})
+        net_spec_dict[link_tuple]['spectrum_arr'][:] = slots_arr
+
+    return net_spec_dict
+
+
 class TestSimHelpers(unittest.TestCase):
     """Unit tests for sim_helpers functions."""
 
@@ -35,18 +49,10 @@ class TestSimHelpers(unittest.TestCase):
         self.topology.add_edge(1, 3, length=50)
         self.topology.add_edge(3, 4, length=15)
 
-        self.net_spec_dict = {
-            ('A', 'B'): {
-                'cores_matrix': {
-                    'c': np.array([[0, 1, 0, 0, 1], [0, 0, 1, 0, 1]])
-                }
-            },
-            ('D', 'E'): {
-                'cores_matrix': {
-                    'c': np.array([[0, 0, 1, 1, -1], [0, 0, 0, 0, 0]])
-                }
-            }
-        }
+        self.net_spec_dict = _stack_links({
+            ('A', 'B'): [[0, 1, 0, 0, 1], [0, 0, 1, 0, 1]],
+            ('D', 'E'): [[0, 0, 1, 1, -1], [0, 0, 0, 0, 0]]
+        })
 
     def test_valid_path_length(self):
         """Test valid path length for modulation format selection."""
@@ -99,21 +105,61 @@ class TestSimHelpers(unittest.TestCase):
 
     def test_find_path_cong(self):
         """Test finding the average congestion of a path."""
-        net_spec_dict = {
-            (1, 2): {'cores_matrix': {'c': np.array([[0, 1, 1], [1, 1, 0]])}},
-            (2, 3): {'cores_matrix': {'c': np.array([[1, 0, 0], [0, 0, 1]])}}
-        }
+        net_spec_dict = _stack_links({(1, 2): [[0, 1, 1], [1, 1, 0]], (2, 3): [[1, 0, 0], [0, 0, 1]]})
         path_list = [1, 2, 3]
         expected_avg_cong = ((4 / 6) + (2 / 6)) / 2
         calculated_avg_cong = find_path_cong(path_list, net_spec_dict)
         self.assertAlmostEqual(calculated_avg_cong, expected_avg_cong, places=5)
 
+    def test_create_link_spectrum(self):
+        """Test that every band of a link is a view of its stacked spectrum."""
+        link_dict = create_link_spectrum(num_cores=2, band_slots_dict={'c': 3, 'l': 2})
+        self.assertEqual(link_dict['spectrum_arr'].shape, (2, 5))
+        self.assertEqual(link_dict['band_offsets'], {'c': (0, 3), 'l': (3, 5)})
+
+        link_dict['cores_matrix']['l'][1, 0] = 4
+        self.assertEqual(link_dict['spectrum_arr'][1, 3], 4)
+        spectrum_arr, _ = get_link_spectrum(link_dict=link_dict)
+        self.assertIs(spectrum_arr, link_dict['spectrum_arr'])
+
+        with self.assertRaises(ValueError):
+            get_link_spectrum(link_dict={'cores_matrix': link_dict['cores_matrix']})
+
+    def test_find_window_fits(self):
+        """Test that windows and runs never cross from one band into the next."""
+        band_offsets_dict = {'c': (0, 3), 'l': (3, 5)}
+        slot_arr, band_index_arr, band_start_arr, band_stop_arr = get_band_slots(band_offsets_dict=band_offsets_dict,
+                                                                                 band_list=['l', 'c'])
+        self.assertEqual(slot_arr.tolist(), [3, 4, 0, 1, 2])
+        self.assertEqual(band_index_arr.tolist(), [0, 0, 1, 1, 1])
+        self.assertEqual(band_start_arr.tolist(), [3, 3, 0, 0, 0])
+
+        free_mat = np.array([[True, True, True, True, True], [False, True, True, True, False]])
+        fits_mat = find_window_fits(free_arr=free_mat, window=2, slot_arr=slot_arr, stop_arr=band_stop_arr)
+        self.assertEqual(fits_mat.tolist(), [[True, False, True, True, False], [False, False, False, True, False]])
+
+        core_arr, band_index_arr, start_arr, length_arr = find_free_runs(free_mat=free_mat,
+                                                                         band_offsets_dict=band_offsets_dict)
+        self.assertEqual(core_arr.tolist(), [0, 0, 1, 1])
+        self.assertEqual(band_index_arr.tolist(), [0, 1, 0, 1])
+        self.assertEqual(start_arr.tolist(), [0, 0, 1, 0])
+        self.assertEqual(length_arr.tolist(), [3, 2, 2, 1])
+
+    def test_multi_band_cong(self):
+        """Test that congestion and free slots are split at band boundaries."""
+        link_dict = create_link_spectrum(num_cores=2, band_slots_dict={'c': 4, 'l': 2})
+        link_dict['spectrum_arr'][:] = [[1, 1, 0, 0, 2, 0], [0, 0, 0, 1, 2, -2]]
+        net_spec_dict = {(1, 2): link_dict}
+
+        self.assertAlmostEqual(find_path_cong([1, 2], net_spec_dict), ((3 / 8) + (3 / 4)) / 2)
+        self.assertAlmostEqual(find_core_cong(1, net_spec_dict, [1, 2]), 3 / 6)
+        free_slots_dict = find_free_slots(net_spec_dict, (1, 2))
+        self.assertEqual(free_slots_dict['c'][1].tolist(), [0, 1, 2])
+        self.assertEqual(free_slots_dict['l'][0].tolist(), [1])
+
     def test_find_core_cong(self):
         """Test finding congestion on a specific core along a path."""
-        net_spec_dict = {
-            (1, 2): {'cores_matrix': {'c': np.array([[0, 1, 1], [1, 1, 0]])}},
-            (2, 3): {'cores_matrix': {'c': np.array([[1, 0, 0], [0, 0, 1]])}}
-        }
+        net_spec_dict = _stack_links({(1, 2): [[0, 1, 1], [1, 1, 0]], (2, 3): [[1, 0, 0], [0, 0, 1]]})
         path_list = [1, 2, 3]
         core_index = 0
         expected_core_cong = ((2 / 3) + (1 / 3)) / 2
@@ -135,6 +181,25 @@ class TestSimHelpers(unittest.TestCase):
         self.assertEqual(frag_resp, 0)
         self.assertEqual(cong_resp, 0)
 
+    def test_find_cores_cong(self):
+        """Test finding congestion on every core along a path in one call."""
+        net_spec_dict = _stack_links({(1, 2): [[0, 1, 1], [1, 1, 0]], (2, 3): [[1, 0, 0], [0, 0, 0]]})
+        cong_arr = find_cores_cong(path_list=[1, 2, 3], net_spec_dict=net_spec_dict)
+        self.assertTrue(np.allclose(cong_arr, [((2 / 3) + (1 / 3)) / 2, (2 / 3) / 2]))
+
+    def test_find_cores_frag_cong(self):
+        """Test fragmentation and congestion of every core for any number of slots."""
+        net_spec_dict = {
+            (1, 2): {'cores_matrix': {'c': np.array([[0, 1, 0, 0, 2, 0], [0, 0, 0, 0, 0, 0]])}},
+            (2, 3): {'cores_matrix': {'c': np.array([[1, 1, 0, 2, 0, 0], [3, -3, 0, 0, 0, 0]])}}
+        }
+        frag_arr, cong_arr = find_cores_frag_cong(net_spec_db=net_spec_dict, path=[1, 2, 3], band='c')
+
+        # At most two fragments fit in six slots, free groups at the end of a core aren't fragments
+        self.assertTrue(np.allclose(frag_arr, [3 / 2 / 2, 0.0]))
+        self.assertTrue(np.allclose(cong_arr, [5 / 6 / 2, 2 / 6 / 2]))
+        self.assertEqual(find_core_frag_cong(net_spec_dict, [1, 2, 3], 1, 'c'), (0.0, 2 / 6 / 2))
+
     def test_find_free_slots(self):
         """Test finding free slots for each core on a link."""
         result1 = find_free_slots(self.net_spec_dict, ('A', 'B'))
@@ -184,13 +249,13 @@ class TestSimHelpers(unittest.TestCase):
         result = list_to_title(input_list)
         self.assertEqual(result, "Alice, Bob & Charlie")
 
-    def test_calc_matrix_stats(self):
+    def test_get_matrix_stats(self):
         """Test calculating min, max, and average of matrix columns."""
-        input_dict = {
-            '0': [1.0, 5.0, 3.0],
-            '1': [2.0, 4.0, 8.0],
-            '2': [0.0, 3.0, 5.0]
-        }
+        input_matrix = np.array([
+            [1.0, 5.0, 3.0],
+            [2.0, 4.0, 8.0],
+            [0.0, 3.0, 5.0]
+        ])
 
         expected_output = {
             'min': [0, 3, 3],
@@ -198,7 +263,7 @@ class TestSimHelpers(unittest.TestCase):
             'average': [1.0, 4.0, 5.333333333333333]
         }
 
-        result = calc_matrix_stats(input_dict)
+        result = get_matrix_stats(input_matrix)
         self.assertDictEqual(result, expected_output)
 
     def test_combine_and_one_hot(self):
@@ -223,6 +288,20 @@ class TestSimHelpers(unittest.TestCase):
         self.assertEqual(sim_dict['s1']['date'], expected_date)
         self.assertTrue(sim_dict['s1']['sim_start'].startswith(expected_sim_start))
 
+    def test_create_engine_props(self):
+        """Test setting up a simulation's properties without saving its input."""
+        engine_props = {'network': 'NSFNet', 'erlang': 100.0, 'cores_per_link': 4, 'holding_time': 2.0,
+                        'const_link_weight': False, 'mod_assumption': 'example_mod_a',
+                        'mod_assumptions_path': 'json_input/example_mods/example_mod_formats.json'}
+
+        resp_props = create_engine_props(engine_props=engine_props, date='bench', sim_start='case')
+
+        self.assertIs(resp_props, engine_props)
+        self.assertEqual(engine_props['arrival_rate'], 200.0)
+        self.assertEqual((engine_props['date'], engine_props['sim_start']), ('bench', 'case'))
+        self.assertIn('100', engine_props['mod_per_bw'])
+        self.assertEqual(len(engine_props['topology_info']['nodes']), 14)
+
     def test_min_max_scale(self):
         """Test scaling a value with respect to a min and max."""
         value = 5
@@ -269,6 +348,34 @@ class TestSimHelpers(unittest.TestCase):
         self.assertTrue(np.array_equal(sc_index_mat, expected_sc_index_mat))
         self.assertTrue(np.array_equal(resp_frag_arr, expected_resp_frag_arr))
 
+    def test_get_hfrag_no_super_channels(self):
+        """Test fragmentation scores when a request fits nowhere or only once."""
+        net_spec_dict = {(1, 2): {'cores_matrix': {'c': np.array([[1, 1, 0, 0, 1, 0]])}}}
+        sc_index_mat, resp_frag_arr = get_hfrag([1, 2], 0, 'c', 2, 6, net_spec_dict)
+        self.assertEqual(len(sc_index_mat), 0)
+        self.assertTrue(np.all(np.isinf(resp_frag_arr)))
+
+        # Allocating the only super-channel leaves none
+        sc_index_mat, resp_frag_arr = get_hfrag([1, 2], 0, 'c', 1, 6, net_spec_dict)
+        self.assertTrue(np.array_equal(sc_index_mat, np.array([[2, 3]])))
+        self.assertEqual(resp_frag_arr[2], -np.inf)
+
+    def test_get_hfrag_mat(self):
+        """Test scoring every core of a path at once."""
+        net_spec_dict = {
+            (1, 2): {'cores_matrix': {'c': np.array([[0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 1, 0, 0, 0, 0]])}},
+            (2, 3): {'cores_matrix': {'c': np.array([[0, 0, 0, 0, 0, 0, 0, -2], [0, 0, 0, 0, 0, 0, 0, 0]])}},
+        }
+        occupied_mat = get_path_occupancy([1, 2, 3], 'c', net_spec_dict)
+        self.assertTrue(np.array_equal(occupied_mat, [[0, 0, 0, 0, 0, 0, 0, 1], [0, 0, 0, 1, 0, 0, 0, 0]]))
+
+        is_start_mat, resp_frag_mat = get_hfrag_mat(occupied_mat, 1, 8)
+        self.assertEqual(resp_frag_mat.shape, (2, 8))
+        for core_num in range(2):
+            sc_index_mat, resp_frag_arr = get_hfrag([1, 2, 3], core_num, 'c', 1, 8, net_spec_dict)
+            self.assertTrue(np.array_equal(np.flatnonzero(is_start_mat[core_num]), sc_index_mat[:, 0]))
+            self.assertTrue(np.array_equal(resp_frag_mat[core_num], resp_frag_arr))
+
     def test_classify_cong(self):
         """Test classifying congestion percentage into levels."""
         curr_cong = 0.2
@@ -281,6 +388,21 @@ class TestSimHelpers(unittest.TestCase):
         cong_index = classify_cong(curr_cong)
         self.assertEqual(cong_index, expected_cong_index)
 
+    def test_get_erlang_bracket(self):
+        """Test finding the Erlangs around a target blocking probability."""
+        points_dict = {100.0: 0.001, 200.0: 0.005, 300.0: 0.02, 400.0: 0.08}
+        self.assertEqual(get_erlang_bracket(points_dict, 0.01), (200.0, 300.0))
+        self.assertEqual(get_erlang_bracket(points_dict, 0.1), (400.0, None))
+        self.assertEqual(get_erlang_bracket(points_dict, 0.0001), (None, 100.0))
+
+    def test_get_next_erlang(self):
+        """Test proposing the next Erlang during a target blocking search."""
+        self.assertEqual(get_next_erlang({100.0: 0.001, 200.0: 0.005}, 0.01), 400.0)
+        self.assertEqual(get_next_erlang({100.0: 0.05, 200.0: 0.1}, 0.01), 50.0)
+        self.assertAlmostEqual(get_next_erlang({200.0: 0.005, 300.0: 0.02}, 0.01), 200.0 + 100.0 / 3.0)
+        # Secant steps are kept inside the bracket
+        self.assertAlmostEqual(get_next_erlang({200.0: 0.0, 300.0: 0.5}, 0.01), 210.0)
+
     @patch('builtins.open', new_callable=mock_open, read_data="key: value")
     @patch('helper_scripts.sim_helpers.yaml.safe_load')
     def test_parse_yaml_file(self, mock_yaml_load, mock_open_file):
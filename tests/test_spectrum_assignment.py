@@ -2,7 +2,8 @@
 
 import unittest
 from unittest.mock import MagicMock, patch
-import numpy as np
+from arg_scripts.engine_args import EngineConfig, AllocationMethod
+from helper_scripts.sim_helpers import create_link_spectrum
 from src.spectrum_assignment import SpectrumAssignment
 
 
@@ -11,17 +12,17 @@ class TestSpectrumAssignment(unittest.TestCase):
 
     def setUp(self):
         """Set up the necessary properties and objects for the tests."""
-        cores_matrix = {
-            'c': np.array([
-                [0, 0, 0, 0, 0, 0, 0, 0, 2, -2],
-                [1, -1, 0, 0, 0, 0, 3, 3, 3, -3],
-                [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
-                [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
-                [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
-                [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
-                [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
-            ])
-        }
+        link_dict = create_link_spectrum(num_cores=7, band_slots_dict={'c': 10})
+        link_dict['spectrum_arr'][:] = [
+            [0, 0, 0, 0, 0, 0, 0, 0, 2, -2],
+            [1, -1, 0, 0, 0, 0, 3, 3, 3, -3],
+            [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
+            [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
+            [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
+            [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
+            [0, 4, 4, 4, -4, 0, 0, 1, 1, 0],
+        ]
+        cores_matrix = link_dict['cores_matrix']
         engine_props = {
             'cores_per_link': 2,
             'guard_slots': 1,
@@ -31,8 +32,8 @@ class TestSpectrumAssignment(unittest.TestCase):
         }
         sdn_props = MagicMock()
         sdn_props.net_spec_dict = {
-            ('source', 'dest'): {'cores_matrix': cores_matrix},
-            ('dest', 'source'): {'cores_matrix': cores_matrix}
+            ('source', 'dest'): link_dict,
+            ('dest', 'source'): dict(link_dict)
         }
         sdn_props.mod_formats_dict = {
             '16QAM': {'slots_needed': 2},
@@ -70,22 +71,25 @@ class TestSpectrumAssignment(unittest.TestCase):
     def test_setup_first_last(self):
         """Test setting up first and last fit."""
         self.spec_assign.spectrum_props.forced_core = 2
-        core_matrix, core_list, _ = self.spec_assign._setup_first_last()
+        core_list, band_list = self.spec_assign._setup_first_last()
         self.assertEqual(core_list, [2])
-        self.assertTrue(np.array_equal(core_matrix[0], [[0,  4,  4,  4, -4,  0,  0,  1,  1,  0]]))
+        self.assertEqual(list(band_list), ['c'])
 
         self.spec_assign.spectrum_props.forced_core = None
         self.spec_assign.engine_props['allocation_method'] = 'priority_first'
-        _, core_list, _ = self.spec_assign._setup_first_last()
+        self.spec_assign.update_config()
+        core_list, _ = self.spec_assign._setup_first_last()
         self.assertEqual(core_list, [0, 2, 4, 1, 3, 5, 6])
 
         self.spec_assign.engine_props['allocation_method'] = 'default'
-        _, core_list, _ = self.spec_assign._setup_first_last()
+        self.spec_assign.update_config()
+        core_list, _ = self.spec_assign._setup_first_last()
         self.assertEqual(core_list, list(range(0, self.spec_assign.engine_props['cores_per_link'])))
 
     def test_first_fit(self):
         """Test first fit allocation."""
         self.spec_assign.engine_props['allocation_method'] = 'first_fit'
+        self.spec_assign.update_config()
         self.spec_assign.handle_first_last('first_fit')
         self.assertEqual(self.spec_assign.spectrum_props.start_slot, 0)
         self.assertEqual(self.spec_assign.spectrum_props.end_slot, 3)
@@ -93,6 +97,7 @@ class TestSpectrumAssignment(unittest.TestCase):
     def test_last_fit(self):
         """Test last fit allocation."""
         self.spec_assign.engine_props['allocation_method'] = 'last_fit'
+        self.spec_assign.update_config()
         self.spec_assign.handle_first_last('last_fit')
         self.assertEqual(self.spec_assign.spectrum_props.start_slot, 5)
         self.assertEqual(self.spec_assign.spectrum_props.end_slot, 8)
@@ -118,6 +123,28 @@ class TestSpectrumAssignment(unittest.TestCase):
             self.assertEqual(self.spec_assign.spectrum_props.modulation, 'QPSK',
                              "Expected modulation to be set to 'QPSK'.")
 
+    def test_update_config(self):
+        """Test that the allocation method is compiled once and shared with the helper objects."""
+        config_obj = EngineConfig(engine_props={'guard_slots': 0, 'cores_per_link': 2, 'band_list': ['c'],
+                                                'allocation_method': 'last_fit'})
+        with self.assertRaises(AttributeError):
+            config_obj.guard_slots = 1
+
+        self.spec_assign.update_config(config_obj=config_obj)
+        self.assertEqual(config_obj.allocation_method, AllocationMethod.LAST_FIT)
+        self.assertIs(self.spec_assign.spec_help_obj.config_obj, config_obj)
+        self.assertIs(self.spec_assign.snr_obj.config_obj, config_obj)
+        self.assertTrue(self.spec_assign.spec_help_obj.is_last_fit)
+
+        self.spec_assign._get_spectrum()
+        self.assertEqual(self.spec_assign.spectrum_props.start_slot, 6)
+        self.assertEqual(self.spec_assign.spectrum_props.end_slot, 7)
+
+        self.spec_assign.engine_props['allocation_method'] = 'unknown'
+        self.spec_assign.update_config()
+        with self.assertRaises(NotImplementedError):
+            self.spec_assign._get_spectrum()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,8 +4,8 @@ import unittest
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
-import numpy as np
-from helper_scripts.spectrum_helpers import SpectrumHelpers
+from helper_scripts.sim_helpers import create_link_spectrum
+from helper_scripts.spectrum_helpers import SpectrumHelpers, FeasibilityOracle, SlicingPlanner
 
 
 class TestSpectrumHelpers(unittest.TestCase):
@@ -31,13 +31,9 @@ class TestSpectrumHelpers(unittest.TestCase):
             curr_band=None
         )
         self.sdn_props = MagicMock()
-        # Initialize cores_matrix as a 2D array (matrix) with 2 cores and 10 slots each
-        self.sdn_props.net_spec_dict = {
-            (1, 2): {'cores_matrix': {'c': np.zeros((2, 10))}},
-            (2, 1): {'cores_matrix': {'c': np.zeros((2, 10))}},
-            (2, 3): {'cores_matrix': {'c': np.zeros((2, 10))}},
-            (3, 2): {'cores_matrix': {'c': np.zeros((2, 10))}},
-        }
+        # Every link direction has its own spectrum with 2 cores and 10 slots each
+        self.sdn_props.net_spec_dict = {link_tuple: create_link_spectrum(num_cores=2, band_slots_dict={'c': 10})
+                                        for link_tuple in [(1, 2), (2, 1), (2, 3), (3, 2)]}
         self.helpers = SpectrumHelpers(self.engine_props, self.sdn_props, self.spectrum_props)
 
     def test_check_free_spectrum(self):
@@ -76,30 +72,137 @@ class TestSpectrumHelpers(unittest.TestCase):
         self.assertEqual(self.spectrum_props.core_num, 0)
         self.assertEqual(self.spectrum_props.curr_band, 'c')
 
-    def test_check_super_channels(self):
-        """Test checking for available super-channels."""
-        open_slots_matrix = [[0, 1, 2, 3, 4], [5, 6, 7, 8]]
-
-        # Set necessary variables
-        self.helpers.curr_band = 'c'
-        self.helpers.core_num = 0
-
-        # Test when there is a valid allocation
-        self.spectrum_props.slots_needed = 2
-        self.helpers.engine_props['guard_slots'] = 1
-        self.assertTrue(self.helpers.check_super_channels(open_slots_matrix, flag=''))
+    def test_find_super_channel(self):
+        """Test finding the first super-channel free on every link."""
+        self.sdn_props.net_spec_dict[(1, 2)]['cores_matrix']['c'][0, 5] = 1
+        self.sdn_props.net_spec_dict[(3, 2)]['cores_matrix']['c'][0, 1] = -1
 
-        # Test when there is no valid allocation (e.g., due to forced index)
-        self.spectrum_props.forced_index = 5
-        self.assertTrue(self.helpers.check_super_channels(open_slots_matrix, flag='forced_index'))
+        # Slots two to four are free on every link of the first core
+        self.assertTrue(self.helpers.find_super_channel(core_list=[0, 1], band_list=['c'], flag='first_fit'))
+        self.assertEqual((self.spectrum_props.start_slot, self.spectrum_props.end_slot), (2, 5))
+        self.assertEqual(self.spectrum_props.core_num, 0)
 
-        # Test when the allocation method is last_fit
-        self.helpers.engine_props['allocation_method'] = 'last_fit'
-        self.assertFalse(self.helpers.check_super_channels(open_slots_matrix, flag=''))
+        # A forced index is only allocated if the window starting there is free
+        self.spectrum_props.forced_index = 3
+        self.assertFalse(self.helpers.find_super_channel(core_list=[0], band_list=['c'], flag='forced_index'))
+        self.assertTrue(self.helpers.find_super_channel(core_list=[0, 1], band_list=['c'], flag='forced_index'))
+        self.assertEqual((self.spectrum_props.core_num, self.spectrum_props.start_slot), (1, 3))
 
         # Test when no super-channel can satisfy the request
         self.spectrum_props.slots_needed = 10
-        self.assertFalse(self.helpers.check_super_channels(open_slots_matrix, flag=''))
+        self.assertFalse(self.helpers.find_super_channel(core_list=[0, 1], band_list=['c'], flag='first_fit'))
+
+    def test_find_super_channel_bands(self):
+        """Test that windows don't cross bands and that reversed flags take the end of a free run."""
+        self.spectrum_props.path_list = [1, 2]
+        link_dict = create_link_spectrum(num_cores=2, band_slots_dict={'c': 4, 'l': 6})
+        link_dict['cores_matrix']['c'][0, 0] = 1
+        self.sdn_props.net_spec_dict = {(1, 2): link_dict, (2, 1): link_dict}
+
+        self.spectrum_props.slots_needed = 3
+        self.assertTrue(self.helpers.find_super_channel(core_list=[0, 1], band_list=['c', 'l'], flag='first_fit'))
+        self.assertEqual((self.spectrum_props.core_num, self.spectrum_props.curr_band), (0, 'l'))
+        self.assertEqual((self.spectrum_props.start_slot, self.spectrum_props.end_slot), (0, 4))
+
+        self.engine_props['allocation_method'] = 'last_fit'
+        self.helpers.update_config()
+        self.assertTrue(self.helpers.find_super_channel(core_list=[0, 1], band_list=['c', 'l'], flag='last_fit'))
+        self.assertEqual((self.spectrum_props.core_num, self.spectrum_props.curr_band), (0, 'l'))
+        self.assertEqual((self.spectrum_props.start_slot, self.spectrum_props.end_slot), (2, 6))
+
+
+class TestFeasibilityOracle(unittest.TestCase):
+    """Unit tests for the FeasibilityOracle class."""
+
+    def setUp(self):
+        """Set up a three node line with two cores and two bands."""
+        self.engine_props = {'allocation_method': 'first_fit', 'snr_type': None, 'guard_slots': 1,
+                             'cores_per_link': 2, 'band_list': ['c', 'l']}
+        self.net_spec_dict = dict()
+        for link_tuple in [(1, 2), (2, 3)]:
+            link_dict = create_link_spectrum(num_cores=2, band_slots_dict={'c': 10, 'l': 6})
+            self.net_spec_dict[link_tuple] = link_dict
+            self.net_spec_dict[link_tuple[::-1]] = dict(link_dict)
+        self.mod_formats_dict = {'QPSK': {'slots_needed': 4}, '16-QAM': {'slots_needed': 2}}
+        self.oracle = FeasibilityOracle(engine_props=self.engine_props)
+
+    def test_is_supported(self):
+        """Test configurations that need a full spectrum search."""
+        self.assertTrue(self.oracle.is_supported())
+        self.engine_props['snr_type'] = 'xt_calculation'
+        self.oracle.update_config()
+        self.assertFalse(self.oracle.is_supported())
+        self.engine_props['snr_type'] = 'None'
+        self.engine_props['allocation_method'] = 'best_fit'
+        self.oracle.update_config()
+        self.assertFalse(self.oracle.is_supported())
+
+    def test_get_feasibility(self):
+        """Test the first-fit start slot on every path, core, and band."""
+        self.net_spec_dict[(1, 2)]['cores_matrix']['c'][0, 0:3] = 1
+        self.net_spec_dict[(2, 3)]['cores_matrix']['c'][0, 4:6] = -1
+        self.net_spec_dict[(2, 3)]['cores_matrix']['l'][1, 2] = 2
+
+        feasible_arr, start_arr = self.oracle.get_feasibility(
+            net_spec_dict=self.net_spec_dict, paths_matrix=[[1, 2, 3], [2, 3]],
+            mod_formats_matrix=[['QPSK', '16-QAM'], [False, 'QPSK']], mod_formats_dict=self.mod_formats_dict)
+
+        self.assertEqual(feasible_arr.shape, (2, 2, 2))
+        # Only 16-QAM fits after the guard band on the first core
+        self.assertEqual(start_arr[0].tolist(), [[6, 0], [0, 3]])
+        self.assertEqual(start_arr[1].tolist(), [[-1, 0], [0, -1]])
+        self.assertEqual(feasible_arr[1].tolist(), [[False, True], [True, False]])
+
+    def test_get_feasibility_fallback_mod(self):
+        """Test that a later modulation format is used where the first does not fit."""
+        self.net_spec_dict[(1, 2)]['cores_matrix']['l'][:, 3:] = 1
+
+        _, start_arr = self.oracle.get_feasibility(
+            net_spec_dict=self.net_spec_dict, paths_matrix=[[1, 2]], mod_formats_matrix=[['QPSK', '16-QAM']],
+            mod_formats_dict=self.mod_formats_dict)
+
+        self.assertEqual(start_arr[0].tolist(), [[0, 0], [0, 0]])
+        self.assertIs(self.oracle.links_dict[(1, 2)][0][0], self.net_spec_dict[(1, 2)]['spectrum_arr'])
+
+
+class TestSlicingPlanner(unittest.TestCase):
+    """Unit tests for the SlicingPlanner class."""
+
+    def setUp(self):
+        """Set up a three node line with two cores and two bands."""
+        self.engine_props = {'allocation_method': 'first_fit', 'snr_type': None, 'guard_slots': 1,
+                             'cores_per_link': 2, 'band_list': ['c', 'l']}
+        self.net_spec_dict = dict()
+        for link_tuple in [(1, 2), (2, 3)]:
+            link_dict = create_link_spectrum(num_cores=2, band_slots_dict={'c': 10, 'l': 6})
+            self.net_spec_dict[link_tuple] = link_dict
+            self.net_spec_dict[link_tuple[::-1]] = dict(link_dict)
+        self.spectrum_props = SimpleNamespace(forced_index=None, forced_core=None, forced_band=None)
+        self.planner = SlicingPlanner(engine_props=self.engine_props)
+
+    def test_is_supported(self):
+        """Test configurations where segments must be searched for one at a time."""
+        self.assertTrue(self.planner.is_supported(spectrum_props=self.spectrum_props))
+        self.spectrum_props.forced_core = 1
+        self.assertFalse(self.planner.is_supported(spectrum_props=self.spectrum_props))
+
+        self.spectrum_props.forced_core = None
+        self.engine_props['allocation_method'] = 'last_fit'
+        self.planner.update_config()
+        self.assertFalse(self.planner.is_supported(spectrum_props=self.spectrum_props))
+
+    def test_plan(self):
+        """Test that segments are packed first-fit into the slots free on every link."""
+        self.net_spec_dict[(1, 2)]['cores_matrix']['c'][0, 0:2] = 1
+        self.net_spec_dict[(2, 3)]['cores_matrix']['c'][0, 7] = -1
+        self.net_spec_dict[(2, 3)]['cores_matrix']['l'][0, 3] = 2
+        self.planner.set_path(net_spec_dict=self.net_spec_dict, path_list=[1, 2, 3])
+
+        # Core zero has slots two to six and eight to nine free in the c-band, zero to two in the l-band
+        self.assertEqual(self.planner.plan(window=2, num_segments=3), [(0, 'c', 2), (0, 'c', 4), (0, 'c', 8)])
+        self.assertEqual(self.planner.plan(window=3, num_segments=3), [(0, 'c', 2), (0, 'l', 0), (1, 'c', 0)])
+        self.assertEqual(len(self.planner.plan(window=5, num_segments=4)), 4)
+        self.assertIsNone(self.planner.plan(window=5, num_segments=5))
 
 
 if __name__ == '__main__':
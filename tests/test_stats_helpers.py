@@ -2,12 +2,13 @@
 
 import unittest
 import shutil
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, mock_open
 
-import numpy as np
 import networkx as nx
 
-from helper_scripts.stats_helpers import SimStats
+from helper_scripts.sim_helpers import create_link_spectrum
+from helper_scripts.stats_helpers import SimStats, get_paired_stats
 from arg_scripts.stats_args import StatsProps
 from arg_scripts.stats_args import SNAP_KEYS_LIST
 
@@ -81,10 +82,10 @@ class TestSimStats(unittest.TestCase):
         """
         Test get snapshot info.
         """
-        net_spec_dict = {
-            (0, 1): {'cores_matrix': [np.array([0, 1, 0, -1]), np.array([1, 0, -1, 0])]},
-            (1, 0): {'cores_matrix': [np.array([0, -1, 1, 0]), np.array([-1, 1, 0, 0])]}
-        }
+        net_spec_dict = {link_tuple: create_link_spectrum(num_cores=2, band_slots_dict={'c': 4})
+                         for link_tuple in [(0, 1), (1, 0)]}
+        net_spec_dict[(0, 1)]['spectrum_arr'][:] = [[0, 1, 0, -1], [1, 0, -1, 0]]
+        net_spec_dict[(1, 0)]['spectrum_arr'][:] = [[0, -1, 1, 0], [-1, 1, 0, 0]]
         path_list = [(0, 1)]
         occupied_slots, guard_slots, active_reqs = SimStats._get_snapshot_info(net_spec_dict=net_spec_dict,
                                                                                path_list=path_list)
@@ -227,7 +228,7 @@ class TestSimStats(unittest.TestCase):
 
     def test_iter_update(self):
         """Test iter update."""
-        req_data_blocked = {'bandwidth': '50GHz'}
+        req_data_blocked = SimpleNamespace(bandwidth='50GHz')
         sdn_data_blocked = MagicMock()
         sdn_data_blocked.was_routed = False
         sdn_data_blocked.block_reason = 'congestion'
@@ -239,7 +240,7 @@ class TestSimStats(unittest.TestCase):
         self.assertEqual(self.sim_stats.stats_props.block_reasons_dict['congestion'], 1)
         self.assertEqual(self.sim_stats.stats_props.block_bw_dict['50GHz'], 1)
 
-        req_data_routed = {'bandwidth': '50GHz'}
+        req_data_routed = SimpleNamespace(bandwidth='50GHz')
         sdn_data_routed = MagicMock()
         sdn_data_routed.was_routed = True
         sdn_data_routed.path_list = ['A', 'B', 'C']
@@ -311,5 +312,40 @@ class TestSimStats(unittest.TestCase):
         mock_file.assert_called_once_with('mocked/path/to/simulation_results/10_erlang.json', 'w', encoding='utf-8')
 
 
+class TestPairedStats(unittest.TestCase):
+    """
+    Tests the paired comparison of two policies.
+    """
+
+    def test_single_iteration(self):
+        """
+        Tests that one iteration is never enough to separate policies.
+        """
+        resp_dict = get_paired_stats(block_one_list=[0.2], block_two_list=[0.1])
+
+        self.assertAlmostEqual(resp_dict['mean_diff'], 0.1)
+        self.assertIsNone(resp_dict['ci_diff'])
+        self.assertFalse(resp_dict['is_separated'])
+
+    def test_separated(self):
+        """
+        Tests policies whose difference is consistent across iterations.
+        """
+        resp_dict = get_paired_stats(block_one_list=[0.2, 0.3, 0.25], block_two_list=[0.1, 0.21, 0.14])
+
+        self.assertAlmostEqual(resp_dict['mean_diff'], 0.1)
+        self.assertTrue(resp_dict['is_separated'])
+        self.assertEqual(resp_dict['num_iters'], 3)
+
+    def test_not_separated(self):
+        """
+        Tests policies whose difference changes sign across iterations.
+        """
+        resp_dict = get_paired_stats(block_one_list=[0.2, 0.1], block_two_list=[0.1, 0.2])
+
+        self.assertAlmostEqual(resp_dict['mean_diff'], 0.0)
+        self.assertFalse(resp_dict['is_separated'])
+
+
 if __name__ == '__main__':
     unittest.main()
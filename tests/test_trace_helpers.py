@@ -0,0 +1,136 @@
+import os
+import shutil
+import unittest
+from types import SimpleNamespace
+
+from helper_scripts.trace_helpers import TraceRecorder, get_trace_fp, read_trace, load_trace_requests
+from arg_scripts.request_args import Request
+from arg_scripts.trace_args import OUTCOME_LIST
+
+
+class TestTraceHelpers(unittest.TestCase):
+    """
+    Tests trace_helpers.py
+    """
+
+    def setUp(self):
+        self.engine_props = {
+            'topology_info': {'nodes': {'A': {}, 'B': {}, 'C': {}}},
+            'band_list': ['c', 'l'],
+            'guard_slots': 1,
+            'mod_per_bw': {'50': {'QPSK': {}}, '100': {'16-QAM': {}}},
+        }
+        self.trace_dir = os.path.join('tests', 'trace_test')
+        self.trace_fp = get_trace_fp(base_dir=self.trace_dir, erlang=10.0, iteration=0)
+
+        self.req_one = SimpleNamespace(req_id=1, source='A', destination='C', arrive=0.5, depart=2.0, bandwidth='100')
+        self.req_two = SimpleNamespace(req_id=2, source='B', destination='A', arrive=1.0, depart=1.5, bandwidth='50')
+        self.req_three = SimpleNamespace(req_id=3, source='C', destination='B', arrive=2.5, depart=3.0,
+                                         bandwidth='100')
+        self.routed_props = SimpleNamespace(was_routed=True, path_index=1, num_trans=1, bandwidth_list=['100'],
+                                            core_list=[3], band_list=['l'], start_slot_list=[10], end_slot_list=[14],
+                                            block_reason=None)
+        # A failed slicing attempt on another bandwidth is left ahead of the two allocated segments
+        self.sliced_props = SimpleNamespace(was_routed=True, path_index=0, num_trans=2,
+                                            bandwidth_list=['25', '50', '50'], core_list=[0, 2, 5],
+                                            band_list=['c', 'c', 'l'], start_slot_list=[0, 0, 20],
+                                            end_slot_list=[1, 2, 22], block_reason=None)
+        self.blocked_props = SimpleNamespace(was_routed=False, block_reason='congestion')
+
+    def tearDown(self):
+        shutil.rmtree(self.trace_dir, ignore_errors=True)
+
+    def _write_trace(self):
+        trace_obj = TraceRecorder(engine_props=self.engine_props, save_fp=self.trace_fp)
+        trace_obj.write_arrival(req_obj=self.req_one, sdn_props=self.routed_props)
+        trace_obj.write_arrival(req_obj=self.req_two, sdn_props=self.blocked_props)
+        trace_obj.write_release(req_obj=self.req_two, was_routed=False)
+        trace_obj.write_release(req_obj=self.req_one, was_routed=True)
+        trace_obj.close()
+
+    def test_get_trace_fp(self):
+        """
+        Tests the trace file path.
+        """
+        self.assertEqual(self.trace_fp, os.path.join('tests', 'trace_test', '10.0_erlang_trace_0.bin'))
+
+    def test_read_trace(self):
+        """
+        Tests writing and reading back every record.
+        """
+        self._write_trace()
+        records_arr = read_trace(trace_fp=self.trace_fp)
+
+        self.assertEqual(len(records_arr), 4)
+        self.assertEqual(records_arr['time'].tolist(), [0.5, 1.0, 1.5, 2.0])
+        self.assertEqual(records_arr['req_type'].tolist(), [0, 0, 1, 1])
+        self.assertEqual(records_arr['source'].tolist(), [0, 1, 1, 0])
+        self.assertEqual(records_arr['bandwidth'].tolist(), [100, 50, 50, 100])
+
+        routed_record = records_arr[0]
+        self.assertEqual(routed_record['path_index'], 1)
+        self.assertEqual(routed_record['core_num'], 3)
+        self.assertEqual(routed_record['band_index'], 1)
+        self.assertEqual(routed_record['start_slot'], 10)
+        self.assertEqual(routed_record['num_slots'], 4)
+        self.assertEqual(OUTCOME_LIST[routed_record['outcome']], 'routed')
+
+        blocked_record = records_arr[1]
+        self.assertEqual(blocked_record['path_index'], -1)
+        self.assertEqual(blocked_record['start_slot'], -1)
+        self.assertEqual(OUTCOME_LIST[blocked_record['outcome']], 'congestion')
+        self.assertEqual(OUTCOME_LIST[records_arr[2]['outcome']], 'blocked')
+
+    def test_read_sliced_trace(self):
+        """
+        Tests every segment of a sliced request is recorded.
+        """
+        trace_obj = TraceRecorder(engine_props=self.engine_props, save_fp=self.trace_fp)
+        trace_obj.write_arrival(req_obj=self.req_three, sdn_props=self.sliced_props)
+        trace_obj.write_release(req_obj=self.req_three, was_routed=True)
+        trace_obj.close()
+        records_arr = read_trace(trace_fp=self.trace_fp)
+
+        self.assertEqual(records_arr['req_type'].tolist(), [0, 0, 1])
+        self.assertEqual(records_arr['req_id'].tolist(), [3, 3, 3])
+        self.assertEqual(records_arr['bandwidth'].tolist(), [50, 50, 100])
+        self.assertEqual(records_arr['path_index'].tolist(), [0, 0, -1])
+        self.assertEqual(records_arr['core_num'].tolist(), [2, 5, -1])
+        self.assertEqual(records_arr['band_index'].tolist(), [0, 1, -1])
+        self.assertEqual(records_arr['start_slot'].tolist(), [0, 20, -1])
+        self.assertEqual(records_arr['num_slots'].tolist(), [2, 2, -1])
+
+        requests_dict = load_trace_requests(trace_fp=self.trace_fp, engine_props=self.engine_props)
+        self.assertEqual(list(requests_dict.keys()), [2.5, 3.0])
+        self.assertEqual(requests_dict[2.5], Request(
+            req_id=3, source='C', destination='B', arrive=2.5, depart=3.0, request_type='arrival', bandwidth='100',
+            mod_formats={'16-QAM': {}}))
+
+    def test_read_invalid_trace(self):
+        """
+        Tests reading a file that is not a trace.
+        """
+        os.makedirs(self.trace_dir)
+        with open(self.trace_fp, 'wb') as file_obj:
+            file_obj.write(b'not a trace file')
+
+        with self.assertRaises(ValueError):
+            read_trace(trace_fp=self.trace_fp)
+
+    def test_load_trace_requests(self):
+        """
+        Tests rebuilding the requests from a trace.
+        """
+        self._write_trace()
+        requests_dict = load_trace_requests(trace_fp=self.trace_fp, engine_props=self.engine_props)
+
+        self.assertEqual(list(requests_dict.keys()), [0.5, 1.0, 1.5, 2.0])
+        self.assertEqual(requests_dict[2.0], Request(
+            req_id=1, source='A', destination='C', arrive=0.5, depart=2.0, request_type='release', bandwidth='100',
+            mod_formats={'16-QAM': {}}))
+        self.assertEqual(requests_dict[1.0].request_type, 'arrival')
+        self.assertEqual(requests_dict[1.0].depart, 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()